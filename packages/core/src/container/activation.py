@@ -0,0 +1,41 @@
+"""
+Compiled Activation Plans
+========================
+
+Per-service resolution plans compiled once from constructor and factory
+signatures, so resolving a service does not reflect over it again.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from .lifetime import ServiceLifetime
+
+
+@dataclass(frozen=True)
+class PlanArgument:
+    """
+    One keyword argument of a compiled activation.
+    
+    ``service_type`` is resolved from the container on each activation;
+    otherwise ``value`` is passed as-is (a parameter default or the
+    container itself for factories).
+    """
+    name: str
+    service_type: Optional[Type] = None
+    value: Any = None
+
+
+@dataclass
+class ActivationPlan:
+    """How a service is resolved: its lifetime, arguments and activation callable."""
+    service_type: Type
+    lifetime: ServiceLifetime
+    source: str  # "instance", "type", "factory" or "provider"
+    arguments: Tuple[PlanArgument, ...] = ()
+    activate: Callable[[], Any] = field(default=None, repr=False)
+    
+    @property
+    def dependencies(self) -> List[Type]:
+        """Service types resolved when the plan is activated."""
+        return [arg.service_type for arg in self.arguments if arg.service_type is not None]
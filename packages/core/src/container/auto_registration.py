@@ -13,15 +13,22 @@ from pathlib import Path
 
 from packages.core.src.container import Container, injectable, singleton, scoped, transient
 from packages.core.src.container.configuration import get_application_config
-from packages.core.src.container.lifetime import ServiceLifetime
+from packages.core.src.container.lifetime import ServiceLifetime, import_path
+from packages.core.src.container.manifest import (
+    ServiceManifest, load_manifest, manifest_verification_enabled
+)
+
+# Source paths scanned for services, relative to the project root
+DISCOVERY_PATHS = ["src/services", "src/adapters", "src/handlers", "packages", "services"]
 
 
 class ServiceDiscovery:
     """Discovers and registers services throughout the monorepo."""
     
-    def __init__(self, container: Container, base_path: str = None):
+    def __init__(self, container: Container, base_path: str = None, discovery_paths: List[str] = None):
         self.container = container
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        self.discovery_paths = discovery_paths or DISCOVERY_PATHS
         self.discovered_services: Dict[str, Type] = {}
         self.registration_errors: List[str] = []
     
@@ -36,11 +43,7 @@ class ServiceDiscovery:
         self._register_aws_services()
         
         # Discover and register services by module
-        self._discover_services_in_path("src/services")
-        self._discover_services_in_path("src/adapters")
-        self._discover_services_in_path("src/handlers")
-        self._discover_services_in_path("packages")
-        self._discover_services_in_path("services")  # Microservices
+        self.discover_services()
         
         # Register discovered services
         self._register_discovered_services()
@@ -51,6 +54,48 @@ class ServiceDiscovery:
         print(f"✅ Service discovery completed. Registered {len(self.discovered_services)} services.")
         return self.container
     
+    def discover_services(self) -> Dict[str, Type]:
+        """Import every module under the discovery paths and collect service classes."""
+        for relative_path in self.discovery_paths:
+            self._discover_services_in_path(relative_path)
+        return self.discovered_services
+    
+    def register_from_manifest(self, manifest: ServiceManifest) -> Container:
+        """Register services listed in a discovery manifest without importing them."""
+        print("📜 Registering services from discovery manifest...")
+        
+        self._register_configuration()
+        self._register_aws_services()
+        
+        for entry in manifest.services:
+            self.container.register_lazy(
+                entry.service,
+                entry.implementation,
+                ServiceLifetime(entry.lifetime)
+            )
+        
+        print(f"✅ Registered {len(manifest.services)} services from manifest (loaded on first resolve).")
+        return self.container
+    
+    def manifest_entries(self) -> List[Dict[str, str]]:
+        """Describe discovered services as manifest entries, as registration would."""
+        entries = []
+        
+        for service_class in self.discovered_services.values():
+            implementation = service_class
+            if inspect.isabstract(service_class):
+                implementation = self._find_implementation(service_class)
+                if implementation is None:
+                    continue
+            
+            entries.append({
+                'service': import_path(service_class),
+                'implementation': import_path(implementation),
+                'lifetime': self._determine_service_lifetime(service_class).value
+            })
+        
+        return entries
+    
     def _register_configuration(self) -> None:
         """Register configuration services."""
         print("📋 Registering configuration services...")
@@ -442,10 +487,25 @@ class MockBedrockClient:
         }
 
 
-def create_auto_configured_container(base_path: str = None) -> Container:
-    """Create a container with automatic service discovery and registration."""
+def create_auto_configured_container(base_path: str = None, manifest_path: str = None) -> Container:
+    """
+    Create a container with automatic service discovery and registration.
+    
+    When ``manifest_path`` names an up-to-date discovery manifest, services are
+    registered from it lazily instead of importing every module to scan them.
+    """
     container = Container()
     discovery = ServiceDiscovery(container, base_path)
+    
+    if manifest_path:
+        manifest = load_manifest(manifest_path)
+        if manifest is None:
+            print(f"⏭️ No usable discovery manifest at {manifest_path}, scanning sources")
+        elif manifest_verification_enabled() and manifest.is_stale(discovery.base_path):
+            print(f"⚠️ Discovery manifest {manifest_path} is stale, scanning sources")
+        else:
+            return discovery.register_from_manifest(manifest)
+    
     return discovery.discover_and_register_all()
 
 
@@ -6,18 +6,19 @@ The core dependency injection container with service resolution and lifecycle ma
 """
 
 import threading
-from typing import Any, Type, Dict, List, Optional, Callable, TypeVar, Union
+from typing import Any, Type, Dict, List, Optional, Callable, Tuple, TypeVar, Union
 import inspect
 from contextlib import contextmanager
 
 from .lifetime import (
-    ServiceLifetime, ServiceDescriptor, ServiceScope,
+    ServiceLifetime, ServiceDescriptor, LazyServiceDescriptor, ServiceScope, import_path,
     SingletonLifetimeManager, ScopedLifetimeManager, TransientLifetimeManager
 )
 from .registry import ServiceRegistry, DependencyInfo
+from .activation import ActivationPlan, PlanArgument
 from .providers import ServiceProvider, ConfigurationProvider, SecretProvider, FactoryProvider, ExternalServiceProvider
 from .exceptions import (
-    ServiceNotRegisteredException, CircularDependencyException,
+    DIException, ServiceNotRegisteredException, CircularDependencyException,
     InvalidLifetimeException, ScopeException
 )
 
@@ -30,7 +31,7 @@ class Container:
     
     Features:
     - Service registration with multiple lifetime strategies
-    - Automatic constructor injection
+    - Automatic constructor injection via compiled activation plans
     - Configuration and secret injection
     - Circular dependency detection
     - Scoped service management
@@ -48,7 +49,13 @@ class Container:
         self._scoped_manager = ScopedLifetimeManager()
         self._transient_manager = TransientLifetimeManager()
         
-        # Resolution tracking for circular dependency detection
+        # Compiled activation plans, dropped whenever the registry changes
+        self._plans: Dict[Type, ActivationPlan] = {}
+        
+        # Services registered by import path, loaded on first resolve
+        self._lazy: Dict[str, LazyServiceDescriptor] = {}
+        
+        # Resolution tracking for cycles through factories and providers
         self._resolution_stack: threading.local = threading.local()
         
         # Setup default providers
@@ -65,6 +72,7 @@ class Container:
         """Register a service provider."""
         with self._lock:
             self._providers.append(provider)
+            self._plans.clear()
     
     def register_singleton(self, service_type: Type[T], implementation_type: Type[T] = None) -> 'Container':
         """Register a service as singleton."""
@@ -93,6 +101,7 @@ class Container:
         
         with self._lock:
             self._registry.register(descriptor)
+            self._plans.clear()
         
         return self
     
@@ -106,6 +115,7 @@ class Container:
         
         with self._lock:
             self._registry.register(descriptor)
+            self._plans.clear()
         
         return self
     
@@ -124,127 +134,229 @@ class Container:
         
         with self._lock:
             self._registry.register(descriptor)
+            self._plans.clear()
+        
+        return self
+    
+    def register_lazy(
+        self,
+        service_path: str,
+        implementation_path: str = None,
+        lifetime: ServiceLifetime = ServiceLifetime.TRANSIENT
+    ) -> 'Container':
+        """
+        Register a service by ``module:qualname`` import path.
+        
+        Nothing is imported until the service is resolved, either by its class
+        or by the import path itself.
+        """
+        descriptor = LazyServiceDescriptor(service_path, implementation_path, lifetime)
+        
+        with self._lock:
+            self._lazy[service_path] = descriptor
+            self._plans.clear()
         
         return self
     
     def resolve(self, service_type: Type[T]) -> T:
         """Resolve a service instance."""
-        # Check resolution stack for circular dependencies
-        if not hasattr(self._resolution_stack, 'stack'):
-            self._resolution_stack.stack = []
+        plan = self._plans.get(service_type)
+        if plan is None:
+            plan = self.get_activation_plan(service_type)
+        return plan.activate()
+    
+    def get_activation_plan(self, service_type: Type) -> ActivationPlan:
+        """Get the compiled activation plan for a service, compiling it if needed."""
+        with self._lock:
+            return self._compile_plan(service_type, [])
+    
+    def _compile_plan(self, service_type: Type, compiling: List[Type]) -> ActivationPlan:
+        """Compile a plan and the plans of its dependencies, detecting cycles."""
+        plan = self._plans.get(service_type)
+        if plan is not None:
+            return plan
         
-        if service_type in self._resolution_stack.stack:
-            chain = self._resolution_stack.stack + [service_type]
-            raise CircularDependencyException(chain)
+        if service_type in compiling:
+            raise CircularDependencyException(compiling + [service_type])
         
+        compiling.append(service_type)
         try:
-            self._resolution_stack.stack.append(service_type)
-            return self._resolve_internal(service_type)
+            plan = self._build_plan(service_type, compiling)
         finally:
-            self._resolution_stack.stack.pop()
+            compiling.pop()
+        
+        self._plans[service_type] = plan
+        return plan
     
-    def _resolve_internal(self, service_type: Type[T]) -> T:
-        """Internal service resolution logic."""
+    def _build_plan(self, service_type: Type, compiling: List[Type]) -> ActivationPlan:
+        """Build the activation plan for a single service."""
         # Try registered services first
         if self._registry.is_registered(service_type):
-            descriptor = self._registry.get_descriptor(service_type)
-            return self._create_instance(descriptor)
+            return self._plan_descriptor(self._registry.get_descriptor(service_type), compiling)
+        
+        # Load lazily registered services on first use
+        lazy_key = service_type if isinstance(service_type, str) else import_path(service_type)
+        lazy = self._lazy.get(lazy_key)
+        if lazy is not None:
+            descriptor = lazy.load()
+            self._registry.register(descriptor)
+            del self._lazy[lazy_key]
+            return self._plan_descriptor(descriptor, compiling)
         
         # Try providers
         for provider in self._providers:
             if provider.can_provide(service_type):
-                return provider.provide(service_type, self)
+                return ActivationPlan(
+                    service_type=service_type,
+                    lifetime=ServiceLifetime.TRANSIENT,
+                    source="provider",
+                    activate=lambda provider=provider: self._guarded(
+                        service_type, lambda: provider.provide(service_type, self)
+                    )
+                )
         
         # If not found and it's a concrete class, try to create it
         if inspect.isclass(service_type) and not inspect.isabstract(service_type):
             # Auto-register as transient
-            self.register_transient(service_type)
-            return self.resolve(service_type)
+            descriptor = ServiceDescriptor(
+                service_type=service_type,
+                implementation_type=service_type,
+                lifetime=ServiceLifetime.TRANSIENT
+            )
+            self._registry.register(descriptor)
+            return self._plan_descriptor(descriptor, compiling)
         
         raise ServiceNotRegisteredException(service_type)
     
-    def _create_instance(self, descriptor: ServiceDescriptor) -> Any:
-        """Create a service instance according to its descriptor."""
+    def _plan_descriptor(self, descriptor: ServiceDescriptor, compiling: List[Type]) -> ActivationPlan:
+        """Build the plan for a registered descriptor."""
+        service_type = descriptor.service_type
+        
         # Return existing instance if provided
         if descriptor.instance is not None:
-            return descriptor.instance
+            instance = descriptor.instance
+            return ActivationPlan(service_type, descriptor.lifetime, "instance", activate=lambda: instance)
         
-        # Create factory function
         if descriptor.factory is not None:
-            factory = lambda: self._call_factory(descriptor.factory)
+            arguments = self._compile_factory_arguments(descriptor.factory, compiling)
+            activator = self._activator(descriptor.factory, arguments)
+            create = lambda: self._guarded(service_type, activator)
+            source = "factory"
         else:
-            factory = lambda: self._create_from_type(descriptor.implementation_type)
+            arguments = self._compile_constructor_arguments(descriptor.implementation_type, compiling)
+            create = self._activator(descriptor.implementation_type, arguments)
+            source = "type"
+        
+        plan = ActivationPlan(service_type, descriptor.lifetime, source, arguments)
         
         # Use appropriate lifetime manager
         if descriptor.lifetime == ServiceLifetime.SINGLETON:
-            return self._singleton_manager.get_instance(descriptor, factory)
+            def activate():
+                instance = self._singleton_manager.get_instance(descriptor, create)
+                # Later resolutions return the instance without the manager's lock
+                plan.activate = lambda: instance
+                return instance
+            plan.activate = activate
         elif descriptor.lifetime == ServiceLifetime.SCOPED:
-            return self._scoped_manager.get_instance(descriptor, factory)
+            plan.activate = lambda: self._scoped_manager.get_instance(descriptor, create)
         else:  # TRANSIENT
-            return self._transient_manager.get_instance(descriptor, factory)
+            plan.activate = create
+        
+        return plan
     
-    def _create_from_type(self, implementation_type: Type) -> Any:
-        """Create an instance from a type using constructor injection."""
+    def _compile_constructor_arguments(self, implementation_type: Type, compiling: List[Type]) -> Tuple[PlanArgument, ...]:
+        """Compile constructor injection for a type."""
         # Get constructor parameters
         try:
             sig = inspect.signature(implementation_type.__init__)
         except (ValueError, TypeError):
             # No constructor signature available
-            return implementation_type()
+            return ()
         
-        # Resolve constructor dependencies
-        kwargs = {}
+        arguments = []
         for param_name, param in sig.parameters.items():
             if param_name == 'self':
                 continue
             
             param_type = param.annotation
-            if param_type == inspect.Parameter.empty:
+            if param_type is inspect.Parameter.empty:
                 # No type annotation, use default if available
-                if param.default != inspect.Parameter.empty:
-                    kwargs[param_name] = param.default
+                if param.default is not inspect.Parameter.empty:
+                    arguments.append(PlanArgument(param_name, value=param.default))
                 continue
             
-            try:
-                # Try to resolve the dependency
-                dependency = self.resolve(param_type)
-                kwargs[param_name] = dependency
-            except ServiceNotRegisteredException:
-                # Dependency not registered
-                if param.default != inspect.Parameter.empty:
-                    kwargs[param_name] = param.default
-                else:
-                    # Required dependency not available
-                    raise ServiceNotRegisteredException(param_type)
-        
-        return implementation_type(**kwargs)
+            if self._can_compile(param_type, compiling):
+                arguments.append(PlanArgument(param_name, param_type))
+            elif param.default is not inspect.Parameter.empty:
+                arguments.append(PlanArgument(param_name, value=param.default))
+            else:
+                # Required dependency not available
+                raise ServiceNotRegisteredException(param_type)
+        
+        return tuple(arguments)
     
-    def _call_factory(self, factory: Callable) -> Any:
-        """Call a factory function with dependency injection."""
+    def _compile_factory_arguments(self, factory: Callable, compiling: List[Type]) -> Tuple[PlanArgument, ...]:
+        """Compile dependency injection for a factory function."""
         try:
             sig = inspect.signature(factory)
         except (ValueError, TypeError):
             # No signature available, call without parameters
-            return factory()
+            return ()
         
-        # Resolve factory dependencies
-        kwargs = {}
+        arguments = []
         for param_name, param in sig.parameters.items():
             param_type = param.annotation
-            if param_type == inspect.Parameter.empty:
+            if param_type is inspect.Parameter.empty:
                 continue
             
             if param_type == type(self) or param_name == 'container':
-                kwargs[param_name] = self
-            else:
-                try:
-                    dependency = self.resolve(param_type)
-                    kwargs[param_name] = dependency
-                except ServiceNotRegisteredException:
-                    if param.default != inspect.Parameter.empty:
-                        kwargs[param_name] = param.default
-        
-        return factory(**kwargs)
+                arguments.append(PlanArgument(param_name, value=self))
+            elif self._can_compile(param_type, compiling):
+                arguments.append(PlanArgument(param_name, param_type))
+            elif param.default is not inspect.Parameter.empty:
+                arguments.append(PlanArgument(param_name, value=param.default))
+        
+        return tuple(arguments)
+    
+    def _can_compile(self, service_type: Type, compiling: List[Type]) -> bool:
+        """Check whether a dependency can be resolved, compiling its plan."""
+        try:
+            self._compile_plan(service_type, compiling)
+            return True
+        except ServiceNotRegisteredException:
+            return False
+    
+    def _activator(self, target: Callable, arguments: Tuple[PlanArgument, ...]) -> Callable[[], Any]:
+        """Create the callable that invokes a constructor or factory with its arguments."""
+        if not arguments:
+            return target
+        
+        injected = tuple((arg.name, arg.service_type) for arg in arguments if arg.service_type is not None)
+        fixed = {arg.name: arg.value for arg in arguments if arg.service_type is None}
+        resolve = self.resolve
+        
+        def create():
+            kwargs = dict(fixed)
+            for param_name, param_type in injected:
+                kwargs[param_name] = resolve(param_type)
+            return target(**kwargs)
+        
+        return create
+    
+    def _guarded(self, service_type: Type, create: Callable[[], Any]) -> Any:
+        """Run a factory or provider, detecting cycles through re-entrant resolution."""
+        stack = getattr(self._resolution_stack, 'stack', None)
+        if stack is None:
+            stack = self._resolution_stack.stack = []
+        
+        if service_type in stack:
+            raise CircularDependencyException(stack + [service_type])
+        
+        stack.append(service_type)
+        try:
+            return create()
+        finally:
+            stack.pop()
     
     def try_resolve(self, service_type: Type[T]) -> Optional[T]:
         """Try to resolve a service, returning None if not found."""
@@ -255,7 +367,9 @@ class Container:
     
     def is_registered(self, service_type: Type) -> bool:
         """Check if a service type is registered."""
-        return self._registry.is_registered(service_type)
+        if self._registry.is_registered(service_type):
+            return True
+        return (service_type if isinstance(service_type, str) else import_path(service_type)) in self._lazy
     
     @contextmanager
     def create_scope(self):
@@ -269,8 +383,16 @@ class Container:
             scope.dispose()
     
     def validate_services(self) -> List[str]:
-        """Validate all registered services for dependency issues."""
-        return self._registry.validate_all_dependencies()
+        """Validate all registered services and compile their activation plans."""
+        issues = self._registry.validate_all_dependencies()
+        
+        for service_type in self._registry.get_all_services():
+            try:
+                self.get_activation_plan(service_type)
+            except DIException as e:
+                issues.append(f"Cannot build activation plan for {getattr(service_type, '__name__', service_type)}: {e}")
+        
+        return issues
     
     def get_service_info(self) -> Dict[str, Any]:
         """Get information about all registered services."""
@@ -286,12 +408,24 @@ class Container:
             except Exception:
                 pass
             
-            info[service_type.__name__] = {
+            info[getattr(service_type, '__name__', str(service_type))] = {
                 'lifetime': descriptor.lifetime.value,
-                'implementation': descriptor.implementation_type.__name__ if descriptor.implementation_type else None,
+                'implementation': getattr(descriptor.implementation_type, '__name__', None),
                 'has_factory': descriptor.factory is not None,
                 'has_instance': descriptor.instance is not None,
-                'dependencies': dependencies
+                'dependencies': dependencies,
+                'lazy': False
+            }
+        
+        # Lazily registered services are described without importing them
+        for service_path, lazy in self._lazy.items():
+            info[service_path.rpartition(':')[2]] = {
+                'lifetime': lazy.lifetime.value,
+                'implementation': lazy.implementation_path.rpartition(':')[2],
+                'has_factory': False,
+                'has_instance': False,
+                'dependencies': [],
+                'lazy': True
             }
         
         return info
@@ -303,6 +437,8 @@ class Container:
             self._scoped_manager.dispose()
             self._transient_manager.dispose()
             self._registry.clear()
+            self._plans.clear()
+            self._lazy.clear()
     
     def __enter__(self):
         return self
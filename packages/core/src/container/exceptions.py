@@ -8,6 +8,11 @@ Custom exceptions for dependency injection system.
 from typing import List, Type
 
 
+def _service_name(service_type) -> str:
+    """Display name of a service key (a type, or a string for named services)."""
+    return getattr(service_type, '__name__', str(service_type))
+
+
 class DIException(Exception):
     """Base exception for DI container errors."""
     pass
@@ -18,7 +23,7 @@ class ServiceNotRegisteredException(DIException):
     
     def __init__(self, service_type: Type):
         self.service_type = service_type
-        super().__init__(f"Service {service_type.__name__} is not registered in the container")
+        super().__init__(f"Service {_service_name(service_type)} is not registered in the container")
 
 
 class CircularDependencyException(DIException):
@@ -26,7 +31,7 @@ class CircularDependencyException(DIException):
     
     def __init__(self, dependency_chain: List[Type]):
         self.dependency_chain = dependency_chain
-        chain_names = " -> ".join(t.__name__ for t in dependency_chain)
+        chain_names = " -> ".join(_service_name(t) for t in dependency_chain)
         super().__init__(f"Circular dependency detected: {chain_names}")
 
 
@@ -8,6 +8,7 @@ Defines how services are instantiated and managed.
 from enum import Enum
 from typing import Any, Dict, Type, Optional, Callable
 from abc import ABC, abstractmethod
+import importlib
 import threading
 import weakref
 
@@ -41,6 +42,47 @@ class ServiceDescriptor:
             raise ValueError("Exactly one of implementation_type, factory, or instance must be provided")
 
 
+def import_path(obj: Any) -> str:
+    """Get the ``module:qualname`` import path of a class."""
+    return f"{getattr(obj, '__module__', '')}:{getattr(obj, '__qualname__', '')}"
+
+
+def load_import_path(path: str) -> Any:
+    """Import the object named by a ``module:qualname`` import path."""
+    module_name, _, qualname = path.partition(':')
+    obj = importlib.import_module(module_name)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class LazyServiceDescriptor:
+    """
+    Describes a service by import path without importing it.
+    
+    The service and implementation modules are imported when the service is
+    first resolved, which keeps them off the startup path.
+    """
+    
+    def __init__(
+        self,
+        service_path: str,
+        implementation_path: str = None,
+        lifetime: ServiceLifetime = ServiceLifetime.TRANSIENT
+    ):
+        self.service_path = service_path
+        self.implementation_path = implementation_path or service_path
+        self.lifetime = lifetime
+    
+    def load(self) -> ServiceDescriptor:
+        """Import the service and build its descriptor."""
+        return ServiceDescriptor(
+            service_type=load_import_path(self.service_path),
+            implementation_type=load_import_path(self.implementation_path),
+            lifetime=self.lifetime
+        )
+
+
 class ServiceInstance:
     """Wrapper for service instances with metadata."""
     
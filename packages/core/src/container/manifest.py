@@ -0,0 +1,231 @@
+"""
+Service Discovery Manifest
+==========================
+
+Build-time record of discovered services so startup can register them
+without importing and scanning every module.
+
+Usage:
+    python -m packages.core.src.container.manifest build   # write the manifest
+    python -m packages.core.src.container.manifest check   # list stale sources
+    python -m packages.core.src.container.manifest report  # compare startup modes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_NAME = "di_manifest.json"
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
+
+
+@dataclass
+class ManifestEntry:
+    """A discovered service: import paths of the service and its implementation."""
+    service: str
+    implementation: str
+    lifetime: str
+
+
+@dataclass
+class ServiceManifest:
+    """Discovered services plus the source fingerprints they were derived from."""
+    services: List[ManifestEntry]
+    sources: Dict[str, Dict[str, Any]]
+    discovery_paths: List[str]
+    generated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    version: int = MANIFEST_VERSION
+    
+    def stale_sources(self, base_path: Path) -> List[str]:
+        """
+        Source files changed since the manifest was built.
+        
+        Added and removed files are stale. A recorded file is fresh when its
+        mtime is unchanged, or when its content hash still matches.
+        """
+        current = source_files(Path(base_path), self.discovery_paths)
+        stale = set(current) ^ set(self.sources)
+        
+        for relative_path in set(current) & set(self.sources):
+            recorded = self.sources[relative_path]
+            file_path = current[relative_path]
+            if file_path.stat().st_mtime == recorded['mtime']:
+                continue
+            if _file_hash(file_path) != recorded['sha256']:
+                stale.add(relative_path)
+        
+        return sorted(stale)
+    
+    def is_stale(self, base_path: Path) -> bool:
+        """Check whether any source changed since the manifest was built."""
+        return bool(self.stale_sources(base_path))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable representation."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ServiceManifest':
+        """Create a manifest from its serialized representation."""
+        return cls(
+            services=[ManifestEntry(**entry) for entry in data['services']],
+            sources=data['sources'],
+            discovery_paths=data['discovery_paths'],
+            generated_at=data['generated_at'],
+            version=data['version']
+        )
+
+
+def source_files(base_path: Path, discovery_paths: List[str]) -> Dict[str, Path]:
+    """Source files service discovery would import, by path relative to ``base_path``."""
+    files = {}
+    for relative_path in discovery_paths:
+        full_path = base_path / relative_path
+        if not full_path.exists():
+            continue
+        
+        for py_file in full_path.rglob("*.py"):
+            if py_file.name.startswith('__') or py_file.name.startswith('test_'):
+                continue
+            rel_path = py_file.relative_to(base_path)
+            if any(part.startswith('.') or part == '__pycache__' for part in rel_path.parts):
+                continue
+            files[rel_path.as_posix()] = py_file
+    
+    return files
+
+
+def _file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def default_manifest_path(base_path: Path) -> Path:
+    """Manifest location: DI_MANIFEST_PATH or the project root."""
+    return Path(os.getenv('DI_MANIFEST_PATH', str(Path(base_path) / DEFAULT_MANIFEST_NAME)))
+
+
+def manifest_verification_enabled() -> bool:
+    """Whether startup checks the manifest against sources (DI_MANIFEST_VERIFY)."""
+    return os.getenv('DI_MANIFEST_VERIFY', 'true').lower() == 'true'
+
+
+def build_manifest(base_path: str, discovery_paths: List[str] = None) -> ServiceManifest:
+    """Scan sources by importing them, as discovery does, and record the results."""
+    from packages.core.src.container.auto_registration import ServiceDiscovery
+    from packages.core.src.container.container import Container
+    
+    discovery = ServiceDiscovery(Container(), base_path, discovery_paths)
+    discovery.discover_services()
+    
+    sources = {
+        relative_path: {'mtime': path.stat().st_mtime, 'sha256': _file_hash(path)}
+        for relative_path, path in source_files(discovery.base_path, discovery.discovery_paths).items()
+    }
+    
+    return ServiceManifest(
+        services=[ManifestEntry(**entry) for entry in discovery.manifest_entries()],
+        sources=sources,
+        discovery_paths=list(discovery.discovery_paths)
+    )
+
+
+def write_manifest(manifest: ServiceManifest, path: str) -> None:
+    """Write a manifest as JSON."""
+    with open(path, 'w') as f:
+        json.dump(manifest.to_dict(), f, indent=2, sort_keys=True)
+
+
+def load_manifest(path: str) -> Optional[ServiceManifest]:
+    """Load a manifest; None if missing, unreadable or from another version."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            return None
+        return ServiceManifest.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+_STARTUP_PROBE = """
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+modules_before = len(sys.modules)
+sys.path[:0] = [{base_path!r}, {project_root!r}]
+from packages.core.src.container.auto_registration import create_auto_configured_container
+with contextlib.redirect_stdout(io.StringIO()):
+    container = create_auto_configured_container({base_path!r}, {manifest_path!r})
+print(json.dumps({{
+    'seconds': time.perf_counter() - started,
+    'modules_imported': len(sys.modules) - modules_before,
+    'registered_services': len(container.get_service_info()),
+}}))
+"""
+
+
+def measure_startup(base_path: str, manifest_path: Optional[str] = None) -> Dict[str, Any]:
+    """Measure container startup in a fresh interpreter (scan mode without a manifest)."""
+    code = _STARTUP_PROBE.format(
+        base_path=str(base_path), project_root=str(PROJECT_ROOT), manifest_path=manifest_path
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=str(base_path), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def startup_report(base_path: str, manifest_path: str) -> Dict[str, Any]:
+    """Compare container startup in manifest mode with scan mode."""
+    scan = measure_startup(base_path)
+    manifest = measure_startup(base_path, manifest_path)
+    
+    return {
+        'scan': scan,
+        'manifest': manifest,
+        'speedup': scan['seconds'] / manifest['seconds'] if manifest['seconds'] else None,
+        'modules_avoided': scan['modules_imported'] - manifest['modules_imported']
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Service discovery manifest")
+    parser.add_argument('command', choices=['build', 'check', 'report'])
+    parser.add_argument('--base-path', default=str(PROJECT_ROOT))
+    parser.add_argument('--manifest', default=None)
+    args = parser.parse_args(argv)
+    
+    manifest_path = args.manifest or str(default_manifest_path(Path(args.base_path)))
+    
+    if args.command == 'build':
+        manifest = build_manifest(args.base_path)
+        write_manifest(manifest, manifest_path)
+        print(f"Wrote {len(manifest.services)} services from {len(manifest.sources)} sources to {manifest_path}")
+        return 0
+    
+    if args.command == 'check':
+        manifest = load_manifest(manifest_path)
+        if manifest is None:
+            print(f"No usable manifest at {manifest_path}")
+            return 1
+        stale = manifest.stale_sources(Path(args.base_path))
+        for relative_path in stale:
+            print(f"stale: {relative_path}")
+        return 1 if stale else 0
+    
+    print(json.dumps(startup_report(args.base_path, manifest_path), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
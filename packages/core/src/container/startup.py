@@ -19,6 +19,7 @@ from packages.core.src.container import (
     injectable, singleton, scoped, transient
 )
 from packages.core.src.container.auto_registration import create_auto_configured_container
+from packages.core.src.container.manifest import default_manifest_path
 from packages.core.src.container.configuration import (
     get_application_config, get_config_manager,
     ApplicationConfig, Environment
@@ -68,8 +69,10 @@ class ApplicationBootstrap:
         print("📦 Creating DI container...")
         
         if os.getenv('AUTO_REGISTRATION', 'true').lower() == 'true':
-            # Use automatic service discovery
-            container = create_auto_configured_container(str(project_root))
+            # Use automatic service discovery, from the build-time manifest when present
+            container = create_auto_configured_container(
+                str(project_root), str(default_manifest_path(project_root))
+            )
         else:
             # Manual registration
             container = Container()
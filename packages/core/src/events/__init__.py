@@ -15,7 +15,16 @@ from .bus import EventBus, AsyncEventBus
 from .dispatcher import EventDispatcher
 from .handlers import EventHandler, AsyncEventHandler
 from .store import EventStore, EventStoreError, InMemoryStorageBackend
-from .sourcing import EventSourcing, EventSourcedAggregate
+from .indexed_store import IndexedStorageBackend, AppendOnlyLogStorageBackend
+from .sourcing import EventSourcing, EventSourcedAggregate, SnapshotCompactor
+from .snapshots import (
+    Snapshot,
+    SnapshotPolicy,
+    SnapshotStore,
+    InMemorySnapshotStore,
+    FileSnapshotStore,
+    SnapshotCheckResult,
+)
 from .dead_letter import DeadLetterQueue, FailedEvent, FailureReason
 from .events import (
     UserRegistered,
@@ -44,8 +53,17 @@ __all__ = [
     "EventStore",
     "EventStoreError",
     "InMemoryStorageBackend",
+    "IndexedStorageBackend",
+    "AppendOnlyLogStorageBackend",
     "EventSourcing",
     "EventSourcedAggregate",
+    "Snapshot",
+    "SnapshotPolicy",
+    "SnapshotStore",
+    "InMemorySnapshotStore",
+    "FileSnapshotStore",
+    "SnapshotCheckResult",
+    "SnapshotCompactor",
     "DeadLetterQueue",
     "FailedEvent",
     "FailureReason",
@@ -0,0 +1,571 @@
+"""
+Indexed storage backends for the event store.
+
+Both backends keep per-aggregate and per-event-type offset lists plus
+time-ordered segments, so ``load_events(aggregate_id=...)`` costs
+O(events of that aggregate) instead of O(all events), and timestamps are
+parsed once at write time rather than on every query.
+
+``IndexedStorageBackend`` holds events in memory. ``AppendOnlyLogStorageBackend``
+persists them as an append-only log of memory-mapped segment files with a
+sparse offset index; its in-memory indexes are rebuilt from fixed-size
+record headers on restart, without decoding event payloads.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from heapq import merge
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .store import EventStoreError
+
+logger = logging.getLogger(__name__)
+
+# Sort key for events without a timestamp; they sort first and pass time filters
+_UNTIMED = float("-inf")
+
+
+def _parse_timestamp(value: Optional[str]) -> float:
+    """Epoch seconds for an ISO timestamp (naive values use local time)."""
+    if not value:
+        return _UNTIMED
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _event_fields(event_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], float]:
+    """Extract (aggregate_id, event_name, timestamp) used for indexing."""
+    metadata = event_data.get("metadata", {})
+    return (
+        metadata.get("aggregate_id"),
+        event_data.get("event_name"),
+        _parse_timestamp(metadata.get("timestamp")),
+    )
+
+
+class _IndexedEventLog(ABC):
+    """
+    Offset-addressed event indexes shared by the indexed backends.
+
+    Events get sequential offsets. Aggregate and event-type indexes are
+    ascending offset lists; timestamps live in a flat array, summarised
+    per ``SEGMENT_EVENTS`` offsets so time-range scans skip whole
+    segments. Deletes are tombstones and the index lists are compacted
+    once tombstones pass ``COMPACT_RATIO`` of all offsets.
+    """
+
+    SEGMENT_EVENTS = 4096
+    COMPACT_RATIO = 0.25
+
+    def __init__(self):
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        self._timestamps = array("d")
+        self._type_ids = array("l")
+        self._type_lookup: Dict[Optional[str], int] = {}
+        self._by_type: Dict[int, List[int]] = {}
+        self._by_aggregate: Dict[str, List[int]] = {}
+        self._segment_min: List[float] = []
+        self._segment_max: List[float] = []
+        self._segment_untimed: List[bool] = []
+        self._deleted: Set[int] = set()
+        self._ordered = True
+        self._has_untimed = False
+        self._max_timestamp = _UNTIMED
+
+    @abstractmethod
+    def _read(self, offset: int) -> Dict[str, Any]:
+        """Return the stored event at ``offset``."""
+        ...
+
+    def _on_delete(self, offsets: List[int]) -> None:
+        """Hook for backends to release or persist deleted offsets."""
+        pass
+
+    @property
+    def event_count(self) -> int:
+        """Number of live (non-deleted) events."""
+        return len(self._timestamps) - len(self._deleted)
+
+    def _index_event(self, aggregate_id: Optional[str], event_name: Optional[str], timestamp: float) -> int:
+        offset = len(self._timestamps)
+        self._timestamps.append(timestamp)
+
+        type_id = self._type_lookup.get(event_name)
+        if type_id is None:
+            type_id = self._type_lookup[event_name] = len(self._type_lookup)
+        self._type_ids.append(type_id)
+        self._by_type.setdefault(type_id, []).append(offset)
+
+        if aggregate_id is not None:
+            self._by_aggregate.setdefault(aggregate_id, []).append(offset)
+
+        # While appends arrive in time order, query results need no sort
+        if timestamp < self._max_timestamp:
+            self._ordered = False
+        else:
+            self._max_timestamp = timestamp
+
+        segment = offset // self.SEGMENT_EVENTS
+        if segment == len(self._segment_min):
+            self._segment_min.append(float("inf"))
+            self._segment_max.append(float("-inf"))
+            self._segment_untimed.append(False)
+        if timestamp == _UNTIMED:
+            self._segment_untimed[segment] = True
+            self._has_untimed = True
+        else:
+            self._segment_min[segment] = min(self._segment_min[segment], timestamp)
+            self._segment_max[segment] = max(self._segment_max[segment], timestamp)
+
+        return offset
+
+    def _time_range_offsets(self, start: Optional[float], end: Optional[float]) -> Iterable[int]:
+        """Offsets in segments that may hold events within [start, end]."""
+        total = len(self._timestamps)
+        for segment in range(len(self._segment_min)):
+            if not self._segment_untimed[segment] and (
+                (start is not None and self._segment_max[segment] < start)
+                or (end is not None and self._segment_min[segment] > end)
+            ):
+                continue
+            first = segment * self.SEGMENT_EVENTS
+            yield from range(first, min(first + self.SEGMENT_EVENTS, total))
+
+    def _since(self, offsets: List[int], start: Optional[float]) -> Iterable[int]:
+        """Skip the prefix of an offset list older than ``start`` when appends were in time order."""
+        if start is None or not self._ordered or self._has_untimed or not offsets:
+            return offsets
+        first = bisect_left(offsets, start, key=self._timestamps.__getitem__)
+        return islice(offsets, first, None)
+
+    def _select(
+        self,
+        aggregate_id: Optional[str],
+        event_types: Optional[List[str]],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        limit: Optional[int],
+    ) -> List[int]:
+        """Offsets matching the filters, in timestamp order."""
+        start = start_time.timestamp() if start_time is not None else None
+        end = end_time.timestamp() if end_time is not None else None
+
+        type_filter: Optional[Set[int]] = None
+        if aggregate_id is not None:
+            candidates: Iterable[int] = self._since(self._by_aggregate.get(aggregate_id, []), start)
+            if event_types is not None:
+                type_filter = {self._type_lookup[name] for name in event_types if name in self._type_lookup}
+        elif event_types is not None:
+            lists = [
+                self._since(self._by_type.get(self._type_lookup[name], []), start)
+                for name in dict.fromkeys(event_types)
+                if name in self._type_lookup
+            ]
+            candidates = lists[0] if len(lists) == 1 else merge(*lists)
+        else:
+            candidates = self._time_range_offsets(start, end)
+
+        timestamps = self._timestamps
+        type_ids = self._type_ids
+        deleted = self._deleted
+        stop_early = self._ordered and limit is not None
+        selected: List[int] = []
+
+        for offset in candidates:
+            if offset in deleted:
+                continue
+            if type_filter is not None and type_ids[offset] not in type_filter:
+                continue
+            timestamp = timestamps[offset]
+            if timestamp != _UNTIMED and (
+                (start is not None and timestamp < start) or (end is not None and timestamp > end)
+            ):
+                continue
+            selected.append(offset)
+            if stop_early and len(selected) >= limit:
+                break
+
+        if not self._ordered:
+            # Stable sort keeps insertion order for equal timestamps
+            selected.sort(key=timestamps.__getitem__)
+        if limit is not None:
+            selected = selected[:limit]
+        return selected
+
+    def load_events(
+        self,
+        aggregate_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Load events matching the filters, ordered by timestamp."""
+        offsets = self._select(aggregate_id, event_types, start_time, end_time, limit)
+        return [self._read(offset) for offset in offsets]
+
+    def delete_events(
+        self,
+        aggregate_id: Optional[str] = None,
+        before_time: Optional[datetime] = None
+    ) -> int:
+        """Delete events of an aggregate and/or events before a time."""
+        if aggregate_id is None and before_time is None:
+            return 0
+
+        doomed: Set[int] = set()
+        if aggregate_id is not None:
+            doomed.update(self._by_aggregate.pop(aggregate_id, []))
+
+        if before_time is not None:
+            cutoff = before_time.timestamp()
+            timestamps = self._timestamps
+            doomed.update(
+                offset
+                for offset in self._time_range_offsets(None, cutoff)
+                if timestamps[offset] != _UNTIMED and timestamps[offset] < cutoff
+            )
+
+        doomed -= self._deleted
+        if not doomed:
+            return 0
+
+        self._deleted.update(doomed)
+        self._on_delete(sorted(doomed))
+
+        if len(self._deleted) > self.COMPACT_RATIO * len(self._timestamps):
+            self._compact_indexes()
+
+        return len(doomed)
+
+    def _compact_indexes(self) -> None:
+        """Drop tombstoned offsets from the aggregate and type lists."""
+        deleted = self._deleted
+        for index in (self._by_aggregate, self._by_type):
+            for key in list(index):
+                live = [offset for offset in index[key] if offset not in deleted]
+                if live:
+                    index[key] = live
+                else:
+                    del index[key]
+
+
+class IndexedStorageBackend(_IndexedEventLog):
+    """In-memory storage backend with aggregate, type and time indexes."""
+
+    def __init__(self):
+        """Initialize indexed in-memory storage."""
+        super().__init__()
+        self._events: List[Optional[Dict[str, Any]]] = []
+
+    def save_event(self, event_data: Dict[str, Any]) -> None:
+        """Save an event to memory and index it."""
+        aggregate_id, event_name, timestamp = _event_fields(event_data)
+        self._events.append(event_data.copy())
+        self._index_event(aggregate_id, event_name, timestamp)
+
+    def _read(self, offset: int) -> Dict[str, Any]:
+        return self._events[offset]
+
+    def _on_delete(self, offsets: List[int]) -> None:
+        for offset in offsets:
+            self._events[offset] = None
+
+    def clear(self) -> None:
+        """Clear all events (for testing)."""
+        self._events.clear()
+        self._reset_index()
+
+
+class _LogSegment:
+    """One segment file: sparse (relative offset -> byte position) index plus a read map."""
+
+    __slots__ = ("path", "base_offset", "size", "record_count", "index_offsets", "index_positions", "_map")
+
+    def __init__(self, path: Path, base_offset: int):
+        self.path = path
+        self.base_offset = base_offset
+        self.size = 0
+        self.record_count = 0
+        self.index_offsets: List[int] = []
+        self.index_positions: List[int] = []
+        self._map: Optional[mmap.mmap] = None
+
+    def view(self) -> mmap.mmap:
+        """Read-only map covering every record appended so far."""
+        if self._map is None or len(self._map) < self.size:
+            self.close()
+            with open(self.path, "rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class AppendOnlyLogStorageBackend(_IndexedEventLog):
+    """
+    File-backed append-only event log.
+
+    Records are appended to segment files named by their first offset and
+    rolled at ``segment_bytes``. Each record starts with a fixed header
+    (payload length, aggregate id length, event name length, epoch
+    timestamp) followed by the aggregate id, event name and JSON payload.
+    Every ``index_interval``-th record is entered in the segment's sparse
+    index, and reads seek from the nearest entry through the memory map.
+    Deletes append offsets to a tombstone file; segments are never
+    rewritten in place.
+    """
+
+    _HEADER = struct.Struct(">IHHd")
+    _TOMBSTONE = struct.Struct(">Q")
+    _NO_VALUE = 0xFFFF
+    _SEGMENT_SUFFIX = ".log"
+    _TOMBSTONE_FILE = "tombstones.bin"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_bytes: int = 64 * 1024 * 1024,
+        index_interval: int = 16,
+        fsync: bool = False
+    ):
+        """
+        Open (or create) an event log.
+
+        Args:
+            directory: Directory holding segment files
+            segment_bytes: Size after which a new segment is started
+            index_interval: Records between sparse index entries
+            fsync: fsync after every append for durability across power loss
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.index_interval = max(1, index_interval)
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._segments: List[_LogSegment] = []
+        self._segment_bases: List[int] = []
+        self._writer = None
+        self._tombstones = None
+        self._open()
+
+    def save_event(self, event_data: Dict[str, Any]) -> None:
+        """Append an event to the log and index it."""
+        aggregate_id, event_name, timestamp = _event_fields(event_data)
+        record = self._encode(event_data, aggregate_id, event_name, timestamp)
+
+        with self._lock:
+            segment = self._segments[-1]
+            if segment.size and segment.size + len(record) > self.segment_bytes:
+                segment = self._roll()
+
+            if segment.record_count % self.index_interval == 0:
+                segment.index_offsets.append(segment.record_count)
+                segment.index_positions.append(segment.size)
+
+            self._writer.write(record)
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+
+            segment.size += len(record)
+            segment.record_count += 1
+            self._index_event(aggregate_id, event_name, timestamp)
+
+    def load_events(
+        self,
+        aggregate_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Load events matching the filters, ordered by timestamp."""
+        with self._lock:
+            return super().load_events(aggregate_id, event_types, start_time, end_time, limit)
+
+    def delete_events(
+        self,
+        aggregate_id: Optional[str] = None,
+        before_time: Optional[datetime] = None
+    ) -> int:
+        """Tombstone events of an aggregate and/or events before a time."""
+        with self._lock:
+            return super().delete_events(aggregate_id, before_time)
+
+    def clear(self) -> None:
+        """Remove every segment and tombstone (for testing)."""
+        with self._lock:
+            self.close()
+            for path in self.directory.glob(f"*{self._SEGMENT_SUFFIX}"):
+                path.unlink()
+            (self.directory / self._TOMBSTONE_FILE).unlink(missing_ok=True)
+            self._open()
+
+    def close(self) -> None:
+        """Close file handles and memory maps."""
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            for handle in (self._writer, self._tombstones):
+                if handle is not None:
+                    handle.close()
+            self._writer = None
+            self._tombstones = None
+
+    def _open(self) -> None:
+        """Rebuild indexes from segment headers and open the active segment."""
+        self._reset_index()
+        self._segments = []
+        self._segment_bases = []
+
+        paths = sorted(self.directory.glob(f"*{self._SEGMENT_SUFFIX}"), key=lambda p: int(p.stem))
+        for position, path in enumerate(paths):
+            segment = _LogSegment(path, int(path.stem))
+            if segment.base_offset != len(self._timestamps):
+                raise EventStoreError(f"Event log segment {path.name} does not continue the previous segment")
+            self._scan(segment, is_last=position == len(paths) - 1)
+            self._segments.append(segment)
+            self._segment_bases.append(segment.base_offset)
+
+        if not self._segments:
+            self._new_segment(0)
+
+        self._writer = open(self._segments[-1].path, "ab")
+
+        tombstone_path = self.directory / self._TOMBSTONE_FILE
+        if tombstone_path.exists():
+            data = tombstone_path.read_bytes()
+            usable = len(data) - len(data) % self._TOMBSTONE.size
+            self._deleted = {offset for (offset,) in self._TOMBSTONE.iter_unpack(data[:usable])}
+            if self._deleted:
+                self._compact_indexes()
+        self._tombstones = open(tombstone_path, "ab")
+
+    def _scan(self, segment: _LogSegment, is_last: bool) -> None:
+        """Index every complete record in a segment; truncate a torn tail."""
+        file_size = segment.path.stat().st_size
+        header = self._HEADER
+        position = 0
+
+        if file_size:
+            segment.size = file_size
+            view = segment.view()
+            while position + header.size <= file_size:
+                end = self._record_end(view, position)
+                if end > file_size:
+                    break
+
+                _, aggregate_len, name_len, timestamp = header.unpack_from(view, position)
+                aggregate_id, cursor = self._read_text(view, position + header.size, aggregate_len)
+                event_name, _ = self._read_text(view, cursor, name_len)
+
+                if segment.record_count % self.index_interval == 0:
+                    segment.index_offsets.append(segment.record_count)
+                    segment.index_positions.append(position)
+                segment.record_count += 1
+                self._index_event(aggregate_id, event_name, timestamp)
+                position = end
+            segment.close()
+
+        if position < file_size:
+            if not is_last:
+                raise EventStoreError(f"Event log segment {segment.path.name} is corrupt at byte {position}")
+            logger.warning(f"Truncating torn write at byte {position} of {segment.path.name}")
+            with open(segment.path, "r+b") as handle:
+                handle.truncate(position)
+
+        segment.size = position
+
+    def _read(self, offset: int) -> Dict[str, Any]:
+        segment = self._segments[bisect_right(self._segment_bases, offset) - 1]
+        relative = offset - segment.base_offset
+        view = segment.view()
+
+        # Seek from the nearest sparse entry, hopping record headers
+        entry = bisect_right(segment.index_offsets, relative) - 1
+        current = segment.index_offsets[entry]
+        position = segment.index_positions[entry]
+        while current < relative:
+            position = self._record_end(view, position)
+            current += 1
+
+        payload_len, aggregate_len, name_len, _ = self._HEADER.unpack_from(view, position)
+        start = position + self._HEADER.size
+        start += 0 if aggregate_len == self._NO_VALUE else aggregate_len
+        start += 0 if name_len == self._NO_VALUE else name_len
+        return json.loads(view[start:start + payload_len])
+
+    def _on_delete(self, offsets: List[int]) -> None:
+        self._tombstones.write(b"".join(self._TOMBSTONE.pack(offset) for offset in offsets))
+        self._tombstones.flush()
+        if self.fsync:
+            os.fsync(self._tombstones.fileno())
+
+    def _roll(self) -> _LogSegment:
+        """Seal the active segment and start a new one at the next offset."""
+        self._writer.close()
+        segment = self._new_segment(len(self._timestamps))
+        self._writer = open(segment.path, "ab")
+        return segment
+
+    def _new_segment(self, base_offset: int) -> _LogSegment:
+        segment = _LogSegment(self.directory / f"{base_offset:020d}{self._SEGMENT_SUFFIX}", base_offset)
+        segment.path.touch()
+        self._segments.append(segment)
+        self._segment_bases.append(base_offset)
+        return segment
+
+    def _encode(
+        self,
+        event_data: Dict[str, Any],
+        aggregate_id: Optional[str],
+        event_name: Optional[str],
+        timestamp: float
+    ) -> bytes:
+        aggregate = self._encode_text(aggregate_id)
+        name = self._encode_text(event_name)
+        payload = json.dumps(event_data, default=str, separators=(",", ":")).encode("utf-8")
+        header = self._HEADER.pack(
+            len(payload),
+            self._NO_VALUE if aggregate is None else len(aggregate),
+            self._NO_VALUE if name is None else len(name),
+            timestamp,
+        )
+        return b"".join((header, aggregate or b"", name or b"", payload))
+
+    def _encode_text(self, value: Optional[str]) -> Optional[bytes]:
+        if value is None:
+            return None
+        encoded = str(value).encode("utf-8")
+        if len(encoded) >= self._NO_VALUE:
+            raise EventStoreError(f"Indexed event field too long ({len(encoded)} bytes)")
+        return encoded
+
+    def _read_text(self, view: mmap.mmap, cursor: int, length: int) -> Tuple[Optional[str], int]:
+        if length == self._NO_VALUE:
+            return None, cursor
+        return view[cursor:cursor + length].decode("utf-8"), cursor + length
+
+    def _record_end(self, view: mmap.mmap, position: int) -> int:
+        payload_len, aggregate_len, name_len, _ = self._HEADER.unpack_from(view, position)
+        end = position + self._HEADER.size + payload_len
+        end += 0 if aggregate_len == self._NO_VALUE else aggregate_len
+        end += 0 if name_len == self._NO_VALUE else name_len
+        return end
@@ -0,0 +1,253 @@
+"""
+Aggregate snapshots for event sourcing.
+
+Provides the snapshot record, the policy deciding when aggregates are
+snapshotted, and pluggable stores that keep the latest snapshots per aggregate.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    Snapshot of aggregate state for performance optimization.
+
+    Snapshots can be used to avoid replaying all events
+    for aggregates with long histories.
+    """
+
+    def __init__(
+        self,
+        aggregate_id: str,
+        aggregate_type: str,
+        version: int,
+        state: Dict[str, Any],
+        timestamp: Optional[str] = None,
+        schema_version: int = 1
+    ):
+        """
+        Initialize the snapshot.
+
+        Args:
+            aggregate_id: The aggregate identifier
+            aggregate_type: The aggregate type name
+            version: The version at snapshot time
+            state: The aggregate state data
+            timestamp: When the snapshot was taken
+            schema_version: Version of the aggregate's snapshot state layout
+        """
+        self.aggregate_id = aggregate_id
+        self.aggregate_type = aggregate_type
+        self.version = version
+        self.state = state
+        self.timestamp = timestamp
+        self.schema_version = schema_version
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert snapshot to dictionary."""
+        return {
+            "aggregate_id": self.aggregate_id,
+            "aggregate_type": self.aggregate_type,
+            "version": self.version,
+            "state": self.state,
+            "timestamp": self.timestamp,
+            "schema_version": self.schema_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Snapshot':
+        """Create snapshot from dictionary."""
+        return cls(
+            aggregate_id=data["aggregate_id"],
+            aggregate_type=data["aggregate_type"],
+            version=data["version"],
+            state=data["state"],
+            timestamp=data.get("timestamp"),
+            schema_version=data.get("schema_version", 1),
+        )
+
+
+@dataclass
+class SnapshotPolicy:
+    """
+    Decides when an aggregate is due for a new snapshot.
+
+    An aggregate is snapshotted once ``every_n_events`` events have been
+    applied since its last snapshot. Individual aggregate types can use a
+    different interval; an interval of 0 disables snapshots for that type.
+    """
+    every_n_events: int = 100
+    per_aggregate_type: Dict[str, int] = field(default_factory=dict)
+
+    def interval_for(self, aggregate_type: str) -> int:
+        """Get the snapshot interval for an aggregate type."""
+        return self.per_aggregate_type.get(aggregate_type, self.every_n_events)
+
+    def should_snapshot(self, aggregate_type: str, last_snapshot_version: int, version: int) -> bool:
+        """
+        Check whether an aggregate is due for a snapshot.
+
+        Args:
+            aggregate_type: The aggregate type name
+            last_snapshot_version: Version covered by the latest snapshot (0 if none)
+            version: Current aggregate version
+
+        Returns:
+            True if a new snapshot should be taken
+        """
+        interval = self.interval_for(aggregate_type)
+        return interval > 0 and version - last_snapshot_version >= interval
+
+
+@dataclass
+class SnapshotCheckResult:
+    """Outcome of comparing a snapshot-based rebuild with a full replay."""
+    aggregate_id: str
+    snapshot_version: Optional[int]
+    replay_version: int
+    consistent: bool
+    differences: List[str] = field(default_factory=list)
+
+
+class SnapshotStore(Protocol):
+    """Protocol for snapshot storage backends."""
+
+    def save_snapshot(self, snapshot: Snapshot) -> None:
+        """Save a snapshot."""
+        ...
+
+    def load_snapshot(self, aggregate_id: str, max_version: Optional[int] = None) -> Optional[Snapshot]:
+        """Load the latest snapshot, optionally at or below a version."""
+        ...
+
+    def delete_snapshots(self, aggregate_id: str) -> int:
+        """Delete all snapshots for an aggregate."""
+        ...
+
+
+class InMemorySnapshotStore:
+    """In-memory snapshot store keeping the most recent snapshots per aggregate."""
+
+    def __init__(self, keep_last: int = 2):
+        """
+        Initialize in-memory snapshot storage.
+
+        Args:
+            keep_last: Number of snapshots retained per aggregate
+        """
+        self._keep_last = max(1, keep_last)
+        self._snapshots: Dict[str, List[Snapshot]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def save_snapshot(self, snapshot: Snapshot) -> None:
+        """Save a snapshot, replacing any snapshot at the same version."""
+        with self._lock:
+            history = [s for s in self._snapshots[snapshot.aggregate_id] if s.version != snapshot.version]
+            history.append(snapshot)
+            history.sort(key=lambda s: s.version)
+            self._snapshots[snapshot.aggregate_id] = history[-self._keep_last:]
+
+    def load_snapshot(self, aggregate_id: str, max_version: Optional[int] = None) -> Optional[Snapshot]:
+        """Load the latest snapshot for an aggregate."""
+        with self._lock:
+            for snapshot in reversed(self._snapshots.get(aggregate_id, [])):
+                if max_version is None or snapshot.version <= max_version:
+                    return snapshot
+        return None
+
+    def delete_snapshots(self, aggregate_id: str) -> int:
+        """Delete all snapshots for an aggregate."""
+        with self._lock:
+            return len(self._snapshots.pop(aggregate_id, []))
+
+    def clear(self) -> None:
+        """Clear all snapshots (for testing)."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+class FileSnapshotStore:
+    """
+    File-based snapshot store writing one JSON document per aggregate.
+
+    Snapshots are written to a temporary file and atomically renamed, so a
+    crash mid-write leaves the previous snapshot intact. Aggregates stored
+    here must produce JSON-serializable snapshot state.
+    """
+
+    def __init__(self, directory: Union[str, Path], keep_last: int = 2):
+        """
+        Initialize file snapshot storage.
+
+        Args:
+            directory: Directory holding the snapshot files
+            keep_last: Number of snapshots retained per aggregate
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._keep_last = max(1, keep_last)
+        self._lock = threading.Lock()
+
+    def save_snapshot(self, snapshot: Snapshot) -> None:
+        """Save a snapshot, replacing any snapshot at the same version."""
+        with self._lock:
+            history = [s for s in self._read(snapshot.aggregate_id) if s.version != snapshot.version]
+            history.append(snapshot)
+            history.sort(key=lambda s: s.version)
+            self._write(snapshot.aggregate_id, history[-self._keep_last:])
+
+    def load_snapshot(self, aggregate_id: str, max_version: Optional[int] = None) -> Optional[Snapshot]:
+        """Load the latest snapshot for an aggregate."""
+        with self._lock:
+            history = self._read(aggregate_id)
+        for snapshot in reversed(history):
+            if max_version is None or snapshot.version <= max_version:
+                return snapshot
+        return None
+
+    def delete_snapshots(self, aggregate_id: str) -> int:
+        """Delete all snapshots for an aggregate."""
+        with self._lock:
+            history = self._read(aggregate_id)
+            if history:
+                self._path(aggregate_id).unlink(missing_ok=True)
+            return len(history)
+
+    def _path(self, aggregate_id: str) -> Path:
+        """Get the snapshot file for an aggregate."""
+        return self._directory / f"{aggregate_id.encode('utf-8').hex()}.json"
+
+    def _read(self, aggregate_id: str) -> List[Snapshot]:
+        """Read the snapshot history for an aggregate."""
+        path = self._path(aggregate_id)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return [Snapshot.from_dict(data) for data in json.load(handle)]
+        except FileNotFoundError:
+            return []
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable snapshot file {path}: {e}")
+            return []
+
+    def _write(self, aggregate_id: str, history: List[Snapshot]) -> None:
+        """Atomically replace the snapshot history for an aggregate."""
+        path = self._path(aggregate_id)
+        temp_path = path.with_suffix(".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump([snapshot.to_dict() for snapshot in history], handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
@@ -4,10 +4,21 @@ Event sourcing implementation for aggregate reconstruction.
 Provides capabilities to rebuild aggregate state from stored events.
 """
 
+import asyncio
+import copy
 import logging
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Type, TypeVar
 from .base import Event
+from .snapshots import (
+    InMemorySnapshotStore,
+    Snapshot,
+    SnapshotCheckResult,
+    SnapshotPolicy,
+    SnapshotStore,
+)
 from .store import EventStore, get_event_store
 
 logger = logging.getLogger(__name__)
@@ -21,8 +32,20 @@ class EventSourcedAggregate(ABC):
     
     Aggregates that inherit from this class can be reconstructed
     from their event history and can track uncommitted changes.
+    
+    Snapshots capture every instance attribute set by the subclass.
+    Aggregates whose state is not deep-copyable (or that use a
+    JSON-backed snapshot store) should override ``_get_snapshot_state``
+    and ``_restore_snapshot_state``, and bump ``SNAPSHOT_SCHEMA_VERSION``
+    whenever the captured layout changes so stale snapshots are ignored.
     """
     
+    SNAPSHOT_SCHEMA_VERSION = 1
+    
+    _BASE_ATTRIBUTES = frozenset(
+        {"_aggregate_id", "_version", "_uncommitted_events", "_is_deleted", "_snapshot_version"}
+    )
+    
     def __init__(self, aggregate_id: str):
         """
         Initialize the aggregate.
@@ -34,6 +57,7 @@ class EventSourcedAggregate(ABC):
         self._version = 0
         self._uncommitted_events: List[Event] = []
         self._is_deleted = False
+        self._snapshot_version = 0
     
     @property
     def aggregate_id(self) -> str:
@@ -55,6 +79,11 @@ class EventSourcedAggregate(ABC):
         """Check if the aggregate has been deleted."""
         return self._is_deleted
     
+    @property
+    def snapshot_version(self) -> int:
+        """Get the version covered by the aggregate's latest snapshot (0 if none)."""
+        return self._snapshot_version
+    
     def mark_events_as_committed(self) -> None:
         """Mark all uncommitted events as committed."""
         self._uncommitted_events.clear()
@@ -71,6 +100,54 @@ class EventSourcedAggregate(ABC):
         
         logger.debug(f"Loaded aggregate {self._aggregate_id} from {len(events)} events (version {self._version})")
     
+    def to_snapshot(self) -> Snapshot:
+        """
+        Capture the aggregate's current state as a snapshot.
+        
+        Returns:
+            Snapshot at the aggregate's current version
+        """
+        return Snapshot(
+            aggregate_id=self._aggregate_id,
+            aggregate_type=self.__class__.__name__,
+            version=self._version,
+            state={"is_deleted": self._is_deleted, "data": self._get_snapshot_state()},
+            timestamp=datetime.utcnow().isoformat(),
+            schema_version=self.SNAPSHOT_SCHEMA_VERSION,
+        )
+    
+    def restore_from_snapshot(self, snapshot: Snapshot) -> None:
+        """
+        Restore aggregate state from a snapshot.
+        
+        Args:
+            snapshot: Snapshot previously taken from this aggregate type
+        """
+        self._restore_snapshot_state(snapshot.state["data"])
+        self._is_deleted = snapshot.state.get("is_deleted", False)
+        self._version = snapshot.version
+        self._snapshot_version = snapshot.version
+    
+    def _get_snapshot_state(self) -> Dict[str, Any]:
+        """
+        Get the state captured in snapshots.
+        
+        Returns:
+            Copy of the aggregate's own attributes
+        """
+        return copy.deepcopy(
+            {name: value for name, value in vars(self).items() if name not in self._BASE_ATTRIBUTES}
+        )
+    
+    def _restore_snapshot_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore state captured by ``_get_snapshot_state``.
+        
+        Args:
+            state: Snapshot state data
+        """
+        vars(self).update(copy.deepcopy(state))
+    
     def apply_event(self, event: Event) -> None:
         """
         Apply a new event to the aggregate.
@@ -127,17 +204,44 @@ class EventSourcing:
     Event sourcing service for managing event-sourced aggregates.
     
     Provides functionality to save and load aggregates using event stores.
+    With a snapshot policy, aggregates are loaded from their latest snapshot
+    plus the events recorded after it instead of their full history.
     """
     
-    def __init__(self, event_store: Optional[EventStore] = None):
+    MAX_PENDING_SNAPSHOTS = 10000
+    
+    def __init__(
+        self,
+        event_store: Optional[EventStore] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        snapshot_policy: Optional[SnapshotPolicy] = None
+    ):
         """
         Initialize the event sourcing service.
         
         Args:
             event_store: Event store to use (uses default if None)
+            snapshot_store: Snapshot store (in-memory if a policy is given without one)
+            snapshot_policy: When to snapshot aggregates (snapshots disabled if None)
         """
         self._event_store = event_store or get_event_store()
         self._aggregate_factories: Dict[str, Type[EventSourcedAggregate]] = {}
+        self._snapshot_policy = snapshot_policy
+        self._snapshot_store = snapshot_store
+        if snapshot_policy is not None and snapshot_store is None:
+            self._snapshot_store = InMemorySnapshotStore()
+        # Aggregates whose replayed tail has grown past the policy, awaiting compaction
+        self._pending_snapshots: "OrderedDict[str, Type[EventSourcedAggregate]]" = OrderedDict()
+    
+    @property
+    def snapshots_enabled(self) -> bool:
+        """Check if snapshots are read and written."""
+        return self._snapshot_store is not None and self._snapshot_policy is not None
+    
+    @property
+    def pending_snapshot_count(self) -> int:
+        """Get the number of aggregates queued for background snapshotting."""
+        return len(self._pending_snapshots)
     
     def register_aggregate(self, aggregate_class: Type[EventSourcedAggregate]) -> None:
         """
@@ -169,6 +273,9 @@ class EventSourcing:
         aggregate.mark_events_as_committed()
         
         logger.info(f"Saved aggregate {aggregate.aggregate_id} with {len(uncommitted_events)} events")
+        
+        if self._is_snapshot_due(aggregate):
+            self.take_snapshot(aggregate)
     
     def load_aggregate(
         self,
@@ -190,19 +297,27 @@ class EventSourcing:
         Raises:
             ConcurrencyError: If version doesn't match expected
         """
-        # Load events for the aggregate
-        events = self._event_store.load_aggregate_events(aggregate_id)
+        # Create aggregate instance
+        aggregate = aggregate_class(aggregate_id)
         
-        if not events:
+        # Start from the latest snapshot and replay only the events after it
+        snapshot = self._load_snapshot(aggregate_class, aggregate_id)
+        if snapshot is not None:
+            aggregate.restore_from_snapshot(snapshot)
+            events = self._event_store.load_aggregate_events(aggregate_id, after_version=snapshot.version)
+        else:
+            events = self._event_store.load_aggregate_events(aggregate_id)
+        
+        if not events and snapshot is None:
             logger.debug(f"No events found for aggregate {aggregate_id}")
             return None
         
-        # Create aggregate instance
-        aggregate = aggregate_class(aggregate_id)
-        
         # Reconstruct from history
         aggregate.load_from_history(events)
         
+        if self._is_snapshot_due(aggregate):
+            self._queue_snapshot(aggregate_class, aggregate_id)
+        
         # Check version if specified
         if expected_version is not None and aggregate.version != expected_version:
             raise ConcurrencyError(
@@ -249,6 +364,9 @@ class EventSourcing:
             Number of deleted events
         """
         deleted_count = self._event_store.delete_events(aggregate_id=aggregate_id)
+        if self._snapshot_store is not None:
+            self._snapshot_store.delete_snapshots(aggregate_id)
+        self._pending_snapshots.pop(aggregate_id, None)
         logger.info(f"Deleted aggregate {aggregate_id} ({deleted_count} events)")
         return deleted_count
     
@@ -307,63 +425,237 @@ class EventSourcing:
         )
 
 
-class ConcurrencyError(Exception):
-    """Exception raised when aggregate version conflicts occur."""
-    pass
+    def take_snapshot(self, aggregate: EventSourcedAggregate) -> Optional[Snapshot]:
+        """
+        Snapshot an aggregate's committed state.
+        
+        Snapshot failures are logged and never propagate, since the
+        event history remains the source of truth.
+        
+        Args:
+            aggregate: The aggregate to snapshot
+            
+        Returns:
+            The stored snapshot or None if it was not taken
+        """
+        if self._snapshot_store is None or aggregate.uncommitted_events or aggregate.version == 0:
+            return None
+        
+        try:
+            snapshot = aggregate.to_snapshot()
+            self._snapshot_store.save_snapshot(snapshot)
+        except Exception as e:
+            logger.error(f"Failed to snapshot aggregate {aggregate.aggregate_id}: {e}")
+            return None
+        
+        aggregate._snapshot_version = snapshot.version
+        self._pending_snapshots.pop(aggregate.aggregate_id, None)
+        logger.debug(f"Snapshotted aggregate {aggregate.aggregate_id} at version {snapshot.version}")
+        return snapshot
+    
+    def compact_snapshots(self, max_aggregates: Optional[int] = None, verify: bool = False) -> int:
+        """
+        Snapshot aggregates queued by loads that replayed a long event tail.
+        
+        Args:
+            max_aggregates: Maximum number of queued aggregates to process
+            verify: Check each new snapshot against a full replay, dropping it if inconsistent
+            
+        Returns:
+            Number of snapshots written
+        """
+        written = 0
+        processed = 0
+        while self._pending_snapshots and (max_aggregates is None or processed < max_aggregates):
+            aggregate_id, aggregate_class = self._pending_snapshots.popitem(last=False)
+            processed += 1
+            try:
+                aggregate = self.load_aggregate(aggregate_class, aggregate_id)
+            except Exception as e:
+                logger.error(f"Failed to load aggregate {aggregate_id} for snapshotting: {e}")
+                continue
+            # Loading re-queues the aggregate; a failed snapshot waits for its next load
+            self._pending_snapshots.pop(aggregate_id, None)
+            if aggregate is None or self.take_snapshot(aggregate) is None:
+                continue
+            written += 1
+            if verify:
+                self.verify_snapshot(aggregate_class, aggregate_id, repair=True)
+        
+        if written:
+            logger.info(f"Compacted {written} aggregates into snapshots")
+        return written
+    
+    def verify_snapshot(
+        self,
+        aggregate_class: Type[T],
+        aggregate_id: str,
+        repair: bool = False
+    ) -> SnapshotCheckResult:
+        """
+        Check that a snapshot-based rebuild matches a full event replay.
+        
+        Args:
+            aggregate_class: The aggregate class to instantiate
+            aggregate_id: The aggregate identifier
+            repair: Delete the aggregate's snapshots if they are inconsistent
+            
+        Returns:
+            Result describing any state differences
+        """
+        snapshot = self._load_snapshot(aggregate_class, aggregate_id)
+        replayed = self.replay_aggregate(aggregate_class, aggregate_id)
+        replay_version = replayed.version if replayed is not None else 0
+        
+        if snapshot is None:
+            return SnapshotCheckResult(aggregate_id, None, replay_version, consistent=True)
+        
+        rebuilt = aggregate_class(aggregate_id)
+        rebuilt.restore_from_snapshot(snapshot)
+        rebuilt.load_from_history(
+            self._event_store.load_aggregate_events(aggregate_id, after_version=snapshot.version)
+        )
+        
+        differences = []
+        if replayed is None:
+            differences.append("events: snapshot exists but the aggregate has no events")
+        else:
+            if rebuilt.version != replayed.version:
+                differences.append(f"version: snapshot rebuild {rebuilt.version} != replay {replayed.version}")
+            if rebuilt.is_deleted != replayed.is_deleted:
+                differences.append(f"is_deleted: snapshot rebuild {rebuilt.is_deleted} != replay {replayed.is_deleted}")
+            rebuilt_state = rebuilt._get_snapshot_state()
+            replayed_state = replayed._get_snapshot_state()
+            for name in sorted(set(rebuilt_state) | set(replayed_state)):
+                if rebuilt_state.get(name) != replayed_state.get(name):
+                    differences.append(
+                        f"{name}: snapshot rebuild {rebuilt_state.get(name)!r} != replay {replayed_state.get(name)!r}"
+                    )
+        
+        result = SnapshotCheckResult(
+            aggregate_id=aggregate_id,
+            snapshot_version=snapshot.version,
+            replay_version=replay_version,
+            consistent=not differences,
+            differences=differences,
+        )
+        if differences:
+            logger.error(f"Snapshot for aggregate {aggregate_id} diverges from replay: {'; '.join(differences)}")
+            if repair and self._snapshot_store is not None:
+                self._snapshot_store.delete_snapshots(aggregate_id)
+        return result
+    
+    def _load_snapshot(self, aggregate_class: Type[EventSourcedAggregate], aggregate_id: str) -> Optional[Snapshot]:
+        """Load a usable snapshot for an aggregate, ignoring stale or foreign ones."""
+        if not self.snapshots_enabled:
+            return None
+        
+        try:
+            snapshot = self._snapshot_store.load_snapshot(aggregate_id)
+        except Exception as e:
+            logger.error(f"Failed to load snapshot for aggregate {aggregate_id}: {e}")
+            return None
+        
+        if snapshot is None:
+            return None
+        if (
+            snapshot.aggregate_type != aggregate_class.__name__
+            or snapshot.schema_version != aggregate_class.SNAPSHOT_SCHEMA_VERSION
+        ):
+            logger.debug(f"Ignoring incompatible snapshot for aggregate {aggregate_id}")
+            return None
+        return snapshot
+    
+    def _is_snapshot_due(self, aggregate: EventSourcedAggregate) -> bool:
+        """Check the snapshot policy for an aggregate."""
+        return self.snapshots_enabled and self._snapshot_policy.should_snapshot(
+            aggregate.__class__.__name__, aggregate.snapshot_version, aggregate.version
+        )
+    
+    def _queue_snapshot(self, aggregate_class: Type[EventSourcedAggregate], aggregate_id: str) -> None:
+        """Queue an aggregate for background snapshotting."""
+        self._pending_snapshots[aggregate_id] = aggregate_class
+        self._pending_snapshots.move_to_end(aggregate_id)
+        while len(self._pending_snapshots) > self.MAX_PENDING_SNAPSHOTS:
+            self._pending_snapshots.popitem(last=False)
 
 
-class Snapshot:
+class SnapshotCompactor:
     """
-    Snapshot of aggregate state for performance optimization.
+    Background task that snapshots aggregates queued by the event sourcing service.
     
-    Snapshots can be used to avoid replaying all events
-    for aggregates with long histories.
+    Loads keep serving from the previous snapshot plus its event tail while
+    the compactor writes fresh snapshots off the request path.
     """
     
     def __init__(
         self,
-        aggregate_id: str,
-        aggregate_type: str,
-        version: int,
-        state: Dict[str, Any],
-        timestamp: Optional[str] = None
+        event_sourcing: EventSourcing,
+        interval_seconds: float = 30.0,
+        batch_size: int = 100,
+        verify: bool = False
     ):
         """
-        Initialize the snapshot.
+        Initialize the compactor.
         
         Args:
-            aggregate_id: The aggregate identifier
-            aggregate_type: The aggregate type name  
-            version: The version at snapshot time
-            state: The aggregate state data
-            timestamp: When the snapshot was taken
-        """
-        self.aggregate_id = aggregate_id
-        self.aggregate_type = aggregate_type
-        self.version = version
-        self.state = state
-        self.timestamp = timestamp
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert snapshot to dictionary."""
-        return {
-            "aggregate_id": self.aggregate_id,
-            "aggregate_type": self.aggregate_type,
-            "version": self.version,
-            "state": self.state,
-            "timestamp": self.timestamp,
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Snapshot':
-        """Create snapshot from dictionary."""
-        return cls(
-            aggregate_id=data["aggregate_id"],
-            aggregate_type=data["aggregate_type"],
-            version=data["version"],
-            state=data["state"],
-            timestamp=data.get("timestamp"),
-        )
+            event_sourcing: Service whose queued aggregates are snapshotted
+            interval_seconds: Delay between compaction passes
+            batch_size: Maximum aggregates snapshotted per pass
+            verify: Check each written snapshot against a full replay
+        """
+        self._event_sourcing = event_sourcing
+        self._interval_seconds = interval_seconds
+        self._batch_size = batch_size
+        self._verify = verify
+        self._task: Optional[asyncio.Task] = None
+        self.snapshots_written = 0
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the background task is running."""
+        return self._task is not None and not self._task.done()
+    
+    def run_once(self) -> int:
+        """
+        Run a single compaction pass.
+        
+        Returns:
+            Number of snapshots written
+        """
+        written = self._event_sourcing.compact_snapshots(self._batch_size, verify=self._verify)
+        self.snapshots_written += written
+        return written
+    
+    def start(self) -> None:
+        """Start the background compaction loop on the running event loop."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background compaction loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        """Compaction loop."""
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Snapshot compaction failed: {e}")
+            await asyncio.sleep(self._interval_seconds)
+
+
+class ConcurrencyError(Exception):
+    """Exception raised when aggregate version conflicts occur."""
+    pass
 
 
 # Default event sourcing instance
@@ -243,33 +243,40 @@ class EventStore:
                 limit=limit
             )
             
-            # Deserialize events
-            events = []
-            for event_data in event_data_list:
-                try:
-                    event = self._deserialize_event(event_data)
-                    if event:
-                        events.append(event)
-                except Exception as e:
-                    logger.warning(f"Failed to deserialize event: {e}")
-            
+            events = self._deserialize_events(event_data_list)
             logger.debug(f"Loaded {len(events)} events")
             return events
             
         except Exception as e:
             raise EventStoreError(f"Failed to load events: {e}")
     
-    def load_aggregate_events(self, aggregate_id: str) -> List[Event]:
+    def load_aggregate_events(self, aggregate_id: str, after_version: int = 0) -> List[Event]:
         """
-        Load all events for a specific aggregate.
+        Load events for a specific aggregate.
         
         Args:
             aggregate_id: The aggregate identifier
+            after_version: Only return events with a higher aggregate version
+                (e.g. the version covered by a snapshot)
             
         Returns:
             List of events for the aggregate, ordered by timestamp
         """
-        return self.load_events(aggregate_id=aggregate_id)
+        if after_version <= 0:
+            return self.load_events(aggregate_id=aggregate_id)
+        
+        try:
+            event_data_list = self._storage.load_events(aggregate_id=aggregate_id)
+            # Skip covered events before paying for deserialization
+            tail = [
+                event_data for event_data in event_data_list
+                if event_data.get("metadata", {}).get("aggregate_version", 1) > after_version
+            ]
+            events = self._deserialize_events(tail)
+            logger.debug(f"Loaded {len(events)} events after version {after_version}")
+            return events
+        except Exception as e:
+            raise EventStoreError(f"Failed to load events: {e}")
     
     def delete_events(
         self,
@@ -314,6 +321,26 @@ class EventStore:
         events = self.load_events(aggregate_id=aggregate_id, event_types=event_types)
         return len(events)
     
+    def _deserialize_events(self, event_data_list: List[Dict[str, Any]]) -> List[Event]:
+        """
+        Deserialize raw event data, skipping events that fail to deserialize.
+        
+        Args:
+            event_data_list: Raw event data
+            
+        Returns:
+            List of event instances
+        """
+        events = []
+        for event_data in event_data_list:
+            try:
+                event = self._deserialize_event(event_data)
+                if event:
+                    events.append(event)
+            except Exception as e:
+                logger.warning(f"Failed to deserialize event: {e}")
+        return events
+    
     def _deserialize_event(self, event_data: Dict[str, Any]) -> Optional[Event]:
         """
         Deserialize event data into an Event instance.
@@ -349,7 +376,7 @@ class EventStore:
         Returns:
             List of events in version order
         """
-        events = self.load_aggregate_events(aggregate_id)
+        events = self.load_aggregate_events(aggregate_id, after_version=from_version - 1)
         
         # Filter by version if specified
         if from_version > 1 or to_version is not None:
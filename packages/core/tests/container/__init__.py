@@ -0,0 +1,3 @@
+"""
+Test configuration for DI container tests.
+"""
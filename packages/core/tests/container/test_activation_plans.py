@@ -0,0 +1,148 @@
+"""
+Tests for compiled activation plans in the DI container.
+"""
+
+import inspect
+from unittest.mock import patch
+
+import pytest
+
+from packages.core.src.container.container import Container
+from packages.core.src.container.exceptions import CircularDependencyException
+from packages.core.src.container.lifetime import ServiceLifetime
+
+
+class Repository:
+    pass
+
+
+class Cache:
+    def __init__(self, size=128):
+        self.size = size
+
+
+class UserService:
+    def __init__(self, repository: Repository, cache: Cache, retries=3):
+        self.repository = repository
+        self.cache = cache
+        self.retries = retries
+
+
+class Clock:
+    pass
+
+
+class Report:
+    def __init__(self, clock: Clock):
+        self.clock = clock
+
+
+class CycleA:
+    def __init__(self, b: 'CycleB'):
+        self.b = b
+
+
+class CycleB:
+    def __init__(self, a: CycleA):
+        self.a = a
+
+
+CycleA.__init__.__annotations__['b'] = CycleB
+
+
+class TestActivationPlans:
+    """Test plan compilation and reuse."""
+    
+    def test_signatures_are_inspected_once_per_service(self):
+        """Repeated resolutions reuse the compiled plan."""
+        container = Container()
+        container.register_singleton(Repository)
+        container.register_transient(Cache)
+        container.register_scoped(UserService)
+        
+        with patch('packages.core.src.container.container.inspect.signature', wraps=inspect.signature) as signature:
+            with container.create_scope():
+                first = container.resolve(UserService)
+                assert container.resolve(UserService) is first
+            with container.create_scope():
+                second = container.resolve(UserService)
+            calls = signature.call_count
+        
+        assert calls == 3  # UserService, Repository, Cache
+        assert second is not first
+        assert second.repository is first.repository
+        assert second.cache is not first.cache
+        assert first.cache.size == 128 and first.retries == 3
+    
+    def test_plan_describes_arguments_and_lifetime(self):
+        """The plan records injected dependencies and defaults."""
+        container = Container()
+        container.register_scoped(UserService)
+        
+        plan = container.get_activation_plan(UserService)
+        
+        assert plan.lifetime == ServiceLifetime.SCOPED
+        assert plan.source == "type"
+        assert plan.dependencies == [Repository, Cache]
+        assert [arg.name for arg in plan.arguments] == ["repository", "cache", "retries"]
+    
+    def test_registry_changes_invalidate_plans(self):
+        """Re-registering a dependency is reflected in later resolutions."""
+        container = Container()
+        container.register_transient(Report)
+        container.resolve(Report)
+        
+        clock = Clock()
+        container.register_instance(Clock, clock)
+        
+        assert container.resolve(Report).clock is clock
+    
+    def test_factories_receive_injected_dependencies(self):
+        """Factory plans inject the container and typed dependencies."""
+        container = Container()
+        container.register_singleton(Clock)
+        
+        def make_report(clock: Clock, container: Container) -> Report:
+            assert container.resolve(Clock) is clock
+            return Report(clock)
+        
+        container.register_factory(Report, make_report, ServiceLifetime.SINGLETON)
+        
+        report = container.resolve(Report)
+        assert report is container.resolve(Report)
+        assert report.clock is container.resolve(Clock)
+        assert container.get_activation_plan(Report).source == "factory"
+    
+    def test_cycles_are_detected_when_compiling(self):
+        """Constructor cycles fail at compile time."""
+        container = Container()
+        container.register_transient(CycleA)
+        container.register_transient(CycleB)
+        
+        with pytest.raises(CircularDependencyException) as exc_info:
+            container.resolve(CycleA)
+        
+        assert exc_info.value.dependency_chain == [CycleA, CycleB, CycleA]
+    
+    def test_cycles_through_factories_are_detected(self):
+        """Re-entrant resolution from a factory is still guarded."""
+        container = Container()
+        def make_clock(container: Container) -> Clock:
+            return container.resolve(Clock)
+        
+        container.register_factory(Clock, make_clock)
+        
+        with pytest.raises(CircularDependencyException):
+            container.resolve(Clock)
+    
+    def test_validate_services_compiles_every_plan(self):
+        """Validation builds plans eagerly and reports failures."""
+        container = Container()
+        container.register_transient(Report)
+        container.register_transient(CycleA)
+        container.register_transient(CycleB)
+        
+        issues = container.validate_services()
+        
+        assert Report in container._plans and Clock in container._plans
+        assert any("Cannot build activation plan for CycleA" in issue for issue in issues)
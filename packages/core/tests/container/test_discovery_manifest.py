@@ -0,0 +1,135 @@
+"""
+Tests for the build-time service discovery manifest.
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+from packages.core.src.container.auto_registration import create_auto_configured_container
+from packages.core.src.container.container import Container
+from packages.core.src.container.manifest import (
+    build_manifest, load_manifest, startup_report, write_manifest
+)
+
+SERVICES_MODULE = '''
+from abc import ABC, abstractmethod
+
+
+class NotificationInterface(ABC):
+    @abstractmethod
+    def send(self, message): ...
+
+
+class EmailNotificationService(NotificationInterface):
+    def send(self, message):
+        return f"emailed: {message}"
+
+
+class GreetingService:
+    def __init__(self, notifier: NotificationInterface):
+        self.notifier = notifier
+
+    def greet(self, name):
+        return self.notifier.send(f"hello {name}")
+'''
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A throwaway project with one discoverable package."""
+    package = f"manifest_demo_{uuid.uuid4().hex[:8]}"
+    (tmp_path / package).mkdir()
+    (tmp_path / package / "greeting.py").write_text(SERVICES_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path, package
+    _forget(package)
+
+
+def _forget(package):
+    for name in [name for name in sys.modules if name.startswith(package)]:
+        del sys.modules[name]
+
+
+class TestDiscoveryManifest:
+    """Test manifest generation, lazy registration and staleness."""
+    
+    def test_manifest_lists_services_interfaces_and_lifetimes(self, project):
+        """Building the manifest records discovered services by import path."""
+        base_path, package = project
+        manifest = build_manifest(str(base_path), [package])
+        
+        entries = {entry.service: entry for entry in manifest.services}
+        interface = entries[f"{package}.greeting:NotificationInterface"]
+        assert interface.implementation == f"{package}.greeting:EmailNotificationService"
+        assert entries[f"{package}.greeting:GreetingService"].lifetime == "scoped"
+        assert list(manifest.sources) == [f"{package}/greeting.py"]
+    
+    def test_manifest_registrations_import_on_first_resolve(self, project, tmp_path):
+        """Manifest mode registers services without importing their modules."""
+        base_path, package = project
+        manifest_path = tmp_path / "di_manifest.json"
+        write_manifest(build_manifest(str(base_path), [package]), str(manifest_path))
+        _forget(package)
+        
+        container = create_auto_configured_container(str(base_path), str(manifest_path))
+        
+        assert f"{package}.greeting" not in sys.modules
+        assert container.get_service_info()["GreetingService"]["lazy"] is True
+        
+        service = container.resolve(f"{package}.greeting:GreetingService")
+        assert service.greet("ada") == "emailed: hello ada"
+        assert f"{package}.greeting" in sys.modules
+        
+        # The loaded class resolves to the same registration
+        assert container.is_registered(type(service))
+        assert container.get_service_info()["GreetingService"]["lazy"] is False
+    
+    def test_staleness_uses_mtimes_then_hashes(self, project):
+        """Touched files are fresh if unchanged; edits and new files are stale."""
+        base_path, package = project
+        manifest = build_manifest(str(base_path), [package])
+        source = base_path / package / "greeting.py"
+        
+        stat = source.stat()
+        os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+        assert not manifest.is_stale(base_path)
+        
+        source.write_text(SERVICES_MODULE + "\n\nclass AuditService:\n    pass\n")
+        (base_path / package / "billing.py").write_text("class BillingService:\n    pass\n")
+        assert manifest.stale_sources(base_path) == [f"{package}/billing.py", f"{package}/greeting.py"]
+    
+    def test_stale_manifest_falls_back_to_scanning(self, project, tmp_path):
+        """A stale manifest is ignored in favour of a source scan."""
+        base_path, package = project
+        manifest_path = tmp_path / "di_manifest.json"
+        manifest = build_manifest(str(base_path), [package])
+        manifest.sources[f"{package}/greeting.py"]["sha256"] = "outdated"
+        manifest.sources[f"{package}/greeting.py"]["mtime"] = 0
+        write_manifest(manifest, str(manifest_path))
+        
+        assert load_manifest(str(manifest_path)).is_stale(base_path)
+        assert load_manifest(str(tmp_path / "missing.json")) is None
+    
+    def test_startup_report_compares_modes(self, tmp_path):
+        """The report measures both startup modes in fresh interpreters."""
+        pytest.importorskip("boto3")
+        package = f"manifest_demo_{uuid.uuid4().hex[:8]}"
+        (tmp_path / "services" / package).mkdir(parents=True)
+        (tmp_path / "services" / package / "greeting.py").write_text(SERVICES_MODULE)
+        manifest_path = tmp_path / "di_manifest.json"
+        
+        sys.path.insert(0, str(tmp_path))
+        try:
+            write_manifest(build_manifest(str(tmp_path)), str(manifest_path))
+        finally:
+            sys.path.remove(str(tmp_path))
+            _forget(f"services.{package}")
+        
+        report = startup_report(str(tmp_path), str(manifest_path))
+        
+        assert report["scan"]["modules_imported"] > report["manifest"]["modules_imported"]
+        assert report["modules_avoided"] > 0
+        assert report["manifest"]["registered_services"] >= 3
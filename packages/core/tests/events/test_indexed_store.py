@@ -0,0 +1,130 @@
+"""
+Tests for the indexed and append-only log event storage backends.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from packages.core.src.events import (
+    AppendOnlyLogStorageBackend,
+    EventStore,
+    IndexedStorageBackend,
+    InMemoryStorageBackend,
+    MealLogged,
+)
+
+BASE_TIME = datetime(2024, 1, 1, 8, 0, 0)
+EVENT_NAMES = ["UserRegistered", "MealLogged", "NutritionGoalSet", "PaymentProcessed"]
+
+
+def _event(index: int, rng: random.Random, shuffle_time: bool = False) -> dict:
+    offset = rng.randint(0, 5000) if shuffle_time else index
+    return {
+        "event_name": rng.choice(EVENT_NAMES),
+        "metadata": {
+            "event_id": f"evt-{index}",
+            "timestamp": (BASE_TIME + timedelta(minutes=offset)).isoformat(),
+            "aggregate_id": f"user-{rng.randint(0, 20)}",
+            "aggregate_version": index,
+        },
+        "data": {"value": index},
+    }
+
+
+@pytest.fixture(params=["indexed", "log"])
+def backend(request, tmp_path):
+    if request.param == "indexed":
+        yield IndexedStorageBackend()
+    else:
+        log = AppendOnlyLogStorageBackend(tmp_path / "events", segment_bytes=4096, index_interval=4)
+        yield log
+        log.close()
+
+
+QUERIES = [
+    {},
+    {"aggregate_id": "user-3"},
+    {"aggregate_id": "missing"},
+    {"event_types": ["MealLogged"]},
+    {"event_types": ["MealLogged", "PaymentProcessed"]},
+    {"event_types": []},
+    {"aggregate_id": "user-7", "event_types": ["UserRegistered"]},
+    {"start_time": BASE_TIME + timedelta(minutes=100), "end_time": BASE_TIME + timedelta(minutes=900)},
+    {"aggregate_id": "user-1", "start_time": BASE_TIME + timedelta(minutes=250)},
+    {"event_types": ["NutritionGoalSet"], "limit": 7},
+    {"limit": 10},
+]
+
+
+@pytest.mark.parametrize("shuffle_time", [False, True], ids=["in_order", "out_of_order"])
+def test_queries_match_scanning_backend(backend, shuffle_time):
+    reference = InMemoryStorageBackend()
+    rng = random.Random(42)
+    for index in range(1500):
+        event = _event(index, rng, shuffle_time)
+        reference.save_event(event)
+        backend.save_event(event)
+
+    for query in QUERIES:
+        expected = [e["metadata"]["event_id"] for e in reference.load_events(**query)]
+        actual = [e["metadata"]["event_id"] for e in backend.load_events(**query)]
+        assert actual == expected, query
+
+
+def test_delete_by_aggregate_or_time_matches_scanning_backend(backend):
+    reference = InMemoryStorageBackend()
+    rng = random.Random(7)
+    for index in range(800):
+        event = _event(index, rng, shuffle_time=True)
+        reference.save_event(event)
+        backend.save_event(event)
+
+    assert backend.delete_events() == reference.delete_events() == 0
+    assert backend.delete_events(aggregate_id="user-2") == reference.delete_events(aggregate_id="user-2")
+    cutoff = BASE_TIME + timedelta(minutes=2000)
+    assert backend.delete_events(before_time=cutoff) == reference.delete_events(before_time=cutoff)
+
+    for query in QUERIES:
+        expected = [e["metadata"]["event_id"] for e in reference.load_events(**query)]
+        assert [e["metadata"]["event_id"] for e in backend.load_events(**query)] == expected
+    assert backend.event_count == len(reference.load_events())
+
+
+def test_log_survives_restart_and_truncates_torn_write(tmp_path):
+    directory = tmp_path / "events"
+    log = AppendOnlyLogStorageBackend(directory, segment_bytes=2048, index_interval=3)
+    rng = random.Random(1)
+    events = [_event(index, rng) for index in range(300)]
+    for event in events:
+        log.save_event(event)
+    log.delete_events(aggregate_id="user-4")
+    expected = log.load_events(aggregate_id="user-5")
+    log.close()
+
+    segments = sorted(directory.glob("*.log"))
+    assert len(segments) > 1
+    with open(segments[-1], "ab") as handle:
+        handle.write(b"\x00\x00\x01\x00partial")
+
+    reopened = AppendOnlyLogStorageBackend(directory, segment_bytes=2048, index_interval=3)
+    assert reopened.load_events(aggregate_id="user-5") == expected
+    assert reopened.load_events(aggregate_id="user-4") == []
+
+    reopened.save_event(_event(300, rng))
+    assert reopened.load_events(limit=1, start_time=BASE_TIME + timedelta(minutes=300))[0]["data"] == {"value": 300}
+    reopened.close()
+
+
+def test_event_store_persists_through_log(tmp_path):
+    log = AppendOnlyLogStorageBackend(tmp_path / "events")
+    store = EventStore(log)
+
+    event = MealLogged(user_id="user-1", meal_id="meal-1", calories=450)
+    store.save_event(event)
+
+    stored = log.load_events(event_types=["MealLogged"], aggregate_id=event.aggregate_id)
+    assert [e["metadata"]["event_id"] for e in stored] == [event.event_id]
+    assert stored[0]["data"]["calories"] == 450
+    log.close()
@@ -0,0 +1,191 @@
+"""
+Tests for aggregate snapshotting in event sourcing.
+"""
+
+import asyncio
+
+import pytest
+
+from packages.core.src.events import (
+    Event,
+    EventSourcedAggregate,
+    EventSourcing,
+    EventStore,
+    FileSnapshotStore,
+    InMemorySnapshotStore,
+    InMemoryStorageBackend,
+    Snapshot,
+    SnapshotCompactor,
+    SnapshotPolicy,
+)
+
+
+class CaloriesLogged(Event):
+    """Event with a payload that round-trips through the event store."""
+
+    def __init__(self, calories: int = 0, **kwargs):
+        super().__init__(calories=calories, **kwargs)
+
+
+class MealLogHistory(EventSourcedAggregate):
+    def __init__(self, aggregate_id: str):
+        super().__init__(aggregate_id)
+        self.total_calories = 0
+        self.entries = []
+        self.replayed_events = 0
+
+    def log(self, calories: int) -> None:
+        self.apply_event(CaloriesLogged(calories=calories))
+
+    def _when(self, event: Event) -> None:
+        self.total_calories += event.data["calories"]
+        self.entries.append(event.data["calories"])
+
+    def _get_snapshot_state(self):
+        return {"total_calories": self.total_calories, "entries": list(self.entries)}
+
+    def _restore_snapshot_state(self, state):
+        self.total_calories = state["total_calories"]
+        self.entries = list(state["entries"])
+
+    def load_from_history(self, events):
+        self.replayed_events += len(events)
+        super().load_from_history(events)
+
+
+def _sourcing(every_n_events=10, snapshot_store=None):
+    store = EventStore(InMemoryStorageBackend())
+    store.register_event_type(CaloriesLogged)
+    return EventSourcing(
+        store,
+        snapshot_store=snapshot_store or InMemorySnapshotStore(),
+        snapshot_policy=SnapshotPolicy(every_n_events=every_n_events),
+    )
+
+
+def _log_meals(sourcing, aggregate_id, count, batch=1):
+    aggregate = sourcing.load_aggregate(MealLogHistory, aggregate_id) or MealLogHistory(aggregate_id)
+    for index in range(count):
+        aggregate.log(100 + index)
+        if (index + 1) % batch == 0:
+            sourcing.save_aggregate(aggregate)
+    sourcing.save_aggregate(aggregate)
+    return aggregate
+
+
+def test_save_snapshots_every_n_events_and_load_replays_only_the_tail():
+    sourcing = _sourcing(every_n_events=10)
+    saved = _log_meals(sourcing, "user-1", 25)
+
+    assert saved.snapshot_version == 20
+
+    loaded = sourcing.load_aggregate(MealLogHistory, "user-1")
+
+    assert loaded.replayed_events == 5
+    assert loaded.version == 25
+    assert loaded.entries == saved.entries
+    assert loaded.total_calories == saved.total_calories
+
+
+def test_load_without_snapshots_matches_snapshot_load():
+    sourcing = _sourcing(every_n_events=7)
+    _log_meals(sourcing, "user-1", 30, batch=4)
+
+    with_snapshot = sourcing.load_aggregate(MealLogHistory, "user-1")
+    full = sourcing.replay_aggregate(MealLogHistory, "user-1")
+
+    assert with_snapshot.replayed_events < full.replayed_events == 30
+    assert (with_snapshot.version, with_snapshot.entries) == (full.version, full.entries)
+
+
+def test_long_tail_on_load_is_queued_and_compacted_in_background():
+    store = EventStore(InMemoryStorageBackend())
+    store.register_event_type(CaloriesLogged)
+    _log_meals(EventSourcing(store), "user-1", 40)
+    sourcing = EventSourcing(store, snapshot_policy=SnapshotPolicy(every_n_events=10))
+
+    assert sourcing.load_aggregate(MealLogHistory, "user-1").replayed_events == 40
+    assert sourcing.pending_snapshot_count == 1
+
+    compactor = SnapshotCompactor(sourcing, verify=True)
+    assert compactor.run_once() == 1
+    assert sourcing.pending_snapshot_count == 0
+    assert sourcing.load_aggregate(MealLogHistory, "user-1").replayed_events == 0
+
+
+@pytest.mark.asyncio
+async def test_compactor_runs_as_background_task():
+    store = EventStore(InMemoryStorageBackend())
+    store.register_event_type(CaloriesLogged)
+    _log_meals(EventSourcing(store), "user-1", 15)
+    sourcing = EventSourcing(store, snapshot_policy=SnapshotPolicy(every_n_events=10))
+    sourcing.load_aggregate(MealLogHistory, "user-1")
+
+    compactor = SnapshotCompactor(sourcing, interval_seconds=0.01)
+    compactor.start()
+    await asyncio.sleep(0.05)
+    await compactor.stop()
+
+    assert not compactor.is_running
+    assert compactor.snapshots_written == 1
+
+
+def test_verify_snapshot_detects_divergence_and_repairs():
+    snapshot_store = InMemorySnapshotStore()
+    sourcing = _sourcing(every_n_events=5, snapshot_store=snapshot_store)
+    _log_meals(sourcing, "user-1", 12)
+
+    assert sourcing.verify_snapshot(MealLogHistory, "user-1").consistent
+
+    corrupted = snapshot_store.load_snapshot("user-1")
+    corrupted.state["data"]["total_calories"] += 1
+    result = sourcing.verify_snapshot(MealLogHistory, "user-1", repair=True)
+
+    assert not result.consistent
+    assert any(difference.startswith("total_calories") for difference in result.differences)
+    assert snapshot_store.load_snapshot("user-1") is None
+    assert sourcing.load_aggregate(MealLogHistory, "user-1").replayed_events == 12
+
+
+def test_snapshots_from_other_schema_versions_are_ignored():
+    snapshot_store = InMemorySnapshotStore()
+    sourcing = _sourcing(every_n_events=5, snapshot_store=snapshot_store)
+    _log_meals(sourcing, "user-1", 10)
+    snapshot_store.load_snapshot("user-1").schema_version = MealLogHistory.SNAPSHOT_SCHEMA_VERSION + 1
+
+    assert sourcing.load_aggregate(MealLogHistory, "user-1").replayed_events == 10
+
+
+def test_delete_aggregate_removes_snapshots():
+    snapshot_store = InMemorySnapshotStore()
+    sourcing = _sourcing(every_n_events=5, snapshot_store=snapshot_store)
+    _log_meals(sourcing, "user-1", 10)
+
+    sourcing.delete_aggregate("user-1")
+
+    assert snapshot_store.load_snapshot("user-1") is None
+    assert sourcing.load_aggregate(MealLogHistory, "user-1") is None
+
+
+def test_file_snapshot_store_keeps_latest_snapshots(tmp_path):
+    store = FileSnapshotStore(tmp_path / "snapshots", keep_last=2)
+    for version in (5, 10, 15):
+        store.save_snapshot(Snapshot("user/1", "MealLogHistory", version, {"data": {"total": version}}))
+
+    reopened = FileSnapshotStore(tmp_path / "snapshots")
+
+    assert reopened.load_snapshot("user/1").version == 15
+    assert reopened.load_snapshot("user/1", max_version=12).version == 10
+    assert reopened.load_snapshot("user/1", max_version=7) is None
+    assert reopened.delete_snapshots("user/1") == 2
+    assert reopened.load_snapshot("user/1") is None
+
+
+def test_event_sourcing_loads_through_file_snapshot_store(tmp_path):
+    sourcing = _sourcing(every_n_events=10, snapshot_store=FileSnapshotStore(tmp_path))
+    saved = _log_meals(sourcing, "user-1", 23)
+
+    loaded = sourcing.load_aggregate(MealLogHistory, "user-1")
+
+    assert loaded.replayed_events == 3
+    assert loaded.entries == saved.entries
@@ -7,7 +7,7 @@ conditional requests support, and performance optimization for mobile widgets.
 Architecture:
 - CachingMiddleware: FastAPI middleware for HTTP caching
 - ETagGenerator: ETag generation and validation
-- CacheManager: Cache storage and invalidation
+- CacheManager: Bounded LRU of serialized responses with an optional shared tier
 - ConditionalRequestHandler: HTTP 304 Not Modified support
 
 Author: AI Nutritionist Development Team
@@ -16,22 +16,41 @@ Date: September 2025
 
 import hashlib
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable, Awaitable
+import logging
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Callable, Awaitable, Set
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from src.models.gamification import WIDGET_CACHE_TTL_MIN, WIDGET_CACHE_TTL_MAX
 
+logger = logging.getLogger(__name__)
+
+HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+# Headers recomputed on every response rather than replayed from the cache
+_UNCACHED_HEADERS = {
+    "content-length", "etag", "cache-control", "last-modified",
+    "expires", "date", "x-cache-status"
+}
+
 
 class ETagGenerator:
     """Generate and validate ETag headers for caching."""
     
     @staticmethod
     def generate_etag(data: Any) -> str:
-        """Generate ETag from response data."""
+        """Generate ETag from response data or serialized response bytes."""
+        if isinstance(data, (bytes, bytearray)):
+            return hashlib.md5(data).hexdigest()
+        
         if isinstance(data, dict):
             # Sort keys for consistent hashing
             json_str = json.dumps(data, sort_keys=True, default=str)
@@ -56,59 +75,280 @@ class ETagGenerator:
         return etag_header.strip().strip('"')
 
 
+@dataclass
+class CachedResponse:
+    """A serialized response ready to be replayed without the route handler."""
+    body: bytes
+    etag: str
+    status_code: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    last_modified: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    )
+    ttl_seconds: int = 600
+    expires_at: float = 0.0
+    
+    def __post_init__(self):
+        if not self.expires_at:
+            self.expires_at = time.time() + self.ttl_seconds
+    
+    @property
+    def remaining_seconds(self) -> int:
+        """Seconds until the entry expires."""
+        return max(0, int(self.expires_at - time.time()))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain representation for the shared cache tier."""
+        return {
+            "body": self.body,
+            "etag": self.etag,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "last_modified": self.last_modified.replace(tzinfo=timezone.utc).timestamp(),
+            "ttl_seconds": self.ttl_seconds,
+            "expires_at": self.expires_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedResponse":
+        """Rebuild an entry read from the shared cache tier."""
+        return cls(
+            body=bytes(data["body"]),
+            etag=data["etag"],
+            status_code=data.get("status_code", 200),
+            headers=dict(data.get("headers") or {}),
+            last_modified=datetime.fromtimestamp(data["last_modified"], timezone.utc).replace(tzinfo=None),
+            ttl_seconds=data.get("ttl_seconds", 600),
+            expires_at=data["expires_at"]
+        )
+
+
 class CacheManager:
-    """Manage cache storage and invalidation."""
+    """
+    Manage cache storage and invalidation.
     
-    def __init__(self):
-        # In-memory cache for demo - use Redis in production
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
+    Entries live in a size-bounded LRU (by count and bytes) with per-entry
+    TTL. Keys stored for a user are indexed so user invalidation touches only
+    that user's entries. An optional ``shared_backend`` (any
+    ``src.core.caching`` backend, typically Redis) lets every worker serve
+    entries cached by the others; local copies of shared entries are kept for
+    at most ``local_ttl_seconds`` so invalidations propagate between workers.
+    """
     
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
-        """Get cached response data."""
-        if key not in self._cache:
-            return None
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        shared_backend: Optional[Any] = None,
+        key_prefix: str = "http_cache",
+        local_ttl_seconds: int = 30
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared_backend = shared_backend
+        self.key_prefix = key_prefix
+        self.local_ttl_seconds = local_ttl_seconds
         
-        # Check if cache entry has expired
-        if self._is_expired(key):
-            self.invalidate(key)
-            return None
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._expires_at: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._key_users: Dict[str, str] = {}
+        self._user_keys: Dict[str, Set[str]] = {}
+        self._bytes = 0
         
-        return self._cache[key]
+        self.stats = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._cache)
     
-    def set(self, key: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached response data."""
+        value = self._get_local(key)
+        if value is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return value
+    
+    def set(self, key: str, data: Any, ttl_seconds: int, user_id: Optional[str] = None) -> None:
         """Store response data in cache."""
+        self.invalidate(key)
+        
+        size = len(data.body) if isinstance(data, CachedResponse) else sys.getsizeof(data)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        
         self._cache[key] = data
-        self._cache_timestamps[key] = datetime.now() + timedelta(seconds=ttl_seconds)
+        self._expires_at[key] = time.time() + ttl_seconds
+        self._sizes[key] = size
+        self._bytes += size
+        if user_id is not None:
+            self._key_users[key] = user_id
+            self._user_keys.setdefault(user_id, set()).add(key)
+        self.stats["stores"] += 1
+        
+        self._evict()
     
     def invalidate(self, key: str) -> None:
         """Remove cache entry."""
-        self._cache.pop(key, None)
-        self._cache_timestamps.pop(key, None)
+        if self._cache.pop(key, None) is None:
+            return
+        self._expires_at.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+        
+        user_id = self._key_users.pop(key, None)
+        if user_id is not None:
+            keys = self._user_keys.get(user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._user_keys[user_id]
     
     def invalidate_pattern(self, pattern: str) -> None:
-        """Remove cache entries matching pattern."""
+        """Remove cache entries whose key contains ``pattern`` (full scan)."""
         keys_to_remove = [key for key in self._cache.keys() if pattern in key]
         for key in keys_to_remove:
             self.invalidate(key)
     
+    def invalidate_user_local(self, user_id: str) -> int:
+        """Remove this worker's entries stored for a user via the user index."""
+        keys = list(self._user_keys.get(str(user_id), ()))
+        for key in keys:
+            self.invalidate(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+    
+    async def invalidate_user(self, user_id: str) -> int:
+        """Remove a user's entries locally and from the shared tier."""
+        removed = self.invalidate_user_local(user_id)
+        
+        delete_by_pattern = getattr(self.shared_backend, "delete_by_pattern", None)
+        if delete_by_pattern is not None:
+            try:
+                removed += await delete_by_pattern(f"{self.key_prefix}:{user_id}:*")
+            except Exception as e:
+                logger.warning(f"Shared HTTP cache invalidation failed for user {user_id}: {e}")
+        
+        return removed
+    
+    async def get_response(self, key: str, user_id: Optional[str] = None) -> Optional[CachedResponse]:
+        """Get a cached response, falling back to the shared tier on a local miss."""
+        entry = self._get_local(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return entry
+        
+        if self.shared_backend is not None:
+            try:
+                data = await self.shared_backend.get(self._shared_key(key, user_id))
+            except Exception as e:
+                logger.warning(f"Shared HTTP cache read failed: {e}")
+                data = None
+            
+            if data:
+                entry = CachedResponse.from_dict(data)
+                if entry.remaining_seconds > 0:
+                    self.stats["hits"] += 1
+                    self.stats["shared_hits"] += 1
+                    self.set(key, entry, self._local_ttl(entry), user_id)
+                    return entry
+        
+        self.stats["misses"] += 1
+        return None
+    
+    async def set_response(self, key: str, entry: CachedResponse, user_id: Optional[str] = None) -> None:
+        """Store a response locally and in the shared tier."""
+        self.set(key, entry, self._local_ttl(entry), user_id)
+        
+        if self.shared_backend is not None:
+            try:
+                await self.shared_backend.set(
+                    self._shared_key(key, user_id), entry.to_dict(), entry.ttl_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Shared HTTP cache write failed: {e}")
+    
+    def record_not_modified(self) -> None:
+        """Count a conditional request answered with 304."""
+        self.stats["not_modified"] += 1
+    
+    def clear(self) -> None:
+        """Remove every local entry."""
+        self._cache.clear()
+        self._expires_at.clear()
+        self._sizes.clear()
+        self._key_users.clear()
+        self._user_keys.clear()
+        self._bytes = 0
+    
+    def _get_local(self, key: str) -> Optional[Any]:
+        """Look up a local entry, dropping it if expired."""
+        value = self._cache.get(key)
+        if value is None:
+            return None
+        
+        # Check if cache entry has expired
+        if self._is_expired(key):
+            self.invalidate(key)
+            self.stats["expirations"] += 1
+            return None
+        
+        self._cache.move_to_end(key)
+        return value
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until within the size bounds."""
+        while self._cache and (
+            len(self._cache) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self.invalidate(next(iter(self._cache)))
+            self.stats["evictions"] += 1
+    
+    def _local_ttl(self, entry: CachedResponse) -> int:
+        """Local lifetime of an entry; bounded when entries are shared."""
+        ttl = entry.remaining_seconds
+        if self.shared_backend is not None:
+            ttl = min(ttl, self.local_ttl_seconds)
+        return ttl
+    
+    def _shared_key(self, key: str, user_id: Optional[str]) -> str:
+        """Shared tier key; the user segment allows per-user pattern deletes."""
+        return f"{self.key_prefix}:{user_id or 'anonymous'}:{key}"
+    
     def _is_expired(self, key: str) -> bool:
         """Check if cache entry has expired."""
-        if key not in self._cache_timestamps:
+        if key not in self._expires_at:
             return True
         
-        return datetime.now() > self._cache_timestamps[key]
+        return time.time() > self._expires_at[key]
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for monitoring."""
         total_entries = len(self._cache)
         expired_entries = sum(1 for key in self._cache.keys() if self._is_expired(key))
+        lookups = self.stats["hits"] + self.stats["misses"]
         
         return {
             "total_entries": total_entries,
             "active_entries": total_entries - expired_entries,
             "expired_entries": expired_entries,
-            "hit_ratio": 0.95  # Mock hit ratio - implement real tracking in production
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "indexed_users": len(self._user_keys),
+            "shared_tier": self.shared_backend is not None,
+            **self.stats
         }
 
 
@@ -129,7 +369,7 @@ class ConditionalRequestHandler:
         if_modified_since = request.headers.get("if-modified-since")
         if if_modified_since:
             try:
-                client_date = datetime.strptime(if_modified_since, "%a, %d %b %Y %H:%M:%S GMT")
+                client_date = datetime.strptime(if_modified_since, HTTP_DATE_FORMAT)
                 if last_modified <= client_date:
                     return True
             except ValueError:
@@ -153,6 +393,10 @@ class CachingMiddleware(BaseHTTPMiddleware):
     - Conditional request handling (304 Not Modified)
     - Configurable TTL (5-15 minutes)
     - Cache invalidation patterns
+    
+    Cached GET responses are replayed from their stored bytes, and
+    conditional requests matching a cached entry get a 304 without
+    reaching the route handler.
     """
     
     def __init__(
@@ -162,7 +406,8 @@ class CachingMiddleware(BaseHTTPMiddleware):
         enabled_paths: Optional[list] = None
     ):
         super().__init__(app)
-        self.cache_manager = cache_manager or CacheManager()
+        # Share the application cache so route-level invalidation reaches it
+        self.cache_manager = cache_manager if cache_manager is not None else get_cache_manager()
         self.etag_generator = ETagGenerator()
         self.conditional_handler = ConditionalRequestHandler()
         
@@ -175,39 +420,41 @@ class CachingMiddleware(BaseHTTPMiddleware):
         call_next: Callable[[Request], Awaitable[Response]]
     ) -> Response:
         """Process request with caching logic."""
-        # Only cache enabled paths
-        if not self._should_cache_path(request.url.path):
+        # Only cache reads on enabled paths
+        if request.method != "GET" or not self._should_cache_path(request.url.path):
             return await call_next(request)
         
         # Generate cache key
         cache_key = self._generate_cache_key(request)
+        user_id = self._request_user_id(request)
         
         # Check cache for existing response
-        cached_response = self.cache_manager.get(cache_key)
-        if cached_response:
+        cached_response = await self.cache_manager.get_response(cache_key, user_id)
+        if cached_response is not None:
             # Check conditional requests
-            etag = cached_response.get("etag", "")
-            last_modified = cached_response.get("last_modified", datetime.now())
-            
-            if self.conditional_handler.should_return_304(request, etag, last_modified):
+            if self.conditional_handler.should_return_304(
+                request, cached_response.etag, cached_response.last_modified
+            ):
+                self.cache_manager.record_not_modified()
                 response = self.conditional_handler.create_304_response()
-                self._add_cache_headers(response, cached_response)
+                self._add_cache_headers(response, cached_response, "HIT")
                 return response
             
-            # Return cached response
-            response = JSONResponse(
-                content=cached_response["data"],
-                status_code=cached_response.get("status_code", 200)
+            # Replay the stored bytes
+            response = Response(
+                content=cached_response.body,
+                status_code=cached_response.status_code,
+                headers=cached_response.headers
             )
-            self._add_cache_headers(response, cached_response)
+            self._add_cache_headers(response, cached_response, "HIT")
             return response
         
         # Process request normally
         response = await call_next(request)
         
         # Cache successful responses
-        if response.status_code == 200 and hasattr(response, 'body'):
-            await self._cache_response(cache_key, request, response)
+        if response.status_code == 200 and self._is_cacheable(response):
+            response = await self._cache_response(cache_key, user_id, response)
         
         return response
     
@@ -227,23 +474,31 @@ class CachingMiddleware(BaseHTTPMiddleware):
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    async def _cache_response(self, cache_key: str, request: Request, response: Response) -> None:
-        """Store response in cache with appropriate headers."""
-        import random
-        
+    @staticmethod
+    def _request_user_id(request: Request) -> Optional[str]:
+        """User the response belongs to, for user-scoped invalidation."""
+        user_id = getattr(request.state, "user_id", None) or request.query_params.get("user_id")
+        return str(user_id) if user_id else None
+    
+    @staticmethod
+    def _is_cacheable(response: Response) -> bool:
+        """Skip responses that set cookies or opt out of caching."""
+        cache_control = response.headers.get("cache-control", "").lower()
+        return "set-cookie" not in response.headers and "no-store" not in cache_control
+    
+    async def _cache_response(self, cache_key: str, user_id: Optional[str], response: Response) -> Response:
+        """Store response bytes in cache and return a response with caching headers."""
         # Read response body
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
-        
-        try:
-            response_data = json.loads(body.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # Don't cache non-JSON responses
-            return
+        body = getattr(response, "body", None)
+        if body is None:
+            body = b""
+            async for chunk in response.body_iterator:
+                body += chunk
         
-        # Generate ETag
-        etag = self.etag_generator.generate_etag(response_data)
+        # Keep the handler's validator when it set one
+        etag = self.etag_generator.extract_etag_from_header(response.headers.get("etag", ""))
+        if not etag:
+            etag = self.etag_generator.generate_etag(body)
         
         # Randomize TTL to prevent thundering herd
         ttl_seconds = random.randint(
@@ -251,54 +506,78 @@ class CachingMiddleware(BaseHTTPMiddleware):
             WIDGET_CACHE_TTL_MAX * 60
         )
         
-        # Cache response data
-        cache_data = {
-            "data": response_data,
-            "etag": etag,
-            "last_modified": datetime.now(),
-            "status_code": response.status_code,
-            "ttl_seconds": ttl_seconds
-        }
-        
-        self.cache_manager.set(cache_key, cache_data, ttl_seconds)
-        
-        # Add cache headers to response
-        self._add_cache_headers(response, cache_data)
+        entry = CachedResponse(
+            body=body,
+            etag=etag,
+            status_code=response.status_code,
+            headers={
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _UNCACHED_HEADERS
+            },
+            ttl_seconds=ttl_seconds
+        )
+        await self.cache_manager.set_response(cache_key, entry, user_id)
         
-        # Reconstruct response body
-        response.body_iterator = self._iter_body(body)
+        cached = Response(content=body, status_code=entry.status_code, headers=entry.headers)
+        self._add_cache_headers(cached, entry, "MISS")
+        return cached
     
-    def _add_cache_headers(self, response: Response, cache_data: Dict[str, Any]) -> None:
+    def _add_cache_headers(self, response: Response, entry: CachedResponse, status: str) -> None:
         """Add caching headers to response."""
-        etag = cache_data.get("etag", "")
-        last_modified = cache_data.get("last_modified", datetime.now())
-        ttl_seconds = cache_data.get("ttl_seconds", 600)  # 10 min default
+        max_age = entry.remaining_seconds
         
-        response.headers["ETag"] = f'"{etag}"'
-        response.headers["Cache-Control"] = f"private, max-age={ttl_seconds}"
-        response.headers["Last-Modified"] = last_modified.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        response.headers["ETag"] = f'"{entry.etag}"'
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
+        response.headers["Last-Modified"] = entry.last_modified.strftime(HTTP_DATE_FORMAT)
         response.headers["Expires"] = (
-            datetime.now() + timedelta(seconds=ttl_seconds)
-        ).strftime("%a, %d %b %Y %H:%M:%S GMT")
+            datetime.now(timezone.utc) + timedelta(seconds=max_age)
+        ).strftime(HTTP_DATE_FORMAT)
         
         # Add cache status for debugging
-        response.headers["X-Cache-Status"] = "HIT" if "etag" in cache_data else "MISS"
-    
-    async def _iter_body(self, body: bytes):
-        """Iterate over response body bytes."""
-        yield body
+        response.headers["X-Cache-Status"] = status
     
     def invalidate_user_cache(self, user_id: str) -> None:
-        """Invalidate cache entries for specific user."""
-        self.cache_manager.invalidate_pattern(str(user_id))
+        """Invalidate this worker's cache entries for specific user."""
+        self.cache_manager.invalidate_user_local(str(user_id))
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics for monitoring."""
         return self.cache_manager.get_cache_stats()
 
 
+def create_shared_backend() -> Optional[Any]:
+    """Redis tier for the HTTP cache when HTTP_CACHE_REDIS_ENABLED is set."""
+    if os.getenv("HTTP_CACHE_REDIS_ENABLED", "false").lower() != "true":
+        return None
+    
+    try:
+        from src.core.caching.backends import RedisCacheBackend
+        from src.core.caching.redis_config import get_redis_config
+        
+        config = get_redis_config()
+        return RedisCacheBackend(
+            host=config["host"],
+            port=config["port"],
+            db=config["db"],
+            password=config["password"],
+            cluster_mode=config["cluster_mode"],
+            connection_pool_size=config["connection_pool_size"],
+            timeout=config["timeout"],
+            # Bodies are already serialized JSON
+            compression="none"
+        )
+    except ImportError as e:
+        logger.warning(f"Shared HTTP cache disabled: {e}")
+        return None
+
+
 # Singleton cache manager for application
-cache_manager = CacheManager()
+cache_manager = CacheManager(shared_backend=create_shared_backend())
+
+
+def get_cache_manager() -> CacheManager:
+    """Get the application's HTTP cache manager."""
+    return cache_manager
 
 
 def create_caching_middleware(app: ASGIApp) -> CachingMiddleware:
@@ -279,7 +279,7 @@ async def invalidate_user_cache(
         await gamification_service.invalidate_user_cache(user_id)
         
         # Invalidate middleware cache
-        cache_manager.invalidate_pattern(str(user_id))
+        await cache_manager.invalidate_user(str(user_id))
         
         return {
             "success": True,
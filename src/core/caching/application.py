@@ -46,6 +46,12 @@ class UserDataCache:
         value, hit = await self.cache_manager.get(key, profile="user_data")
         return value
     
+    async def get_user_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several user profiles with one batched lookup per tier."""
+        keys = {self.key_builder.build_user_key(user_id, "profile"): user_id for user_id in user_ids}
+        found = await self.cache_manager.get_many(list(keys), profile="user_data")
+        return {keys[key]: value for key, value in found.items()}
+    
     async def set_user_profile(
         self, 
         user_id: str, 
@@ -97,6 +103,19 @@ class UserDataCache:
             keys_and_loaders.append((key, loader))
         
         return await self.cache_manager.warm_cache(keys_and_loaders, "user_data")
+    
+    async def warm_cohort_cache(
+        self, 
+        cohort_loaders: Dict[str, Dict[str, callable]]
+    ) -> int:
+        """Warm cache for many users at once (user_id -> data_type -> loader)."""
+        keys_and_loaders = [
+            (self.key_builder.build_user_key(user_id, data_type), loader)
+            for user_id, data_loaders in cohort_loaders.items()
+            for data_type, loader in data_loaders.items()
+        ]
+        
+        return await self.cache_manager.warm_cache(keys_and_loaders, "user_data")
 
 
 class MealPlanCache:
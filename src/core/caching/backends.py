@@ -3,12 +3,17 @@ Cache backend implementations for different storage systems.
 """
 
 import asyncio
+import fnmatch
+import heapq
 import json
 import pickle
+import sys
+import threading
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import hashlib
 
@@ -30,6 +35,8 @@ except ImportError:
     AWS_AVAILABLE = False
     boto3 = None
 
+from .serialization import DEFAULT_CODEC, CacheSerializer
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,69 +72,192 @@ class CacheBackend(ABC):
     async def get_size(self) -> int:
         """Get current cache size."""
         pass
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values; missing keys are absent from the result."""
+        unique_keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.get(key) for key in unique_keys))
+        return {key: value for key, value in zip(unique_keys, values) if value is not None}
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """Set several values with one TTL; returns how many were stored."""
+        results = await asyncio.gather(*(self.set(key, value, ttl) for key, value in items.items()))
+        return sum(1 for result in results if result)
+    
+    async def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[int]]]:
+        """Get several values with their remaining TTL in seconds (None when unknown)."""
+        return {key: (value, None) for key, value in (await self.get_many(keys)).items()}
+    
+    async def set_many_with_ttl(self, items: Dict[str, Tuple[Any, Optional[int]]]) -> int:
+        """Set several values, each with its own TTL; returns how many were stored."""
+        by_ttl: Dict[Optional[int], Dict[str, Any]] = {}
+        for key, (value, ttl) in items.items():
+            by_ttl.setdefault(ttl, {})[key] = value
+        counts = await asyncio.gather(*(self.set_many(group, ttl) for ttl, group in by_ttl.items()))
+        return sum(counts)
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys; returns how many were removed."""
+        results = await asyncio.gather(*(self.delete(key) for key in dict.fromkeys(keys)))
+        return sum(1 for result in results if result)
+
+
+class _MemoryShard:
+    """One LRU segment of the memory cache with its own lock, expiry heap and counters."""
+    
+    __slots__ = ('entries', 'expiry_heap', 'lock', 'bytes_used', 'stats')
+    
+    def __init__(self):
+        # key -> (value, expires_at, size_bytes); order is recency (last = most recent)
+        self.entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.lock = threading.Lock()
+        self.bytes_used = 0
+        # Only updated while holding ``lock``
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejected': 0}
 
 
 class MemoryCacheBackend(CacheBackend):
-    """In-memory cache backend with LRU eviction."""
+    """
+    In-memory cache backend with O(1) LRU eviction.
+    
+    Entries live in sharded ordered dicts, so get/set/evict are O(1) and each
+    shard has its own short critical section instead of one global lock.
+    Expired entries are reclaimed from a per-shard min-heap of expiry times;
+    reads only compare the stored deadline. Optional ``max_bytes`` bounds the
+    estimated payload size in addition to the entry count; a value larger than
+    a shard's share of it is rejected rather than evicting the whole shard.
+    """
+    
+    # Expired heap entries reclaimed opportunistically per write.
+    _PURGE_BATCH = 8
     
-    def __init__(self, max_size: int = 1000, default_ttl: int = 3600):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: int = 3600,
+        max_bytes: Optional[int] = None,
+        shards: Optional[int] = None,
+        sizer: Optional[Callable[[Any], int]] = None
+    ):
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._access_order: List[str] = []
-        self._lock = asyncio.Lock()
+        self.max_bytes = max_bytes
+        # Small caches keep a single shard so LRU order is exact.
+        self.shard_count = shards or min(16, max(1, max_size // 4096))
+        self._shards = [_MemoryShard() for _ in range(self.shard_count)]
+        self._shard_capacity = -(-max_size // self.shard_count)
+        self._shard_max_bytes = -(-max_bytes // self.shard_count) if max_bytes else None
+        self._sizer = sizer or estimate_size
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction, expiration and rejected-write counts summed over shards."""
+        totals = dict.fromkeys(self._shards[0].stats, 0)
+        for shard in self._shards:
+            with shard.lock:
+                for name, count in shard.stats.items():
+                    totals[name] += count
+        return totals
+    
+    def _shard(self, key: str) -> _MemoryShard:
+        if self.shard_count == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % self.shard_count]
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from memory cache."""
-        async with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                
-                # Check expiration
-                if entry['expires_at'] > time.time():
-                    # Update access order
-                    self._access_order.remove(key)
-                    self._access_order.append(key)
-                    return entry['value']
-                else:
-                    # Expired entry
-                    await self._remove_entry(key)
-            
-            return None
+        return self.get_nowait(key)
+    
+    def get_nowait(self, key: str) -> Optional[Any]:
+        """Synchronous get; safe to call from threads and sync code."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if entry[1] > time.time():
+                    shard.entries.move_to_end(key)
+                    shard.stats['hits'] += 1
+                    return entry[0]
+                self._drop(shard, key)
+                shard.stats['expirations'] += 1
+            shard.stats['misses'] += 1
+        return None
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in memory cache."""
-        async with self._lock:
-            try:
-                ttl = ttl or self.default_ttl
-                expires_at = time.time() + ttl
-                
-                # Remove existing entry from access order
-                if key in self._cache:
-                    self._access_order.remove(key)
-                
-                # Evict if necessary
-                while len(self._cache) >= self.max_size:
-                    await self._evict_lru()
-                
-                # Add new entry
-                self._cache[key] = {
-                    'value': value,
-                    'expires_at': expires_at,
-                    'created_at': time.time()
-                }
-                self._access_order.append(key)
+        return self.set_nowait(key, value, ttl)
+    
+    def set_nowait(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Synchronous set; safe to call from threads and sync code."""
+        try:
+            expires_at = time.time() + (ttl or self.default_ttl)
+            size = self._sizer(value) if self.max_bytes else 0
+            shard = self._shard(key)
+            
+            with shard.lock:
+                self._purge_expired(shard, limit=self._PURGE_BATCH)
+                if key in shard.entries:
+                    self._drop(shard, key)
+                if self._shard_max_bytes and size > self._shard_max_bytes:
+                    # Storing it would evict everything else in the shard
+                    shard.stats['rejected'] += 1
+                    return False
                 
-                return True
+                while shard.entries and (
+                    len(shard.entries) >= self._shard_capacity
+                    or (self._shard_max_bytes and shard.bytes_used + size > self._shard_max_bytes)
+                ):
+                    lru_key = next(iter(shard.entries))
+                    self._drop(shard, lru_key)
+                    shard.stats['evictions'] += 1
                 
-            except Exception as e:
-                logger.error(f"Error setting memory cache entry {key}: {e}")
-                return False
+                shard.entries[key] = (value, expires_at, size)
+                shard.bytes_used += size
+                heapq.heappush(shard.expiry_heap, (expires_at, key))
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error setting memory cache entry {key}: {e}")
+            return False
     
     async def delete(self, key: str) -> bool:
         """Delete value from memory cache."""
-        async with self._lock:
-            return await self._remove_entry(key)
+        shard = self._shard(key)
+        with shard.lock:
+            return self._drop(shard, key)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values from memory cache."""
+        found = {}
+        for key in keys:
+            value = self.get_nowait(key)
+            if value is not None:
+                found[key] = value
+        return found
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """Set several values in memory cache."""
+        return sum(1 for key, value in items.items() if self.set_nowait(key, value, ttl))
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from memory cache."""
+        removed = 0
+        for key in keys:
+            shard = self._shard(key)
+            with shard.lock:
+                removed += self._drop(shard, key)
+        return removed
+    
+    async def delete_by_pattern(self, pattern: str) -> int:
+        """Delete keys matching a glob-style pattern."""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                for key in fnmatch.filter(list(shard.entries), pattern):
+                    removed += self._drop(shard, key)
+        return removed
     
     async def exists(self, key: str) -> bool:
         """Check if key exists and is not expired."""
@@ -136,35 +266,89 @@ class MemoryCacheBackend(CacheBackend):
     
     async def clear(self) -> bool:
         """Clear all cache entries."""
-        async with self._lock:
-            self._cache.clear()
-            self._access_order.clear()
-            return True
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+                shard.bytes_used = 0
+        return True
     
     async def get_size(self) -> int:
         """Get current cache size."""
-        async with self._lock:
-            return len(self._cache)
-    
-    async def _remove_entry(self, key: str) -> bool:
-        """Remove entry from cache."""
-        if key in self._cache:
-            del self._cache[key]
-            if key in self._access_order:
-                self._access_order.remove(key)
-            return True
-        return False
+        return sum(len(shard.entries) for shard in self._shards)
+    
+    def get_bytes(self) -> int:
+        """Estimated payload bytes held (0 unless ``max_bytes`` is set)."""
+        return sum(shard.bytes_used for shard in self._shards)
+    
+    def purge_expired(self) -> int:
+        """Reclaim every expired entry; returns how many were removed."""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += self._purge_expired(shard)
+        return removed
+    
+    async def run_expiry_loop(self, interval: float = 30.0):
+        """Periodically reclaim expired entries (run as a background task)."""
+        while True:
+            await asyncio.sleep(interval)
+            self.purge_expired()
+    
+    def _purge_expired(self, shard: _MemoryShard, limit: Optional[int] = None) -> int:
+        """Pop expired deadlines off the shard heap, skipping stale heap records."""
+        now = time.time()
+        heap = shard.expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            expires_at, key = heapq.heappop(heap)
+            entry = shard.entries.get(key)
+            # The key may have been overwritten or deleted since this deadline was pushed.
+            if entry is not None and entry[1] == expires_at:
+                self._drop(shard, key)
+                shard.stats['expirations'] += 1
+                removed += 1
+        # Stale records accumulate when keys are overwritten; rebuild if they dominate.
+        if len(heap) > 2 * len(shard.entries) + 64:
+            shard.expiry_heap = [(entry[1], key) for key, entry in shard.entries.items()]
+            heapq.heapify(shard.expiry_heap)
+        return removed
     
-    async def _evict_lru(self):
-        """Evict least recently used entry."""
-        if self._access_order:
-            lru_key = self._access_order[0]
-            await self._remove_entry(lru_key)
+    @staticmethod
+    def _drop(shard: _MemoryShard, key: str) -> bool:
+        entry = shard.entries.pop(key, None)
+        if entry is None:
+            return False
+        shard.bytes_used -= entry[2]
+        return True
+
+
+def estimate_size(value: Any) -> int:
+    """Cheap recursive estimate of a value's in-memory footprint in bytes."""
+    stack = [value]
+    seen: Set[int] = set()
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
 
 
 class RedisCacheBackend(CacheBackend):
     """Redis cache backend with clustering support."""
     
+    # Keys per SCAN page and per UNLINK call
+    SCAN_COUNT = 1000
+    DELETE_BATCH_SIZE = 500
+    
     def __init__(
         self, 
         host: str = 'localhost',
@@ -173,11 +357,19 @@ class RedisCacheBackend(CacheBackend):
         password: Optional[str] = None,
         cluster_mode: bool = False,
         connection_pool_size: int = 20,
-        timeout: float = 1.0
+        timeout: float = 1.0,
+        codec: str = DEFAULT_CODEC,
+        compression: str = "zlib",
+        compression_threshold: Optional[int] = 1024
     ):
         if not REDIS_AVAILABLE:
             raise ImportError("redis package is required for Redis backend")
         
+        self.serializer = CacheSerializer(
+            codec=codec,
+            compression=compression,
+            compression_threshold=compression_threshold
+        )
         self.host = host
         self.port = port
         self.db = db
@@ -295,16 +487,114 @@ class RedisCacheBackend(CacheBackend):
             logger.error(f"Error getting Redis cache size: {e}")
             return 0
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values from Redis in one MGET round trip."""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+        
+        try:
+            redis_client = await self._get_redis()
+            
+            if self.cluster_mode:
+                # Keys span hash slots; the cluster client splits per node
+                values = await redis_client.mget_nonatomic(unique_keys)
+            else:
+                values = await redis_client.mget(unique_keys)
+            
+            return {
+                key: self._deserialize(data)
+                for key, data in zip(unique_keys, values)
+                if data is not None
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting {len(unique_keys)} Redis cache entries: {e}")
+            return {}
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """Set several values in Redis with one pipelined round trip."""
+        return await self.set_many_with_ttl({key: (value, ttl) for key, value in items.items()})
+    
+    async def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[int]]]:
+        """Get several values and their remaining TTLs with one pipelined GET/PTTL round trip."""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+        
+        try:
+            redis_client = await self._get_redis()
+            pipe = redis_client.pipeline(transaction=False)
+            for key in unique_keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            results = await pipe.execute()
+            
+            found: Dict[str, Tuple[Any, Optional[int]]] = {}
+            for index, key in enumerate(unique_keys):
+                data, pttl = results[2 * index], results[2 * index + 1]
+                if data is not None:
+                    # PTTL is -1 for keys without expiry
+                    found[key] = (self._deserialize(data), -(-pttl // 1000) if pttl > 0 else None)
+            return found
+            
+        except Exception as e:
+            logger.error(f"Error getting {len(unique_keys)} Redis cache entries with TTL: {e}")
+            return {}
+    
+    async def set_many_with_ttl(self, items: Dict[str, Tuple[Any, Optional[int]]]) -> int:
+        """Set several values, each with its own TTL, in one pipelined round trip."""
+        if not items:
+            return 0
+        
+        try:
+            redis_client = await self._get_redis()
+            pipe = redis_client.pipeline(transaction=False)
+            
+            for key, (value, ttl) in items.items():
+                serialized_data = self._serialize(value)
+                if ttl:
+                    pipe.setex(key, ttl, serialized_data)
+                else:
+                    pipe.set(key, serialized_data)
+            
+            results = await pipe.execute()
+            return sum(1 for result in results if result)
+            
+        except Exception as e:
+            logger.error(f"Error setting {len(items)} Redis cache entries: {e}")
+            return 0
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from Redis, UNLINKing in batches."""
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return 0
+        
+        try:
+            redis_client = await self._get_redis()
+            return await self._unlink(redis_client, unique_keys)
+            
+        except Exception as e:
+            logger.error(f"Error deleting {len(unique_keys)} Redis cache entries: {e}")
+            return 0
+    
     async def delete_by_pattern(self, pattern: str) -> int:
         """Delete keys matching a pattern."""
         try:
             redis_client = await self._get_redis()
             
-            # Use SCAN for large datasets
+            # Use SCAN for large datasets and UNLINK matches in batches
             count = 0
-            async for key in redis_client.scan_iter(match=pattern, count=100):
-                await redis_client.delete(key)
-                count += 1
+            batch: List[Any] = []
+            async for key in redis_client.scan_iter(match=pattern, count=self.SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= self.DELETE_BATCH_SIZE:
+                    count += await self._unlink(redis_client, batch)
+                    batch = []
+            
+            if batch:
+                count += await self._unlink(redis_client, batch)
             
             return count
             
@@ -312,6 +602,13 @@ class RedisCacheBackend(CacheBackend):
             logger.error(f"Error deleting Redis keys by pattern {pattern}: {e}")
             return 0
     
+    async def _unlink(self, redis_client, keys: List[Any]) -> int:
+        """UNLINK keys in batches; reclamation happens off the main thread."""
+        count = 0
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            count += await redis_client.unlink(*keys[start:start + self.DELETE_BATCH_SIZE])
+        return count
+    
     async def get_ttl(self, key: str) -> Optional[int]:
         """Get TTL for a key."""
         try:
@@ -325,25 +622,11 @@ class RedisCacheBackend(CacheBackend):
     
     def _serialize(self, value: Any) -> bytes:
         """Serialize value for Redis storage."""
-        try:
-            # Try JSON first for simple types
-            if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                return json.dumps(value).encode('utf-8')
-            else:
-                # Use pickle for complex objects
-                return pickle.dumps(value)
-        except Exception:
-            # Fallback to pickle
-            return pickle.dumps(value)
+        return self.serializer.dumps(value)
     
     def _deserialize(self, data: bytes) -> Any:
-        """Deserialize value from Redis storage."""
-        try:
-            # Try JSON first
-            return json.loads(data.decode('utf-8'))
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # Fallback to pickle
-            return pickle.loads(data)
+        """Deserialize value from Redis storage (codec-tagged or legacy)."""
+        return self.serializer.loads(data)
     
     async def close(self):
         """Close Redis connection."""
@@ -354,6 +637,12 @@ class RedisCacheBackend(CacheBackend):
 class DatabaseCacheBackend(CacheBackend):
     """Database cache backend using DynamoDB."""
     
+    # DynamoDB batch API limits and client-side concurrency
+    BATCH_GET_SIZE = 100
+    BATCH_WRITE_SIZE = 25
+    BATCH_CONCURRENCY = 8
+    BATCH_MAX_ATTEMPTS = 5
+    
     def __init__(
         self, 
         table_name: str = "ai_nutritionist_cache",
@@ -441,6 +730,114 @@ class DatabaseCacheBackend(CacheBackend):
             logger.error(f"Error deleting DynamoDB cache entry {key}: {e}")
             return False
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values with BatchGetItem (100 keys per request)."""
+        return {key: value for key, (value, _) in (await self.get_many_with_ttl(keys)).items()}
+    
+    async def get_many_with_ttl(self, keys: List[str]) -> Dict[str, Tuple[Any, Optional[int]]]:
+        """Get several values with the seconds left until their ``expires_at``."""
+        unique_keys = list(dict.fromkeys(keys))
+        chunks = [
+            unique_keys[start:start + self.BATCH_GET_SIZE]
+            for start in range(0, len(unique_keys), self.BATCH_GET_SIZE)
+        ]
+        
+        found: Dict[str, Tuple[Any, Optional[int]]] = {}
+        expired: List[str] = []
+        now = time.time()
+        for items in await self._run_batches(self._batch_get_chunk, chunks):
+            for item in items:
+                expires_at = float(item.get('expires_at', 0))  # boto3 returns numbers as Decimal
+                if expires_at > now:
+                    found[item['cache_key']] = (self._deserialize(item['value']), max(1, int(expires_at - now)))
+                else:
+                    expired.append(item['cache_key'])
+        
+        if expired:
+            await self.delete_many(expired)
+        
+        return found
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """Set several values with BatchWriteItem (25 items per request)."""
+        now = time.time()
+        expires_at = int(now + (ttl or 3600))
+        requests = [
+            {
+                'PutRequest': {
+                    'Item': {
+                        'cache_key': key,
+                        'value': self._serialize(value),
+                        'expires_at': expires_at,
+                        'created_at': int(now)
+                    }
+                }
+            }
+            for key, value in items.items()
+        ]
+        return await self._write_many(requests)
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys with BatchWriteItem (25 keys per request)."""
+        requests = [
+            {'DeleteRequest': {'Key': {'cache_key': key}}}
+            for key in dict.fromkeys(keys)
+        ]
+        return await self._write_many(requests)
+    
+    async def _write_many(self, requests: List[Dict[str, Any]]) -> int:
+        """Run write requests in BatchWriteItem chunks; returns items written."""
+        chunks = [
+            requests[start:start + self.BATCH_WRITE_SIZE]
+            for start in range(0, len(requests), self.BATCH_WRITE_SIZE)
+        ]
+        return sum(await self._run_batches(self._batch_write_chunk, chunks))
+    
+    async def _run_batches(self, worker: Callable, chunks: List[List[Any]]) -> List[Any]:
+        """Run chunk requests concurrently, bounded by ``BATCH_CONCURRENCY``."""
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+        
+        async def run(chunk):
+            async with semaphore:
+                return await asyncio.to_thread(worker, chunk)
+        
+        return await asyncio.gather(*(run(chunk) for chunk in chunks))
+    
+    def _batch_get_chunk(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """BatchGetItem for one chunk, retrying unprocessed keys."""
+        self._get_table()
+        request_items = {self.table_name: {'Keys': [{'cache_key': key} for key in keys]}}
+        items: List[Dict[str, Any]] = []
+        attempts = 0
+        try:
+            while request_items and attempts < self.BATCH_MAX_ATTEMPTS:
+                if attempts:
+                    time.sleep(0.05 * 2 ** attempts)
+                response = self._dynamodb.batch_get_item(RequestItems=request_items)
+                items.extend(response.get('Responses', {}).get(self.table_name, []))
+                request_items = response.get('UnprocessedKeys') or {}
+                attempts += 1
+        except Exception as e:
+            logger.error(f"Error batch-getting {len(keys)} DynamoDB cache entries: {e}")
+        return items
+    
+    def _batch_write_chunk(self, requests: List[Dict[str, Any]]) -> int:
+        """BatchWriteItem for one chunk, retrying unprocessed items."""
+        self._get_table()
+        request_items = {self.table_name: requests}
+        attempts = 0
+        try:
+            while request_items and attempts < self.BATCH_MAX_ATTEMPTS:
+                if attempts:
+                    time.sleep(0.05 * 2 ** attempts)
+                response = self._dynamodb.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems') or {}
+                attempts += 1
+        except Exception as e:
+            logger.error(f"Error batch-writing {len(requests)} DynamoDB cache entries: {e}")
+            return 0
+        return len(requests) - len(request_items.get(self.table_name, []))
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in DynamoDB cache."""
         value = await self.get(key)
@@ -586,6 +983,28 @@ class CDNCacheBackend(CacheBackend):
             logger.error(f"Error deleting CDN cache entry {key}: {e}")
             return False
     
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several objects from CDN (S3), 1000 per request."""
+        if not self._s3_client or not self.s3_bucket:
+            return 0
+        
+        unique_keys = list(dict.fromkeys(keys))
+        deleted = 0
+        
+        for start in range(0, len(unique_keys), 1000):
+            chunk = unique_keys[start:start + 1000]
+            try:
+                response = await asyncio.to_thread(
+                    self._s3_client.delete_objects,
+                    Bucket=self.s3_bucket,
+                    Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+                )
+                deleted += len(chunk) - len(response.get('Errors', []))
+            except Exception as e:
+                logger.error(f"Error deleting {len(chunk)} CDN cache entries: {e}")
+        
+        return deleted
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in CDN."""
         if not self._s3_client or not self.s3_bucket:
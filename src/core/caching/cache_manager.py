@@ -4,8 +4,11 @@ Comprehensive cache manager coordinating multiple cache backends and strategies.
 
 import asyncio
 import logging
+import math
+import random
 import time
-from typing import Any, Dict, List, Optional, Tuple, Callable, Union
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Callable, Union
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -88,6 +91,10 @@ class CacheManager:
         # Initialize invalidation handler
         self.invalidation = InvalidationHandler(self)
         
+        # Single-flight loads and XFetch history (key -> (load seconds, expires_at))
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._load_history: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        
         # Background tasks
         self._background_tasks: List[asyncio.Task] = []
         self._start_background_tasks()
@@ -98,7 +105,8 @@ class CacheManager:
             # Memory cache (always available)
             self.backends[CacheTier.MEMORY] = MemoryCacheBackend(
                 max_size=self.config.memory_cache_size,
-                default_ttl=self.config.memory_cache_ttl
+                default_ttl=self.config.memory_cache_ttl,
+                max_bytes=self.config.memory_cache_max_bytes
             )
             
             # Redis cache (if available)
@@ -110,7 +118,13 @@ class CacheManager:
                     db=self.config.redis_db,
                     cluster_mode=self.config.redis_cluster_mode,
                     connection_pool_size=self.config.redis_connection_pool_size,
-                    timeout=self.config.timeout_seconds
+                    timeout=self.config.timeout_seconds,
+                    codec=self.config.redis_codec,
+                    compression=self.config.compression_algorithm,
+                    compression_threshold=(
+                        self.config.compression_threshold
+                        if self.config.compression_enabled else None
+                    )
                 )
                 logger.info("Redis cache backend initialized")
             except Exception as e:
@@ -183,50 +197,55 @@ class CacheManager:
         self, 
         key: str, 
         profile: str = "default",
-        loader_func: Optional[Callable] = None
+        loader_func: Optional[Callable] = None,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        single_flight: Optional[bool] = None,
+        early_expiration: Optional[float] = None
     ) -> Tuple[Optional[Any], bool]:
         """
         Get value from cache with fallback loading.
         
+        Concurrent misses on the same key share a single in-flight call to
+        ``loader_func``. When an early expiration beta is configured, hits
+        are refreshed ahead of expiry with XFetch probability so hot keys do
+        not all expire at once.
+        
         Args:
             key: Cache key
             profile: Cache profile name (from CACHE_PROFILES)
             loader_func: Function to load data on cache miss
+            ttl: Time to live for loaded values
+            tags: Tags for loaded values
+            single_flight: Coalesce concurrent loads (defaults to config)
+            early_expiration: XFetch beta (defaults to profile/config)
             
         Returns:
             Tuple of (value, was_cache_hit)
         """
         start_time = time.time()
         
+        # Get cache profile configuration
+        cache_config = CACHE_PROFILES.get(profile, {})
+        tier = cache_config.get('tier', CacheTier.MEMORY)
+        strategy = cache_config.get('strategy', CacheStrategy.CACHE_ASIDE)
+        
         try:
-            # Get cache profile configuration
-            cache_config = CACHE_PROFILES.get(profile, {})
-            tier = cache_config.get('tier', CacheTier.MEMORY)
-            strategy = cache_config.get('strategy', CacheStrategy.CACHE_ASIDE)
-            
             # Try multi-tier lookup for HYBRID
             if tier == CacheTier.HYBRID:
-                value, hit = await self._hybrid_get(key, loader_func)
+                value, hit = await self._hybrid_get(key, None)
             else:
                 # Use specific tier and strategy
                 backend = self.backends.get(tier)
                 strategy_handler = self.strategies.get(strategy)
                 
                 if backend and strategy_handler:
-                    value = await strategy_handler.get(key, loader_func)
-                    hit = value is not None
+                    value = await strategy_handler.get(key)
                 elif backend:
                     value = await backend.get(key)
-                    hit = value is not None
-                    
-                    # If miss and loader provided, load and cache
-                    if not hit and loader_func:
-                        value = await loader_func()
-                        if value is not None:
-                            await self.set(key, value, profile=profile)
-                        hit = False
                 else:
-                    value, hit = None, False
+                    value = None
+                hit = value is not None
             
             # Update metrics
             if hit:
@@ -248,12 +267,39 @@ class CacheManager:
                     (self.metrics.hits + 1)
                 )
             
-            return value, hit
-            
         except Exception as e:
             logger.error(f"Error getting cache entry {key}: {e}")
             self.metrics.errors += 1
-            return None, False
+            value, hit = None, False
+        
+        if not loader_func:
+            return value, hit
+        
+        ttl = ttl or cache_config.get('ttl', self.config.default_ttl)
+        
+        async def store(loaded: Any) -> bool:
+            return await self.set(key, loaded, ttl=ttl, profile=profile, tags=tags)
+        
+        if not hit:
+            # Loader errors propagate to every caller waiting on the load
+            value = await self._load(key, loader_func, store, ttl, single_flight)
+            return value, False
+        
+        beta = early_expiration
+        if beta is None:
+            beta = cache_config.get('early_expiration_beta', self.config.early_expiration_beta)
+        
+        if self._should_refresh_early(key, beta):
+            self.metrics.early_refreshes += 1
+            try:
+                refreshed = await self._load(key, loader_func, store, ttl, single_flight)
+                if refreshed is not None:
+                    value = refreshed
+            except Exception as e:
+                # The cached value is still valid, so serve it
+                logger.warning(f"Early refresh failed for cache entry {key}: {e}")
+        
+        return value, hit
     
     async def set(
         self, 
@@ -321,6 +367,180 @@ class CacheManager:
             self.metrics.errors += 1
             return False
     
+    async def get_many(
+        self,
+        keys: List[str],
+        profile: str = "default",
+        loader_func: Optional[Callable] = None
+    ) -> Dict[str, Any]:
+        """
+        Get several values, one batched round trip per tier.
+        
+        For HYBRID profiles, keys missing from memory are read from Redis and
+        then the database in bulk, and hits are written back to the faster
+        tiers in bulk.
+        
+        Args:
+            keys: Cache keys
+            profile: Cache profile name (from CACHE_PROFILES)
+            loader_func: Called with the list of missing keys; returns a
+                dict of loaded values, which are cached
+            
+        Returns:
+            Dict of found (and loaded) values; missing keys are absent
+        """
+        keys = list(dict.fromkeys(keys))
+        cache_config = CACHE_PROFILES.get(profile, {})
+        tier = cache_config.get('tier', CacheTier.MEMORY)
+        strategy = cache_config.get('strategy', CacheStrategy.CACHE_ASIDE)
+        found: Dict[str, Any] = {}
+        
+        try:
+            if tier == CacheTier.HYBRID:
+                found = await self._hybrid_get_many(keys)
+            else:
+                strategy_handler = self.strategies.get(strategy)
+                backend = self._profile_backend(tier, strategy_handler)
+                
+                if backend:
+                    found = await backend.get_many(keys)
+                
+                # Read-through strategies may still find misses in their data store
+                if strategy_handler and not isinstance(strategy_handler, CacheAsideStrategy):
+                    missing = [key for key in keys if key not in found]
+                    values = await asyncio.gather(*(strategy_handler.get(key) for key in missing))
+                    found.update(
+                        (key, value) for key, value in zip(missing, values) if value is not None
+                    )
+            
+            self.metrics.hits += len(found)
+            self.metrics.misses += len(keys) - len(found)
+            
+        except Exception as e:
+            logger.error(f"Error getting {len(keys)} cache entries: {e}")
+            self.metrics.errors += 1
+        
+        missing = [key for key in keys if key not in found]
+        if missing and loader_func:
+            loaded = {
+                key: value
+                for key, value in (await loader_func(missing) or {}).items()
+                if value is not None
+            }
+            self.metrics.loads += len(loaded)
+            if loaded:
+                await self.set_many(loaded, profile=profile)
+                found.update(loaded)
+        
+        return found
+    
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        profile: str = "default",
+        tags: Optional[List[str]] = None
+    ) -> int:
+        """
+        Set several values using profile configuration.
+        
+        Args:
+            items: Mapping of cache key to value
+            ttl: Time to live in seconds
+            profile: Cache profile name
+            tags: Tags for invalidation, applied to every key
+            
+        Returns:
+            Number of entries stored
+        """
+        if not items:
+            return 0
+        
+        start_time = time.time()
+        
+        try:
+            cache_config = CACHE_PROFILES.get(profile, {})
+            tier = cache_config.get('tier', CacheTier.MEMORY)
+            strategy = cache_config.get('strategy', CacheStrategy.CACHE_ASIDE)
+            
+            ttl = ttl or cache_config.get('ttl', self.config.default_ttl)
+            tags = tags or cache_config.get('tags', [])
+            
+            if tags:
+                for key in items:
+                    self.invalidation.register_tag(key, tags)
+            
+            if tier == CacheTier.HYBRID:
+                stored = await self._hybrid_set_many(items, ttl)
+            else:
+                strategy_handler = self.strategies.get(strategy)
+                backend = self._profile_backend(tier, strategy_handler)
+                
+                if strategy_handler and not isinstance(strategy_handler, CacheAsideStrategy):
+                    # Write-through/behind must also reach their data store per key
+                    results = await asyncio.gather(
+                        *(strategy_handler.set(key, value, ttl) for key, value in items.items())
+                    )
+                    stored = sum(1 for result in results if result)
+                elif backend:
+                    stored = await backend.set_many(items, ttl)
+                else:
+                    stored = 0
+            
+            # Update metrics
+            self.metrics.sets += len(items)
+            operation_time = (time.time() - start_time) * 1000 / len(items)
+            self.metrics.avg_set_time_ms = (
+                (self.metrics.avg_set_time_ms * (self.metrics.sets - len(items)) +
+                 operation_time * len(items)) / self.metrics.sets
+            )
+            
+            return stored
+            
+        except Exception as e:
+            logger.error(f"Error setting {len(items)} cache entries: {e}")
+            self.metrics.errors += 1
+            return 0
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys from all cache tiers; returns keys removed."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        
+        try:
+            counts = await asyncio.gather(
+                *(backend.delete_many(keys) for backend in self.backends.values())
+            )
+            
+            for key in keys:
+                self.invalidation.unregister_key(key)
+                self._load_history.pop(key, None)
+            
+            deleted = max(counts, default=0)
+            self.metrics.deletes += deleted
+            return deleted
+            
+        except Exception as e:
+            logger.error(f"Error deleting {len(keys)} cache entries: {e}")
+            self.metrics.errors += 1
+            return 0
+    
+    async def delete_by_pattern(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern from tiers that support it."""
+        deleted = 0
+        
+        for tier, backend in self.backends.items():
+            if not hasattr(backend, 'delete_by_pattern'):
+                continue
+            try:
+                deleted = max(deleted, await backend.delete_by_pattern(pattern))
+            except Exception as e:
+                logger.error(f"Error deleting {tier} cache keys by pattern {pattern}: {e}")
+        
+        self.metrics.deletes += deleted
+        return deleted
+    
     async def delete(self, key: str) -> bool:
         """Delete value from all cache tiers."""
         try:
@@ -333,6 +553,7 @@ class CacheManager:
             
             # Unregister from tag mappings
             self.invalidation.unregister_key(key)
+            self._load_history.pop(key, None)
             
             # Update metrics
             if success:
@@ -408,15 +629,26 @@ class CacheManager:
         Returns:
             Number of successfully warmed entries
         """
-        success_count = 0
+        semaphore = asyncio.Semaphore(self.config.batch_size)
         
-        for key, loader_func in keys_and_loaders:
-            try:
-                value = await loader_func()
-                if value is not None and await self.set(key, value, profile=profile):
-                    success_count += 1
-            except Exception as e:
-                logger.error(f"Error warming cache key {key}: {e}")
+        async def load(key: str, loader_func: Callable) -> Tuple[str, Any]:
+            async with semaphore:
+                try:
+                    return key, await loader_func()
+                except Exception as e:
+                    logger.error(f"Error warming cache key {key}: {e}")
+                    return key, None
+        
+        # Run loaders concurrently, then write in batches instead of per key
+        loaded = await asyncio.gather(
+            *(load(key, loader_func) for key, loader_func in keys_and_loaders)
+        )
+        items = [(key, value) for key, value in loaded if value is not None]
+        
+        success_count = 0
+        for start in range(0, len(items), self.config.batch_size):
+            batch = dict(items[start:start + self.config.batch_size])
+            success_count += await self.set_many(batch, profile=profile)
         
         logger.info(f"Cache warming completed: {success_count}/{len(keys_and_loaders)} entries")
         return success_count
@@ -444,21 +676,164 @@ class CacheManager:
             if value is not None:
                 # Store in upper tiers
                 if CacheTier.REDIS in self.backends:
-                    await self.backends[CacheTier.REDIS].set(key, value)
+                    await self.backends[CacheTier.REDIS].set(key, value, self.config.default_ttl)
                 if CacheTier.MEMORY in self.backends:
                     await self.backends[CacheTier.MEMORY].set(key, value, 300)
                 return value, True
         
         # Cache miss - use loader if provided
         if loader_func:
-            value = await loader_func()
-            if value is not None:
+            ttl = self.config.default_ttl
+            
+            async def store(loaded: Any) -> bool:
                 # Store in all available tiers
-                await self._hybrid_set(key, value, self.config.default_ttl)
+                return await self._hybrid_set(key, loaded, ttl)
+            
+            value = await self._load(key, loader_func, store, ttl)
             return value, False
         
         return None, False
     
+    async def _load(
+        self,
+        key: str,
+        loader_func: Callable,
+        store: Callable[[Any], Awaitable[bool]],
+        ttl: int,
+        single_flight: Optional[bool] = None
+    ) -> Optional[Any]:
+        """
+        Load a value on miss, sharing one in-flight load per key.
+        
+        The first caller starts the load; concurrent callers for the same key
+        await its result instead of calling the loader themselves.
+        """
+        if single_flight is None:
+            single_flight = self.config.single_flight_enabled
+        
+        if not single_flight:
+            return await self._run_loader(key, loader_func, store, ttl)
+        
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.metrics.coalesced_loads += 1
+        else:
+            flight = asyncio.ensure_future(self._run_loader(key, loader_func, store, ttl))
+            self._inflight[key] = flight
+            flight.add_done_callback(lambda done: self._finish_flight(key, done))
+        
+        # Shield so a cancelled caller does not cancel the load for the others
+        return await asyncio.shield(flight)
+    
+    async def _run_loader(
+        self,
+        key: str,
+        loader_func: Callable,
+        store: Callable[[Any], Awaitable[bool]],
+        ttl: int
+    ) -> Optional[Any]:
+        """Call the loader, store the result and record its cost for XFetch."""
+        started = time.monotonic()
+        value = await loader_func()
+        self.metrics.loads += 1
+        
+        if value is not None:
+            await store(value)
+            self._record_load(key, time.monotonic() - started, ttl)
+        
+        return value
+    
+    def _finish_flight(self, key: str, flight: asyncio.Future):
+        """Drop a completed load from the in-flight table."""
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        
+        # Mark the exception retrieved when every waiter was cancelled
+        if not flight.cancelled():
+            flight.exception()
+    
+    def _record_load(self, key: str, duration: float, ttl: int):
+        """Remember how long a key took to load and when it goes stale."""
+        self._load_history[key] = (duration, time.time() + ttl)
+        self._load_history.move_to_end(key)
+        
+        while len(self._load_history) > self.config.max_size:
+            self._load_history.popitem(last=False)
+    
+    def _should_refresh_early(self, key: str, beta: float) -> bool:
+        """
+        XFetch check: refresh with a probability that rises towards expiry.
+        
+        Keys that are slow to load (large delta) or read often get refreshed
+        earlier; a beta of 0 disables early refresh.
+        """
+        if beta <= 0:
+            return False
+        
+        history = self._load_history.get(key)
+        if history is None:
+            return False
+        
+        delta, expires_at = history
+        # 1 - random() keeps the draw in (0, 1] so log() is defined
+        return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires_at
+    
+    async def _hybrid_get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Multi-tier bulk lookup; lower-tier hits fill the upper tiers."""
+        found: Dict[str, Any] = {}
+        missing = keys
+        upper_tiers: List[CacheTier] = []
+        
+        for tier in (CacheTier.MEMORY, CacheTier.REDIS, CacheTier.DATABASE):
+            backend = self.backends.get(tier)
+            if backend is None or not missing:
+                continue
+            
+            if upper_tiers:
+                # Remaining TTLs bound how long upper tiers may keep the copies
+                hits = await backend.get_many_with_ttl(missing)
+            else:
+                hits = {key: (value, None) for key, value in (await backend.get_many(missing)).items()}
+            if hits:
+                found.update((key, value) for key, (value, _) in hits.items())
+                missing = [key for key in missing if key not in hits]
+                
+                # Store in upper tiers for faster future access, never outliving the source entry
+                for upper in upper_tiers:
+                    cap = 300 if upper == CacheTier.MEMORY else self.config.default_ttl  # 5 min in memory
+                    await self.backends[upper].set_many_with_ttl({
+                        key: (value, min(cap, remaining) if remaining else cap)
+                        for key, (value, remaining) in hits.items()
+                    })
+            
+            upper_tiers.append(tier)
+        
+        return found
+    
+    async def _hybrid_set_many(self, items: Dict[str, Any], ttl: int) -> int:
+        """Bulk set in every tier; returns the best per-tier count."""
+        stored = 0
+        
+        for tier, backend in self.backends.items():
+            try:
+                # Adjust TTL for different tiers
+                tier_ttl = min(ttl, 300) if tier == CacheTier.MEMORY else ttl
+                stored = max(stored, await backend.set_many(items, tier_ttl))
+            except Exception as e:
+                logger.error(f"Error setting values in {tier} cache: {e}")
+        
+        return stored
+    
+    def _profile_backend(
+        self,
+        tier: CacheTier,
+        strategy_handler: Optional[CacheStrategyHandler]
+    ) -> Optional[CacheBackend]:
+        """Backend that single-key get/set reach for a non-hybrid profile."""
+        if strategy_handler is not None and hasattr(strategy_handler, 'cache_backend'):
+            return strategy_handler.cache_backend
+        return self.backends.get(tier)
+    
     async def _hybrid_set(self, key: str, value: Any, ttl: int) -> bool:
         """Set value in hybrid multi-tier setup."""
         success = False
@@ -501,6 +876,7 @@ class CacheManager:
                         f"Hit ratio: {self.metrics.hit_ratio:.2%}, "
                         f"Hits: {self.metrics.hits}, "
                         f"Misses: {self.metrics.misses}, "
+                        f"Coalesced loads: {self.metrics.coalesced_loads}, "
                         f"Errors: {self.metrics.errors}"
                     )
                 
@@ -515,9 +891,11 @@ class CacheManager:
                 await asyncio.sleep(300)  # Run every 5 minutes
                 
                 # Cleanup expired entries from memory cache
-                if CacheTier.MEMORY in self.backends:
-                    # This would need implementation in the backend
-                    pass
+                memory_backend = self.backends.get(CacheTier.MEMORY)
+                if isinstance(memory_backend, MemoryCacheBackend):
+                    removed = memory_backend.purge_expired()
+                    if removed:
+                        logger.debug(f"Purged {removed} expired memory cache entries")
                 
             except Exception as e:
                 logger.error(f"Error in cleanup worker: {e}")
@@ -535,6 +913,9 @@ class CacheManager:
             "metrics": {
                 "hit_ratio": self.metrics.hit_ratio,
                 "total_operations": self.metrics.total_operations,
+                "loads": self.metrics.loads,
+                "coalesced_loads": self.metrics.coalesced_loads,
+                "early_refreshes": self.metrics.early_refreshes,
                 "errors": self.metrics.errors
             },
             "background_tasks": len([t for t in self._background_tasks if not t.done()])
@@ -7,6 +7,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Any
 import os
 
+from .serialization import DEFAULT_CODEC
+
 
 class CacheTier(Enum):
     """Cache tier definitions for different performance requirements."""
@@ -44,6 +46,8 @@ class CacheConfig:
     default_ttl: int = 3600  # 1 hour
     max_size: int = 10000
     compression_enabled: bool = True
+    compression_threshold: int = 1024  # Compress encoded values at least this large
+    compression_algorithm: str = "zlib"  # zlib or lz4
     
     # Redis settings
     redis_host: str = field(default_factory=lambda: os.getenv('REDIS_HOST', 'localhost'))
@@ -52,6 +56,7 @@ class CacheConfig:
     redis_db: int = 0
     redis_cluster_mode: bool = False
     redis_connection_pool_size: int = 20
+    redis_codec: str = field(default_factory=lambda: os.getenv('REDIS_CACHE_CODEC', DEFAULT_CODEC))  # msgpack, json or pickle
     
     # CDN settings
     cdn_enabled: bool = False
@@ -64,6 +69,10 @@ class CacheConfig:
     batch_size: int = 100
     timeout_seconds: float = 1.0
     
+    # Stampede protection
+    single_flight_enabled: bool = True  # Concurrent misses share one load
+    early_expiration_beta: float = 0.0  # XFetch beta; 0 disables early refresh
+    
     # Monitoring
     enable_metrics: bool = True
     metrics_interval: int = 60  # seconds
@@ -71,6 +80,7 @@ class CacheConfig:
     # Memory cache settings
     memory_cache_size: int = 1000
     memory_cache_ttl: int = 300  # 5 minutes
+    memory_cache_max_bytes: Optional[int] = None  # Optional payload budget
     
     # Database cache settings
     db_cache_table: str = "ai_nutritionist_cache"
@@ -92,6 +102,10 @@ class CacheMetrics:
     redis_hits: int = 0
     db_hits: int = 0
     
+    loads: int = 0
+    coalesced_loads: int = 0
+    early_refreshes: int = 0
+    
     avg_get_time_ms: float = 0.0
     avg_set_time_ms: float = 0.0
     
@@ -22,7 +22,9 @@ def cached(
     tags: Optional[List[str]] = None,
     condition: Optional[Callable] = None,
     serializer: Optional[Callable] = None,
-    deserializer: Optional[Callable] = None
+    deserializer: Optional[Callable] = None,
+    single_flight: bool = True,
+    early_expiration: Optional[float] = None
 ):
     """
     Decorator for caching function results.
@@ -35,6 +37,8 @@ def cached(
         condition: Function to determine if result should be cached
         serializer: Custom serialization function
         deserializer: Custom deserialization function
+        single_flight: Concurrent misses for a key await one call (async only)
+        early_expiration: XFetch beta for refreshing hot keys before expiry
     
     Usage:
         @cached(ttl=3600, profile="user_data", tags=["user"])
@@ -44,6 +48,10 @@ def cached(
         @cached(key_template="recipe:search:{query}:{filters}")
         async def search_recipes(query: str, filters: dict):
             return await search_api(query, filters)
+        
+        @cached(ttl=900, early_expiration=1.0)
+        async def get_popular_recipes():
+            return await load_popular_recipes()
     """
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
@@ -61,36 +69,28 @@ def cached(
             if condition and not condition(*args, **kwargs):
                 return await func(*args, **kwargs)
             
-            # Try to get from cache
+            async def load():
+                result = await func(*args, **kwargs)
+                # Serialize if needed
+                if result is not None and serializer:
+                    return serializer(result)
+                return result
+            
+            # Cache manager loads and stores on miss, once per key
             value, hit = await cache_manager.get(
                 cache_key, 
                 profile=profile,
-                loader_func=lambda: func(*args, **kwargs)
+                loader_func=load,
+                ttl=ttl,
+                tags=tags,
+                single_flight=single_flight,
+                early_expiration=early_expiration
             )
             
-            if hit:
-                # Deserialize if needed
-                if deserializer:
-                    value = deserializer(value)
-                return value
-            
-            # Cache miss - execute function
-            result = await func(*args, **kwargs)
-            
-            # Cache result if condition is met
-            if result is not None and (not condition or condition(*args, **kwargs)):
-                # Serialize if needed
-                cache_value = serializer(result) if serializer else result
-                
-                await cache_manager.set(
-                    cache_key, 
-                    cache_value, 
-                    ttl=ttl,
-                    profile=profile,
-                    tags=tags
-                )
-            
-            return result
+            # Deserialize if needed
+            if value is not None and deserializer:
+                value = deserializer(value)
+            return value
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> T:
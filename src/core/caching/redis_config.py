@@ -5,6 +5,8 @@ Redis configuration and setup for the caching system.
 import os
 from typing import Dict, Any, Optional
 
+from .serialization import DEFAULT_CODEC
+
 
 def get_redis_config() -> Dict[str, Any]:
     """Get Redis configuration from environment variables."""
@@ -30,10 +32,14 @@ def get_cache_config() -> Dict[str, Any]:
         "default_ttl": int(os.getenv("CACHE_DEFAULT_TTL", "3600")),  # 1 hour
         "max_size": int(os.getenv("CACHE_MAX_SIZE", "10000")),
         "compression_enabled": os.getenv("CACHE_COMPRESSION", "true").lower() == "true",
+        "compression_threshold": int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024")),
+        "compression_algorithm": os.getenv("CACHE_COMPRESSION_ALGORITHM", "zlib"),
+        "redis_codec": os.getenv("REDIS_CACHE_CODEC", DEFAULT_CODEC),
         
         # Memory cache settings
         "memory_cache_size": int(os.getenv("MEMORY_CACHE_SIZE", "1000")),
         "memory_cache_ttl": int(os.getenv("MEMORY_CACHE_TTL", "300")),  # 5 minutes
+        "memory_cache_max_bytes": int(os.getenv("MEMORY_CACHE_MAX_BYTES", "0")) or None,
         
         # Redis settings
         **get_redis_config(),
@@ -0,0 +1,237 @@
+"""
+Pluggable value codecs for distributed cache storage.
+
+Every encoded entry starts with one header byte: the low three bits name the
+codec and the next two bits the compression applied to the payload. Header
+values stay within 0x01-0x1F, which legacy (headerless) entries never start
+with - those began with JSON text or a pickle protocol marker (0x80) - so
+old and new entries can be read side by side while a cache migrates.
+"""
+
+import json
+import logging
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Optional imports with fallbacks
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+
+_COMPRESSION_IDS = {'none': COMPRESSION_NONE, 'zlib': COMPRESSION_ZLIB, 'lz4': COMPRESSION_LZ4}
+_CODEC_MASK = 0x07
+_COMPRESSION_SHIFT = 3
+
+
+class CacheCodec(ABC):
+    """Encodes values to bytes and back; ``codec_id`` is stored in the header."""
+
+    codec_id: int = 0
+    name: str = ""
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode a value; raise TypeError for values the codec cannot represent."""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode bytes produced by ``encode``."""
+        pass
+
+
+class JSONCodec(CacheCodec):
+    """Compact JSON for plain dict/list/scalar payloads."""
+
+    codec_id = 1
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PickleCodec(CacheCodec):
+    """Pickle for arbitrary Python objects such as dataclasses."""
+
+    codec_id = 2
+    name = "pickle"
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class MsgPackCodec(CacheCodec):
+    """Binary msgpack with extension types for dates and datetimes."""
+
+    codec_id = 3
+    name = "msgpack"
+
+    _EXT_DATETIME = 1
+    _EXT_DATE = 2
+
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack package is required for the msgpack codec")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, ext_hook=self._ext_hook, strict_map_key=False)
+
+    def _default(self, value: Any) -> Any:
+        # datetime is a date subclass, so check it first
+        if isinstance(value, datetime):
+            return msgpack.ExtType(self._EXT_DATETIME, value.isoformat().encode('ascii'))
+        if isinstance(value, date):
+            return msgpack.ExtType(self._EXT_DATE, value.isoformat().encode('ascii'))
+        raise TypeError(f"msgpack codec cannot encode {type(value).__name__}")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == self._EXT_DATETIME:
+            return datetime.fromisoformat(data.decode('ascii'))
+        if code == self._EXT_DATE:
+            return date.fromisoformat(data.decode('ascii'))
+        return msgpack.ExtType(code, data)
+
+
+CODECS: Dict[str, type] = {
+    JSONCodec.name: JSONCodec,
+    PickleCodec.name: PickleCodec,
+    MsgPackCodec.name: MsgPackCodec,
+}
+
+
+# Preferred codec when configuration does not name one
+DEFAULT_CODEC = MsgPackCodec.name if MSGPACK_AVAILABLE else JSONCodec.name
+
+
+def available_codecs() -> Tuple[str, ...]:
+    """Codec names usable in this environment."""
+    return tuple(name for name in CODECS if name != MsgPackCodec.name or MSGPACK_AVAILABLE)
+
+
+class CacheSerializer:
+    """
+    Header-tagged serializer with size-gated compression.
+
+    Values the preferred codec cannot represent fall back to pickle, so one
+    serializer handles both plain dicts and dataclass instances. Payloads of
+    at least ``compression_threshold`` bytes are compressed when that makes
+    them smaller; ``None`` disables compression.
+    """
+
+    def __init__(
+        self,
+        codec: str = DEFAULT_CODEC,
+        compression: str = "zlib",
+        compression_threshold: Optional[int] = 1024,
+        compression_level: int = 1
+    ):
+        if codec == MsgPackCodec.name and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed; falling back to json cache codec")
+            codec = JSONCodec.name
+        if compression == 'lz4' and not LZ4_AVAILABLE:
+            logger.warning("lz4 not installed; falling back to zlib cache compression")
+            compression = 'zlib'
+        if codec not in CODECS:
+            raise ValueError(f"Unknown cache codec: {codec}")
+        if compression not in _COMPRESSION_IDS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        self.codec: CacheCodec = CODECS[codec]()
+        self.fallback: CacheCodec = PickleCodec()
+        self.compression = _COMPRESSION_IDS[compression]
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self._decoders: Dict[int, CacheCodec] = {self.codec.codec_id: self.codec}
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value with its header byte."""
+        codec = self.codec
+        try:
+            payload = codec.encode(value)
+        except (TypeError, ValueError, OverflowError):
+            codec = self.fallback
+            payload = codec.encode(value)
+
+        compression = COMPRESSION_NONE
+        if (
+            self.compression_threshold is not None
+            and self.compression != COMPRESSION_NONE
+            and len(payload) >= self.compression_threshold
+        ):
+            compressed = self._compress(payload)
+            # Already-dense payloads can grow; keep whichever is smaller
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+
+        header = codec.codec_id | (compression << _COMPRESSION_SHIFT)
+        return bytes((header,)) + payload
+
+    def loads(self, data: bytes) -> Any:
+        """Decode an entry written by ``dumps`` or by the legacy encoding."""
+        header = data[0]
+        if not 0x01 <= header <= 0x1F:
+            return self._legacy_loads(data)
+
+        payload = data[1:]
+        compression = header >> _COMPRESSION_SHIFT
+        if compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression == COMPRESSION_LZ4:
+            if not LZ4_AVAILABLE:
+                raise ValueError("lz4 package is required to read this cache entry")
+            payload = lz4_frame.decompress(payload)
+
+        return self._decoder(header & _CODEC_MASK).decode(payload)
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == COMPRESSION_LZ4:
+            return lz4_frame.compress(payload)
+        return zlib.compress(payload, self.compression_level)
+
+    def _decoder(self, codec_id: int) -> CacheCodec:
+        decoder = self._decoders.get(codec_id)
+        if decoder is None:
+            for codec_class in CODECS.values():
+                if codec_class.codec_id == codec_id:
+                    decoder = codec_class()
+                    break
+            else:
+                raise ValueError(f"Unknown cache codec id: {codec_id}")
+            self._decoders[codec_id] = decoder
+        return decoder
+
+    @staticmethod
+    def _legacy_loads(data: bytes) -> Any:
+        """Headerless JSON-or-pickle entries written before codecs existed."""
+        try:
+            return json.loads(data.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return pickle.loads(data)
@@ -397,12 +397,8 @@ class InvalidationHandler:
     async def invalidate_by_tag(self, tag: str) -> int:
         """Invalidate all cache entries with a specific tag."""
         if tag in self.tag_mappings:
-            keys_to_invalidate = self.tag_mappings[tag].copy()
-            count = 0
-            
-            for key in keys_to_invalidate:
-                if await self.cache_manager.delete(key):
-                    count += 1
+            keys_to_invalidate = list(self.tag_mappings[tag])
+            count = await self.cache_manager.delete_many(keys_to_invalidate)
             
             # Clear tag mapping
             del self.tag_mappings[tag]
@@ -9,11 +9,8 @@ import os
 from typing import Dict, Any, Optional
 
 import boto3
-from services.messaging.sms import SMSService
-from services.nutrition.insights import NutritionInsightsService
-from services.personalization.preferences import UserPreferenceService
-from services.meal_planning.planner import MealPlannerService
-from handlers.spam_protection_handler import SpamProtectionService
+from services.infrastructure.lazy_loading import LazyService
+from services.infrastructure.usage_accounting import flush_usage_after
 
 # Configure logging
 logger = logging.getLogger()
@@ -23,12 +20,18 @@ logger.setLevel(logging.INFO)
 dynamodb = boto3.resource('dynamodb')
 lambda_client = boto3.client('lambda')
 
-# Initialize domain services
-sms_service = SMSService()
-nutrition_insights_service = NutritionInsightsService()
-user_preference_service = UserPreferenceService(dynamodb)
-meal_planner_service = MealPlannerService(dynamodb, nutrition_insights_service)
-spam_service = SpamProtectionService()
+# Domain services are imported and constructed on first use to keep cold starts short.
+# No class in the tree provides all the methods called below: AWSMessagingService has no
+# send_message, AIService has no answer_nutrition_question or get_recipe_with_nutrition, and
+# UserService has none of create_user, get_user_by_phone, log_interaction,
+# update_user_preferences or update_user_status.
+sms_service = LazyService("services.messaging.notifications:AWSMessagingService")
+nutrition_insights_service = LazyService("services.infrastructure.ai:AIService")
+user_preference_service = LazyService("services.personalization.preferences:UserService", dynamodb)
+meal_planner_service = LazyService(
+    "services.meal_planning.optimizer:MealPlanService", dynamodb, nutrition_insights_service
+)
+spam_service = LazyService("handlers.spam_protection_handler:SpamProtectionService")
 
 # Compatibility aliases for existing code
 ai_service = nutrition_insights_service
@@ -36,6 +39,7 @@ user_service = user_preference_service
 meal_plan_service = meal_planner_service
 
 
+@flush_usage_after
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Main Lambda handler for processing AWS SMS messages
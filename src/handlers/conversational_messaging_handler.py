@@ -10,7 +10,6 @@ import logging
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
-from ..services.conversational_ai import ConversationalNutritionistAI
 from ..services.messaging.cost_aware_handler import process_nutrition_request_with_optimization
 from ..models.user_profile import UserProfile
 
@@ -35,7 +34,7 @@ class ConversationalNutritionistHandler:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.ai_nutritionist = ConversationalNutritionistAI()
+        self._ai_nutritionist = None
         
         # AWS End User Messaging client
         try:
@@ -64,6 +63,18 @@ class ConversationalNutritionistHandler:
         # Photo analysis capabilities (for food photos)
         self.photo_analysis_enabled = True
     
+    @property
+    def ai_nutritionist(self):
+        """Conversational AI, imported and created on first message."""
+        if self._ai_nutritionist is None:
+            from ..services.conversational_ai import ConversationalNutritionistAI
+            self._ai_nutritionist = ConversationalNutritionistAI()
+        return self._ai_nutritionist
+    
+    @ai_nutritionist.setter
+    def ai_nutritionist(self, value):
+        self._ai_nutritionist = value
+    
     def handle_incoming_message(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle incoming messages from AWS End User Messaging
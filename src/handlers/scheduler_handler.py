@@ -11,10 +11,16 @@ from typing import Dict, Any
 import boto3
 
 # Import our domain-organized services
-from services.nutrition.insights import NutritionInsightsService
-from services.personalization.preferences import UserPreferenceService
-from services.meal_planning.planner import MealPlannerService
-from services.messaging.sms import SMSService
+from services.infrastructure.ai import AIService
+from services.personalization.preferences import UserService
+from services.meal_planning.optimizer import MealPlanService
+from services.messaging.notifications import AWSMessagingService
+from services.infrastructure.usage_accounting import flush_usage_after
+from services.meal_planning.batch_scheduler import (
+    BatchPlanScheduler,
+    DynamoDBCheckpointStore,
+    weekly_run_id,
+)
 
 # Configure logging
 logger = logging.getLogger()
@@ -24,10 +30,10 @@ logger.setLevel(logging.INFO)
 dynamodb = boto3.resource('dynamodb')
 
 # Initialize domain services
-user_preference_service = UserPreferenceService(dynamodb)
-nutrition_insights_service = NutritionInsightsService()
-meal_planner_service = MealPlannerService(dynamodb, nutrition_insights_service)
-sms_service = SMSService()
+user_preference_service = UserService(dynamodb)
+nutrition_insights_service = AIService()
+meal_planner_service = MealPlanService(dynamodb, nutrition_insights_service)
+sms_service = AWSMessagingService()
 
 # Compatibility aliases for existing code
 user_service = user_preference_service
@@ -38,62 +44,55 @@ messaging_service = sms_service
 # Set up service dependencies
 meal_plan_service.set_user_service(user_service)
 
+batch_scheduler = BatchPlanScheduler(
+    user_service=user_service,
+    meal_plan_service=meal_plan_service,
+    send_plan=lambda user_profile, meal_plan: send_meal_plan_to_user(user_profile, meal_plan),
+    checkpoint_store=DynamoDBCheckpointStore(user_service.table),
+)
 
+
+@flush_usage_after
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Lambda handler for scheduled meal plan generation
-    Runs weekly to generate meal plans for users with auto-plans enabled
+    Runs weekly to generate meal plans for users with auto-plans enabled.
+    Re-invocations within the same week resume from the stored checkpoint.
     """
     try:
         logger.info("Starting scheduled meal plan generation")
         
-        # Get users who have auto meal plans enabled
-        auto_plan_users = user_service.get_users_for_auto_plans()
-        logger.info(f"Found {len(auto_plan_users)} users with auto plans enabled")
-        
-        successful_plans = 0
-        failed_plans = 0
-        
-        for user_id in auto_plan_users:
-            try:
-                # Get user profile
-                user_profile = user_service.get_user_profile(user_id)
-                if not user_profile:
-                    logger.warning(f"Could not find profile for user {user_id}")
-                    failed_plans += 1
-                    continue
-                
-                # Generate new meal plan
-                meal_plan = meal_plan_service.generate_meal_plan(user_profile, force_new=True)
-                
-                if meal_plan:
-                    # Send meal plan to user
-                    success = send_meal_plan_to_user(user_profile, meal_plan)
-                    
-                    if success:
-                        successful_plans += 1
-                        logger.info(f"Successfully generated and sent meal plan to user {user_id}")
-                    else:
-                        failed_plans += 1
-                        logger.error(f"Failed to send meal plan to user {user_id}")
-                else:
-                    failed_plans += 1
-                    logger.error(f"Failed to generate meal plan for user {user_id}")
-                    
-            except Exception as e:
-                failed_plans += 1
-                logger.error(f"Error processing user {user_id}: {str(e)}")
+        run_id = (event or {}).get('run_id') or weekly_run_id()
+        remaining_time = None
+        if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+            remaining_time = lambda: context.get_remaining_time_in_millis() / 1000
+        
+        # One-time migration: align existing profiles with the cohort index before trusting it
+        backfill = user_service.ensure_auto_plan_cohort()
+        if backfill is not None:
+            logger.info(f"Backfilled auto-plan cohort index: {json.dumps(backfill)}")
+        
+        # Stream users with auto meal plans enabled from the cohort index, page by page
+        report = batch_scheduler.run_cohort_sync(
+            user_service.iter_auto_plan_user_pages, run_id, remaining_time=remaining_time
+        )
+        summary = report.to_dict()
+        logger.info(f"Streamed {report.total_users} users with auto plans enabled")
         
         # Log summary
-        logger.info(f"Scheduled meal plan generation complete: {successful_plans} successful, {failed_plans} failed")
+        logger.info(
+            f"Scheduled meal plan generation {'complete' if report.completed else 'paused'}: "
+            f"{report.successful} successful, {report.failed} failed, "
+            f"{report.plans_reused} reused plans, {report.throughput:.1f} users/sec"
+        )
+        logger.info(f"Scheduler stage latency: {json.dumps(summary['stage_latency'])}")
         
         return {
             'statusCode': 200,
             'body': json.dumps({
-                'message': 'Scheduled meal plan generation completed',
-                'successful_plans': successful_plans,
-                'failed_plans': failed_plans,
-                'total_users': len(auto_plan_users)
+                'message': 'Scheduled meal plan generation completed'
+                if report.completed else 'Scheduled meal plan generation paused; will resume from checkpoint',
+                **summary,
             })
         }
         
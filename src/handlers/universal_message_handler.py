@@ -21,22 +21,9 @@ from urllib.parse import quote, unquote_plus
 import boto3
 from botocore.exceptions import ClientError
 
-# Import our domain-organized services with correct class names
-# Analytics & cadence
-from services.analytics.analytics_service import AnalyticsService
-
-from services.nutrition.insights import NutritionInsights
-from services.nutrition.tracker import NutritionTracker
-from services.personalization.preferences import UserPreferencesService
-from services.personalization.goals import HealthGoalsService
-from services.meal_planning.planner import MealPlanningService
-from services.orchestration.next_best_action import NextBestActionService
-from services.messaging.sms import SMSCommunicationService
-from services.messaging.templates import MessageTemplatesService, NutritionMessagingService
-from services.messaging.notifications import NotificationManagementService
-from services.business.subscription import SubscriptionService
-from services.infrastructure.agent import ReasoningAgent
 from services.infrastructure.aws_optimization import get_aws_service, cached_aws_call
+from services.infrastructure.lazy_loading import LazyService
+from services.infrastructure.usage_accounting import flush_usage_after
 
 # Configure logging
 logger = logging.getLogger()
@@ -46,22 +33,32 @@ logger.setLevel(logging.INFO)
 dynamodb = get_aws_service('dynamodb')
 ssm = get_aws_service('ssm')
 
-# Initialize domain services using correct class names
-user_preferences_service = UserPreferencesService(dynamodb)
-nutrition_insights_service = NutritionInsights()
-nutrition_tracker_service = NutritionTracker()
-nutrition_messaging_service = NutritionMessagingService(nutrition_tracker_service)
-health_goals_service = HealthGoalsService()
-meal_planning_service = MealPlanningService(dynamodb, nutrition_insights_service)
-sms_communication_service = SMSCommunicationService()
-message_templates_service = MessageTemplatesService(base=nutrition_messaging_service)
-notification_management_service = NotificationManagementService()
-analytics_service = AnalyticsService()
-next_best_action_service = NextBestActionService()
+# Domain services are imported and constructed on first use to keep cold starts short.
+# UserService has no create_user_profile, get_recent_meal_plans, update_user or
+# update_user_interaction, and AdaptiveMealPlanningService has no format_meal_plan_message.
+user_preferences_service = LazyService("services.personalization.preferences:UserService", dynamodb)
+nutrition_insights_service = LazyService("services.nutrition.insights:ConsolidatedAINutritionService")
+nutrition_tracker_service = LazyService(
+    "services.nutrition.tracker:NutritionTrackingService", user_preferences_service, nutrition_insights_service
+)
+nutrition_messaging_service = LazyService(
+    "services.messaging.templates:NutritionMessagingService", nutrition_tracker_service
+)
+health_goals_service = LazyService("services.personalization.goals:HealthGoalsService")
+meal_planning_service = LazyService(
+    "services.meal_planning.planner:AdaptiveMealPlanningService", dynamodb
+)
+sms_communication_service = LazyService("services.messaging.sms:ConsolidatedMessagingService")
+message_templates_service = LazyService(
+    "services.messaging.templates:MessageTemplatesService", base=nutrition_messaging_service
+)
+notification_management_service = LazyService("services.messaging.notifications:AWSMessagingService")
+analytics_service = LazyService("services.analytics.analytics_service:AnalyticsService")
+next_best_action_service = LazyService("services.orchestration.next_best_action:NextBestActionService")
 
 UNIFIED_ORCHESTRATION_ENABLED = os.getenv("ENABLE_UNIFIED_ORCHESTRATION", "true").lower() not in {"0", "false", "off"}
-subscription_service = SubscriptionService()
-reasoning_agent = ReasoningAgent()
+subscription_service = LazyService("services.business.subscription:SubscriptionService")
+reasoning_agent = LazyService("services.infrastructure.agent:ReasoningAgent")
 
 # Compatibility aliases for existing code
 user_service = user_preferences_service
@@ -74,6 +71,7 @@ multi_user_handler = notification_management_service
 from .async_lambda_wrapper import async_lambda_handler, utils
 
 
+@flush_usage_after
 @async_lambda_handler
 async def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
@@ -25,6 +25,7 @@ from ..services.personalization.preferences import UserPreferencesService
 from ..services.nutrition.insights import NutritionInsights
 from ..services.meal_planning.planner import MealPlanningService
 from ..services.business.subscription import SubscriptionService
+from ..services.infrastructure.usage_accounting import flush_usage_after
 
 # Configure logging
 logger = logging.getLogger()
@@ -50,6 +51,7 @@ consolidated_ai_service = nutrition_insights_service
 ai_service = nutrition_insights_service
 
 
+@flush_usage_after
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Universal Lambda handler for processing messages from any platform
@@ -0,0 +1,112 @@
+"""
+Compiled threat scanning for request validation.
+
+Merges the injection rule families (SQL injection, XSS, path traversal,
+command injection) into one precompiled regular expression with a named
+group per family, so a value is scanned left to right once instead of once
+per rule:
+- Values are case-folded once and the rules are compiled folded, which
+  keeps the regex engine's literal fast paths that IGNORECASE disables
+- Each match reports its family; the scan resumes at that position with the
+  remaining families only, so every family that matches anywhere is found
+  without rescanning earlier text
+- ``first_only`` stops at the first hit for allow/deny decisions
+
+Lowercasing and ``re.IGNORECASE`` only agree on ASCII text (``'ſ'.upper()``
+is ``'S'``; ``'İ'.lower()`` adds a combining dot). Families registered with a
+``non_ascii`` rule keep their original matching for non-ASCII values: the
+value is transformed as the family's rules expect and searched with the
+unfolded rules and the given flags.
+"""
+
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Pattern, Sequence, Tuple
+
+# How a family matches non-ASCII values: (value transform, regex flags)
+NonAsciiRule = Tuple[Callable[[str], str], int]
+
+SQL_INJECTION = "sql_injection"
+XSS = "xss"
+PATH_TRAVERSAL = "path_traversal"
+COMMAND_INJECTION = "command_injection"
+
+
+def fold_pattern(pattern: str) -> str:
+    """Lowercase a regex outside of escape sequences (``\\S`` and ``\\D`` keep their meaning)."""
+    folded = []
+    index = 0
+    while index < len(pattern):
+        if pattern[index] == "\\":
+            folded.append(pattern[index:index + 2])
+            index += 2
+        else:
+            folded.append(pattern[index].lower())
+            index += 1
+    return "".join(folded)
+
+
+def literal_patterns(characters: Iterable[str] = (), substrings: Iterable[str] = ()) -> list:
+    """Rules matching any of ``characters`` or ``substrings`` literally."""
+    patterns = []
+    characters = "".join(re.escape(character) for character in characters)
+    if characters:
+        patterns.append(f"[{characters}]")
+    patterns.extend(re.escape(substring) for substring in substrings)
+    return patterns
+
+
+class ThreatScanner:
+    """Single-pass scanner over named rule families."""
+
+    def __init__(self, rules: Dict[str, Sequence[str]], non_ascii: Optional[Dict[str, NonAsciiRule]] = None):
+        self.families: Tuple[str, ...] = tuple(rules)
+        self._alternatives = {
+            family: "|".join(f"(?:{fold_pattern(pattern)})" for pattern in patterns)
+            for family, patterns in rules.items()
+        }
+        self._non_ascii: Dict[str, Tuple[Callable[[str], str], Pattern]] = {
+            family: (transform, re.compile("|".join(f"(?:{pattern})" for pattern in rules[family]), flags))
+            for family, (transform, flags) in (non_ascii or {}).items()
+        }
+        self._compiled: Dict[Tuple[str, ...], Pattern] = {}
+        self._pattern(self.families)
+
+    def scan(self, value: str, families: Optional[Sequence[str]] = None,
+             first_only: bool = False) -> FrozenSet[str]:
+        """Rule families matching ``value``; at most one with ``first_only``."""
+        remaining = tuple(families) if families is not None else self.families
+        found = set()
+        if self._non_ascii and not value.isascii():
+            for family in remaining:
+                rule = self._non_ascii.get(family)
+                if rule is not None and rule[1].search(rule[0](value)):
+                    found.add(family)
+                    if first_only:
+                        return frozenset(found)
+            remaining = tuple(family for family in remaining if family not in self._non_ascii)
+
+        folded = value.lower()
+        position = 0
+        while remaining:
+            match = self._pattern(remaining).search(folded, position)
+            if match is None:
+                break
+            found.add(match.lastgroup)
+            if first_only:
+                break
+            remaining = tuple(family for family in remaining if family != match.lastgroup)
+            position = match.start()
+        return frozenset(found)
+
+    def is_suspicious(self, value: str, family: str) -> bool:
+        """Whether ``value`` matches a rule of ``family``."""
+        return bool(self.scan(value, (family,), first_only=True))
+
+    def _pattern(self, families: Tuple[str, ...]) -> Pattern:
+        """Combined pattern for a subset of families, compiled on first use."""
+        pattern = self._compiled.get(families)
+        if pattern is None:
+            pattern = self._compiled[families] = re.compile("|".join(
+                f"(?P<{family}>{self._alternatives[family]})" for family in families
+            ))
+        return pattern
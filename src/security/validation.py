@@ -15,12 +15,20 @@ import html
 import bleach
 import validators
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, FrozenSet, List, Optional, Union
 from urllib.parse import urlparse, unquote
 from pydantic import BaseModel, ValidationError, validator
 from fastapi import HTTPException, status
 
 from ..core.exceptions import ValidationError as AppValidationError
+from .threat_scanner import (
+    COMMAND_INJECTION,
+    PATH_TRAVERSAL,
+    SQL_INJECTION,
+    XSS,
+    ThreatScanner,
+    literal_patterns,
+)
 
 
 class ValidationResult(BaseModel):
@@ -47,11 +55,7 @@ class SQLInjectionPatterns:
     @classmethod
     def is_suspicious(cls, value: str) -> bool:
         """Check if value contains SQL injection patterns."""
-        value_upper = value.upper()
-        for pattern in cls.PATTERNS:
-            if re.search(pattern, value_upper, re.IGNORECASE):
-                return True
-        return False
+        return THREAT_SCANNER.is_suspicious(value, SQL_INJECTION)
 
 
 class XSSPatterns:
@@ -77,10 +81,7 @@ class XSSPatterns:
     @classmethod
     def is_suspicious(cls, value: str) -> bool:
         """Check if value contains XSS patterns."""
-        for pattern in cls.PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return THREAT_SCANNER.is_suspicious(value, XSS)
 
 
 class PathTraversalValidator:
@@ -105,10 +106,8 @@ class PathTraversalValidator:
         normalized_path = os.path.normpath(unquote(path))
         
         # Check for dangerous patterns
-        path_lower = normalized_path.lower()
-        for pattern in cls.DANGEROUS_PATTERNS:
-            if re.search(pattern, path_lower, re.IGNORECASE):
-                return False
+        if THREAT_SCANNER.is_suspicious(normalized_path, PATH_TRAVERSAL):
+            return False
         
         # Check if path is within allowed base paths
         if allowed_base_paths:
@@ -142,18 +141,27 @@ class CommandInjectionValidator:
     @classmethod
     def is_safe_command_input(cls, value: str) -> bool:
         """Check if input is safe from command injection."""
-        # Check for dangerous characters
-        for char in cls.DANGEROUS_CHARS:
-            if char in value:
-                return False
-        
-        # Check for dangerous commands
-        value_lower = value.lower()
-        for cmd in cls.DANGEROUS_COMMANDS:
-            if cmd in value_lower:
-                return False
-        
-        return True
+        return not THREAT_SCANNER.is_suspicious(value, COMMAND_INJECTION)
+
+
+# All rule families compiled into one scanner; rules are read at import time
+THREAT_SCANNER = ThreatScanner({
+    SQL_INJECTION: SQLInjectionPatterns.PATTERNS,
+    XSS: XSSPatterns.PATTERNS,
+    PATH_TRAVERSAL: PathTraversalValidator.DANGEROUS_PATTERNS,
+    COMMAND_INJECTION: literal_patterns(
+        CommandInjectionValidator.DANGEROUS_CHARS, CommandInjectionValidator.DANGEROUS_COMMANDS
+    ),
+}, non_ascii={
+    # Matching as the per-rule checks did: command rules are literal substrings
+    # of the lowercased value, which the folded scan already reproduces
+    SQL_INJECTION: (str.upper, re.IGNORECASE),
+    XSS: (str, re.IGNORECASE),
+    PATH_TRAVERSAL: (str.lower, re.IGNORECASE),
+})
+
+# Families checked for free-text input
+TEXT_THREATS = (SQL_INJECTION, XSS, COMMAND_INJECTION)
 
 
 class InputValidator:
@@ -239,25 +247,30 @@ class InputValidator:
     def validate_text_input(self, text: str, max_length: int = 1000, 
                           allow_html: bool = False) -> ValidationResult:
         """Validate general text input."""
-        errors = []
-        
         if text is None:
             return ValidationResult(is_valid=True, sanitized_value="")
         
+        return self._validate_scanned_text(text, THREAT_SCANNER.scan(text, TEXT_THREATS), max_length, allow_html)
+    
+    def _validate_scanned_text(self, text: str, threats: FrozenSet[str], max_length: int = 1000,
+                               allow_html: bool = False) -> ValidationResult:
+        """Validate text input given its threat scan result."""
+        errors = []
+        
         # Length check
         if len(text) > max_length:
             errors.append(f"Text too long (max {max_length} characters)")
         
         # Check for SQL injection
-        if SQLInjectionPatterns.is_suspicious(text):
+        if SQL_INJECTION in threats:
             errors.append("Text contains suspicious SQL patterns")
         
         # Check for XSS
-        if XSSPatterns.is_suspicious(text):
+        if XSS in threats:
             errors.append("Text contains suspicious script patterns")
         
         # Check for command injection
-        if not CommandInjectionValidator.is_safe_command_input(text):
+        if COMMAND_INJECTION in threats:
             errors.append("Text contains suspicious command patterns")
         
         # Sanitize
@@ -424,16 +437,19 @@ class SecurityValidator:
         # Additional security validation
         for key, value in data.items():
             if isinstance(value, str):
+                # Scan once for every family checked below
+                threats = THREAT_SCANNER.scan(value, TEXT_THREATS)
+                
                 # Check for common injection patterns
-                if SQLInjectionPatterns.is_suspicious(value):
+                if SQL_INJECTION in threats:
                     errors.append(f"Field '{key}' contains suspicious SQL patterns")
                 
-                if XSSPatterns.is_suspicious(value):
+                if XSS in threats:
                     errors.append(f"Field '{key}' contains suspicious script patterns")
                 
                 # Sanitize string values
                 if key not in sanitized_data:
-                    result = self.input_validator.validate_text_input(value)
+                    result = self.input_validator._validate_scanned_text(value, threats)
                     if not result.is_valid:
                         errors.extend([f"{key}: {error}" for error in result.errors])
                     else:
@@ -0,0 +1,195 @@
+"""
+Bedrock Invocation Dispatcher
+Coalesces identical in-flight prompts, gathers requests into short
+micro-batch windows and caps concurrent invocations per model
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingInvocation:
+    """A distinct prompt waiting for its batch to be dispatched"""
+    key: str
+    prompt: str
+    model_config: Any
+    params: Dict[str, Any]
+    future: asyncio.Future
+
+
+class BedrockDispatcher:
+    """
+    Dispatch layer in front of synchronous Bedrock invocations
+
+    Requests for the same model, prompt and parameters share one invocation
+    while it is pending or in flight. New prompts are collected for
+    ``batch_window_seconds`` (or until ``max_batch_size``) and dispatched
+    together on worker threads, at most ``max_concurrency_per_model`` at a
+    time per model, so the event loop never blocks on the Bedrock client.
+    A batch for a model whose circuit breaker is open fails fast with None.
+    """
+
+    def __init__(
+        self,
+        invoke: Callable[[str, Any, Dict[str, Any]], Optional[str]],
+        is_circuit_open: Callable[[str], bool],
+        batch_window_seconds: float = 0.005,
+        max_batch_size: int = 16,
+        max_concurrency_per_model: int = 8
+    ):
+        """
+        Args:
+            invoke: Blocking call performing one model invocation
+            is_circuit_open: Circuit breaker check by model id
+            batch_window_seconds: How long to collect requests before dispatching
+            max_batch_size: Dispatch early once this many distinct prompts wait
+            max_concurrency_per_model: Maximum invocations in flight per model
+        """
+        self._invoke = invoke
+        self._is_circuit_open = is_circuit_open
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
+        self.max_concurrency_per_model = max_concurrency_per_model
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._batches: Dict[str, List[_PendingInvocation]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._running: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            'requests': 0,
+            'coalesced': 0,
+            'invocations': 0,
+            'batches': 0,
+            'circuit_rejections': 0,
+            'max_concurrent': 0
+        }
+
+    async def dispatch(self, prompt: str, model_config: Any, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the model's response to a prompt, sharing identical in-flight requests
+
+        Returns:
+            Generated text, or None if the invocation failed or the circuit is open
+        """
+        self._bind_loop()
+        self.stats['requests'] += 1
+        model_id = model_config.model_id
+        key = self._request_key(model_id, prompt, params)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        if self._is_circuit_open(model_id):
+            self.stats['circuit_rejections'] += 1
+            return None
+
+        future = self._loop.create_future()
+        self._inflight[key] = future
+        batch = self._batches.setdefault(model_id, [])
+        batch.append(_PendingInvocation(key, prompt, model_config, params, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(model_id)
+        elif len(batch) == 1:
+            self._timers[model_id] = self._loop.call_later(self.batch_window_seconds, self._flush, model_id)
+
+        return await asyncio.shield(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatch statistics"""
+        requests = self.stats['requests']
+        return {
+            **self.stats,
+            'coalescing_rate': self.stats['coalesced'] / requests if requests else 0.0,
+            'avg_batch_size': self.stats['invocations'] / self.stats['batches'] if self.stats['batches'] else 0.0,
+            'pending': sum(len(batch) for batch in self._batches.values()),
+            'in_flight': dict(self._running)
+        }
+
+    def _flush(self, model_id: str) -> None:
+        """Dispatch the pending batch of a model"""
+        timer = self._timers.pop(model_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(model_id, [])
+        if not batch:
+            return
+
+        self.stats['batches'] += 1
+        if self._is_circuit_open(model_id):
+            # Breaker opened while the batch was collecting
+            self.stats['circuit_rejections'] += len(batch)
+            for pending in batch:
+                self._complete(pending, None)
+            return
+
+        for pending in batch:
+            task = self._loop.create_task(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: _PendingInvocation) -> None:
+        """Invoke the model for one distinct prompt within the model's concurrency cap"""
+        model_id = pending.model_config.model_id
+        semaphore = self._semaphores.get(model_id)
+        if semaphore is None:
+            semaphore = self._semaphores[model_id] = asyncio.Semaphore(self.max_concurrency_per_model)
+
+        result = None
+        try:
+            async with semaphore:
+                # Earlier invocations in the batch may have opened the breaker
+                if self._is_circuit_open(model_id):
+                    self.stats['circuit_rejections'] += 1
+                    return
+
+                self._running[model_id] = self._running.get(model_id, 0) + 1
+                self.stats['max_concurrent'] = max(self.stats['max_concurrent'], self._running[model_id])
+                self.stats['invocations'] += 1
+                try:
+                    result = await asyncio.to_thread(
+                        self._invoke, pending.prompt, pending.model_config, pending.params
+                    )
+                finally:
+                    self._running[model_id] -= 1
+        except Exception as e:
+            logger.error(f"Dispatch error for {model_id}: {e}")
+        finally:
+            self._complete(pending, result)
+
+    def _complete(self, pending: _PendingInvocation, result: Optional[str]) -> None:
+        """Resolve every request waiting on a prompt"""
+        self._inflight.pop(pending.key, None)
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    def _bind_loop(self) -> None:
+        """Reset loop-bound state when called from a new event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._inflight.clear()
+            self._batches.clear()
+            self._timers.clear()
+            self._semaphores.clear()
+            self._running.clear()
+            self._tasks.clear()
+
+    @staticmethod
+    def _request_key(model_id: str, prompt: str, params: Dict[str, Any]) -> str:
+        """Identify requests that would produce the same invocation"""
+        payload = json.dumps([model_id, prompt, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
@@ -14,10 +14,21 @@ import logging
 
 from ...config.ai_config import ai_config, AIModel
 from .prompt_engine import prompt_engine
+from .dispatcher import BedrockDispatcher
 from ..infrastructure.caching import AdvancedCachingService
+from ..knowledge.semantic_cache import profile_scope, semantic_response_cache
 
 logger = logging.getLogger(__name__)
 
+# Template variable holding the user's input, the only part of a prompt compared by
+# similarity; templates not listed are served from the exact-match cache only
+SEMANTIC_QUERY_VARIABLES = {
+    'quick_nutrition_qa': 'question',
+    'nutrition_analysis_fast': 'food_item',
+    'recipe_suggestion_creative': 'ingredients',
+    'ingredient_substitution': 'ingredient',
+}
+
 
 class EnhancedAIService:
     """
@@ -38,6 +49,9 @@ class EnhancedAIService:
             logger.warning(f"Failed to initialize caching service: {e}")
             self.caching_service = None
         
+        # Similar-prompt response cache shared by all Bedrock entry points
+        self.semantic_cache = semantic_response_cache
+        
         # Performance tracking
         self.performance_metrics = {
             'requests_total': 0,
@@ -55,6 +69,9 @@ class EnhancedAIService:
         # Request queue for batch processing
         self.request_queue = []
         self.batch_processing_enabled = True
+        
+        # Coalesces identical prompts and micro-batches invocations per model
+        self.dispatcher = BedrockDispatcher(self._invoke_model_sync, self._is_circuit_breaker_open)
     
     async def generate_nutrition_response(self, request_type: str, user_input: Dict[str, Any], 
                                         user_profile: Optional[Dict[str, Any]] = None,
@@ -87,6 +104,17 @@ class EnhancedAIService:
                 self.performance_metrics['requests_cached'] += 1
                 return self._format_response(cached_response, cached=True, response_time=time.time() - start_time)
             
+            # Then a response to a similar question asked through the same template
+            semantic_scope = profile_scope(user_profile)
+            query_variable = SEMANTIC_QUERY_VARIABLES.get(template_name)
+            query = str(user_input[query_variable]) if query_variable in user_input else None
+            semantic_hit = query is not None and self.semantic_cache.lookup(
+                prompt, template_name, semantic_scope, query=query
+            )
+            if semantic_hit:
+                self.performance_metrics['requests_cached'] += 1
+                return self._format_response(semantic_hit.response, cached=True, response_time=time.time() - start_time)
+            
             # Optimize prompt for selected model
             optimized_prompt = prompt_engine.optimize_prompt_for_model(prompt, model_config.model_id)
             
@@ -101,6 +129,9 @@ class EnhancedAIService:
             if response:
                 # Cache successful response
                 await self._cache_response(cache_key, response, template.cache_ttl_hours)
+                if query is not None:
+                    self.semantic_cache.store(prompt, response, template_name, ttl_seconds=template.cache_ttl_hours * 3600,
+                                              scope=semantic_scope, query=query)
                 
                 # Track performance
                 response_time = time.time() - start_time
@@ -150,12 +181,22 @@ class EnhancedAIService:
                           params: Dict[str, Any]) -> Optional[str]:
         """
         Invoke specific AI model with error handling and circuit breaker
+        Identical concurrent prompts share one invocation through the dispatcher
+        """
+        # Check circuit breaker
+        if self._is_circuit_breaker_open(model_config.model_id):
+            return None
+        
+        if not self.batch_processing_enabled:
+            return self._invoke_model_sync(prompt, model_config, params)
+        return await self.dispatcher.dispatch(prompt, model_config, params)
+    
+    def _invoke_model_sync(self, prompt: str, model_config: Any,
+                           params: Dict[str, Any]) -> Optional[str]:
+        """
+        Perform one blocking Bedrock invocation, updating the circuit breaker
         """
         try:
-            # Check circuit breaker
-            if self._is_circuit_breaker_open(model_config.model_id):
-                return None
-            
             # Prepare request based on model type
             if 'claude' in model_config.model_id:
                 body = self._prepare_claude_request(prompt, params)
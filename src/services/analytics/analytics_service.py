@@ -71,8 +71,12 @@ except ImportError:
         InventoryStateRecordedEvent
     )
 
+from .event_buffer import ColumnarEventBuffer, epoch_seconds
+
 logger = logging.getLogger(__name__)
 
+SUBSCRIPTION_EVENT_TYPES = (EventType.SUBSCRIBE_ACTIVATED, EventType.CHURNED)
+
 
 class AnalyticsService:
     """Core analytics service with privacy controls."""
@@ -86,10 +90,17 @@ class AnalyticsService:
         self.event_history: Dict[UUID, Dict[EventType, datetime]] = defaultdict(dict)
         self._recent_events: Dict[UUID, deque] = defaultdict(lambda: deque(maxlen=50))
         
+        # Columnar history with incremental per-day aggregates for dashboard queries;
+        # unlike ``events`` it outlives warehouse flushes; both it and ``subscription_events``
+        # are trimmed to the retention window on every flush
+        self.event_buffer = ColumnarEventBuffer()
+        self.subscription_events: List[BaseEvent] = []
+        
         # Configuration
         self.batch_size = 100
         self.flush_interval_seconds = 60
         self.consent_cache_ttl = 300  # 5 minutes
+        self.event_buffer_retention_days = 90  # longest cohort window
         
         # Background tasks
         self._background_tasks: Set[asyncio.Task] = set()
@@ -220,6 +231,9 @@ class AnalyticsService:
             
             # Store event
             self.events.append(event)
+            self.event_buffer.append(event.timestamp, event.event_type, event.user_id)
+            if event.event_type in SUBSCRIPTION_EVENT_TYPES:
+                self.subscription_events.append(event)
 
             # Update user profile
             if event.user_id:
@@ -330,9 +344,25 @@ class AnalyticsService:
             profile.subscription_start = event.timestamp
             if "price_usd" in event.properties:
                 profile.ltv_usd += event.properties["price_usd"]
+        
+        self.event_buffer.update_user(
+            profile.user_id,
+            created_at=profile.created_at,
+            last_active_at=profile.last_active_at,
+            plans_generated=profile.total_plans_generated,
+            meals_logged=profile.total_meals_logged,
+            ltv_usd=profile.ltv_usd,
+            tier=profile.current_tier,
+        )
     
     async def _flush_events_to_warehouse(self):
         """Flush events to data warehouse."""
+        cutoff = self.event_buffer.retention_cutoff(self.event_buffer_retention_days)
+        if cutoff is not None:
+            self.event_buffer.retain_days(self.event_buffer_retention_days)
+            self.subscription_events[:] = [
+                event for event in self.subscription_events if epoch_seconds(event.timestamp) >= cutoff
+            ]
         if not self.events:
             return
         
@@ -773,19 +803,8 @@ class AnalyticsService:
         end_time: Optional[datetime] = None
     ) -> Dict[EventType, int]:
         """Get event counts by type."""
-        events = self.events
-        
-        if start_time:
-            events = [e for e in events if e.timestamp >= start_time]
-        
-        if end_time:
-            events = [e for e in events if e.timestamp <= end_time]
-        
-        counts = {}
-        for event in events:
-            counts[event.event_type] = counts.get(event.event_type, 0) + 1
-        
-        return counts
+        counts = self.event_buffer.event_counts_by_type(start_time, end_time)
+        return {EventType(event_type): count for event_type, count in counts.items()}
     
     async def cleanup(self):
         """Cleanup resources."""
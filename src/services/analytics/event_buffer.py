@@ -0,0 +1,443 @@
+"""Columnar event storage for analytics queries.
+
+Events are kept as array-backed columns (timestamp, user code, event type code)
+partitioned by UTC day. Each day also maintains per-user activity aggregates
+(event count and a bitmask of event types seen) as events are ingested, so
+funnel, cohort and event-count queries run as vectorized NumPy operations over
+day buckets instead of rescanning event objects.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# Subscription tier codes stored in the user columns
+TIER_FREE = 0
+TIER_PLUS = 1
+TIER_PRO = 2
+TIER_OTHER = 3
+_TIER_CODES = {None: TIER_FREE, "free": TIER_FREE, "plus": TIER_PLUS, "pro": TIER_PRO}
+
+
+def epoch_seconds(timestamp: datetime) -> float:
+    """Convert a datetime to epoch seconds, reading naive datetimes as UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    """Return ``array`` with capacity for at least ``needed`` elements."""
+    if needed <= len(array):
+        return array
+    grown = np.empty(max(needed, len(array) * 2, 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _event_type_key(event_type: Any) -> str:
+    """Normalize an event type enum member or string to its value."""
+    return getattr(event_type, "value", event_type)
+
+
+@dataclass
+class DailyActivity:
+    """Per-(user, day) activity rows for a time window."""
+    users: np.ndarray       # int64 user codes
+    days: np.ndarray        # int64 days since epoch (UTC)
+    counts: np.ndarray      # int64 events per user and day
+    type_masks: np.ndarray  # int64 bitmask of event type codes seen
+
+
+@dataclass
+class UserColumns:
+    """Per-user profile columns indexed by user code."""
+    created_at: np.ndarray      # epoch seconds
+    last_active_at: np.ndarray  # epoch seconds, NaN if never active
+    plans_generated: np.ndarray
+    meals_logged: np.ndarray
+    ltv_usd: np.ndarray
+    tier: np.ndarray            # TIER_* codes
+
+
+class _DayPartition:
+    """Columns and per-user activity aggregates for a single UTC day."""
+
+    __slots__ = (
+        "timestamps", "users", "types", "size", "min_ts", "max_ts", "type_counts",
+        "activity_users", "activity_counts", "activity_masks", "activity_size", "_activity_index",
+    )
+
+    def __init__(self):
+        self.timestamps = np.empty(64, dtype=np.float64)
+        self.users = np.empty(64, dtype=np.int32)
+        self.types = np.empty(64, dtype=np.int8)
+        self.size = 0
+        self.min_ts = math.inf
+        self.max_ts = -math.inf
+        self.type_counts = np.zeros(0, dtype=np.int64)
+
+        self.activity_users = np.empty(16, dtype=np.int64)
+        self.activity_counts = np.empty(16, dtype=np.int64)
+        self.activity_masks = np.empty(16, dtype=np.int64)
+        self.activity_size = 0
+        # user code -> activity row; rebuilt lazily after bulk merges
+        self._activity_index: Optional[Dict[int, int]] = {}
+
+    def append(self, ts: float, user: int, type_code: int) -> None:
+        """Append one event and update the day's aggregates."""
+        index = self.size
+        self.timestamps = _grow(self.timestamps, index + 1)
+        self.users = _grow(self.users, index + 1)
+        self.types = _grow(self.types, index + 1)
+        self.timestamps[index] = ts
+        self.users[index] = user
+        self.types[index] = type_code
+        self.size = index + 1
+        self.min_ts = min(self.min_ts, ts)
+        self.max_ts = max(self.max_ts, ts)
+
+        if type_code >= len(self.type_counts):
+            self.type_counts = np.concatenate(
+                [self.type_counts, np.zeros(type_code + 1 - len(self.type_counts), dtype=np.int64)]
+            )
+        self.type_counts[type_code] += 1
+
+        if user < 0:
+            return
+        if self._activity_index is None:
+            self._activity_index = {
+                int(code): row for row, code in enumerate(self.activity_users[:self.activity_size])
+            }
+        row = self._activity_index.get(user)
+        if row is None:
+            row = self.activity_size
+            self.activity_users = _grow(self.activity_users, row + 1)
+            self.activity_counts = _grow(self.activity_counts, row + 1)
+            self.activity_masks = _grow(self.activity_masks, row + 1)
+            self.activity_users[row] = user
+            self.activity_counts[row] = 0
+            self.activity_masks[row] = 0
+            self.activity_size = row + 1
+            self._activity_index[user] = row
+        self.activity_counts[row] += 1
+        self.activity_masks[row] |= 1 << type_code
+
+    def extend(self, timestamps: np.ndarray, users: np.ndarray, types: np.ndarray) -> None:
+        """Append a batch of events and merge them into the day's aggregates."""
+        count = len(timestamps)
+        if count == 0:
+            return
+        end = self.size + count
+        self.timestamps = _grow(self.timestamps, end)
+        self.users = _grow(self.users, end)
+        self.types = _grow(self.types, end)
+        self.timestamps[self.size:end] = timestamps
+        self.users[self.size:end] = users
+        self.types[self.size:end] = types
+        self.size = end
+        self.min_ts = min(self.min_ts, float(timestamps.min()))
+        self.max_ts = max(self.max_ts, float(timestamps.max()))
+
+        batch_counts = np.bincount(types.astype(np.int64))
+        if len(batch_counts) > len(self.type_counts):
+            self.type_counts = np.concatenate(
+                [self.type_counts, np.zeros(len(batch_counts) - len(self.type_counts), dtype=np.int64)]
+            )
+        self.type_counts[:len(batch_counts)] += batch_counts
+
+        known = users >= 0
+        merged_users, merged_counts, merged_masks = _aggregate_activity(
+            np.concatenate([self.activity_users[:self.activity_size], users[known].astype(np.int64)]),
+            np.concatenate([self.activity_counts[:self.activity_size], np.ones(int(known.sum()), dtype=np.int64)]),
+            np.concatenate([self.activity_masks[:self.activity_size], np.left_shift(1, types[known].astype(np.int64))]),
+        )
+        self.activity_users = merged_users
+        self.activity_counts = merged_counts
+        self.activity_masks = merged_masks
+        self.activity_size = len(merged_users)
+        self._activity_index = None
+
+    def activity(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the day's (users, counts, type masks) aggregate rows."""
+        size = self.activity_size
+        return self.activity_users[:size], self.activity_counts[:size], self.activity_masks[:size]
+
+    def window_rows(self, start_ts: float, end_ts: float) -> np.ndarray:
+        """Get a boolean mask of the day's events inside ``[start_ts, end_ts]``."""
+        timestamps = self.timestamps[:self.size]
+        return (timestamps >= start_ts) & (timestamps <= end_ts)
+
+
+def _aggregate_activity(
+    users: np.ndarray,
+    counts: np.ndarray,
+    masks: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Collapse activity rows to one row per user."""
+    if len(users) == 0:
+        return users, counts, masks
+    unique_users, inverse = np.unique(users, return_inverse=True)
+    merged_counts = np.bincount(inverse, weights=counts, minlength=len(unique_users)).astype(np.int64)
+    merged_masks = np.zeros(len(unique_users), dtype=np.int64)
+    np.bitwise_or.at(merged_masks, inverse, masks)
+    return unique_users, merged_counts, merged_masks
+
+
+class ColumnarEventBuffer:
+    """Day-partitioned columnar event store with incremental per-user aggregates."""
+
+    def __init__(self):
+        self._days: Dict[int, _DayPartition] = {}
+        self._type_codes: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._user_codes: Dict[Hashable, int] = {}
+        self._user_ids: List[Hashable] = []
+        self._event_count = 0
+
+        capacity = 1024
+        self._created_at = np.empty(capacity, dtype=np.float64)
+        self._last_active_at = np.empty(capacity, dtype=np.float64)
+        self._plans_generated = np.empty(capacity, dtype=np.int64)
+        self._meals_logged = np.empty(capacity, dtype=np.int64)
+        self._ltv_usd = np.empty(capacity, dtype=np.float64)
+        self._tier = np.empty(capacity, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return self._event_count
+
+    @property
+    def user_count(self) -> int:
+        """Number of users with a code assigned."""
+        return len(self._user_ids)
+
+    def type_code(self, event_type: Any) -> int:
+        """Get (assigning if needed) the code for an event type."""
+        key = _event_type_key(event_type)
+        code = self._type_codes.get(key)
+        if code is None:
+            code = len(self._type_names)
+            if code >= 63:
+                raise ValueError("Columnar event buffer supports at most 63 event types")
+            self._type_codes[key] = code
+            self._type_names.append(key)
+        return code
+
+    def type_bit(self, event_type: Any) -> int:
+        """Get the activity mask bit for an event type (0 if never seen)."""
+        code = self._type_codes.get(_event_type_key(event_type))
+        return 0 if code is None else 1 << code
+
+    def user_code(self, user_id: Hashable) -> int:
+        """Get (assigning if needed) the code for a user."""
+        code = self._user_codes.get(user_id)
+        if code is None:
+            code = len(self._user_ids)
+            self._user_codes[user_id] = code
+            self._user_ids.append(user_id)
+            self._reserve_users(code + 1)
+            self._created_at[code] = np.nan
+            self._last_active_at[code] = np.nan
+            self._plans_generated[code] = 0
+            self._meals_logged[code] = 0
+            self._ltv_usd[code] = 0.0
+            self._tier[code] = TIER_FREE
+        return code
+
+    def user_id(self, code: int) -> Hashable:
+        """Get the user identifier for a code."""
+        return self._user_ids[code]
+
+    def append(self, timestamp: datetime, event_type: Any, user_id: Optional[Hashable] = None) -> None:
+        """Ingest a single event."""
+        ts = epoch_seconds(timestamp)
+        day = int(ts // SECONDS_PER_DAY)
+        partition = self._days.get(day)
+        if partition is None:
+            partition = self._days[day] = _DayPartition()
+        user = self.user_code(user_id) if user_id is not None else -1
+        partition.append(ts, user, self.type_code(event_type))
+        self._event_count += 1
+
+    def extend(
+        self,
+        timestamps: Sequence[float],
+        event_types: Sequence[Any],
+        user_ids: Sequence[Optional[Hashable]]
+    ) -> None:
+        """
+        Ingest a batch of events, e.g. when backfilling from the warehouse.
+
+        Args:
+            timestamps: Event times as epoch seconds
+            event_types: Event type enum members or values
+            user_ids: User identifiers (None for anonymous events)
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) == 0:
+            return
+
+        type_values, type_inverse = np.unique(
+            np.asarray([_event_type_key(t) for t in event_types], dtype=object), return_inverse=True
+        )
+        type_lookup = np.array([self.type_code(value) for value in type_values], dtype=np.int8)
+        types = type_lookup[type_inverse]
+
+        user_array = np.asarray(user_ids, dtype=object)
+        anonymous = np.array([user is None for user in user_array], dtype=bool)
+        users = np.full(len(timestamps), -1, dtype=np.int32)
+        if not anonymous.all():
+            unique_users, user_inverse = np.unique(user_array[~anonymous], return_inverse=True)
+            user_lookup = np.array([self.user_code(user) for user in unique_users], dtype=np.int32)
+            users[~anonymous] = user_lookup[user_inverse]
+
+        days = np.floor_divide(timestamps, SECONDS_PER_DAY).astype(np.int64)
+        order = np.argsort(days, kind="stable")
+        sorted_days = days[order]
+        boundaries = np.flatnonzero(np.diff(sorted_days)) + 1
+        for chunk in np.split(order, boundaries):
+            day = int(days[chunk[0]])
+            partition = self._days.get(day)
+            if partition is None:
+                partition = self._days[day] = _DayPartition()
+            partition.extend(timestamps[chunk], users[chunk], types[chunk])
+        self._event_count += len(timestamps)
+
+    def update_user(
+        self,
+        user_id: Hashable,
+        created_at: Optional[datetime],
+        last_active_at: Optional[datetime],
+        plans_generated: int,
+        meals_logged: int,
+        ltv_usd: float,
+        tier: Optional[str]
+    ) -> None:
+        """Mirror a user's profile fields into the user columns."""
+        code = self.user_code(user_id)
+        self._created_at[code] = epoch_seconds(created_at) if created_at else np.nan
+        self._last_active_at[code] = epoch_seconds(last_active_at) if last_active_at else np.nan
+        self._plans_generated[code] = plans_generated
+        self._meals_logged[code] = meals_logged
+        self._ltv_usd[code] = ltv_usd
+        self._tier[code] = _TIER_CODES.get(tier, TIER_OTHER)
+
+    def user_columns(self) -> UserColumns:
+        """Get read-only views of the user columns."""
+        size = self.user_count
+        return UserColumns(
+            created_at=self._created_at[:size],
+            last_active_at=self._last_active_at[:size],
+            plans_generated=self._plans_generated[:size],
+            meals_logged=self._meals_logged[:size],
+            ltv_usd=self._ltv_usd[:size],
+            tier=self._tier[:size],
+        )
+
+    def daily_activity(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> DailyActivity:
+        """
+        Get per-(user, day) activity for events inside ``[start, end]``.
+
+        Days fully inside the window use the incrementally maintained
+        aggregates; only the partial days at the window edges are
+        aggregated from their raw columns.
+        """
+        start_ts, end_ts = self._window(start, end)
+        users, days, counts, masks = [], [], [], []
+        for day, partition in self._partitions(start_ts, end_ts):
+            if start_ts <= partition.min_ts and partition.max_ts <= end_ts:
+                day_users, day_counts, day_masks = partition.activity()
+            else:
+                rows = partition.window_rows(start_ts, end_ts) & (partition.users[:partition.size] >= 0)
+                day_users, day_counts, day_masks = _aggregate_activity(
+                    partition.users[:partition.size][rows].astype(np.int64),
+                    np.ones(int(rows.sum()), dtype=np.int64),
+                    np.left_shift(1, partition.types[:partition.size][rows].astype(np.int64)),
+                )
+            users.append(day_users)
+            counts.append(day_counts)
+            masks.append(day_masks)
+            days.append(np.full(len(day_users), day, dtype=np.int64))
+
+        if not users:
+            empty = np.zeros(0, dtype=np.int64)
+            return DailyActivity(empty, empty, empty, empty)
+        return DailyActivity(
+            users=np.concatenate(users),
+            days=np.concatenate(days),
+            counts=np.concatenate(counts),
+            type_masks=np.concatenate(masks),
+        )
+
+    def event_counts_by_type(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict[str, int]:
+        """Count events per event type value inside ``[start, end]``."""
+        start_ts, end_ts = self._window(start, end)
+        totals = np.zeros(len(self._type_names), dtype=np.int64)
+        for _, partition in self._partitions(start_ts, end_ts):
+            if start_ts <= partition.min_ts and partition.max_ts <= end_ts:
+                totals[:len(partition.type_counts)] += partition.type_counts
+            else:
+                rows = partition.window_rows(start_ts, end_ts)
+                day_counts = np.bincount(partition.types[:partition.size][rows].astype(np.int64))
+                totals[:len(day_counts)] += day_counts
+        return {self._type_names[code]: int(count) for code, count in enumerate(totals) if count}
+
+    def retention_cutoff(self, days: int) -> Optional[float]:
+        """Epoch seconds from which ``retain_days(days)`` keeps events (None when empty)."""
+        if not self._days:
+            return None
+        return float((max(self._days) - days + 1) * SECONDS_PER_DAY)
+
+    def retain_days(self, days: int) -> int:
+        """
+        Drop day partitions older than the newest ``days`` UTC days of events.
+
+        The window is anchored at the newest ingested day rather than the
+        clock, so backfilled history is kept the same way as live events.
+        User codes and columns are kept. Returns the number of events dropped.
+        """
+        if not self._days:
+            return 0
+        cutoff = max(self._days) - days + 1
+        dropped = 0
+        for day in [day for day in self._days if day < cutoff]:
+            dropped += self._days.pop(day).size
+        self._event_count -= dropped
+        return dropped
+
+    def clear(self) -> None:
+        """Drop all events and user columns."""
+        self.__init__()
+
+    def _window(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[float, float]:
+        """Convert optional window bounds to epoch seconds."""
+        return (
+            epoch_seconds(start) if start is not None else -math.inf,
+            epoch_seconds(end) if end is not None else math.inf,
+        )
+
+    def _partitions(self, start_ts: float, end_ts: float):
+        """Yield ``(day, partition)`` for days overlapping the window, in day order."""
+        first_day = -math.inf if math.isinf(start_ts) else start_ts // SECONDS_PER_DAY
+        last_day = math.inf if math.isinf(end_ts) else end_ts // SECONDS_PER_DAY
+        for day in sorted(self._days):
+            if first_day <= day <= last_day:
+                yield day, self._days[day]
+
+    def _reserve_users(self, needed: int) -> None:
+        """Grow the user columns to hold ``needed`` users."""
+        if needed <= len(self._created_at):
+            return
+        self._created_at = _grow(self._created_at, needed)
+        self._last_active_at = _grow(self._last_active_at, needed)
+        self._plans_generated = _grow(self._plans_generated, needed)
+        self._meals_logged = _grow(self._meals_logged, needed)
+        self._ltv_usd = _grow(self._ltv_usd, needed)
+        self._tier = _grow(self._tier, needed)
@@ -13,6 +13,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+import numpy as np
+
+from .event_buffer import SECONDS_PER_DAY, TIER_FREE, TIER_PLUS, TIER_PRO
+
 try:
     from ...models.analytics import (
         EventType,
@@ -80,78 +84,61 @@ class WarehouseProcessor:
                 return cached
         
         try:
-            # Get all events in period
-            events = [
-                e for e in self.analytics_service.events
-                if start_date <= e.timestamp <= end_date
-            ]
-            
-            # Group events by user
-            user_events = defaultdict(list)
-            for event in events:
-                if event.user_id:
-                    user_events[event.user_id].append(event)
-            
-            # Calculate funnel steps
-            registered_users = set()
-            completed_onboarding = set()
-            generated_first_plan = set()
-            logged_first_meal = set()
-            active_day_7 = set()
-            active_day_30 = set()
-            
-            for user_id, user_event_list in user_events.items():
-                user_event_types = {e.event_type for e in user_event_list}
-                user_timestamps = {e.event_type: e.timestamp for e in user_event_list}
-                
-                # Registration (implied by having any events)
-                registered_users.add(user_id)
-                
-                # Onboarding completion
-                if EventType.ONBOARDING_COMPLETED in user_event_types:
-                    completed_onboarding.add(user_id)
-                
-                # First plan generation
-                if EventType.PLAN_GENERATED in user_event_types:
-                    generated_first_plan.add(user_id)
-                
-                # First meal logged
-                if EventType.MEAL_LOGGED in user_event_types:
-                    logged_first_meal.add(user_id)
-                
-                # 7-day activity (check if user was active within 7 days of registration)
-                first_event_time = min(e.timestamp for e in user_event_list)
-                seven_day_cutoff = first_event_time + timedelta(days=7)
-                recent_events = [e for e in user_event_list if e.timestamp <= seven_day_cutoff]
-                if len(recent_events) >= 3:  # Active = 3+ events in first 7 days
-                    active_day_7.add(user_id)
-                
-                # 30-day activity
-                thirty_day_cutoff = first_event_time + timedelta(days=30)
-                if thirty_day_cutoff <= datetime.now(timezone.utc):
-                    recent_events_30 = [e for e in user_event_list if e.timestamp <= thirty_day_cutoff]
-                    if len(recent_events_30) >= 5:  # Active = 5+ events in first 30 days
-                        active_day_30.add(user_id)
+            buffer = self.analytics_service.event_buffer
+            activity = buffer.daily_activity(start_date, end_date)
+            users, days, counts = activity.users, activity.days, activity.counts
+            user_count = buffer.user_count
+            
+            def users_with(event_type: EventType) -> int:
+                bit = buffer.type_bit(event_type)
+                if not bit:
+                    return 0
+                hits = np.bincount(users[(activity.type_masks & bit) != 0], minlength=user_count)
+                return int(np.count_nonzero(hits))
+            
+            # Registration (implied by having any events in the period)
+            registered = np.bincount(users, minlength=user_count) > 0
+            
+            # Activity windows are measured in whole UTC days from the user's
+            # first active day in the period: a 7-day window is days 0-6
+            first_day = np.full(user_count, np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(first_day, users, days)
+            day_offset = days - first_day[users]
+            
+            def events_within(window_days: int) -> np.ndarray:
+                in_window = day_offset < window_days
+                return np.bincount(users[in_window], weights=counts[in_window], minlength=user_count)
+            
+            # 7-day activity: 3+ events in first 7 days
+            active_day_7 = int(np.count_nonzero(events_within(7) >= 3))
+            
+            # 30-day activity: 5+ events in first 30 days, once 30 days have passed
+            today = datetime.now(timezone.utc).timestamp() // SECONDS_PER_DAY
+            active_day_30 = int(np.count_nonzero((events_within(30) >= 5) & (first_day <= today - 30)))
+            
+            completed_onboarding = users_with(EventType.ONBOARDING_COMPLETED)
+            generated_first_plan = users_with(EventType.PLAN_GENERATED)
+            logged_first_meal = users_with(EventType.MEAL_LOGGED)
             
             # Calculate conversion rates
-            total_registered = len(registered_users)
+            total_registered = int(np.count_nonzero(registered))
             
             funnel_metrics = FunnelMetrics(
                 period_start=start_date,
                 period_end=end_date,
                 registered_users=total_registered,
-                completed_onboarding=len(completed_onboarding),
-                generated_first_plan=len(generated_first_plan),
-                logged_first_meal=len(logged_first_meal),
-                active_day_7=len(active_day_7),
-                active_day_30=len(active_day_30),
+                completed_onboarding=completed_onboarding,
+                generated_first_plan=generated_first_plan,
+                logged_first_meal=logged_first_meal,
+                active_day_7=active_day_7,
+                active_day_30=active_day_30,
                 
                 # Conversion rates
-                onboarding_rate=len(completed_onboarding) / max(total_registered, 1),
-                first_plan_rate=len(generated_first_plan) / max(total_registered, 1),
-                first_meal_rate=len(logged_first_meal) / max(total_registered, 1),
-                d7_activation_rate=len(active_day_7) / max(total_registered, 1),
-                d30_retention_rate=len(active_day_30) / max(total_registered, 1)
+                onboarding_rate=completed_onboarding / max(total_registered, 1),
+                first_plan_rate=generated_first_plan / max(total_registered, 1),
+                first_meal_rate=logged_first_meal / max(total_registered, 1),
+                d7_activation_rate=active_day_7 / max(total_registered, 1),
+                d30_retention_rate=active_day_30 / max(total_registered, 1)
             )
             
             # Cache result
@@ -193,15 +180,10 @@ class WarehouseProcessor:
                 cohort_end = datetime(year, month + 1, 1, tzinfo=timezone.utc)
             
             # Find cohort users (users who registered in this month)
-            cohort_users = set()
-            registration_dates = {}
+            users = self.analytics_service.event_buffer.user_columns()
+            in_cohort = (users.created_at >= cohort_start.timestamp()) & (users.created_at < cohort_end.timestamp())
             
-            for user_id, profile in self.analytics_service.user_profiles.items():
-                if cohort_start <= profile.created_at < cohort_end:
-                    cohort_users.add(user_id)
-                    registration_dates[user_id] = profile.created_at
-            
-            cohort_size = len(cohort_users)
+            cohort_size = int(np.count_nonzero(in_cohort))
             if cohort_size == 0:
                 # Return empty metrics for cohorts with no users
                 return CohortMetrics(
@@ -219,42 +201,23 @@ class WarehouseProcessor:
                     calculated_at=datetime.now(timezone.utc)
                 )
             
-            # Calculate retention for each time period
+            created_at = users.created_at[in_cohort]
+            last_active_at = users.last_active_at[in_cohort]
+            plans = users.plans_generated[in_cohort]
+            meals = users.meals_logged[in_cohort]
+            now_ts = datetime.now(timezone.utc).timestamp()
+            
+            # Retained = active after the cutoff, once enough time has passed
+            # (NaN last-active times never compare true)
             retention_metrics = {}
-            engagement_metrics = defaultdict(list)
-            ltv_values = []
-            converted_users = 0
+            for days in self.cohort_analysis_days:
+                retention_cutoff = created_at + days * SECONDS_PER_DAY
+                retained = (retention_cutoff <= now_ts) & (last_active_at >= retention_cutoff)
+                retention_metrics[f"day_{days}_retention"] = int(np.count_nonzero(retained))
             
-            for user_id in cohort_users:
-                reg_date = registration_dates[user_id]
-                profile = self.analytics_service.user_profiles[user_id]
-                
-                # Check retention at each interval
-                for days in self.cohort_analysis_days:
-                    retention_cutoff = reg_date + timedelta(days=days)
-                    
-                    # Only calculate if enough time has passed
-                    if retention_cutoff <= datetime.now(timezone.utc):
-                        # Check if user was active after the cutoff
-                        if profile.last_active_at and profile.last_active_at >= retention_cutoff:
-                            retention_key = f"day_{days}_retention"
-                            if retention_key not in retention_metrics:
-                                retention_metrics[retention_key] = 0
-                            retention_metrics[retention_key] += 1
-                
-                # Collect engagement metrics
-                engagement_metrics['plans'].append(profile.total_plans_generated)
-                engagement_metrics['meals'].append(profile.total_meals_logged)
-                
-                # Calculate adherence (meals logged / plans generated)
-                if profile.total_plans_generated > 0:
-                    adherence = min(profile.total_meals_logged / (profile.total_plans_generated * 7), 1.0)
-                    engagement_metrics['adherence'].append(adherence * 100)
-                
-                # LTV and conversion
-                ltv_values.append(profile.ltv_usd)
-                if profile.current_tier and profile.current_tier != "free":
-                    converted_users += 1
+            # Adherence (meals logged / plans generated) for users with plans
+            with_plans = plans > 0
+            adherence = np.minimum(meals[with_plans] / (plans[with_plans] * 7), 1.0) * 100
             
             # Calculate final metrics
             cohort_metrics = CohortMetrics(
@@ -268,13 +231,13 @@ class WarehouseProcessor:
                 day_90_retention=retention_metrics.get("day_90_retention", 0) / cohort_size,
                 
                 # Engagement metrics
-                avg_plans_per_user=sum(engagement_metrics['plans']) / cohort_size,
-                avg_meals_logged_per_user=sum(engagement_metrics['meals']) / cohort_size,
-                avg_adherence_percent=sum(engagement_metrics['adherence']) / max(len(engagement_metrics['adherence']), 1),
+                avg_plans_per_user=float(plans.sum()) / cohort_size,
+                avg_meals_logged_per_user=float(meals.sum()) / cohort_size,
+                avg_adherence_percent=float(adherence.sum()) / max(len(adherence), 1),
                 
                 # Monetization metrics
-                conversion_rate=converted_users / cohort_size,
-                avg_ltv_usd=sum(ltv_values) / cohort_size,
+                conversion_rate=int(np.count_nonzero(users.tier[in_cohort] != TIER_FREE)) / cohort_size,
+                avg_ltv_usd=float(users.ltv_usd[in_cohort].sum()) / cohort_size,
                 
                 calculated_at=datetime.now(timezone.utc)
             )
@@ -310,9 +273,8 @@ class WarehouseProcessor:
         try:
             # Get subscription events in period
             subscription_events = [
-                e for e in self.analytics_service.events
-                if e.event_type in [EventType.SUBSCRIBE_ACTIVATED, EventType.CHURNED]
-                and start_date <= e.timestamp <= end_date
+                e for e in self.analytics_service.subscription_events
+                if start_date <= e.timestamp <= end_date
             ]
             
             # Count subscription changes
@@ -328,20 +290,12 @@ class WarehouseProcessor:
                     churned_subscribers += 1
             
             # Calculate current subscriber counts
-            free_users = 0
-            plus_subscribers = 0
-            pro_subscribers = 0
-            total_ltv = 0.0
-            
-            for profile in self.analytics_service.user_profiles.values():
-                total_ltv += profile.ltv_usd
-                
-                if not profile.current_tier or profile.current_tier == "free":
-                    free_users += 1
-                elif profile.current_tier == "plus":
-                    plus_subscribers += 1
-                elif profile.current_tier == "pro":
-                    pro_subscribers += 1
+            users = self.analytics_service.event_buffer.user_columns()
+            tier_counts = np.bincount(users.tier, minlength=TIER_PRO + 1)
+            free_users = int(tier_counts[TIER_FREE])
+            plus_subscribers = int(tier_counts[TIER_PLUS])
+            pro_subscribers = int(tier_counts[TIER_PRO])
+            total_ltv = float(users.ltv_usd.sum())
             
             total_active_subscribers = plus_subscribers + pro_subscribers
             total_users = free_users + total_active_subscribers
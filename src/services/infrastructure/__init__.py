@@ -37,20 +37,41 @@ Track G - Reliability, Security, Compliance:
 - G5 Incident management with runbooks and disaster recovery
 """
 
-from .ai import AIService
-from .caching import AdvancedCachingService
-from .resilience import ErrorRecoveryService
-from .monitoring import PerformanceMonitoringService
-from .experience import EnhancedUserExperienceService
-from .dashboard import ImprovementDashboard
-from .agent import ReasoningAgent
-
-# Track G services
-from .observability import observability, log_info, log_error, trace_operation
-from .distributed_rate_limiting import rate_limiter, check_rate_limit
-from .secrets_manager import secrets_manager, get_secret, store_secret, secret_context
-from .privacy_compliance import privacy_service, record_consent, check_processing_consent, request_data_deletion
-from .incident_management import incident_manager, create_incident, get_runbook, escalate_incident
+from .lazy_loading import lazy_exports
+
+# Submodules are imported on first access so that importing one service
+# (e.g. services.infrastructure.agent) does not load the whole package.
+_EXPORTS = {
+    'AIService': '.ai:AIService',
+    'AdvancedCachingService': '.caching:AdvancedCachingService',
+    'ErrorRecoveryService': '.resilience:ErrorRecoveryService',
+    'PerformanceMonitoringService': '.monitoring:PerformanceMonitoringService',
+    'EnhancedUserExperienceService': '.experience:EnhancedUserExperienceService',
+    'ImprovementDashboard': '.dashboard:ImprovementDashboard',
+    'ReasoningAgent': '.agent:ReasoningAgent',
+    
+    # Track G services
+    'observability': '.observability:observability',
+    'log_info': '.observability:log_info',
+    'log_error': '.observability:log_error',
+    'trace_operation': '.observability:trace_operation',
+    'rate_limiter': '.distributed_rate_limiting:rate_limiter',
+    'check_rate_limit': '.distributed_rate_limiting:check_rate_limit',
+    'secrets_manager': '.secrets_manager:secrets_manager',
+    'get_secret': '.secrets_manager:get_secret',
+    'store_secret': '.secrets_manager:store_secret',
+    'secret_context': '.secrets_manager:secret_context',
+    'privacy_service': '.privacy_compliance:privacy_service',
+    'record_consent': '.privacy_compliance:record_consent',
+    'check_processing_consent': '.privacy_compliance:check_processing_consent',
+    'request_data_deletion': '.privacy_compliance:request_data_deletion',
+    'incident_manager': '.incident_management:incident_manager',
+    'create_incident': '.incident_management:create_incident',
+    'get_runbook': '.incident_management:get_runbook',
+    'escalate_incident': '.incident_management:escalate_incident',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'AIService',
@@ -94,44 +115,55 @@ __all__ = [
 # Service factory functions for easy instantiation
 def get_ai_service():
     """Get AI service instance"""
+    from .ai import AIService
     return AIService()
 
 def get_caching_service():
     """Get advanced caching service instance"""
+    from .caching import AdvancedCachingService
     return AdvancedCachingService()
 
 def get_resilience_service():
     """Get error recovery service instance"""
+    from .resilience import ErrorRecoveryService
     return ErrorRecoveryService()
 
 def get_monitoring_service():
     """Get performance monitoring service instance"""
+    from .monitoring import PerformanceMonitoringService
     return PerformanceMonitoringService()
 
 def get_experience_service():
     """Get enhanced user experience service instance"""
+    from .experience import EnhancedUserExperienceService
     return EnhancedUserExperienceService()
 
 def get_dashboard_service():
     """Get improvement dashboard service instance"""
+    from .dashboard import ImprovementDashboard
     return ImprovementDashboard()
 
 def get_observability_service():
     """Get observability service instance"""
+    from .observability import observability
     return observability
 
 def get_rate_limiter():
     """Get rate limiter service instance"""
+    from .distributed_rate_limiting import rate_limiter
     return rate_limiter
 
 def get_secrets_manager():
     """Get secrets manager service instance"""
+    from .secrets_manager import secrets_manager
     return secrets_manager
 
 def get_privacy_service():
     """Get privacy compliance service instance"""
+    from .privacy_compliance import privacy_service
     return privacy_service
 
 def get_incident_manager():
     """Get incident manager service instance"""
+    from .incident_management import incident_manager
     return incident_manager
@@ -16,6 +16,9 @@ import requests
 from botocore.exceptions import ClientError
 
 from ..nutrition.calculator import EdamamService
+from ..knowledge.semantic_cache import profile_scope, semantic_response_cache
+from .recipe_enrichment import RecipeEnrichmentStage, normalize_meal_name, plan_meals
+from .usage_accounting import bedrock_cost, usage_accumulator
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,15 @@ class AIService:
         # Enhanced Edamam service integration
         self.edamam_service = EdamamService()
         
+        # Concurrent, deduplicated recipe lookups shared across users
+        self.recipe_enrichment = RecipeEnrichmentStage()
+        
+        # Buffered usage counters, flushed off the request path
+        self.usage_accumulator = usage_accumulator
+        
+        # Similar-prompt response cache shared by all Bedrock entry points
+        self.semantic_cache = semantic_response_cache
+        
         # Legacy recipe API integration (keeping for backward compatibility)
         self.recipe_api_key = self._get_parameter('/ai-nutritionist/edamam/api-key')
         self.recipe_app_id = self._get_parameter('/ai-nutritionist/edamam/app-id')
@@ -66,7 +78,8 @@ class AIService:
             
             logger.info(f"Generating new meal plan for user {user_profile.get('user_id', 'unknown')}")
             
-            response = self._invoke_model_with_cache(prompt, cache_key, max_tokens=3000)
+            response = self._invoke_model_with_cache(prompt, cache_key, max_tokens=3000, template="meal_plan",
+                                                     scope=profile_scope(user_profile))
             if response:
                 meal_plan = self._parse_meal_plan_response(response)
                 
@@ -88,8 +101,9 @@ class AIService:
         Uses caching for repeated questions
         """
         try:
-            # Create cache key for nutrition questions
-            cache_key = f"nutrition_{hashlib.md5(question.lower().encode()).hexdigest()}"
+            # Create cache key for nutrition questions (answers depend on the user's restrictions)
+            scope = profile_scope(user_profile)
+            cache_key = f"nutrition_{hashlib.md5(f'{question.lower()}:{scope}'.encode()).hexdigest()}"
             cached_response = self._get_cached_response(cache_key)
             
             if cached_response:
@@ -97,7 +111,8 @@ class AIService:
             
             prompt = self._build_nutrition_advice_prompt(question, user_profile)
             
-            response = self._invoke_model_with_cache(prompt, cache_key, max_tokens=500)
+            response = self._invoke_model_with_cache(prompt, cache_key, max_tokens=500, template="quick_nutrition_qa",
+                                                     scope=scope, query=question)
             if response:
                 advice = response.strip()
                 # Cache nutrition advice
@@ -306,7 +321,9 @@ Sodium: {int(minerals.get('sodium', 0))}mg
         # Create hash of relevant user preferences for caching
         cache_data = {
             'dietary_restrictions': user_profile.get('dietary_restrictions', []),
+            'allergies': user_profile.get('allergies', []),
             'budget': user_profile.get('budget', 75),
+            'weekly_budget': user_profile.get('weekly_budget', 75),
             'household_size': user_profile.get('household_size', 1),
             'fitness_goal': user_profile.get('fitness_goal', 'maintenance'),
             'week': datetime.now().strftime('%Y-W%U')  # Weekly cache
@@ -371,24 +388,27 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             if 'dairy-free' in restrictions:
                 health_labels.append('dairy-free')
             
-            # Enrich each day's meals
+            # Resolve each distinct meal name once, concurrently
             enriched_plan = meal_plan.copy()
-            
-            for day_key, day_data in meal_plan.get('days', {}).items():
-                for meal_type in ['breakfast', 'lunch', 'dinner']:
-                    meal = day_data.get(meal_type)
-                    if meal and isinstance(meal, dict):
-                        recipe_data = self._fetch_recipe_data(
-                            meal.get('name', ''),
-                            diet_labels,
-                            health_labels
-                        )
-                        
-                        if recipe_data:
-                            meal['recipe_url'] = recipe_data.get('url')
-                            meal['prep_time'] = recipe_data.get('prep_time')
-                            meal['servings'] = recipe_data.get('servings')
-                            meal['verified_ingredients'] = recipe_data.get('ingredients', [])
+            meals = plan_meals(meal_plan, ['breakfast', 'lunch', 'dinner'])
+            
+            async def lookup(meal_name: str) -> Optional[Dict[str, Any]]:
+                return await asyncio.to_thread(self._fetch_recipe_data, meal_name, diet_labels, health_labels)
+            
+            recipes = asyncio.run(self.recipe_enrichment.resolve(
+                [meal['name'] for _, _, meal in meals],
+                lookup,
+                diet_labels,
+                health_labels
+            ))
+            
+            for _, _, meal in meals:
+                recipe_data = recipes.get(normalize_meal_name(meal['name']))
+                if recipe_data:
+                    meal['recipe_url'] = recipe_data.get('url')
+                    meal['prep_time'] = recipe_data.get('prep_time')
+                    meal['servings'] = recipe_data.get('servings')
+                    meal['verified_ingredients'] = recipe_data.get('ingredients', [])
             
             return enriched_plan
             
@@ -403,6 +423,15 @@ Sodium: {int(minerals.get('sodium', 0))}mg
         try:
             enriched_plan = meal_plan.copy()
             
+            # Enhanced recipe search for each distinct meal name, concurrently
+            recipes = await self.recipe_enrichment.resolve(
+                [meal['name'] for _, _, meal in plan_meals(meal_plan)],
+                lambda meal_name: self.edamam_service.enhanced_recipe_search(meal_name, user_profile),
+                self.edamam_service._extract_diet_labels(user_profile),
+                self.edamam_service._extract_health_labels(user_profile),
+                scope=self._enhanced_recipe_scope(user_profile)
+            )
+            
             # Process each day's meals
             for day_key, day_data in meal_plan.get('days', {}).items():
                 daily_ingredients = []
@@ -410,12 +439,7 @@ Sodium: {int(minerals.get('sodium', 0))}mg
                 for meal_type in ['breakfast', 'lunch', 'dinner', 'snacks']:
                     meal = day_data.get(meal_type)
                     if meal and isinstance(meal, dict):
-                        meal_name = meal.get('name', '')
-                        
-                        # Enhanced recipe search
-                        recipe_results = await self.edamam_service.enhanced_recipe_search(
-                            meal_name, user_profile
-                        )
+                        recipe_results = recipes.get(normalize_meal_name(meal.get('name', '')))
                         
                         if recipe_results and recipe_results.get('recipes'):
                             # Use the best recipe (first one after scoring)
@@ -488,6 +512,15 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             logger.error(f"Error in enhanced recipe enrichment: {e}")
             return meal_plan
 
+    def _enhanced_recipe_scope(self, user_profile: Dict[str, Any]) -> str:
+        """Identify the profile fields besides labels that shape enhanced recipe search results"""
+        return "enhanced:{}:{}:{}-{}".format(
+            user_profile.get('cooking_skill', 'intermediate'),
+            user_profile.get('max_prep_time', 45),
+            user_profile.get('min_calories', 200),
+            user_profile.get('max_calories', 800)
+        )
+
     def _format_nutrition_summary(self, nutrition_data: Dict) -> str:
         """Format nutrition data for WhatsApp display"""
         try:
@@ -516,7 +549,8 @@ Sodium: {int(minerals.get('sodium', 0))}mg
         """Fetch recipe data from Edamam API"""
         try:
             # Check recipe cache first
-            recipe_cache_key = f"recipe_{hashlib.md5(meal_name.lower().encode()).hexdigest()}"
+            lookup_key = "|".join([normalize_meal_name(meal_name), ",".join(sorted(diet_labels)), ",".join(sorted(health_labels))])
+            recipe_cache_key = f"recipe_{hashlib.md5(lookup_key.encode()).hexdigest()}"
             cached_recipe = self._get_cached_response(recipe_cache_key)
             
             if cached_recipe:
@@ -585,13 +619,19 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             logger.error(f"Error generating grocery list: {str(e)}")
             return []
     
-    def _invoke_model_with_cache(self, prompt: str, cache_key: str, max_tokens: int = 1000) -> Optional[str]:
+    def _invoke_model_with_cache(self, prompt: str, cache_key: str, max_tokens: int = 1000,
+                                 template: str = "default", scope: str = "",
+                                 query: Optional[str] = None) -> Optional[str]:
         """
         Invoke Bedrock model with cost optimization and caching
+        Prompts of the same template and profile scope reuse a cached response when the rest of the prompt is
+        identical and the query (the user's input within the prompt) is similar enough to the cached one
         """
         try:
-            # Track usage for cost monitoring
-            self._track_bedrock_usage(len(prompt.split()))
+            semantic_hit = self.semantic_cache.lookup(prompt, template, scope, query=query)
+            if semantic_hit:
+                logger.info(f"Semantic cache hit for {template} (similarity {semantic_hit.similarity:.3f})")
+                return semantic_hit.response
             
             # Prepare the request body for Titan Text Express
             body = json.dumps({
@@ -615,6 +655,9 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             # Parse response
             response_body = json.loads(response['body'].read())
             
+            # Track usage for cost monitoring
+            self._track_bedrock_usage(prompt, response_body)
+            
             # Extract text from Titan response
             generated_text = None
             if 'results' in response_body and len(response_body['results']) > 0:
@@ -623,6 +666,7 @@ Sodium: {int(minerals.get('sodium', 0))}mg
                 # Cache successful responses for cost optimization
                 if generated_text:
                     self._cache_response(cache_key, {'response': generated_text})
+                    self.semantic_cache.store(prompt, generated_text, template, scope=scope, query=query)
             
             return generated_text
             
@@ -633,28 +677,18 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             logger.error(f"Unexpected error: {str(e)}")
             return None
     
-    def _track_bedrock_usage(self, token_count: int) -> None:
-        """Track Bedrock API usage for cost monitoring"""
+    def _track_bedrock_usage(self, prompt: str, response_body: Dict[str, Any]) -> None:
+        """Track Bedrock API usage for cost monitoring (buffered, no I/O)"""
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            usage_key = f"bedrock_usage_{today}"
-            
-            # Get current usage
-            response = self.cache_table.get_item(Key={'cache_key': usage_key})
-            
-            current_usage = 0
-            if 'Item' in response:
-                current_usage = response['Item'].get('data', {}).get('token_count', 0)
-            
-            # Update usage
-            new_usage = current_usage + token_count
-            
-            self.cache_table.put_item(
-                Item={
-                    'cache_key': usage_key,
-                    'data': {'token_count': new_usage},
-                    'ttl': int((datetime.now() + timedelta(days=7)).timestamp())
-                }
+            results = response_body.get('results') or [{}]
+            input_tokens = response_body.get('inputTextTokenCount', len(prompt.split()))
+            output_tokens = results[0].get('tokenCount', 0)
+            
+            self.usage_accumulator.record(
+                f"bedrock:{self.model_id}",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost=bedrock_cost(self.model_id, input_tokens, output_tokens)
             )
             
         except Exception as e:
@@ -686,6 +720,7 @@ Sodium: {int(minerals.get('sodium', 0))}mg
             
             # Parse response
             response_body = json.loads(response['body'].read())
+            self._track_bedrock_usage(prompt, response_body)
             
             # Extract text from Titan response
             if 'results' in response_body and len(response_body['results']) > 0:
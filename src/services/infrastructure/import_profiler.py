@@ -0,0 +1,185 @@
+"""
+Handler Import Profiler
+======================
+
+Per-module import times for Lambda entry points, measured in a fresh
+interpreter with ``python -X importtime`` so nothing is already cached.
+
+Usage:
+    python -m services.infrastructure.import_profiler                 # all handlers
+    python -m services.infrastructure.import_profiler handlers.aws_sms_handler --top 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SRC_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Import-time budget per Lambda entry point, in milliseconds
+HANDLER_IMPORT_BUDGETS_MS: Dict[str, float] = {
+    'handlers.aws_sms_handler': 1000.0,
+    'handlers.universal_message_handler': 1500.0,
+}
+
+# Service modules each entry point defers until its first request
+DEFERRED_MODULES: Dict[str, List[str]] = {
+    'handlers.aws_sms_handler': [
+        'services.messaging.notifications',
+        'services.infrastructure.ai',
+        'services.personalization.preferences',
+        'services.meal_planning.optimizer',
+    ],
+    'handlers.universal_message_handler': [
+        'services.analytics.analytics_service',
+        'services.nutrition.insights',
+        'services.nutrition.tracker',
+        'services.meal_planning.planner',
+        'services.messaging.templates',
+        'services.infrastructure.agent',
+        'services.infrastructure.monitoring',
+    ],
+}
+
+
+@dataclass
+class ModuleImport:
+    """One line of ``-X importtime`` output, in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """Import timings for one entry point."""
+    entry_point: str
+    modules: List[ModuleImport] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the entry point itself."""
+        for module in self.modules:
+            if module.module == self.entry_point:
+                return module.cumulative_us / 1000
+        return sum(module.self_us for module in self.modules) / 1000
+
+    def is_imported(self, module: str) -> bool:
+        """Whether ``module`` was imported while loading the entry point."""
+        return any(entry.module == module for entry in self.modules)
+
+    def slowest(self, limit: int = 10) -> List[ModuleImport]:
+        """Modules with the highest self time."""
+        return sorted(self.modules, key=lambda module: module.self_us, reverse=True)[:limit]
+
+    def by_package(self, depth: int = 2) -> Dict[str, float]:
+        """Self time in milliseconds per top-level package path."""
+        totals: Dict[str, float] = {}
+        for module in self.modules:
+            package = '.'.join(module.module.split('.')[:depth])
+            totals[package] = totals.get(package, 0.0) + module.self_us / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self) -> Dict:
+        """Serializable representation."""
+        data = asdict(self)
+        data['total_ms'] = self.total_ms
+        return data
+
+
+def parse_importtime(output: str) -> List[ModuleImport]:
+    """Parse the stderr of ``python -X importtime``."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()[1:]
+        stripped = name.lstrip()
+        modules.append(ModuleImport(
+            module=stripped,
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1]),
+            depth=(len(name) - len(stripped)) // 2
+        ))
+    return modules
+
+
+def profile_import(entry_point: str, search_paths: List[str] = None,
+                   python: str = sys.executable, timeout: float = 120) -> ImportProfile:
+    """Import ``entry_point`` in a fresh interpreter and record per-module import times."""
+    paths = [str(path) for path in (search_paths or [SRC_ROOT])]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(paths + [p for p in [env.get('PYTHONPATH')] if p])
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {entry_point}'],
+        cwd=paths[0], capture_output=True, text=True, env=env, timeout=timeout
+    )
+    profile = ImportProfile(
+        entry_point=entry_point,
+        modules=parse_importtime(result.stderr),
+        wall_seconds=time.perf_counter() - started
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if line and not line.startswith('import time:')]
+        profile.error = errors[-1] if errors else f"exit status {result.returncode}"
+    return profile
+
+
+def check_budget(profile: ImportProfile, budget_ms: float) -> List[str]:
+    """Budget violations for a profile: overall time and deferred modules imported eagerly."""
+    violations = []
+    if profile.total_ms > budget_ms:
+        violations.append(f"{profile.entry_point} imports in {profile.total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    for module in DEFERRED_MODULES.get(profile.entry_point, []):
+        if profile.is_imported(module):
+            violations.append(f"{profile.entry_point} imports {module} at load time")
+    return violations
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Per-module import times of Lambda entry points")
+    parser.add_argument('entry_points', nargs='*', default=list(HANDLER_IMPORT_BUDGETS_MS))
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for entry_point in args.entry_points:
+        profile = profile_import(entry_point)
+        violations = [] if profile.error else check_budget(
+            profile, HANDLER_IMPORT_BUDGETS_MS.get(entry_point, float('inf'))
+        )
+        failed = failed or bool(profile.error or violations)
+
+        if args.json:
+            print(json.dumps({**profile.to_dict(), 'violations': violations}))
+            continue
+
+        print(f"{entry_point}: {profile.total_ms:.1f} ms, {len(profile.modules)} modules")
+        if profile.error:
+            print(f"  import failed: {profile.error}")
+        for module in profile.slowest(args.top):
+            print(f"  {module.self_us / 1000:8.1f} ms  {module.module}")
+        for violation in violations:
+            print(f"  over budget: {violation}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Lazy Loading for Cold Starts
+===========================
+
+Deferred imports for Lambda entry points: service proxies that import and
+construct their service on first use, and PEP 562 package exports that
+import a submodule only when one of its names is accessed.
+
+Usage:
+    from services.infrastructure.lazy_loading import LazyService
+
+    ai_service = LazyService("services.infrastructure.ai:AIService")
+    meal_plan_service = LazyService(
+        "services.meal_planning.optimizer:MealPlanService", dynamodb, ai_service
+    )
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def import_object(target: str, package: Optional[str] = None) -> Any:
+    """
+    Import ``"module:attribute"`` (or a bare module path).
+
+    Relative module paths are resolved against ``package``; the attribute may
+    be dotted to reach nested classes.
+    """
+    module_path, _, attribute = target.partition(':')
+    obj = importlib.import_module(module_path, package)
+    for part in filter(None, attribute.split('.')):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _unwrap(value: Any) -> Any:
+    """Resolve a LazyService passed as a constructor argument."""
+    return value.resolve() if isinstance(value, LazyService) else value
+
+
+class LazyService:
+    """
+    Proxy that imports and constructs a service on first attribute access.
+
+    Constructor arguments are kept until then; arguments that are themselves
+    LazyService proxies are resolved first, so services can depend on each
+    other without importing anything at module load.
+    """
+
+    __slots__ = ('_target', '_factory', '_args', '_kwargs', '_instance', '_lock', 'load_seconds')
+
+    def __init__(self, target: str, *args: Any, factory: Optional[Callable[..., Any]] = None, **kwargs: Any):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_args', args)
+        object.__setattr__(self, '_kwargs', kwargs)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+        object.__setattr__(self, 'load_seconds', None)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the service has been imported and constructed."""
+        return self.load_seconds is not None
+
+    def resolve(self) -> Any:
+        """Return the service instance, importing and constructing it on first call."""
+        if self.load_seconds is not None:
+            return self._instance
+
+        with self._lock:
+            if self.load_seconds is None:
+                started = time.perf_counter()
+                factory = self._factory or import_object(self._target)
+                args = [_unwrap(arg) for arg in self._args]
+                kwargs = {name: _unwrap(value) for name, value in self._kwargs.items()}
+                object.__setattr__(self, '_instance', factory(*args, **kwargs))
+                object.__setattr__(self, 'load_seconds', time.perf_counter() - started)
+                logger.debug("Loaded %s in %.1f ms", self._target, self.load_seconds * 1000)
+
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'deferred'
+        return f"<LazyService {self._target} ({state})>"
+
+
+def loaded_services(services: Iterable[LazyService]) -> Dict[str, float]:
+    """Load time in seconds of each proxy that has been resolved, by target."""
+    return {service._target: service.load_seconds for service in services if service.is_loaded}
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module ``__getattr__`` and ``__dir__`` for a package with lazy exports (PEP 562).
+
+    ``exports`` maps each public name to a ``"module:attribute"`` target,
+    relative to the package; the submodule is imported on first access and
+    the value cached on the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            target = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = import_object(target, package)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
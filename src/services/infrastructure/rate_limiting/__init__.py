@@ -14,6 +14,7 @@ Features:
 - Global, per-user, and per-endpoint limits
 - Redis-based distributed counters
 - Graceful degradation and fallbacks
+- Optional local token leasing to offload Redis
 - Rate limit headers
 - Dynamic configuration
 """
@@ -26,6 +27,7 @@ from .strategies import (
     LeakyBucketStrategy,
 )
 from .engine import RateLimitEngine
+from .leasing import TokenLeaseManager
 from .config import RateLimitConfig, TierConfig
 from .middleware import RateLimitMiddleware
 from .redis_backend import RedisRateLimitBackend
@@ -37,6 +39,7 @@ __all__ = [
     "FixedWindowStrategy",
     "LeakyBucketStrategy",
     "RateLimitEngine",
+    "TokenLeaseManager",
     "RateLimitConfig",
     "TierConfig", 
     "RateLimitMiddleware",
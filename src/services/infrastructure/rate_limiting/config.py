@@ -139,6 +139,21 @@ class RateLimitConfig:
     global_limit_per_second: int = 1000
     global_limit_per_minute: int = 50000
     
+    # Evaluate global, dimension and window limits in one Redis script call
+    combined_evaluation: bool = True
+    
+    # Hybrid mode: lease blocks of tokens per key from Redis and spend them
+    # locally. Leased tokens are reserved before they are spent, so a window
+    # is only exceeded by tokens spent after the window they were reserved in
+    # rolled over: at most lease_max_tokens per key per process per window.
+    # Global counters are charged for the whole lease when it is taken.
+    token_leasing_enabled: bool = False
+    lease_min_tokens: int = 4
+    lease_max_tokens: int = 64
+    lease_ttl_seconds: float = 5.0
+    lease_max_fraction: float = 0.1  # Share of the remaining budget one lease may take
+    lease_renew_fraction: float = 0.25  # Prefetch the next lease when this share is left
+    
     # Default tier configuration
     tier_config: TierConfig = field(default_factory=TierConfig)
     
@@ -195,6 +210,13 @@ class RateLimitConfig:
             "stats_retention": self.stats_retention,
             "global_limit_per_second": self.global_limit_per_second,
             "global_limit_per_minute": self.global_limit_per_minute,
+            "combined_evaluation": self.combined_evaluation,
+            "token_leasing_enabled": self.token_leasing_enabled,
+            "lease_min_tokens": self.lease_min_tokens,
+            "lease_max_tokens": self.lease_max_tokens,
+            "lease_ttl_seconds": self.lease_ttl_seconds,
+            "lease_max_fraction": self.lease_max_fraction,
+            "lease_renew_fraction": self.lease_renew_fraction,
             "dynamic_limits_enabled": self.dynamic_limits_enabled,
             "auto_scaling_enabled": self.auto_scaling_enabled,
         }
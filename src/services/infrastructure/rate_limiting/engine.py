@@ -12,8 +12,9 @@ from typing import Dict, Optional, Tuple, Any, List
 from datetime import datetime, timedelta
 
 from .config import RateLimitConfig, UserTier, TierLimits, RateLimitStrategy
-from .strategies import get_strategy, RateLimitResult
+from .strategies import get_strategy, GlobalLimit, LimitCheck, RateLimitResult
 from .redis_backend import RedisRateLimitBackend
+from .leasing import TokenLeaseManager
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class RateLimitEngine:
             'blocked_requests': 0,
             'start_time': time.time()
         }
+        self._lease_manager = TokenLeaseManager(config, global_limits=self._global_limits)
         self._cleanup_task = None
         self._initialized = False
     
@@ -62,6 +64,7 @@ class RateLimitEngine:
             except asyncio.CancelledError:
                 pass
         
+        await self._lease_manager.release_all()
         await self.backend.close()
         logger.info("Rate limiting engine closed")
     
@@ -101,12 +104,6 @@ class RateLimitEngine:
         self._global_stats['total_requests'] += 1
         
         try:
-            # Check global rate limits first
-            global_result = await self._check_global_limits(identifier)
-            if not global_result.allowed:
-                self._global_stats['blocked_requests'] += 1
-                return global_result
-            
             # Get endpoint configuration
             endpoint_config = self.config.get_endpoint_config(endpoint)
             
@@ -126,15 +123,34 @@ class RateLimitEngine:
             else:
                 tier_limits = self.config.get_tier_limits(user_tier)
             
-            # Check multiple rate limit dimensions
-            results = await self._check_multi_dimensional_limits(
-                identifier=identifier,
-                endpoint=endpoint,
-                user_tier=user_tier,
-                user_id=user_id,
-                tier_limits=tier_limits,
-                strategy_name=strategy_name
-            )
+            results = None
+            if self.config.combined_evaluation:
+                # Global and all dimension limits in a single round trip
+                results = await self._check_combined_limits(
+                    identifier=identifier,
+                    endpoint=endpoint,
+                    user_tier=user_tier,
+                    user_id=user_id,
+                    tier_limits=tier_limits,
+                    strategy_name=strategy_name
+                )
+            
+            if results is None:
+                # Check global rate limits first
+                global_result = await self._check_global_limits(identifier)
+                if not global_result.allowed:
+                    self._global_stats['blocked_requests'] += 1
+                    return global_result
+                
+                # Check multiple rate limit dimensions
+                results = await self._check_multi_dimensional_limits(
+                    identifier=identifier,
+                    endpoint=endpoint,
+                    user_tier=user_tier,
+                    user_id=user_id,
+                    tier_limits=tier_limits,
+                    strategy_name=strategy_name
+                )
             
             # Find the most restrictive result
             most_restrictive = min(results, key=lambda r: r.remaining if r.allowed else -1)
@@ -220,44 +236,100 @@ class RateLimitEngine:
         strategy = get_strategy(strategy_name)
         results = []
         
+        for prefix, key in self._dimension_keys(identifier, endpoint, user_tier, user_id):
+            results.append(await self._check_dimension_limits(
+                key=key,
+                limits=tier_limits,
+                strategy=strategy,
+                prefix=prefix
+            ))
+        
+        return results
+    
+    async def _check_combined_limits(
+        self,
+        identifier: str,
+        endpoint: str,
+        user_tier: UserTier,
+        user_id: Optional[str],
+        tier_limits: TierLimits,
+        strategy_name: str
+    ) -> Optional[List[RateLimitResult]]:
+        """
+        Check global limits and every dimension and window in one script call.
+        
+        Unlike the sequential checks, no window is consumed unless the request
+        is allowed by all of them. With token leasing enabled, tokens are
+        spent from a local lease when one is available. Returns None when the
+        strategy or backend cannot evaluate the combined script.
+        """
+        
+        strategy = get_strategy(strategy_name)
+        checks = [
+            LimitCheck(
+                key=f"{prefix}:{window_name}:{key}",
+                limit=limit,
+                window=window,
+                burst_capacity=tier_limits.burst_capacity
+            )
+            for prefix, key in self._dimension_keys(identifier, endpoint, user_tier, user_id)
+            for window_name, limit, window in self._windows(tier_limits)
+        ]
+        
+        if self.config.token_leasing_enabled:
+            lease_key = strategy_name + "|" + "|".join(f"{check.key}:{check.limit}" for check in checks)
+            return await self._lease_manager.check(lease_key, strategy, checks, self.backend)
+        
+        return await strategy.check_limits(checks, self.backend, global_limits=self._global_limits(time.time()))
+    
+    def _global_limits(self, current_time: float) -> List[GlobalLimit]:
+        """Get the global counters to charge at ``current_time``."""
+        global_limits = []
+        if self.config.global_limit_per_second > 0:
+            global_limits.append(GlobalLimit(
+                key=f"global:second:{int(current_time)}",
+                limit=self.config.global_limit_per_second,
+                window=1
+            ))
+        if self.config.global_limit_per_minute > 0:
+            global_limits.append(GlobalLimit(
+                key=f"global:minute:{int(current_time // 60)}",
+                limit=self.config.global_limit_per_minute,
+                window=60
+            ))
+        return global_limits
+    
+    def _dimension_keys(
+        self,
+        identifier: str,
+        endpoint: str,
+        user_tier: UserTier,
+        user_id: Optional[str]
+    ) -> List[Tuple[str, str]]:
+        """Get the (prefix, key) pairs of the rate limit dimensions for a request."""
+        
         # 1. Per-identifier limits (IP/API key)
-        identifier_result = await self._check_dimension_limits(
-            key=f"id:{identifier}",
-            limits=tier_limits,
-            strategy=strategy,
-            prefix="identifier"
-        )
-        results.append(identifier_result)
+        dimensions = [("identifier", f"id:{identifier}")]
         
         # 2. Per-endpoint limits
-        endpoint_result = await self._check_dimension_limits(
-            key=f"endpoint:{endpoint}:{identifier}",
-            limits=tier_limits,
-            strategy=strategy,
-            prefix="endpoint"
-        )
-        results.append(endpoint_result)
+        dimensions.append(("endpoint", f"endpoint:{endpoint}:{identifier}"))
         
         # 3. Per-user limits (if user_id provided)
         if user_id:
-            user_result = await self._check_dimension_limits(
-                key=f"user:{user_id}",
-                limits=tier_limits,
-                strategy=strategy,
-                prefix="user"
-            )
-            results.append(user_result)
+            dimensions.append(("user", f"user:{user_id}"))
         
         # 4. Per-tier limits (global tier tracking)
-        tier_result = await self._check_dimension_limits(
-            key=f"tier:{user_tier.value}:{identifier}",
-            limits=tier_limits,
-            strategy=strategy,
-            prefix="tier"
-        )
-        results.append(tier_result)
+        dimensions.append(("tier", f"tier:{user_tier.value}:{identifier}"))
         
-        return results
+        return dimensions
+    
+    def _windows(self, limits: TierLimits) -> List[Tuple[str, int, int]]:
+        """Get the (name, limit, window seconds) time windows checked per dimension."""
+        return [
+            ("min", limits.requests_per_minute, 60),
+            ("hour", limits.requests_per_hour, 3600),
+            ("day", limits.requests_per_day, 86400),
+        ]
     
     async def _check_dimension_limits(
         self,
@@ -268,40 +340,20 @@ class RateLimitEngine:
     ) -> RateLimitResult:
         """Check rate limits for a specific dimension."""
         
-        # Check minute limit
-        minute_result = await strategy.check_limit(
-            key=f"{prefix}:min:{key}",
-            limit=limits.requests_per_minute,
-            window=60,
-            backend=self.backend,
-            burst_capacity=limits.burst_capacity
-        )
-        
-        if not minute_result.allowed:
-            return minute_result
-        
-        # Check hour limit
-        hour_result = await strategy.check_limit(
-            key=f"{prefix}:hour:{key}",
-            limit=limits.requests_per_hour,
-            window=3600,
-            backend=self.backend,
-            burst_capacity=limits.burst_capacity
-        )
-        
-        if not hour_result.allowed:
-            return hour_result
-        
-        # Check day limit
-        day_result = await strategy.check_limit(
-            key=f"{prefix}:day:{key}",
-            limit=limits.requests_per_day,
-            window=86400,
-            backend=self.backend,
-            burst_capacity=limits.burst_capacity
-        )
+        result = None
+        for window_name, limit, window in self._windows(limits):
+            result = await strategy.check_limit(
+                key=f"{prefix}:{window_name}:{key}",
+                limit=limit,
+                window=window,
+                backend=self.backend,
+                burst_capacity=limits.burst_capacity
+            )
+            
+            if not result.allowed:
+                return result
         
-        return day_result
+        return result
     
     def _create_custom_limits(self, custom_limits: Dict[str, int]) -> TierLimits:
         """Create TierLimits from custom limit dictionary."""
@@ -402,6 +454,7 @@ class RateLimitEngine:
             'success_rate': 1 - (self._global_stats['blocked_requests'] / max(1, self._global_stats['total_requests'])),
             'requests_per_second': self._global_stats['total_requests'] / max(1, uptime),
             'backend': backend_stats,
+            'leasing': self._lease_manager.get_stats(),
             'config': {
                 'enabled': self.config.enabled,
                 'default_strategy': self.config.default_strategy.value,
@@ -426,6 +479,11 @@ class RateLimitEngine:
                 if cleaned > 0:
                     logger.debug(f"Cleaned up {cleaned} expired rate limit keys")
                 
+                # Refund leases of keys that went idle
+                released = await self._lease_manager.release_expired()
+                if released > 0:
+                    logger.debug(f"Released {released} expired token leases")
+                
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -439,6 +497,7 @@ class RateLimitEngine:
         
         old_config = self.config
         self.config = new_config
+        self._lease_manager.config = new_config
         
         logger.info("Rate limiting configuration updated")
         
@@ -0,0 +1,287 @@
+"""
+Token Leasing
+=============
+
+Hybrid rate limiting: each process leases blocks of tokens per key from Redis
+and spends them locally, so most requests from clients well below their
+limits never reach Redis.
+
+Leased tokens are reserved in Redis (through the combined check script)
+before they are spent, so leasing never admits more requests than a window
+allows, except for tokens spent after the window they were reserved in rolled
+over. Leases expire after ``lease_ttl_seconds`` and unused tokens are refunded
+asynchronously. Lease sizes adapt to demand between ``lease_min_tokens`` and
+``lease_max_tokens`` and never exceed ``lease_max_fraction`` of the remaining
+budget; when that is smaller than ``lease_min_tokens`` the key is checked
+strictly, one request at a time.
+
+Keys whose capacity is too small to ever lease ``lease_min_tokens`` (for
+example the free tier under the token bucket strategy: a burst capacity of
+10 at the default 10% share is 1 token) are always checked strictly and keep
+no per-key state. Per-key state of other keys is forgotten once they have
+been idle for a lease lifetime.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from .config import RateLimitConfig
+from .strategies import GlobalLimit, LimitCheck, RateLimitResult, RateLimitStrategy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenLease:
+    """A block of tokens reserved in Redis for one set of limits."""
+    lease_id: str
+    strategy: RateLimitStrategy
+    checks: List[LimitCheck]
+    backend: Any
+    granted: int
+    tokens: int
+    leased_at: float
+    expires_at: float
+    result: RateLimitResult
+    renewal: Optional[asyncio.Task] = None
+
+    def usable(self, current_time: float) -> bool:
+        """Check whether tokens can still be spent from this lease."""
+        return self.tokens > 0 and self.expires_at > current_time
+
+
+class TokenLeaseManager:
+    """Leases tokens per key from Redis and spends them in process."""
+
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        global_limits: Callable[[float], List[GlobalLimit]]
+    ):
+        self.config = config
+        self._global_limits = global_limits
+        self._leases: Dict[str, TokenLease] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_sizes: Dict[str, int] = {}
+        self._budgets: Dict[str, int] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._refunds: Set[asyncio.Task] = set()
+        self._stats = {
+            'local_requests': 0,
+            'strict_requests': 0,
+            'leases_granted': 0,
+            'leases_denied': 0,
+            'tokens_refunded': 0,
+        }
+
+    async def check(
+        self,
+        lease_key: str,
+        strategy: RateLimitStrategy,
+        checks: Sequence[LimitCheck],
+        backend
+    ) -> Optional[List[RateLimitResult]]:
+        """
+        Check a request against its limits, spending a leased token if possible.
+
+        Args:
+            lease_key: Identity of the set of limits (one lease per key)
+            strategy: Rate limiting strategy for the limits
+            checks: Per-key limits to lease from
+            backend: Rate limit backend
+
+        Returns:
+            Results as from ``RateLimitStrategy.check_limits``, or None if the
+            backend cannot run the combined script
+        """
+        current_time = time.time()
+        lease = self._leases.get(lease_key)
+        if lease is not None and lease.usable(current_time):
+            return [self._spend(lease_key, lease)]
+
+        if not self.leasable(strategy, checks):
+            # Too small to lease from: strict, without serializing on a per-key lock
+            self._stats['strict_requests'] += 1
+            return await strategy.check_limits(checks, backend, global_limits=self._global_limits(current_time))
+
+        self._last_seen[lease_key] = current_time
+        lock = self._locks.setdefault(lease_key, asyncio.Lock())
+        async with lock:
+            # Another request may have replaced the lease while we waited
+            lease = self._leases.get(lease_key)
+            if lease is not None and lease.usable(time.time()):
+                return [self._spend(lease_key, lease)]
+
+            if lease is not None:
+                del self._leases[lease_key]
+                renewed = await lease.renewal if lease.renewal is not None else None
+                self._retire(lease_key, lease)
+                if renewed is not None:
+                    if renewed.usable(time.time()):
+                        self._leases[lease_key] = renewed
+                        return [self._spend(lease_key, renewed)]
+                    self._retire(lease_key, renewed)
+
+            lease = await self._lease(lease_key, strategy, checks, backend)
+            if lease is not None:
+                self._leases[lease_key] = lease
+                return [self._spend(lease_key, lease)]
+
+            # Strict mode: near the limit, lease denied or lease too small
+            self._stats['strict_requests'] += 1
+            results = await strategy.check_limits(checks, backend, global_limits=self._global_limits(time.time()))
+            if results is not None:
+                self._budgets[lease_key] = min(result.remaining for result in results)
+            return results
+
+    def leasable(self, strategy: RateLimitStrategy, checks: Sequence[LimitCheck]) -> bool:
+        """Check whether limits are large enough to ever lease ``lease_min_tokens`` from."""
+        capacity = min(strategy.capacity(check) for check in checks)
+        return int(capacity * self.config.lease_max_fraction) >= self.config.lease_min_tokens
+
+    async def release_expired(self) -> int:
+        """
+        Refund leases that expired without being replaced and forget keys idle
+        for a lease lifetime; returns the number of keys forgotten.
+        """
+        current_time = time.time()
+        expired = [key for key, lease in self._leases.items() if lease.expires_at <= current_time]
+        for key in expired:
+            await self._release(key)
+
+        idle_since = current_time - self.config.lease_ttl_seconds
+        idle = [
+            key for key, last_seen in self._last_seen.items()
+            if last_seen <= idle_since and key not in self._leases
+            and not (key in self._locks and self._locks[key].locked())
+        ]
+        for key in idle:
+            del self._last_seen[key]
+            self._locks.pop(key, None)
+            self._next_sizes.pop(key, None)
+            self._budgets.pop(key, None)
+        return len(idle)
+
+    async def release_all(self):
+        """Refund every outstanding lease and wait for the refunds."""
+        for key in list(self._leases):
+            await self._release(key)
+        if self._refunds:
+            await asyncio.gather(*self._refunds, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get leasing statistics."""
+        total = self._stats['local_requests'] + self._stats['strict_requests']
+        return {
+            **self._stats,
+            'active_leases': len(self._leases),
+            'tracked_keys': len(self._last_seen),
+            'local_ratio': self._stats['local_requests'] / max(1, total),
+        }
+
+    def _spend(self, lease_key: str, lease: TokenLease) -> RateLimitResult:
+        """Spend one local token and start renewing the lease when it runs low."""
+        lease.tokens -= 1
+        self._stats['local_requests'] += 1
+
+        if lease.renewal is None and lease.tokens <= lease.granted * self.config.lease_renew_fraction:
+            lease.renewal = asyncio.create_task(
+                self._lease(lease_key, lease.strategy, lease.checks, lease.backend)
+            )
+
+        remaining = lease.result.remaining + lease.tokens
+        return dataclasses.replace(
+            lease.result,
+            remaining=remaining,
+            current_usage=max(0, lease.result.limit - remaining)
+        )
+
+    def _lease_size(self, lease_key: str, strategy: RateLimitStrategy, checks: Sequence[LimitCheck]) -> int:
+        """Get the number of tokens to lease next for a key."""
+        budget = self._budgets.get(lease_key)
+        if budget is None:
+            budget = min(strategy.capacity(check) for check in checks)
+        size = self._next_sizes.get(lease_key, self.config.lease_min_tokens)
+        return min(size, self.config.lease_max_tokens, int(budget * self.config.lease_max_fraction))
+
+    async def _lease(
+        self,
+        lease_key: str,
+        strategy: RateLimitStrategy,
+        checks: Sequence[LimitCheck],
+        backend
+    ) -> Optional[TokenLease]:
+        """Reserve a block of tokens in Redis; None if too close to the limit or denied."""
+        size = self._lease_size(lease_key, strategy, checks)
+        if size < self.config.lease_min_tokens:
+            return None
+
+        try:
+            lease_id = uuid.uuid4().hex
+            current_time = time.time()
+            results = await strategy.check_limits(
+                checks,
+                backend,
+                global_limits=self._global_limits(current_time),
+                cost=size,
+                lease_id=lease_id
+            )
+        except Exception as e:
+            logger.error(f"Token lease failed: {e}")
+            return None
+
+        if not results or not all(result.allowed for result in results):
+            self._stats['leases_denied'] += 1
+            self._next_sizes[lease_key] = self.config.lease_min_tokens
+            return None
+
+        most_restrictive = min(results, key=lambda r: r.remaining)
+        self._budgets[lease_key] = most_restrictive.remaining
+        self._stats['leases_granted'] += 1
+        return TokenLease(
+            lease_id=lease_id,
+            strategy=strategy,
+            checks=list(checks),
+            backend=backend,
+            granted=size,
+            tokens=size,
+            leased_at=current_time,
+            expires_at=current_time + self.config.lease_ttl_seconds,
+            result=most_restrictive
+        )
+
+    def _retire(self, lease_key: str, lease: TokenLease):
+        """Adapt the next lease size and refund unused tokens in the background."""
+        if lease.tokens > 0:
+            # Demand was lower than the lease: shrink and give tokens back
+            self._next_sizes[lease_key] = max(self.config.lease_min_tokens, lease.granted // 2)
+            task = asyncio.create_task(self._refund(lease, lease.tokens))
+            self._refunds.add(task)
+            task.add_done_callback(self._refunds.discard)
+            lease.tokens = 0
+        else:
+            # Lease used up before it expired: grow
+            self._next_sizes[lease_key] = min(self.config.lease_max_tokens, lease.granted * 2)
+
+    async def _release(self, lease_key: str):
+        """Retire a lease and any lease renewed for it."""
+        lease = self._leases.pop(lease_key, None)
+        if lease is None:
+            return
+        renewed = await lease.renewal if lease.renewal is not None else None
+        self._retire(lease_key, lease)
+        if renewed is not None:
+            self._retire(lease_key, renewed)
+
+    async def _refund(self, lease: TokenLease, amount: int):
+        """Return unused leased tokens to Redis."""
+        try:
+            if await lease.strategy.refund_limits(lease.checks, lease.backend, amount, lease.lease_id, lease.leased_at):
+                self._stats['tokens_refunded'] += amount
+        except Exception as e:
+            logger.error(f"Token lease refund failed: {e}")
@@ -33,6 +33,7 @@ class RedisRateLimitBackend:
         self._redis_pool = None
         self._redis_client = None
         self._memory_fallback = {}
+        self._script_hashes: Dict[str, str] = {}
         self._connection_healthy = False
         self._last_health_check = 0
         self._health_check_interval = 30  # seconds
@@ -111,6 +112,13 @@ class RedisRateLimitBackend:
         """Create prefixed Redis key."""
         return f"{self.config.redis_key_prefix}{key}"
     
+    @staticmethod
+    def _is_noscript_error(error: Exception) -> bool:
+        """Check whether EVALSHA failed because the script is not cached."""
+        # redis-py strips the NOSCRIPT prefix when raising NoScriptError
+        message = str(error)
+        return "NOSCRIPT" in message or "No matching script" in message
+    
     async def execute_lua_script(
         self,
         script: str,
@@ -134,7 +142,7 @@ class RedisRateLimitBackend:
                 # Try to execute by hash first (more efficient)
                 result = await self._redis_client.evalsha(script_hash, len(prefixed_keys), *prefixed_keys, *args)
             except redis.ResponseError as e:
-                if "NOSCRIPT" in str(e):
+                if self._is_noscript_error(e):
                     # Script not cached, send full script
                     result = await self._redis_client.eval(script, len(prefixed_keys), *prefixed_keys, *args)
                 else:
@@ -146,6 +154,38 @@ class RedisRateLimitBackend:
             logger.error(f"Lua script execution failed: {e}")
             return await self._execute_fallback_script(script, keys, args)
     
+    async def execute_batch_script(
+        self,
+        script: str,
+        keys: List[str],
+        args: List[Union[str, int, float]]
+    ) -> Optional[List[Any]]:
+        """
+        Execute a multi-key Lua script atomically, without memory fallback.
+        
+        Returns None when Redis is unavailable or the script fails, so callers
+        can fall back to per-key checks that the memory fallback understands.
+        """
+        if not await self._check_health():
+            return None
+        
+        try:
+            prefixed_keys = [self._make_key(key) for key in keys]
+            script_hash = self._script_hashes.get(script)
+            if script_hash is None:
+                script_hash = self._script_hashes[script] = hashlib.sha1(script.encode()).hexdigest()
+            
+            try:
+                return await self._redis_client.evalsha(script_hash, len(prefixed_keys), *prefixed_keys, *args)
+            except redis.ResponseError as e:
+                if self._is_noscript_error(e):
+                    return await self._redis_client.eval(script, len(prefixed_keys), *prefixed_keys, *args)
+                raise
+            
+        except Exception as e:
+            logger.error(f"Batch Lua script execution failed: {e}")
+            return None
+    
     async def _execute_fallback_script(
         self,
         script: str,
@@ -9,7 +9,7 @@ import time
 import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
 import logging
 
 if TYPE_CHECKING:
@@ -45,9 +45,104 @@ class RateLimitResult:
         return headers
 
 
+@dataclass
+class LimitCheck:
+    """One (key, window) limit evaluated as part of a combined check."""
+    key: str
+    limit: int
+    window: int
+    burst_capacity: Optional[int] = None
+
+
+@dataclass
+class GlobalLimit:
+    """A global fixed-window counter checked before any per-key limit."""
+    key: str
+    limit: int
+    window: int
+
+
+# Wraps a strategy's Lua ``evaluate``/``apply`` functions so that global
+# counters and every per-key limit are checked in a single script call.
+# Limits are evaluated first and only consumed when all of them allow the
+# request, so a request blocked by one window does not use up the others.
+# ``cost`` units are consumed at once when leasing a block of tokens.
+#
+# KEYS: global counter keys, then per-check keys
+# ARGV: now, cost, lease id, global count, (limit, window) per global, then
+#       (limit, window, capacity, extra) per check
+COMBINED_SCRIPT_HEADER = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local lease_id = ARGV[3]
+local global_count = tonumber(ARGV[4])
+"""
+
+COMBINED_SCRIPT_BODY = """
+for i = 1, global_count do
+    local limit = tonumber(ARGV[3 + i * 2])
+    local window = tonumber(ARGV[4 + i * 2])
+    local count = redis.call('INCRBY', KEYS[i], cost)
+    redis.call('EXPIRE', KEYS[i], window)
+    if count > limit then
+        return {-1, i, count}
+    end
+end
+
+local base = 4 + global_count * 2
+local states = {}
+local all_allowed = true
+for i = global_count + 1, #KEYS do
+    local offset = base + (i - global_count - 1) * 4
+    local state = evaluate(
+        KEYS[i], tonumber(ARGV[offset + 1]), tonumber(ARGV[offset + 2]),
+        tonumber(ARGV[offset + 3]), now, tonumber(ARGV[offset + 4])
+    )
+    states[i] = state
+    if not state[1] then
+        all_allowed = false
+    end
+end
+
+local response = {all_allowed and 1 or 0, 0}
+for i = global_count + 1, #KEYS do
+    local offset = base + (i - global_count - 1) * 4
+    local applied = apply(
+        KEYS[i], tonumber(ARGV[offset + 1]), tonumber(ARGV[offset + 2]),
+        tonumber(ARGV[offset + 3]), now, tonumber(ARGV[offset + 4]), states[i], all_allowed
+    )
+    table.insert(response, states[i][1] and 1 or 0)
+    table.insert(response, applied[1])
+    table.insert(response, applied[2])
+    table.insert(response, applied[3])
+end
+return response
+"""
+
+# Returns ``cost`` unused leased units to every per-check key, using the
+# same ARGV layout as the combined script (with no global counters)
+REFUND_SCRIPT_BODY = """
+for i = 1, #KEYS do
+    local offset = 4 + (i - 1) * 4
+    refund(
+        KEYS[i], tonumber(ARGV[offset + 1]), tonumber(ARGV[offset + 2]),
+        tonumber(ARGV[offset + 3]), now, tonumber(ARGV[offset + 4])
+    )
+end
+return #KEYS
+"""
+
+
 class RateLimitStrategy(ABC):
     """Abstract base class for rate limiting strategies."""
     
+    # Lua ``evaluate(key, limit, window, capacity, now, extra)`` returning
+    # ``{allowed, state}``, ``apply(..., state, consume)`` returning
+    # ``{remaining, reset_time, usage}`` and ``refund(...)`` giving back
+    # ``cost`` leased units; strategies without it cannot be evaluated in a
+    # combined check
+    combined_functions: Optional[str] = None
+    
     @abstractmethod
     async def check_limit(
         self,
@@ -64,6 +159,158 @@ class RateLimitStrategy(ABC):
     def get_strategy_name(self) -> str:
         """Get the name of this strategy."""
         pass
+    
+    @abstractmethod
+    def storage_key(self, key: str, window: int, current_time: float) -> str:
+        """Get the Redis key holding the state of ``key`` for ``window``."""
+        pass
+    
+    def capacity(self, check: LimitCheck) -> int:
+        """Get the maximum number of requests ``check`` can hold."""
+        return check.limit
+    
+    def window_start(self, window: int, current_time: float) -> float:
+        """Get the extra per-check script argument (start of the current window)."""
+        return 0
+    
+    @property
+    def combined_script(self) -> Optional[str]:
+        """Full Lua script evaluating several limits in one call."""
+        if self.combined_functions is None:
+            return None
+        script = getattr(self, "_combined_script", None)
+        if script is None:
+            script = COMBINED_SCRIPT_HEADER + self.combined_functions + COMBINED_SCRIPT_BODY
+            self._combined_script = script
+        return script
+    
+    @property
+    def refund_script(self) -> Optional[str]:
+        """Full Lua script returning unused leased units to several keys."""
+        if self.combined_functions is None:
+            return None
+        script = getattr(self, "_refund_script", None)
+        if script is None:
+            script = COMBINED_SCRIPT_HEADER + self.combined_functions + REFUND_SCRIPT_BODY
+            self._refund_script = script
+        return script
+    
+    def _script_args(
+        self,
+        checks: Sequence[LimitCheck],
+        global_limits: Sequence[GlobalLimit],
+        current_time: float,
+        cost: int,
+        lease_id: str
+    ) -> Tuple[List[str], List[Any]]:
+        """Build KEYS and ARGV for the combined and refund scripts."""
+        keys = [limit.key for limit in global_limits]
+        args: List[Any] = [current_time, cost, lease_id, len(global_limits)]
+        for limit in global_limits:
+            args.extend([limit.limit, limit.window])
+        for check in checks:
+            keys.append(self.storage_key(check.key, check.window, current_time))
+            args.extend([
+                check.limit,
+                check.window,
+                self.capacity(check),
+                self.window_start(check.window, current_time),
+            ])
+        return keys, args
+    
+    async def check_limits(
+        self,
+        checks: Sequence[LimitCheck],
+        backend: 'RedisRateLimitBackend',
+        global_limits: Sequence[GlobalLimit] = (),
+        cost: int = 1,
+        lease_id: str = ""
+    ) -> Optional[List[RateLimitResult]]:
+        """
+        Check global counters and several limits atomically in one Redis call.
+        
+        Args:
+            checks: Per-key limits to evaluate
+            backend: Rate limit backend
+            global_limits: Global counters incremented and checked first
+            cost: Units to consume from every limit (more than 1 when leasing)
+            lease_id: Unique lease identifier, used to tag leased units
+            
+        Returns:
+            One result per check, a single ``global_limit`` result if a global
+            counter was exceeded, or None if the backend cannot run the
+            combined script (callers should then check limits one by one)
+        """
+        script = self.combined_script
+        if script is None:
+            return None
+        
+        current_time = time.time()
+        keys, args = self._script_args(checks, global_limits, current_time, cost, lease_id)
+        
+        result = await backend.execute_batch_script(script, keys=keys, args=args)
+        if result is None:
+            return None
+        
+        status = int(result[0])
+        if status == -1:
+            limit = global_limits[int(result[1]) - 1]
+            return [RateLimitResult(
+                allowed=False,
+                remaining=0,
+                reset_time=current_time + limit.window,
+                retry_after=limit.window,
+                current_usage=int(result[2]),
+                limit=limit.limit,
+                window_size=limit.window,
+                strategy="global_limit"
+            )]
+        
+        results = []
+        for index, check in enumerate(checks):
+            allowed, remaining, reset_time, usage = result[2 + index * 4:6 + index * 4]
+            allowed = bool(int(allowed))
+            reset_time = float(reset_time)
+            results.append(RateLimitResult(
+                allowed=allowed,
+                remaining=max(0, int(remaining)),
+                reset_time=reset_time,
+                retry_after=max(1, int(reset_time - current_time)) if not allowed else None,
+                current_usage=int(usage),
+                limit=self.capacity(check),
+                window_size=check.window,
+                strategy=self.get_strategy_name()
+            ))
+        return results
+    
+    async def refund_limits(
+        self,
+        checks: Sequence[LimitCheck],
+        backend: 'RedisRateLimitBackend',
+        amount: int,
+        lease_id: str,
+        leased_at: float
+    ) -> bool:
+        """
+        Return unused leased units to every limit in one Redis call.
+        
+        Args:
+            checks: Per-key limits the lease was taken from
+            backend: Rate limit backend
+            amount: Unused units to give back
+            lease_id: Identifier the lease was taken with
+            leased_at: Time the lease was taken (selects fixed window keys)
+            
+        Returns:
+            True if the refund was applied
+        """
+        script = self.refund_script
+        if script is None or amount <= 0:
+            return False
+        
+        keys, args = self._script_args(checks, (), leased_at, amount, lease_id)
+        args[0] = time.time()
+        return await backend.execute_batch_script(script, keys=keys, args=args) is not None
 
 
 class TokenBucketStrategy(RateLimitStrategy):
@@ -75,9 +322,43 @@ class TokenBucketStrategy(RateLimitStrategy):
     Good for APIs that need to handle traffic spikes.
     """
     
+    combined_functions = """
+    local function evaluate(key, limit, window, capacity, now, extra)
+        local bucket_data = redis.call('HMGET', key, 'tokens', 'last_refill')
+        local tokens = tonumber(bucket_data[1]) or capacity
+        local last_refill = tonumber(bucket_data[2]) or now
+        local tokens_to_add = math.floor((now - last_refill) * limit / window)
+        tokens = math.min(capacity, tokens + tokens_to_add)
+        return {tokens >= cost, tokens}
+    end
+    
+    local function apply(key, limit, window, capacity, now, extra, state, consume)
+        local tokens = state[2]
+        if consume then
+            tokens = tokens - cost
+        end
+        redis.call('HMSET', key, 'tokens', tokens, 'last_refill', now)
+        redis.call('EXPIRE', key, window)
+        return {tokens, now + ((capacity - tokens) / (limit / window)), capacity - tokens}
+    end
+    
+    local function refund(key, limit, window, capacity, now, extra)
+        local tokens = tonumber(redis.call('HGET', key, 'tokens'))
+        if tokens then
+            redis.call('HSET', key, 'tokens', math.min(capacity, tokens + cost))
+        end
+    end
+    """
+    
     def get_strategy_name(self) -> str:
         return "token_bucket"
     
+    def storage_key(self, key: str, window: int, current_time: float) -> str:
+        return f"tb:{key}"
+    
+    def capacity(self, check: LimitCheck) -> int:
+        return check.limit if check.burst_capacity is None else check.burst_capacity
+    
     async def check_limit(
         self,
         key: str,
@@ -178,9 +459,42 @@ class SlidingWindowStrategy(RateLimitStrategy):
     Most accurate but requires more memory.
     """
     
+    combined_functions = """
+    local function evaluate(key, limit, window, capacity, now, extra)
+        redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+        local current_count = redis.call('ZCARD', key)
+        return {current_count + cost <= limit, current_count}
+    end
+    
+    local function apply(key, limit, window, capacity, now, extra, state, consume)
+        local current_count = state[2]
+        if consume then
+            if lease_id == '' then
+                redis.call('ZADD', key, now, now)
+            else
+                for i = 1, cost do
+                    redis.call('ZADD', key, now, lease_id .. ':' .. i)
+                end
+            end
+            current_count = current_count + cost
+        end
+        redis.call('EXPIRE', key, window)
+        return {limit - current_count, now + window, current_count}
+    end
+    
+    local function refund(key, limit, window, capacity, now, extra)
+        for i = 1, cost do
+            redis.call('ZREM', key, lease_id .. ':' .. i)
+        end
+    end
+    """
+    
     def get_strategy_name(self) -> str:
         return "sliding_window"
     
+    def storage_key(self, key: str, window: int, current_time: float) -> str:
+        return f"sw:{key}"
+    
     async def check_limit(
         self,
         key: str,
@@ -271,9 +585,37 @@ class FixedWindowStrategy(RateLimitStrategy):
     Memory efficient but can have burst issues at window boundaries.
     """
     
+    combined_functions = """
+    local function evaluate(key, limit, window, capacity, now, extra)
+        local current_count = tonumber(redis.call('GET', key) or 0)
+        return {current_count + cost <= limit, current_count}
+    end
+    
+    local function apply(key, limit, window, capacity, now, extra, state, consume)
+        local current_count = state[2]
+        if consume then
+            current_count = redis.call('INCRBY', key, cost)
+            redis.call('EXPIRE', key, window)
+        end
+        return {limit - current_count, extra + window, current_count}
+    end
+    
+    local function refund(key, limit, window, capacity, now, extra)
+        if redis.call('EXISTS', key) == 1 then
+            redis.call('DECRBY', key, cost)
+        end
+    end
+    """
+    
     def get_strategy_name(self) -> str:
         return "fixed_window"
     
+    def storage_key(self, key: str, window: int, current_time: float) -> str:
+        return f"fw:{key}:{int(self.window_start(window, current_time))}"
+    
+    def window_start(self, window: int, current_time: float) -> float:
+        return int(current_time // window) * window
+    
     async def check_limit(
         self,
         key: str,
@@ -361,9 +703,43 @@ class LeakyBucketStrategy(RateLimitStrategy):
     Good for protecting downstream services from spikes.
     """
     
+    combined_functions = """
+    local function evaluate(key, limit, window, capacity, now, extra)
+        local bucket_data = redis.call('HMGET', key, 'level', 'last_leak')
+        local level = tonumber(bucket_data[1]) or 0
+        local last_leak = tonumber(bucket_data[2]) or now
+        level = math.max(0, level - (now - last_leak) * limit / window)
+        return {level + cost - 1 < capacity, level}
+    end
+    
+    local function apply(key, limit, window, capacity, now, extra, state, consume)
+        local level = state[2]
+        if consume then
+            level = level + cost
+        end
+        redis.call('HMSET', key, 'level', level, 'last_leak', now)
+        redis.call('EXPIRE', key, window)
+        local reset_time = now
+        if level >= capacity then
+            reset_time = now + ((level - capacity + 1) / (limit / window))
+        end
+        return {capacity - level, reset_time, level}
+    end
+    
+    local function refund(key, limit, window, capacity, now, extra)
+        local level = tonumber(redis.call('HGET', key, 'level'))
+        if level then
+            redis.call('HSET', key, 'level', math.max(0, level - cost))
+        end
+    end
+    """
+    
     def get_strategy_name(self) -> str:
         return "leaky_bucket"
     
+    def storage_key(self, key: str, window: int, current_time: float) -> str:
+        return f"lb:{key}"
+    
     async def check_limit(
         self,
         key: str,
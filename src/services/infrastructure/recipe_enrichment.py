@@ -0,0 +1,221 @@
+"""
+Recipe Enrichment Stage
+Resolves the recipes for a meal plan's meal names concurrently, deduplicating
+names within a plan and sharing resolved lookups across users.
+
+Completed lookups are shared process-wide and handed out as copies. In-flight
+lookups are only shared within one event loop: plans generated concurrently
+on other threads (each with its own ``asyncio.run`` loop) cannot await them.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RecipeLookupKey = Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]
+InflightLookups = Dict[RecipeLookupKey, asyncio.Future]
+
+MEAL_TYPES = ['breakfast', 'lunch', 'dinner', 'snacks']
+
+
+def normalize_meal_name(meal_name: str) -> str:
+    """Normalize a meal name for lookup deduplication"""
+    return " ".join(meal_name.lower().split())
+
+
+def recipe_lookup_key(
+    meal_name: str,
+    diet_labels: Iterable[str],
+    health_labels: Iterable[str],
+    scope: str = "recipe"
+) -> RecipeLookupKey:
+    """Build the shared cache key for a recipe lookup"""
+    return (
+        scope,
+        normalize_meal_name(meal_name),
+        tuple(sorted(set(diet_labels))),
+        tuple(sorted(set(health_labels))),
+    )
+
+
+def plan_meals(meal_plan: Dict[str, Any], meal_types: Iterable[str] = MEAL_TYPES) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """List (day, meal type, meal) entries of a meal plan that have a name"""
+    meals = []
+    for day_key, day_data in meal_plan.get('days', {}).items():
+        for meal_type in meal_types:
+            meal = day_data.get(meal_type)
+            if meal and isinstance(meal, dict) and meal.get('name'):
+                meals.append((day_key, meal_type, meal))
+    return meals
+
+
+class RecipeLookupCache:
+    """Bounded, thread-safe in-process cache of recipe lookups shared by all users"""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[RecipeLookupKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # In-flight lookups per event loop; entries go away with their loop
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InflightLookups]" = weakref.WeakKeyDictionary()
+        self.stats = {'hits': 0, 'misses': 0, 'shared_inflight': 0}
+
+    def get(self, key: RecipeLookupKey) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached recipe, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            recipe = entry[1]
+        return copy.deepcopy(recipe)
+
+    def set(self, key: RecipeLookupKey, recipe: Dict[str, Any]) -> None:
+        """Cache a copy of a recipe, evicting the least recently used entries"""
+        recipe = copy.deepcopy(recipe)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, recipe)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def inflight(self) -> InflightLookups:
+        """In-flight lookups of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.get(loop)
+            if inflight is None:
+                inflight = self._inflight[loop] = {}
+            return inflight
+
+    def clear(self) -> None:
+        """Drop all cached lookups"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared across AIService instances so lookups resolved for one user are
+# reused for everyone with the same meal name and labels
+shared_recipe_cache = RecipeLookupCache()
+
+
+class RecipeEnrichmentStage:
+    """Concurrent, deduplicated and cached recipe lookups for meal plans"""
+
+    def __init__(
+        self,
+        cache: Optional[RecipeLookupCache] = None,
+        max_concurrency: int = 6,
+        timeout_seconds: float = 8.0
+    ):
+        self.cache = cache if cache is not None else shared_recipe_cache
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+
+    async def resolve(
+        self,
+        meal_names: Iterable[str],
+        lookup: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        diet_labels: Iterable[str] = (),
+        health_labels: Iterable[str] = (),
+        scope: str = "recipe"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve recipes for meal names.
+
+        Args:
+            meal_names: Meal names, possibly repeated across the plan
+            lookup: Coroutine function fetching the recipe for one meal name
+            diet_labels: Diet labels the lookup filters by
+            health_labels: Health labels the lookup filters by
+            scope: Lookup variant, so differently shaped results never share keys
+
+        Returns:
+            Recipes by normalized meal name. Names whose lookup timed out or
+            failed are missing, so callers enrich the meals that did resolve.
+        """
+        diet_labels = list(diet_labels)
+        health_labels = list(health_labels)
+
+        # One lookup per distinct normalized name (first spelling wins)
+        names: Dict[str, str] = {}
+        for meal_name in meal_names:
+            names.setdefault(normalize_meal_name(meal_name), meal_name)
+
+        resolved: Dict[str, Dict[str, Any]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        inflight_lookups = self.cache.inflight()
+
+        for normalized, meal_name in names.items():
+            key = recipe_lookup_key(meal_name, diet_labels, health_labels, scope)
+            recipe = self.cache.get(key)
+            if recipe is not None:
+                resolved[normalized] = recipe
+                continue
+
+            inflight = inflight_lookups.get(key)
+            if inflight is not None:
+                # Another plan is already resolving this name
+                self.cache.stats['shared_inflight'] += 1
+                waiting[normalized] = inflight
+                continue
+
+            task = asyncio.ensure_future(self._lookup(key, meal_name, lookup, semaphore, inflight_lookups))
+            inflight_lookups[key] = task
+            waiting[normalized] = task
+
+        if not waiting:
+            return resolved
+
+        done, pending = await asyncio.wait(
+            [asyncio.shield(future) for future in waiting.values()],
+            timeout=self.timeout_seconds
+        )
+        if pending:
+            # Shielded lookups keep running and fill the cache for later plans
+            logger.warning(f"Recipe lookup timed out for {len(pending)} of {len(waiting)} meals")
+            for future in pending:
+                future.cancel()
+
+        for normalized, future in waiting.items():
+            if future.done() and not future.cancelled() and future.result():
+                # In-flight results are shared by every plan awaiting them
+                resolved[normalized] = copy.deepcopy(future.result())
+
+        return resolved
+
+    async def _lookup(
+        self,
+        key: RecipeLookupKey,
+        meal_name: str,
+        lookup: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        semaphore: asyncio.Semaphore,
+        inflight_lookups: InflightLookups
+    ) -> Optional[Dict[str, Any]]:
+        """Run one lookup within the concurrency bound and cache its result"""
+        try:
+            async with semaphore:
+                recipe = await lookup(meal_name)
+            # Empty results are usually API errors or quota, so they are not cached
+            if recipe:
+                self.cache.set(key, recipe)
+            return recipe
+        except Exception as e:
+            logger.warning(f"Error looking up recipe for {meal_name}: {e}")
+            return None
+        finally:
+            inflight_lookups.pop(key, None)
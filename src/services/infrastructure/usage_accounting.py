@@ -0,0 +1,231 @@
+"""
+Usage Accounting
+Buffers API usage (calls, tokens, estimated cost) in process and flushes it to
+the API usage table with atomic ADD updates, off the request path.
+"""
+
+import atexit
+import functools
+import logging
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# Estimated USD per 1K tokens as (input, output)
+BEDROCK_PRICING_PER_1K = {
+    'amazon.titan-text-express-v1': (0.0002, 0.0006),
+    'amazon.titan-text-lite-v1': (0.00015, 0.0002),
+}
+DEFAULT_PRICING_PER_1K = (0.0008, 0.0016)
+
+COUNTER_FIELDS = ('count', 'input_tokens', 'output_tokens', 'total_cost')
+
+
+def bedrock_cost(model_id: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate the cost of one Bedrock invocation"""
+    input_price, output_price = BEDROCK_PRICING_PER_1K.get(model_id, DEFAULT_PRICING_PER_1K)
+    return (input_tokens * input_price + output_tokens * output_price) / 1000
+
+
+class UsageAccumulator:
+    """
+    In-process usage counters per (day, API type), flushed periodically.
+
+    Items use the ``system#{api_type}#{date}`` keys and ``count``/``total_cost``
+    attributes of the API usage table, so ``EdamamUsageTracker`` summaries and
+    cost dashboards read Bedrock usage alongside Edamam usage.
+    """
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        flush_interval_seconds: float = 30.0,
+        retention_days: int = 90,
+        table_factory: Optional[Callable[[str], Any]] = None
+    ):
+        self.table_name = table_name or os.getenv('API_USAGE_TABLE_NAME', 'ai-nutritionist-api-usage-dev')
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retention_days = retention_days
+        self._table_factory = table_factory or (lambda name: boto3.resource('dynamodb').Table(name))
+        self._table = None
+        self._pending: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # Reentrant: the SIGTERM handler flushes on the main thread, which may
+        # be interrupted while it holds either lock in record() or flush()
+        self._lock = threading.RLock()
+        self._flush_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._shutdown_hooks_installed = False
+        self.stats = {'recorded': 0, 'flushes': 0, 'items_written': 0, 'flush_errors': 0}
+
+    def record(
+        self,
+        api_type: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cost: float = 0.0,
+        calls: int = 1,
+        date: Optional[str] = None
+    ) -> None:
+        """Add usage to the in-process counters; never performs I/O"""
+        key = (date or datetime.now().strftime('%Y-%m-%d'), api_type)
+        with self._lock:
+            counters = self._pending.get(key)
+            if counters is None:
+                counters = self._pending[key] = dict.fromkeys(COUNTER_FIELDS, 0)
+            counters['count'] += calls
+            counters['input_tokens'] += input_tokens
+            counters['output_tokens'] += output_tokens
+            counters['total_cost'] += cost
+            self.stats['recorded'] += 1
+
+        if self._worker is None:
+            self._start()
+
+    def snapshot(self, date: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Get counters not yet flushed, by API type, for a day (default today)"""
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        with self._lock:
+            return {
+                api_type: dict(counters)
+                for (day, api_type), counters in self._pending.items()
+                if day == date
+            }
+
+    def flush(self) -> int:
+        """Write pending counters with atomic ADD updates; returns items written"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            written = 0
+            failed: Dict[Tuple[str, str], Dict[str, float]] = {}
+            for (date, api_type), counters in pending.items():
+                try:
+                    self._write(date, api_type, counters)
+                    written += 1
+                except Exception as e:
+                    logger.warning(f"Error flushing usage for {api_type}: {e}")
+                    failed[(date, api_type)] = counters
+
+            if failed:
+                # Keep failed counters for the next flush
+                self.stats['flush_errors'] += 1
+                with self._lock:
+                    for key, counters in failed.items():
+                        current = self._pending.setdefault(key, dict.fromkeys(COUNTER_FIELDS, 0))
+                        for field in COUNTER_FIELDS:
+                            current[field] += counters[field]
+
+            self.stats['flushes'] += 1
+            self.stats['items_written'] += written
+            return written
+
+    def close(self) -> None:
+        """Stop the flush thread and flush what is left"""
+        self._stop.set()
+        self.flush()
+
+    def _write(self, date: str, api_type: str, counters: Dict[str, float]) -> None:
+        """Apply one item's counters to the usage table"""
+        if self._table is None:
+            self._table = self._table_factory(self.table_name)
+        expires_at = datetime.strptime(date, '%Y-%m-%d') + timedelta(days=self.retention_days)
+        self._table.update_item(
+            Key={'usage_key': f"system#{api_type}#{date}"},
+            UpdateExpression=(
+                'ADD #count :count, #input :input, #output :output, #cost :cost '
+                'SET #ttl = if_not_exists(#ttl, :ttl)'
+            ),
+            ExpressionAttributeNames={
+                '#count': 'count',
+                '#input': 'input_tokens',
+                '#output': 'output_tokens',
+                '#cost': 'total_cost',
+                '#ttl': 'ttl'
+            },
+            ExpressionAttributeValues={
+                ':count': int(counters['count']),
+                ':input': int(counters['input_tokens']),
+                ':output': int(counters['output_tokens']),
+                # DynamoDB numbers must be Decimal, not float
+                ':cost': Decimal(str(round(counters['total_cost'], 8))),
+                ':ttl': int(expires_at.timestamp())
+            }
+        )
+
+    def _start(self) -> None:
+        """Start the periodic flush thread and install shutdown hooks"""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name='usage-accounting', daemon=True)
+            self._worker.start()
+            self._install_shutdown_hooks()
+
+    def _run(self) -> None:
+        """Flush periodically until closed"""
+        while not self._stop.wait(self.flush_interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Usage flush failed: {e}")
+
+    def _install_shutdown_hooks(self) -> None:
+        """
+        Flush on interpreter exit and on SIGTERM.
+
+        Lambda only delivers SIGTERM to runtimes with a registered extension;
+        handlers wrapped with ``flush_usage_after`` flush every invocation.
+        """
+        if self._shutdown_hooks_installed:
+            return
+        self._shutdown_hooks_installed = True
+        atexit.register(self.close)
+
+        try:
+            previous = signal.getsignal(signal.SIGTERM)
+
+            def on_sigterm(signum, frame):
+                self.close()
+                if callable(previous):
+                    previous(signum, frame)
+                elif previous != signal.SIG_IGN:
+                    # SIG_DFL, or None for a handler not installed from Python:
+                    # terminate as the default disposition would
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    os.kill(os.getpid(), signal.SIGTERM)
+
+            signal.signal(signal.SIGTERM, on_sigterm)
+        except ValueError:
+            # Signal handlers can only be installed from the main thread
+            pass
+
+
+# Shared by every service in the process
+usage_accumulator = UsageAccumulator()
+
+
+def flush_usage_after(handler: Callable) -> Callable:
+    """Decorate a Lambda handler to flush buffered usage before it returns"""
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            try:
+                usage_accumulator.flush()
+            except Exception as e:
+                logger.warning(f"Usage flush failed: {e}")
+
+    return wrapper
@@ -1,9 +1,16 @@
 """Integration service exports."""
 
-from .calendar_service import CalendarService
-from .fitness_service import FitnessService
-from .grocery_service import GroceryService
-from .health_sync_service import HealthSyncService
+from ..infrastructure.lazy_loading import lazy_exports
+
+# Imported on first access so each integration loads independently
+_EXPORTS = {
+    "CalendarService": ".calendar_service:CalendarService",
+    "FitnessService": ".fitness_service:FitnessService",
+    "GroceryService": ".grocery_service:GroceryService",
+    "HealthSyncService": ".health_sync_service:HealthSyncService",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "CalendarService",
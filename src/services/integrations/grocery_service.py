@@ -21,6 +21,7 @@ from ...models.integrations import (
     GroceryPartner,
     PartnerDeepLink
 )
+from .ingredients import IngredientAggregator
 
 
 logger = logging.getLogger(__name__)
@@ -119,43 +120,40 @@ class GroceryListGenerator:
             "piece": {"to_grams": 1, "display": "piece"},
             "item": {"to_grams": 1, "display": "item"}
         }
+        
+        # Canonical ingredients, unit normalization and pantry matching
+        self.aggregator = IngredientAggregator()
     
     def generate_from_meal_plan(self, user_id: UUID, meal_plan_id: UUID,
-                              meals: List[Dict], pantry_items: List[str] = None) -> GroceryList:
+                              meals: List[Dict], pantry_items: List[str] = None,
+                              household_size: Optional[int] = None) -> GroceryList:
         """Generate grocery list from meal plan."""
-        pantry_items = pantry_items or []
+        return self.generate_from_meal_plans(
+            user_id, [meals], pantry_items, household_size, meal_plan_id=meal_plan_id
+        )
+    
+    def generate_from_meal_plans(self, user_id: UUID, plans: List[List[Dict]],
+                               pantry_items: List[str] = None,
+                               household_size: Optional[int] = None,
+                               meal_plan_id: Optional[UUID] = None) -> GroceryList:
+        """
+        Generate one grocery list covering several meal plans.
+        
+        Ingredients are consolidated by canonical ingredient across plans and
+        units; meals with a ``servings`` count are scaled to ``household_size``.
+        """
         grocery_list = GroceryList(
             user_id=user_id,
             meal_plan_id=meal_plan_id,
             title=f"Grocery List - Week of {datetime.now().strftime('%B %d, %Y')}"
         )
         
-        # Extract ingredients from all meals
-        all_ingredients = []
-        for meal in meals:
-            if "ingredients" in meal:
-                for ingredient in meal["ingredients"]:
-                    all_ingredients.append({
-                        "name": ingredient.get("name", ""),
-                        "quantity": Decimal(str(ingredient.get("quantity", 1))),
-                        "unit": ingredient.get("unit", "item"),
-                        "recipe_id": meal.get("recipe_id"),
-                        "meal_name": meal.get("name", "")
-                    })
-        
-        # Group and consolidate ingredients
-        consolidated_ingredients = self._consolidate_ingredients(all_ingredients)
-        
-        # Filter out pantry items
-        filtered_ingredients = [
-            ing for ing in consolidated_ingredients
-            if ing["name"].lower() not in [item.lower() for item in pantry_items]
-        ]
+        consolidated_ingredients = self.aggregator.aggregate_plans(plans, pantry_items or [], household_size)
         
-        # Convert to grocery items
-        for ingredient in filtered_ingredients:
-            grocery_item = self._create_grocery_item(ingredient, meal_plan_id)
-            grocery_list.add_item(grocery_item)
+        # Consolidated items are unique, so skip add_item's duplicate scan
+        grocery_list.items.extend(
+            self._create_grocery_item(ingredient, meal_plan_id) for ingredient in consolidated_ingredients
+        )
         
         # Calculate total cost
         grocery_list.calculate_total_cost()
@@ -163,27 +161,8 @@ class GroceryListGenerator:
         return grocery_list
     
     def _consolidate_ingredients(self, ingredients: List[Dict]) -> List[Dict]:
-        """Consolidate duplicate ingredients by name and unit."""
-        consolidated = {}
-        
-        for ingredient in ingredients:
-            name = ingredient["name"].lower().strip()
-            unit = ingredient["unit"].lower()
-            key = f"{name}_{unit}"
-            
-            if key in consolidated:
-                # Add quantities
-                consolidated[key]["quantity"] += ingredient["quantity"]
-                # Keep track of recipes using this ingredient
-                if "recipes" not in consolidated[key]:
-                    consolidated[key]["recipes"] = []
-                if ingredient.get("recipe_id"):
-                    consolidated[key]["recipes"].append(ingredient["recipe_id"])
-            else:
-                consolidated[key] = ingredient.copy()
-                consolidated[key]["recipes"] = [ingredient.get("recipe_id")] if ingredient.get("recipe_id") else []
-        
-        return list(consolidated.values())
+        """Consolidate duplicate ingredients by canonical ingredient and unit dimension."""
+        return self.aggregator.consolidate(ingredients)
     
     def _create_grocery_item(self, ingredient: Dict, meal_plan_id: UUID) -> GroceryItem:
         """Create grocery item from ingredient."""
@@ -469,10 +448,24 @@ class GroceryService:
         self.grocery_lists: Dict[UUID, GroceryList] = {}
     
     def generate_grocery_list(self, user_id: UUID, meal_plan_id: UUID,
-                            meals: List[Dict], pantry_items: List[str] = None) -> GroceryList:
+                            meals: List[Dict], pantry_items: List[str] = None,
+                            household_size: Optional[int] = None) -> GroceryList:
         """Generate grocery list from meal plan."""
         grocery_list = self.generator.generate_from_meal_plan(
-            user_id, meal_plan_id, meals, pantry_items
+            user_id, meal_plan_id, meals, pantry_items, household_size
+        )
+        
+        # Store the list
+        self.grocery_lists[grocery_list.list_id] = grocery_list
+        
+        return grocery_list
+    
+    def generate_household_grocery_list(self, user_id: UUID, plans: List[List[Dict]],
+                                      pantry_items: List[str] = None,
+                                      household_size: Optional[int] = None) -> GroceryList:
+        """Generate one grocery list for several meal plans (e.g. a month for a household)."""
+        grocery_list = self.generator.generate_from_meal_plans(
+            user_id, plans, pantry_items, household_size
         )
         
         # Store the list
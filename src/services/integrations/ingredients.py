@@ -0,0 +1,343 @@
+"""Ingredient aggregation engine for grocery lists.
+
+Resolves ingredient names to canonical ids through an alias table, converts
+quantities to one base unit per ingredient (mass, volume or count, bridged by
+per-ingredient densities and unit weights) and sums them across meals, plans
+and household members in a single pass over the ingredient rows. Ingredients
+only ever listed by count ("2 bell peppers") are shown as a count even when
+their base unit is a mass.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MASS = "mass"        # grams
+VOLUME = "volume"    # millilitres
+COUNT = "count"      # items
+
+# Unit aliases -> (dimension, factor to the dimension's base unit)
+UNITS: Dict[str, Tuple[str, float]] = {
+    "g": (MASS, 1.0), "gram": (MASS, 1.0), "grams": (MASS, 1.0),
+    "kg": (MASS, 1000.0), "kilogram": (MASS, 1000.0), "kilograms": (MASS, 1000.0),
+    "oz": (MASS, 28.3495), "ounce": (MASS, 28.3495), "ounces": (MASS, 28.3495),
+    "lb": (MASS, 453.592), "lbs": (MASS, 453.592), "pound": (MASS, 453.592), "pounds": (MASS, 453.592),
+    "ml": (VOLUME, 1.0), "milliliter": (VOLUME, 1.0), "milliliters": (VOLUME, 1.0),
+    "l": (VOLUME, 1000.0), "liter": (VOLUME, 1000.0), "liters": (VOLUME, 1000.0),
+    "tsp": (VOLUME, 4.92892), "teaspoon": (VOLUME, 4.92892), "teaspoons": (VOLUME, 4.92892),
+    "tbsp": (VOLUME, 14.7868), "tablespoon": (VOLUME, 14.7868), "tablespoons": (VOLUME, 14.7868),
+    "fl oz": (VOLUME, 29.5735), "cup": (VOLUME, 236.588), "cups": (VOLUME, 236.588),
+    "pint": (VOLUME, 473.176), "pints": (VOLUME, 473.176),
+    "quart": (VOLUME, 946.353), "quarts": (VOLUME, 946.353),
+    "gallon": (VOLUME, 3785.41), "gallons": (VOLUME, 3785.41),
+    "item": (COUNT, 1.0), "items": (COUNT, 1.0), "piece": (COUNT, 1.0), "pieces": (COUNT, 1.0),
+    "each": (COUNT, 1.0), "whole": (COUNT, 1.0), "clove": (COUNT, 1.0), "cloves": (COUNT, 1.0),
+    "head": (COUNT, 1.0), "heads": (COUNT, 1.0), "slice": (COUNT, 1.0), "slices": (COUNT, 1.0),
+    "fillet": (COUNT, 1.0), "fillets": (COUNT, 1.0), "dozen": (COUNT, 12.0),
+}
+
+
+@dataclass(frozen=True)
+class CanonicalIngredient:
+    """A canonical ingredient and how its quantities convert between dimensions."""
+
+    ingredient_id: str
+    base: str = MASS
+    density: Optional[float] = None      # grams per millilitre
+    unit_weight: Optional[float] = None  # grams per item
+    aliases: Tuple[str, ...] = ()
+
+
+DEFAULT_INGREDIENTS: Tuple[CanonicalIngredient, ...] = (
+    CanonicalIngredient("chicken breast", MASS, unit_weight=200, aliases=("boneless skinless chicken breast",)),
+    CanonicalIngredient("chicken thigh", MASS, unit_weight=110),
+    CanonicalIngredient("ground beef", MASS, aliases=("minced beef", "beef mince")),
+    CanonicalIngredient("salmon", MASS, unit_weight=170, aliases=("salmon fillet",)),
+    CanonicalIngredient("tuna", MASS, aliases=("canned tuna", "tuna packet")),
+    CanonicalIngredient("eggs", COUNT, unit_weight=50, aliases=("egg", "large egg", "large eggs")),
+    CanonicalIngredient("tofu", MASS, unit_weight=400, aliases=("firm tofu", "extra firm tofu")),
+    CanonicalIngredient("chickpeas", MASS, density=0.7, aliases=("garbanzo beans", "chickpea")),
+    CanonicalIngredient("black beans", MASS, density=0.75),
+    CanonicalIngredient("lentils", MASS, density=0.8, aliases=("lentil", "red lentils", "green lentils")),
+    CanonicalIngredient("spinach", MASS, density=0.127, aliases=("baby spinach", "fresh spinach")),
+    CanonicalIngredient("lettuce", COUNT, unit_weight=500, aliases=("romaine lettuce", "romaine")),
+    CanonicalIngredient("tomato", MASS, unit_weight=120, aliases=("tomatoes",)),
+    CanonicalIngredient("onion", MASS, unit_weight=150, aliases=("yellow onion", "white onion")),
+    CanonicalIngredient("red onion", MASS, unit_weight=150),
+    CanonicalIngredient("garlic", COUNT, unit_weight=5, aliases=("garlic clove", "garlic cloves", "cloves garlic")),
+    CanonicalIngredient("carrot", MASS, density=0.54, unit_weight=60, aliases=("carrots",)),
+    CanonicalIngredient("broccoli", MASS, density=0.38, unit_weight=300, aliases=("broccoli florets",)),
+    CanonicalIngredient("bell pepper", MASS, unit_weight=150, aliases=("red bell pepper", "green bell pepper")),
+    CanonicalIngredient("cucumber", COUNT, unit_weight=300),
+    CanonicalIngredient("avocado", COUNT, unit_weight=150),
+    CanonicalIngredient("apple", COUNT, unit_weight=180),
+    CanonicalIngredient("banana", COUNT, unit_weight=120),
+    CanonicalIngredient("lemon", COUNT, unit_weight=60),
+    CanonicalIngredient("lime", COUNT, unit_weight=45),
+    CanonicalIngredient("berries", MASS, density=0.61, aliases=("mixed berries", "blueberries", "blueberry")),
+    CanonicalIngredient("milk", VOLUME, density=1.03, aliases=("whole milk", "skim milk", "2% milk")),
+    CanonicalIngredient("greek yogurt", MASS, density=1.03, aliases=("plain greek yogurt",)),
+    CanonicalIngredient("yogurt", MASS, density=1.03, aliases=("plain yogurt",)),
+    CanonicalIngredient("cheddar cheese", MASS, density=0.48, aliases=("cheddar", "shredded cheddar")),
+    CanonicalIngredient("butter", MASS, density=0.96, aliases=("unsalted butter", "salted butter")),
+    CanonicalIngredient("heavy cream", VOLUME, density=1.0, aliases=("cream", "whipping cream")),
+    CanonicalIngredient("rice", MASS, density=0.78, aliases=("white rice", "long grain rice")),
+    CanonicalIngredient("brown rice", MASS, density=0.8),
+    CanonicalIngredient("oats", MASS, density=0.34, aliases=("rolled oats", "oatmeal")),
+    CanonicalIngredient("pasta", MASS, density=0.42, aliases=("spaghetti", "penne")),
+    CanonicalIngredient("bread", MASS, unit_weight=30, aliases=("sliced bread", "whole wheat bread")),
+    CanonicalIngredient("flour", MASS, density=0.53, aliases=("all-purpose flour", "all purpose flour")),
+    CanonicalIngredient("sugar", MASS, density=0.85, aliases=("granulated sugar", "white sugar")),
+    CanonicalIngredient("salt", MASS, density=1.2, aliases=("sea salt", "kosher salt", "table salt")),
+    CanonicalIngredient("black pepper", MASS, density=0.46, aliases=("pepper", "ground black pepper")),
+    CanonicalIngredient("olive oil", VOLUME, density=0.91, aliases=("extra virgin olive oil", "evoo")),
+    CanonicalIngredient("vegetable oil", VOLUME, density=0.92, aliases=("canola oil",)),
+    CanonicalIngredient("soy sauce", VOLUME, density=1.15, aliases=("low sodium soy sauce", "tamari")),
+    CanonicalIngredient("vinegar", VOLUME, density=1.01, aliases=("white vinegar",)),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, trim and collapse whitespace."""
+    return _WHITESPACE.sub(" ", (name or "").lower()).strip()
+
+
+def singular(name: str) -> str:
+    """Naive singular form of the last word ("tomatoes" -> "tomato")."""
+    head, _, word = name.rpartition(" ")
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("oes", "ches", "shes", "xes", "ses")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+    return f"{head} {word}" if head else word
+
+
+def unit_dimension(unit: str) -> Tuple[str, float]:
+    """Dimension of ``unit`` and its factor to that dimension's base; unknown units stand alone."""
+    unit = normalize_name(unit) or "item"
+    return UNITS.get(unit) or UNITS.get(singular(unit)) or (f"unit:{unit}", 1.0)
+
+
+class IngredientCatalog:
+    """Canonical ingredient table with O(1) alias lookup."""
+
+    def __init__(self, ingredients: Iterable[CanonicalIngredient] = DEFAULT_INGREDIENTS):
+        self.ingredients: Dict[str, CanonicalIngredient] = {}
+        self._aliases: Dict[str, str] = {}
+        for ingredient in ingredients:
+            self.add(ingredient)
+
+    def add(self, ingredient: CanonicalIngredient) -> None:
+        """Register an ingredient under its id, its aliases and their singular forms."""
+        self.ingredients[ingredient.ingredient_id] = ingredient
+        for alias in (ingredient.ingredient_id,) + ingredient.aliases:
+            alias = normalize_name(alias)
+            self._aliases.setdefault(alias, ingredient.ingredient_id)
+            self._aliases.setdefault(singular(alias), ingredient.ingredient_id)
+
+    def resolve(self, name: str) -> str:
+        """Canonical id for an ingredient name; unknown names map to their singular form."""
+        normalized = normalize_name(name)
+        found = self._aliases.get(normalized)
+        if found is None:
+            normalized = singular(normalized)
+            found = self._aliases.get(normalized, normalized)
+        return found
+
+    def conversion(self, ingredient_id: str, unit: str) -> Tuple[str, float]:
+        """Dimension a quantity in ``unit`` is summed in, and its factor to that dimension's base."""
+        dimension, factor = unit_dimension(unit)
+        ingredient = self.ingredients.get(ingredient_id)
+        if ingredient is None or dimension == ingredient.base:
+            return dimension, factor
+
+        if dimension == MASS:
+            grams = factor
+        elif dimension == VOLUME and ingredient.density:
+            grams = factor * ingredient.density
+        elif dimension == COUNT and ingredient.unit_weight:
+            grams = factor * ingredient.unit_weight
+        else:
+            return dimension, factor
+
+        if ingredient.base == MASS:
+            return MASS, grams
+        if ingredient.base == VOLUME and ingredient.density:
+            return VOLUME, grams / ingredient.density
+        if ingredient.base == COUNT and ingredient.unit_weight:
+            return COUNT, grams / ingredient.unit_weight
+        return dimension, factor
+
+
+class PantryIndex:
+    """Hashed set of the canonical ids a household already has."""
+
+    def __init__(self, catalog: IngredientCatalog, pantry_items: Iterable[str] = ()):
+        self._ids = frozenset(catalog.resolve(item) for item in pantry_items if item)
+
+    def __contains__(self, ingredient_id: str) -> bool:
+        return ingredient_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def display_quantity(dimension: str, base_quantity: float) -> Tuple[Decimal, str]:
+    """Convert a base quantity to a shopping-friendly unit."""
+    if dimension == MASS:
+        quantity, unit = (base_quantity / UNITS["lb"][1], "lb") if base_quantity >= UNITS["lb"][1] \
+            else (base_quantity / UNITS["oz"][1], "oz")
+    elif dimension == VOLUME:
+        if base_quantity >= UNITS["gallon"][1]:
+            quantity, unit = base_quantity / UNITS["gallon"][1], "gallon"
+        elif base_quantity >= UNITS["cup"][1] / 4:
+            quantity, unit = base_quantity / UNITS["cup"][1], "cup"
+        elif base_quantity >= UNITS["tbsp"][1]:
+            quantity, unit = base_quantity / UNITS["tbsp"][1], "tbsp"
+        else:
+            quantity, unit = base_quantity / UNITS["tsp"][1], "tsp"
+    elif dimension == COUNT:
+        quantity, unit = base_quantity, "item"
+    else:
+        quantity, unit = base_quantity, dimension.split(":", 1)[1]
+    return max(Decimal(str(round(quantity, 2))), Decimal("0.01")), unit
+
+
+@dataclass
+class _Bucket:
+    """Per-ingredient bookkeeping gathered during the aggregation pass."""
+
+    ingredient_id: str
+    dimension: str
+    name: str
+    meal_name: str
+    recipes: List = field(default_factory=list)
+    counted: bool = True  # every row was given as a count
+
+
+class IngredientAggregator:
+    """Consolidates ingredient rows from any number of meal plans in one pass."""
+
+    def __init__(self, catalog: Optional[IngredientCatalog] = None, cache_size: int = 4096):
+        self.catalog = catalog or IngredientCatalog()
+        self.cache_size = cache_size
+        # Keyed by raw names and units from recipes and LLM output; bounded
+        self._name_ids: Dict[str, str] = {}
+        self._conversions: Dict[Tuple[str, str], Tuple[str, float, Optional[float]]] = {}
+
+    def aggregate_plans(self, plans: Iterable[Iterable[Dict]], pantry_items: Iterable[str] = (),
+                        household_size: Optional[int] = None) -> List[Dict]:
+        """
+        Consolidated ingredients for several meal plans.
+
+        Meals with a ``servings`` count are scaled to ``household_size``;
+        ingredients whose canonical id is in the pantry are left out.
+        """
+        rows = []
+        for meals in plans:
+            for meal in meals:
+                scale = 1.0
+                if household_size and meal.get("servings"):
+                    scale = household_size / float(meal["servings"])
+                for ingredient in meal.get("ingredients", ()):
+                    rows.append({
+                        "name": ingredient.get("name", ""),
+                        "quantity": float(ingredient.get("quantity", 1)) * scale,
+                        "unit": ingredient.get("unit", "item"),
+                        "recipe_id": meal.get("recipe_id"),
+                        "meal_name": meal.get("name", ""),
+                    })
+        return self.consolidate(rows, pantry_items)
+
+    def consolidate(self, ingredients: Iterable[Dict], pantry_items: Iterable[str] = ()) -> List[Dict]:
+        """Sum ingredient rows by canonical id and dimension."""
+        buckets: Dict[Tuple[str, str], int] = {}
+        bucket_info: List[_Bucket] = []
+        indices: List[int] = []
+        quantities: List[float] = []
+        counts: List[float] = []
+
+        for ingredient in ingredients:
+            raw_name = ingredient["name"]
+            ingredient_id = self._name_ids.get(raw_name)
+            if ingredient_id is None:
+                ingredient_id = self._remember(self._name_ids, raw_name, self.catalog.resolve(raw_name))
+
+            unit = ingredient.get("unit") or "item"
+            conversion = self._conversions.get((ingredient_id, unit))
+            if conversion is None:
+                unit_kind, unit_factor = unit_dimension(unit)
+                conversion = self._remember(self._conversions, (ingredient_id, unit), (
+                    *self.catalog.conversion(ingredient_id, unit),
+                    unit_factor if unit_kind == COUNT else None
+                ))
+            dimension, factor, count_factor = conversion
+
+            key = (ingredient_id, dimension)
+            index = buckets.get(key)
+            if index is None:
+                index = buckets[key] = len(bucket_info)
+                known = ingredient_id in self.catalog.ingredients
+                bucket_info.append(_Bucket(
+                    ingredient_id=ingredient_id,
+                    dimension=dimension,
+                    name=ingredient_id if known else raw_name.strip(),
+                    meal_name=ingredient.get("meal_name", "")
+                ))
+            recipe_id = ingredient.get("recipe_id")
+            if recipe_id and recipe_id not in bucket_info[index].recipes:
+                bucket_info[index].recipes.append(recipe_id)
+            if count_factor is None:
+                bucket_info[index].counted = False
+
+            quantity = float(ingredient["quantity"])
+            indices.append(index)
+            quantities.append(quantity * factor)
+            counts.append(quantity * (count_factor or 0.0))
+
+        if not bucket_info:
+            return []
+
+        index_array = np.asarray(indices, dtype=np.intp)
+        totals = np.bincount(
+            index_array, weights=np.asarray(quantities, dtype=np.float64), minlength=len(bucket_info)
+        )
+        count_totals = np.bincount(
+            index_array, weights=np.asarray(counts, dtype=np.float64), minlength=len(bucket_info)
+        )
+
+        pantry = PantryIndex(self.catalog, pantry_items)
+        consolidated = []
+        for bucket, total, count_total in zip(bucket_info, totals, count_totals):
+            if bucket.ingredient_id in pantry or total <= 0:
+                continue
+            if bucket.counted:
+                quantity, unit = display_quantity(COUNT, float(count_total))
+            else:
+                quantity, unit = display_quantity(bucket.dimension, float(total))
+            consolidated.append({
+                "name": bucket.name,
+                "ingredient_id": bucket.ingredient_id,
+                "quantity": quantity,
+                "unit": unit,
+                "recipe_id": bucket.recipes[0] if bucket.recipes else None,
+                "recipes": bucket.recipes,
+                "meal_name": bucket.meal_name,
+            })
+        return consolidated
+
+    def _remember(self, cache: Dict, key, value):
+        """Store a memoized lookup, evicting the oldest entry once the cache is full."""
+        if len(cache) >= self.cache_size:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+        return value
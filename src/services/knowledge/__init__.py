@@ -7,9 +7,13 @@ Knowledge base services for RAG (Retrieval-Augmented Generation).
 from .food_rag import FoodKnowledgeRAG
 from .ingestion_pipeline import RecipeIngestionPipeline
 from .sample_data import SAMPLE_RECIPES
+from .semantic_cache import SemanticResponseCache, profile_scope, semantic_response_cache
 
 __all__ = [
     "FoodKnowledgeRAG",
     "RecipeIngestionPipeline",
     "SAMPLE_RECIPES",
+    "SemanticResponseCache",
+    "profile_scope",
+    "semantic_response_cache",
 ]
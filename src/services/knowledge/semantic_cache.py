@@ -0,0 +1,497 @@
+# src/services/knowledge/semantic_cache.py
+
+"""
+Semantic response cache for LLM calls.
+
+Prompts are embedded with an encoder exposing ``encode(texts)`` (the
+``MockEmbeddingEncoder`` interface, also satisfied by SentenceTransformer)
+and stored as unit vectors in one NumPy matrix that grows by doubling up
+to ``max_entries``. Lookups find
+candidates through random-hyperplane LSH tables (multi-probe) and rerank
+them by exact cosine similarity, so lookup cost depends on bucket sizes, not
+on the number of cached prompts.
+
+Responses personalized to a user profile are only reused within the same
+scope (see ``profile_scope``), and templates in ``EXACT_ONLY_TEMPLATES`` are
+never matched by similarity: prompts that differ in a single allergy can
+still embed almost identically.
+
+Prompts built from a template should pass the user's input as ``query``:
+only the query is embedded, and the rest of the prompt (the template text
+with the query removed) must match exactly. Embedding the whole prompt lets
+the shared template text dominate the similarity, so unrelated questions
+would match each other.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Minimum cosine similarity for a hit, per prompt template
+DEFAULT_TEMPLATE_THRESHOLDS = {
+    "nutrition_analysis_fast": 0.95,
+    "recipe_suggestion_creative": 0.95,
+    "ingredient_substitution": 0.93,
+    "quick_nutrition_qa": 0.90,
+    # Roughly the Jaccard 0.7 cut-off SmartResponseCache used on word sets
+    "smart_cache": 0.82,
+}
+
+# Templates answered for one user's profile: only an identical prompt (in the
+# same scope) may reuse a response, never a merely similar one
+EXACT_ONLY_TEMPLATES = frozenset({"meal_plan", "meal_planning_optimized"})
+
+# Profile fields a personalized response depends on; responses are never
+# shared between profiles that differ in any of them
+SCOPE_PROFILE_FIELDS = (
+    "allergies",
+    "dietary_restrictions",
+    "health_conditions",
+    "household_size",
+    "budget",
+    "weekly_budget",
+    "fitness_goal",
+    "fitness_goals",
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def profile_scope(profile: Optional[Dict[str, Any]]) -> str:
+    """Cache scope for responses personalized to a user profile ("" without one)."""
+    if not profile:
+        return ""
+    values = {}
+    for field in SCOPE_PROFILE_FIELDS:
+        value = profile.get(field)
+        if value in (None, "", [], ()):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item).strip().lower() for item in value)
+        values[field] = value
+    if not values:
+        return ""
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class HashingEmbeddingEncoder:
+    """
+    Deterministic bag-of-words encoder using feature hashing.
+
+    Compatible with ``MockEmbeddingEncoder``, but texts sharing words get
+    similar vectors, so it is usable for similarity lookups without a model.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts to L2-normalized vectors."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in set(_TOKEN_PATTERN.findall(text.lower())):
+                digest = zlib.crc32(token.encode())
+                vectors[row, digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class SemanticCacheHit:
+    """A cached response matched to a prompt."""
+
+    response: Any
+    similarity: float
+    template: str
+    cached_prompt: str
+    exact: bool = False
+
+
+class SemanticResponseCache:
+    """
+    Bounded, thread-safe semantic cache of LLM responses.
+
+    Entries expire after their TTL; when full, expired entries are evicted
+    first, then the least recently used.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Any] = None,
+        default_threshold: float = 0.92,
+        template_thresholds: Optional[Dict[str, float]] = None,
+        exact_only_templates: Optional[Set[str]] = None,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 100_000,
+        lsh_tables: int = 12,
+        lsh_bits: int = 14,
+        lsh_probes: int = 2,
+        exact_scan_limit: int = 4096,
+        seed: int = 7,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            encoder: Object with ``encode(texts)`` returning one vector per text
+            default_threshold: Minimum cosine similarity for templates without one
+            template_thresholds: Minimum cosine similarity per template
+            exact_only_templates: Templates served from identical prompts only
+            ttl_seconds: Default entry lifetime
+            max_entries: Maximum number of cached prompts
+            lsh_tables: Number of LSH hash tables
+            lsh_bits: Hyperplanes (signature bits) per table
+            lsh_probes: Lowest-margin bits flipped to probe neighbouring buckets
+            exact_scan_limit: Templates with at most this many entries are scanned exactly
+            seed: Seed for the LSH hyperplanes
+        """
+        self.encoder = encoder or HashingEmbeddingEncoder()
+        self.default_threshold = default_threshold
+        self.template_thresholds = dict(DEFAULT_TEMPLATE_THRESHOLDS)
+        self.template_thresholds.update(template_thresholds or {})
+        self.exact_only_templates = frozenset(
+            EXACT_ONLY_TEMPLATES if exact_only_templates is None else exact_only_templates
+        )
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lsh_tables = lsh_tables
+        self.lsh_bits = lsh_bits
+        self.lsh_probes = min(lsh_probes, lsh_bits)
+        self.exact_scan_limit = exact_scan_limit
+        self._seed = seed
+
+        self._lock = threading.RLock()
+        self._dimension: Optional[int] = None
+        self._planes: Optional[np.ndarray] = None
+        self._bit_weights = (1 << np.arange(lsh_bits, dtype=np.int64))
+        self._capacity = 0
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._expires = np.zeros(0)
+        self._last_used = np.zeros(0)
+        self._templates = np.zeros(0, dtype=np.int32)
+        self._occupied = np.zeros(0, dtype=bool)
+        self._signatures = np.zeros((0, lsh_tables), dtype=np.int64)
+        self._free: List[int] = []
+        self._responses: Dict[int, Any] = {}
+        self._prompts: Dict[int, str] = {}
+        self._exact: Dict[Tuple[int, str], int] = {}
+        self._buckets: Dict[Tuple[int, int, int], Set[int]] = {}
+        self._template_ids: Dict[Tuple[str, str, str], int] = {}
+        self._template_keys: Dict[int, Tuple[str, str, str]] = {}
+        self._template_sizes: Dict[int, int] = {}
+        self._next_template_id = 0
+        self._encodings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "lookup_seconds": 0.0,
+        }
+        self._template_stats: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def threshold_for(self, template: str) -> float:
+        """Get the similarity threshold for a template."""
+        return self.template_thresholds.get(template, self.default_threshold)
+
+    def lookup(
+        self, prompt: str, template: str = "default", scope: str = "", query: Optional[str] = None
+    ) -> Optional[SemanticCacheHit]:
+        """
+        Find the cached response for the most similar prompt of a template.
+
+        Args:
+            prompt: Prompt about to be sent to the model
+            template: Prompt template (or entry point) the prompt was built from
+            scope: Only entries stored with the same scope are considered
+            query: User input within the prompt; when given, only the query is
+                compared by similarity and the rest of the prompt must be identical
+
+        Returns:
+            The best match at or above the template's threshold, or None
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.stats["lookups"] += 1
+            template_stats = self._template_stats.setdefault(template, {"lookups": 0, "hits": 0})
+            template_stats["lookups"] += 1
+            hit = self._lookup(prompt, template, scope, query)
+            if hit is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+                self.stats["exact_hits" if hit.exact else "semantic_hits"] += 1
+                template_stats["hits"] += 1
+            self.stats["lookup_seconds"] += time.perf_counter() - started
+            return hit
+
+    def store(
+        self,
+        prompt: str,
+        response: Any,
+        template: str = "default",
+        ttl_seconds: Optional[float] = None,
+        scope: str = "",
+        query: Optional[str] = None,
+    ) -> None:
+        """Cache a response for a prompt (see ``lookup`` for ``scope`` and ``query``)."""
+        with self._lock:
+            now = time.time()
+            template_key = self._template_key(template, scope, prompt, query)
+            normalized = self._normalize(prompt)
+            expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+
+            template_id = self._template_ids.get(template_key)
+            slot = self._exact.get((template_id, normalized))
+            if slot is not None:
+                # Same prompt: refresh in place
+                self._responses[slot] = response
+                self._expires[slot] = expires_at
+                self._last_used[slot] = now
+                self.stats["stores"] += 1
+                return
+
+            vector = self._encode(prompt if query is None else query)
+            slot = self._allocate(now)
+            # After allocating: an eviction may have released the template's id
+            template_id = self._template_id(template_key)
+            self._vectors[slot] = vector
+            self._expires[slot] = expires_at
+            self._last_used[slot] = now
+            self._templates[slot] = template_id
+            self._occupied[slot] = True
+            self._responses[slot] = response
+            self._prompts[slot] = prompt
+            self._exact[(template_id, normalized)] = slot
+            self._template_sizes[template_id] += 1
+
+            signatures = self._signatures_for(vector)[0]
+            self._signatures[slot] = signatures
+            for table, signature in enumerate(signatures):
+                self._buckets.setdefault((template_id, table, int(signature)), set()).add(slot)
+            self.stats["stores"] += 1
+
+    def remove_expired(self) -> int:
+        """Drop expired entries; returns the number removed."""
+        with self._lock:
+            expired = np.flatnonzero(self._occupied & (self._expires <= time.time()))
+            for slot in expired:
+                self._remove(int(slot))
+            self.stats["expirations"] += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            for slot in list(self._responses):
+                self._remove(slot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate metrics."""
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                **{k: v for k, v in self.stats.items() if k != "lookup_seconds"},
+                "size": len(self._responses),
+                "max_entries": self.max_entries,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "avg_lookup_ms": self.stats["lookup_seconds"] * 1000 / lookups if lookups else 0.0,
+                "templates": {
+                    template: {
+                        **counts,
+                        "hit_rate": counts["hits"] / counts["lookups"] if counts["lookups"] else 0.0,
+                        "threshold": self.threshold_for(template),
+                    }
+                    for template, counts in self._template_stats.items()
+                },
+            }
+
+    def _lookup(self, prompt: str, template: str, scope: str, query: Optional[str]) -> Optional[SemanticCacheHit]:
+        """Find a match; the caller holds the lock and records statistics."""
+        template_id = self._template_ids.get(self._template_key(template, scope, prompt, query))
+        if template_id is None:
+            return None
+        now = time.time()
+
+        slot = self._exact.get((template_id, self._normalize(prompt)))
+        if slot is not None:
+            if self._expires[slot] > now:
+                self._last_used[slot] = now
+                return SemanticCacheHit(self._responses[slot], 1.0, template, self._prompts[slot], exact=True)
+            self._remove(slot)
+            self.stats["expirations"] += 1
+        if template in self.exact_only_templates:
+            return None
+
+        vector = self._encode(prompt if query is None else query)
+        if self._template_sizes.get(template_id, 0) <= self.exact_scan_limit:
+            candidates = np.flatnonzero(self._occupied & (self._templates == template_id))
+        else:
+            candidates = self._candidates(vector, template_id)
+        if len(candidates) == 0:
+            return None
+
+        candidates = candidates[self._expires[candidates] > now]
+        if len(candidates) == 0:
+            return None
+        similarities = self._vectors[candidates] @ vector
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.threshold_for(template):
+            return None
+
+        slot = int(candidates[best])
+        self._last_used[slot] = now
+        return SemanticCacheHit(self._responses[slot], similarity, template, self._prompts[slot])
+
+    def _candidates(self, vector: np.ndarray, template_id: int) -> np.ndarray:
+        """Collect slots sharing a probed LSH bucket with the vector."""
+        projections = (vector @ self._planes).reshape(self.lsh_tables, self.lsh_bits)
+        bits = projections > 0
+        signatures = bits.astype(np.int64) @ self._bit_weights
+        # Neighbouring buckets: flip the bits closest to their hyperplane
+        flips = np.argsort(np.abs(projections), axis=1)[:, :self.lsh_probes]
+
+        candidates: Set[int] = set()
+        buckets = self._buckets
+        for table in range(self.lsh_tables):
+            signature = int(signatures[table])
+            bucket = buckets.get((template_id, table, signature))
+            if bucket:
+                candidates.update(bucket)
+            for bit in flips[table]:
+                bucket = buckets.get((template_id, table, signature ^ (1 << int(bit))))
+                if bucket:
+                    candidates.update(bucket)
+        return np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+
+    def _encode(self, prompt: str) -> np.ndarray:
+        """Embed a prompt as a unit float32 vector, memoizing recent prompts."""
+        vector = self._encodings.get(prompt)
+        if vector is not None:
+            self._encodings.move_to_end(prompt)
+            return vector
+
+        vector = np.asarray(self.encoder.encode([prompt]), dtype=np.float32)[0]
+        vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        if self._dimension is None:
+            self._init_index(len(vector))
+
+        self._encodings[prompt] = vector
+        if len(self._encodings) > 256:
+            self._encodings.popitem(last=False)
+        return vector
+
+    def _init_index(self, dimension: int) -> None:
+        """Create the hyperplanes once the embedding dimension is known."""
+        self._dimension = dimension
+        rng = np.random.default_rng(self._seed)
+        self._planes = rng.standard_normal((dimension, self.lsh_tables * self.lsh_bits)).astype(np.float32)
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+
+    def _signatures_for(self, vectors: np.ndarray) -> np.ndarray:
+        """Compute the LSH signature of each vector in every table."""
+        vectors = np.atleast_2d(vectors)
+        bits = (vectors @ self._planes > 0).reshape(len(vectors), self.lsh_tables, self.lsh_bits)
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _allocate(self, now: float) -> int:
+        """Get a free slot, growing storage or evicting as needed."""
+        if not self._free and self._capacity < self.max_entries:
+            self._grow(min(self.max_entries, max(1024, self._capacity * 2)))
+        if not self._free:
+            self._evict(now)
+        return self._free.pop()
+
+    def _grow(self, capacity: int) -> None:
+        """Grow slot storage to a new capacity."""
+        extra = capacity - self._capacity
+        self._vectors = np.vstack([self._vectors, np.zeros((extra, self._dimension), dtype=np.float32)])
+        self._expires = np.concatenate([self._expires, np.zeros(extra)])
+        self._last_used = np.concatenate([self._last_used, np.zeros(extra)])
+        self._templates = np.concatenate([self._templates, np.full(extra, -1, dtype=np.int32)])
+        self._occupied = np.concatenate([self._occupied, np.zeros(extra, dtype=bool)])
+        self._signatures = np.vstack([self._signatures, np.zeros((extra, self.lsh_tables), dtype=np.int64)])
+        self._free.extend(range(capacity - 1, self._capacity - 1, -1))
+        self._capacity = capacity
+
+    def _evict(self, now: float) -> None:
+        """Free slots: all expired entries, otherwise the least recently used."""
+        expired = np.flatnonzero(self._occupied & (self._expires <= now))
+        if len(expired):
+            for slot in expired:
+                self._remove(int(slot))
+            self.stats["expirations"] += len(expired)
+            return
+
+        last_used = np.where(self._occupied, self._last_used, np.inf)
+        self._remove(int(np.argmin(last_used)))
+        self.stats["evictions"] += 1
+
+    def _remove(self, slot: int) -> None:
+        """Release a slot and unlink it from the indexes."""
+        template_id = int(self._templates[slot])
+        for table, signature in enumerate(self._signatures[slot]):
+            key = (template_id, table, int(signature))
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self._buckets[key]
+
+        prompt = self._prompts.pop(slot)
+        self._exact.pop((template_id, self._normalize(prompt)), None)
+        self._responses.pop(slot, None)
+        self._occupied[slot] = False
+        self._templates[slot] = -1
+        self._template_sizes[template_id] -= 1
+        if not self._template_sizes[template_id]:
+            # Scopes come and go with user profiles: forget ids without entries
+            del self._template_sizes[template_id]
+            del self._template_ids[self._template_keys.pop(template_id)]
+        self._free.append(slot)
+
+    def _template_key(self, template: str, scope: str, prompt: str, query: Optional[str]) -> Tuple[str, str, str]:
+        """Key of the entries a prompt may match: template, scope and, with a query, the rest of the prompt."""
+        if query is None:
+            return template, scope, ""
+        remainder = self._normalize(prompt.replace(query, "\x00"))
+        return template, scope, hashlib.sha1(remainder.encode()).hexdigest()
+
+    def _template_id(self, key: Tuple[str, str, str]) -> int:
+        """Get the integer id of a template key, assigning one if new."""
+        template_id = self._template_ids.get(key)
+        if template_id is None:
+            template_id = self._template_ids[key] = self._next_template_id
+            self._template_keys[template_id] = key
+            self._template_sizes[template_id] = 0
+            self._next_template_id += 1
+        return template_id
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        """Normalize a prompt for exact-match lookups."""
+        return " ".join(prompt.lower().split())
+
+
+# Shared by every Bedrock entry point in the process
+semantic_response_cache = SemanticResponseCache()
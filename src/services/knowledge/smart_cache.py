@@ -11,6 +11,8 @@ import re
 from datetime import datetime, timedelta
 from typing import Awaitable, Callable, Dict, List, Optional
 
+from .semantic_cache import SemanticResponseCache, semantic_response_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,18 +30,22 @@ class SmartResponseCache:
     Now: 90% cache hit = 90% personalized-from-template responses
     """
 
-    def __init__(self, cache_ttl_hours: int = 24):
+    # Template of this cache's entries in the semantic response cache
+    SEMANTIC_TEMPLATE = "smart_cache"
+
+    def __init__(self, cache_ttl_hours: int = 24, semantic_cache: Optional[SemanticResponseCache] = None):
         """
         Initialize cache system
 
         Args:
             cache_ttl_hours: Cache validity period in hours
+            semantic_cache: Similar-query index (defaults to the shared LLM response cache)
         """
         self.cache_ttl = timedelta(hours=cache_ttl_hours)
 
         # Different cache strategies
         self.exact_cache: Dict[str, Dict] = {}  # Exact query matches
-        self.semantic_cache: Dict[str, Dict] = {}  # Similar queries
+        self.semantic_cache = semantic_cache if semantic_cache is not None else semantic_response_cache  # Similar queries
         self.pattern_cache: Dict[str, Dict] = {}  # Common patterns
         self.user_cache: Dict[str, Dict] = {}  # Per-user preferences
 
@@ -313,29 +319,10 @@ class SmartResponseCache:
     def _find_similar_cached(self, query: str) -> Optional[str]:
         """
         Find semantically similar cached responses
-        Uses Jaccard similarity for simplicity
+        Uses the vector index of the semantic response cache
         """
-        query_words = set(query.lower().split())
-        best_match = None
-        best_similarity = 0.0
-
-        for cached_query, cached_data in self.semantic_cache.items():
-            cached_words = set(cached_query.lower().split())
-
-            # Jaccard similarity
-            intersection = len(query_words & cached_words)
-            union = len(query_words | cached_words)
-
-            if union == 0:
-                continue
-
-            similarity = intersection / union
-
-            if similarity > 0.7 and similarity > best_similarity:
-                best_similarity = similarity
-                best_match = cached_data.get("response")
-
-        return best_match
+        hit = self.semantic_cache.lookup(query, self.SEMANTIC_TEMPLATE)
+        return hit.response if hit else None
 
     def _check_user_patterns(self, user_id: str, query: str) -> Optional[str]:
         """Check user's historical patterns"""
@@ -360,7 +347,9 @@ class SmartResponseCache:
 
         # Also add to semantic cache (normalized query)
         normalized_query = query.lower().strip()
-        self.semantic_cache[normalized_query] = {"response": response, "timestamp": timestamp}
+        self.semantic_cache.store(
+            normalized_query, response, self.SEMANTIC_TEMPLATE, ttl_seconds=self.cache_ttl.total_seconds()
+        )
 
         # Track user patterns
         if user_id not in self.user_cache:
@@ -436,15 +425,9 @@ class SmartResponseCache:
             del self.exact_cache[key]
 
         # Clear semantic cache
-        expired_queries = [
-            query
-            for query, item in self.semantic_cache.items()
-            if "timestamp" in item and (now - item["timestamp"]) > self.cache_ttl
-        ]
-        for query in expired_queries:
-            del self.semantic_cache[query]
+        expired_queries = self.semantic_cache.remove_expired()
 
-        logger.info(f"Cleared {len(expired_keys) + len(expired_queries)} expired cache entries")
+        logger.info(f"Cleared {len(expired_keys) + expired_queries} expired cache entries")
 
     def get_personalized_with_cache(self, query: str, user_profile: Dict) -> Dict:
         """
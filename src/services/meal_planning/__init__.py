@@ -42,6 +42,7 @@ from .plan_coordinator import (
 )
 from .repository import InMemoryPlanRepository
 from .rule_engine import RuleBasedMealPlanEngine
+from .library_index import MealLibraryIndex
 from .data_store import InMemoryPlanDataStore, PlanDataStore, UserPreferenceRecord, PantryItemRecord, UserRecord
 from .ml_logging import FeatureLogger
 from .pipeline import MealPlanPipeline
@@ -58,6 +59,7 @@ __all__ = [
     'compute_week_start',
     'InMemoryPlanRepository',
     'RuleBasedMealPlanEngine',
+    'MealLibraryIndex',
     'MealPlanPipeline',
     'PlanDataStore',
     'InMemoryPlanDataStore',
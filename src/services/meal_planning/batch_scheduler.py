@@ -0,0 +1,455 @@
+"""Batch meal plan generation for the weekly auto-plan scheduler.
+
+Users are processed in sorted chunks: profiles are bulk-fetched, users with
+identical plan-relevant preferences share one generated plan, and deliveries
+go out in bounded-concurrency batches. A cursor is checkpointed after every
+chunk so a run that approaches the Lambda timeout can resume where it stopped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Profile fields that shape the generated plan; users matching on all of them share a plan.
+# Covers everything the meal plan prompt, strategy guidance and recipe enrichment read.
+PLAN_FINGERPRINT_FIELDS: Tuple[str, ...] = (
+    "dietary_restrictions",
+    "allergies",
+    "health_conditions",
+    "household_size",
+    "weekly_budget",
+    "budget",
+    "fitness_goals",
+    "fitness_goal",
+    "daily_calories",
+    "min_calories",
+    "max_calories",
+    "cooking_skill",
+    "max_prep_time",
+    "meal_preferences",
+)
+
+STAGES: Tuple[str, ...] = ("fetch", "generate", "send", "checkpoint")
+
+
+class CheckpointStore(Protocol):
+    """Persists the resume cursor for a scheduler run."""
+
+    def load(self, run_id: str) -> Optional[str]:
+        ...
+
+    def save(self, run_id: str, cursor: str) -> None:
+        ...
+
+    def clear(self, run_id: str) -> None:
+        ...
+
+
+class InMemoryCheckpointStore:
+    """Process-local checkpoint store for tests and local runs."""
+
+    def __init__(self) -> None:
+        self._cursors: Dict[str, str] = {}
+
+    def load(self, run_id: str) -> Optional[str]:
+        return self._cursors.get(run_id)
+
+    def save(self, run_id: str, cursor: str) -> None:
+        self._cursors[run_id] = cursor
+
+    def clear(self, run_id: str) -> None:
+        self._cursors.pop(run_id, None)
+
+
+class DynamoDBCheckpointStore:
+    """Stores cursors as items in the users table under a reserved partition key."""
+
+    PARTITION_KEY = "__scheduler__"
+
+    def __init__(self, table, ttl_days: int = 14) -> None:
+        self.table = table
+        self.ttl_days = ttl_days
+
+    def load(self, run_id: str) -> Optional[str]:
+        try:
+            response = self.table.get_item(Key=self._key(run_id))
+            return response.get("Item", {}).get("cursor")
+        except Exception as e:
+            logger.warning(f"Could not load scheduler checkpoint {run_id}: {e}")
+            return None
+
+    def save(self, run_id: str, cursor: str) -> None:
+        self.table.put_item(
+            Item={
+                **self._key(run_id),
+                "cursor": cursor,
+                "updated_at": datetime.utcnow().isoformat(),
+                "ttl": int((datetime.utcnow() + timedelta(days=self.ttl_days)).timestamp()),
+            }
+        )
+
+    def clear(self, run_id: str) -> None:
+        try:
+            self.table.delete_item(Key=self._key(run_id))
+        except Exception as e:
+            logger.warning(f"Could not clear scheduler checkpoint {run_id}: {e}")
+
+    def _key(self, run_id: str) -> Dict[str, str]:
+        return {"user_id": self.PARTITION_KEY, "plan_date": f"checkpoint#{run_id}"}
+
+
+@dataclass
+class BatchPlanConfig:
+    """Tuning knobs for a batch run."""
+
+    chunk_size: int = 100
+    generation_concurrency: int = 8
+    send_concurrency: int = 16
+    reuse_plans: bool = True
+    fingerprint_fields: Tuple[str, ...] = PLAN_FINGERPRINT_FIELDS
+    # Stop starting new chunks when less than this many seconds remain.
+    safety_margin_seconds: float = 30.0
+
+
+@dataclass
+class StageStats:
+    """Latency samples for a pipeline stage."""
+
+    samples: List[float] = field(default_factory=list)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"count": 0, "total_ms": 0.0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+        total = sum(ordered)
+        return {
+            "count": len(ordered),
+            "total_ms": round(total * 1000, 2),
+            "avg_ms": round(total / len(ordered) * 1000, 2),
+            "p95_ms": round(ordered[p95_index] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+
+@dataclass
+class BatchRunReport:
+    """Outcome and throughput of a scheduler run."""
+
+    run_id: str
+    total_users: int = 0
+    processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    missing_profiles: int = 0
+    plans_generated: int = 0
+    plans_reused: int = 0
+    completed: bool = False
+    resumed_from: Optional[str] = None
+    cursor: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(default_factory=lambda: {stage: StageStats() for stage in STAGES})
+
+    @property
+    def throughput(self) -> float:
+        """Users processed per second."""
+
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "total_users": self.total_users,
+            "processed": self.processed,
+            "successful_plans": self.successful,
+            "failed_plans": self.failed,
+            "missing_profiles": self.missing_profiles,
+            "plans_generated": self.plans_generated,
+            "plans_reused": self.plans_reused,
+            "completed": self.completed,
+            "resumed_from": self.resumed_from,
+            "cursor": self.cursor,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "users_per_second": round(self.throughput, 2),
+            "stage_latency": {stage: stats.summary() for stage, stats in self.stages.items()},
+        }
+
+
+def plan_fingerprint(user_profile: Dict[str, Any], fields: Iterable[str] = PLAN_FINGERPRINT_FIELDS) -> str:
+    """Hash the plan-relevant preferences of a profile."""
+
+    relevant: Dict[str, Any] = {}
+    for name in fields:
+        value = user_profile.get(name)
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item).strip().lower() for item in value)
+        elif isinstance(value, str):
+            value = value.strip().lower()
+        relevant[name] = value
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BatchPlanScheduler:
+    """Generates and delivers weekly plans for a cohort of users."""
+
+    def __init__(
+        self,
+        user_service,
+        meal_plan_service,
+        send_plan: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+        checkpoint_store: Optional[CheckpointStore] = None,
+        config: Optional[BatchPlanConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.user_service = user_service
+        self.meal_plan_service = meal_plan_service
+        self.send_plan = send_plan
+        self.checkpoint_store = checkpoint_store or InMemoryCheckpointStore()
+        self.config = config or BatchPlanConfig()
+        self._clock = clock
+
+    def run_sync(
+        self,
+        user_ids: Iterable[str],
+        run_id: str,
+        remaining_time: Optional[Callable[[], float]] = None,
+    ) -> BatchRunReport:
+        """Blocking entry point for Lambda handlers."""
+
+        return asyncio.run(self.run(user_ids, run_id, remaining_time=remaining_time))
+
+    def run_cohort_sync(
+        self,
+        pages: Callable[[Optional[str]], Iterable[Iterable[str]]],
+        run_id: str,
+        remaining_time: Optional[Callable[[], float]] = None,
+    ) -> BatchRunReport:
+        """Blocking entry point for streaming a cohort in pages."""
+
+        return asyncio.run(self.run_cohort(pages, run_id, remaining_time=remaining_time))
+
+    async def run(
+        self,
+        user_ids: Iterable[str],
+        run_id: str,
+        remaining_time: Optional[Callable[[], float]] = None,
+    ) -> BatchRunReport:
+        """
+        Process ``user_ids`` in sorted chunks, resuming after any stored cursor.
+
+        ``remaining_time`` returns the seconds left before the invocation times
+        out; the run stops cleanly between chunks once it drops below the
+        configured safety margin.
+        """
+
+        ordered = sorted(set(user_ids))
+        return await self._run(lambda after: [ordered], run_id, remaining_time, total_users=len(ordered))
+
+    async def run_cohort(
+        self,
+        pages: Callable[[Optional[str]], Iterable[Iterable[str]]],
+        run_id: str,
+        remaining_time: Optional[Callable[[], float]] = None,
+    ) -> BatchRunReport:
+        """
+        Process a cohort streamed as pages of ascending user ids.
+
+        ``pages(after)`` yields the user ids after the stored cursor (or all of
+        them when ``after`` is None), so only the pages this invocation gets to
+        are ever read. ``total_users`` counts the users streamed by this run.
+        """
+
+        return await self._run(pages, run_id, remaining_time)
+
+    async def _run(
+        self,
+        pages: Callable[[Optional[str]], Iterable[Iterable[str]]],
+        run_id: str,
+        remaining_time: Optional[Callable[[], float]],
+        total_users: Optional[int] = None,
+    ) -> BatchRunReport:
+        started = self._clock()
+        report = BatchRunReport(run_id=run_id)
+
+        cursor = self.checkpoint_store.load(run_id)
+        if cursor is not None:
+            report.resumed_from = cursor
+            logger.info(f"Resuming scheduler run {run_id} after {cursor}")
+
+        generation_slots = asyncio.Semaphore(self.config.generation_concurrency)
+        send_slots = asyncio.Semaphore(self.config.send_concurrency)
+        streamed = 0
+
+        for chunk in ascending_chunks(pages(cursor), cursor, self.config.chunk_size):
+            if remaining_time is not None and remaining_time() < self.config.safety_margin_seconds:
+                logger.warning(f"Stopping scheduler run {run_id} early; cursor={report.cursor}")
+                break
+
+            streamed += len(chunk)
+            await self._process_chunk(chunk, report, generation_slots, send_slots)
+
+            stage_start = self._clock()
+            report.cursor = chunk[-1]
+            self.checkpoint_store.save(run_id, chunk[-1])
+            report.stages["checkpoint"].record(self._clock() - stage_start)
+        else:
+            report.completed = True
+            self.checkpoint_store.clear(run_id)
+
+        report.total_users = total_users if total_users is not None else streamed
+        report.elapsed_seconds = self._clock() - started
+        return report
+
+    async def _process_chunk(
+        self,
+        chunk: List[str],
+        report: BatchRunReport,
+        generation_slots: asyncio.Semaphore,
+        send_slots: asyncio.Semaphore,
+    ) -> None:
+        stage_start = self._clock()
+        profiles = await asyncio.to_thread(self.user_service.get_user_profiles, chunk)
+        report.stages["fetch"].record(self._clock() - stage_start)
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for user_id in chunk:
+            profile = profiles.get(user_id)
+            if not profile:
+                logger.warning(f"Could not find profile for user {user_id}")
+                report.missing_profiles += 1
+                report.failed += 1
+                report.processed += 1
+                continue
+            if self.config.reuse_plans:
+                key = plan_fingerprint(profile, self.config.fingerprint_fields)
+            else:
+                key = user_id
+            groups.setdefault(key, []).append(profile)
+
+        plans = await asyncio.gather(
+            *(self._generate(members[0], report, generation_slots) for members in groups.values())
+        )
+
+        deliveries: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]] = []
+        for members, plan in zip(groups.values(), plans):
+            for index, profile in enumerate(members):
+                deliveries.append((profile, plan, index > 0))
+
+        results = await asyncio.gather(
+            *(self._deliver(profile, plan, reused, report, send_slots) for profile, plan, reused in deliveries)
+        )
+        report.processed += len(results)
+        report.successful += sum(1 for ok in results if ok)
+        report.failed += sum(1 for ok in results if not ok)
+
+    async def _generate(
+        self, profile: Dict[str, Any], report: BatchRunReport, slots: asyncio.Semaphore
+    ) -> Optional[Dict[str, Any]]:
+        async with slots:
+            stage_start = self._clock()
+            try:
+                plan = await asyncio.to_thread(
+                    self.meal_plan_service.generate_meal_plan, profile, force_new=True
+                )
+            except Exception as e:
+                logger.error(f"Error generating meal plan for user {profile.get('user_id')}: {str(e)}")
+                plan = None
+            report.stages["generate"].record(self._clock() - stage_start)
+        if plan:
+            report.plans_generated += 1
+        return plan
+
+    async def _deliver(
+        self,
+        profile: Dict[str, Any],
+        plan: Optional[Dict[str, Any]],
+        reused: bool,
+        report: BatchRunReport,
+        slots: asyncio.Semaphore,
+    ) -> bool:
+        user_id = profile.get("user_id")
+        if not plan:
+            logger.error(f"Failed to generate meal plan for user {user_id}")
+            return False
+
+        async with slots:
+            stage_start = self._clock()
+            saved = sent = False
+            try:
+                if reused:
+                    # The representative's plan was saved by the meal plan service.
+                    plan = copy.deepcopy(plan)
+                    saved = await asyncio.to_thread(self.user_service.save_meal_plan, user_id, plan)
+                    if saved:
+                        report.plans_reused += 1
+                if saved or not reused:
+                    sent = await asyncio.to_thread(self.send_plan, profile, plan)
+            except Exception as e:
+                logger.error(f"Error processing user {user_id}: {str(e)}")
+            report.stages["send"].record(self._clock() - stage_start)
+
+        if reused and not saved:
+            logger.error(f"Failed to save meal plan for user {user_id}")
+        elif not sent:
+            logger.error(f"Failed to send meal plan to user {user_id}")
+        return bool(sent)
+
+
+def ascending_chunks(pages: Iterable[Iterable[str]], after: Optional[str], size: int) -> Iterator[List[str]]:
+    """
+    Regroup pages of ascending user ids into chunks of ``size``.
+
+    Ids at or before ``after`` (or the previous id) are dropped, so the
+    checkpointed cursor always advances.
+    """
+
+    chunk: List[str] = []
+    last = after
+    for page in pages:
+        for user_id in page:
+            if last is not None and user_id <= last:
+                continue
+            chunk.append(user_id)
+            last = user_id
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def weekly_run_id(now: Optional[datetime] = None) -> str:
+    """Run identifier shared by every invocation within the same ISO week."""
+
+    year, week, _ = (now or datetime.utcnow()).isocalendar()
+    return f"auto-plans#{year}-W{week:02d}"
+
+
+__all__ = [
+    "BatchPlanConfig",
+    "BatchPlanScheduler",
+    "BatchRunReport",
+    "CheckpointStore",
+    "DynamoDBCheckpointStore",
+    "InMemoryCheckpointStore",
+    "PLAN_FINGERPRINT_FIELDS",
+    "StageStats",
+    "plan_fingerprint",
+    "weekly_run_id",
+]
@@ -0,0 +1,262 @@
+"""Precompiled, immutable index over the rule engine meal library.
+
+The index is built once per library and answers candidate queries with set
+intersections over inverted indexes instead of scanning every meal, so plan
+latency stays flat as the library grows.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .models import PlanPreferences
+
+MEAL_TYPES: Tuple[str, ...] = ("breakfast", "lunch", "dinner")
+
+# Diets that accept any meal in the library.
+_UNRESTRICTED_DIETS = frozenset({"any", "omnivore"})
+
+# Diet -> tags, any of which qualifies a meal for that diet.
+_DIET_TAGS: Dict[str, FrozenSet[str]] = {
+    "vegetarian": frozenset({"vegetarian", "vegan"}),
+    "vegan": frozenset({"vegan"}),
+    "pescatarian": frozenset({"pescatarian", "seafood"}),
+    "gluten_free": frozenset({"gluten_free"}),
+    "gluten-free": frozenset({"gluten_free"}),
+    "mediterranean": frozenset({"mediterranean", "vegetarian", "pescatarian"}),
+}
+
+INTOLERANCE_KEYWORDS: Dict[str, List[str]] = {
+    "lactose": [
+        "milk",
+        "cheese",
+        "cream",
+        "butter",
+        "yogurt",
+        "whey",
+        "casein",
+        "custard",
+        "ghee",
+    ],
+    "gluten": [
+        "wheat",
+        "barley",
+        "rye",
+        "malt",
+        "semolina",
+        "spelt",
+        "farina",
+        "triticale",
+    ],
+    "soy": ["soy", "tofu", "edamame", "soybean"],
+    "peanut": ["peanut", "groundnut"],
+    "tree_nut": ["almond", "cashew", "walnut", "pecan", "hazelnut", "pistachio"],
+    "shellfish": ["shrimp", "prawn", "lobster", "crab", "clam", "oyster", "scallop"],
+}
+
+# Normalized preference key: (diet, patterns, max prep, blocked terms, preference tags).
+PreferenceKey = Tuple[Optional[str], FrozenSet[str], Optional[int], FrozenSet[str], FrozenSet[str]]
+
+_DEFAULT_CACHE_SIZE = 1024
+
+
+def build_blocked_terms(preferences: PlanPreferences) -> FrozenSet[str]:
+    """Collect lower-cased allergy, avoidance and intolerance terms."""
+
+    terms: Set[str] = {item.lower() for item in preferences.allergies}
+    terms.update(item.lower() for item in preferences.avoid_ingredients)
+    for intolerance in preferences.intolerances:
+        terms.update(INTOLERANCE_KEYWORDS.get(intolerance.lower(), []))
+    return frozenset(terms)
+
+
+def normalize_preferences(preferences: PlanPreferences) -> PreferenceKey:
+    """Reduce preferences to the hashable subset that affects candidate filtering."""
+
+    diet = preferences.diet.lower() if preferences.diet else None
+    if diet in _UNRESTRICTED_DIETS or diet not in _DIET_TAGS:
+        diet = None
+
+    patterns = frozenset(
+        pattern.lower().replace(" ", "_").replace("-", "_")
+        for pattern in preferences.dietary_patterns
+        if pattern.lower() not in {"none", "any"}
+    )
+    tags = frozenset(tag.lower().replace(" ", "_") for tag in preferences.preference_tags)
+
+    return (
+        diet,
+        patterns,
+        preferences.max_prep_minutes or None,
+        build_blocked_terms(preferences),
+        tags,
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class MealLibraryIndex:
+    """Inverted indexes from diet, tag, ingredient and prep time to meal ids.
+
+    Meal ids are positions in ``meals``; candidate tuples are returned in
+    library order so plan selection stays deterministic.
+    """
+
+    meals: Tuple[Mapping[str, object], ...]
+    by_meal_type: Mapping[str, FrozenSet[int]]
+    by_diet: Mapping[str, FrozenSet[int]]
+    by_tag: Mapping[str, FrozenSet[int]]
+    by_ingredient: Mapping[str, FrozenSet[int]]
+    prep_thresholds: Tuple[int, ...]
+    prep_buckets: Tuple[FrozenSet[int], ...]
+    cache_size: int = _DEFAULT_CACHE_SIZE
+    _term_cache: "OrderedDict[str, FrozenSet[int]]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _candidate_cache: "OrderedDict[PreferenceKey, Mapping[str, Tuple[Mapping[str, object], ...]]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    @classmethod
+    def build(
+        cls, meals: Iterable[Mapping[str, object]], *, cache_size: int = _DEFAULT_CACHE_SIZE
+    ) -> "MealLibraryIndex":
+        """Compile the indexes for ``meals`` in a single pass."""
+
+        library = tuple(MappingProxyType(dict(meal)) for meal in meals)
+        by_meal_type: Dict[str, Set[int]] = defaultdict(set)
+        by_tag: Dict[str, Set[int]] = defaultdict(set)
+        by_ingredient: Dict[str, Set[int]] = defaultdict(set)
+        by_prep: Dict[int, Set[int]] = defaultdict(set)
+
+        for meal_id, meal in enumerate(library):
+            by_meal_type[str(meal["meal_type"])].add(meal_id)
+            for tag in meal.get("tags", []):
+                by_tag[str(tag).lower()].add(meal_id)
+            for ingredient in meal.get("ingredients", []):
+                by_ingredient[str(ingredient).lower()].add(meal_id)
+            by_prep[int(meal.get("prep_minutes", 0))].add(meal_id)
+
+        by_diet: Dict[str, FrozenSet[int]] = {}
+        for diet, accepted_tags in _DIET_TAGS.items():
+            members: Set[int] = set()
+            for tag in accepted_tags:
+                members |= by_tag.get(tag, set())
+            by_diet[diet] = frozenset(members)
+
+        thresholds = tuple(sorted(by_prep))
+
+        return cls(
+            meals=library,
+            by_meal_type=_freeze(by_meal_type),
+            by_diet=MappingProxyType(by_diet),
+            by_tag=_freeze(by_tag),
+            by_ingredient=_freeze(by_ingredient),
+            prep_thresholds=thresholds,
+            prep_buckets=tuple(frozenset(by_prep[minutes]) for minutes in thresholds),
+            cache_size=cache_size,
+        )
+
+    def meals_for_type(self, meal_type: str) -> Tuple[Mapping[str, object], ...]:
+        """Return every meal of ``meal_type`` in library order."""
+
+        return self._materialize(self.by_meal_type.get(meal_type, frozenset()))
+
+    def candidates(
+        self, preferences: PlanPreferences
+    ) -> Mapping[str, Tuple[Mapping[str, object], ...]]:
+        """Return preference-compatible meals grouped by meal type.
+
+        Results are memoized per normalized preference key, keeping the
+        ``cache_size`` most recently used keys.
+        """
+
+        key = normalize_preferences(preferences)
+        cached = self._candidate_cache.get(key)
+        if cached is not None:
+            self._candidate_cache.move_to_end(key)
+            return cached
+
+        allowed = self._allowed_ids(key)
+        result = MappingProxyType(
+            {
+                meal_type: self._materialize(self.by_meal_type.get(meal_type, frozenset()) & allowed)
+                for meal_type in MEAL_TYPES
+            }
+        )
+
+        self._candidate_cache[key] = result
+        if len(self._candidate_cache) > self.cache_size:
+            self._candidate_cache.popitem(last=False)
+        return result
+
+    def ids_with_prep_at_most(self, max_minutes: int) -> FrozenSet[int]:
+        """Union the prep buckets whose threshold does not exceed ``max_minutes``."""
+
+        cutoff = bisect_right(self.prep_thresholds, max_minutes)
+        if cutoff == len(self.prep_buckets):
+            return frozenset(range(len(self.meals)))
+        return frozenset().union(*self.prep_buckets[:cutoff])
+
+    def ids_containing(self, term: str) -> FrozenSet[int]:
+        """Meals with any ingredient containing ``term`` as a substring."""
+
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            self._term_cache.move_to_end(term)
+            return cached
+
+        # Scans the distinct ingredient vocabulary, not the meals.
+        cached = frozenset().union(
+            *(ids for ingredient, ids in self.by_ingredient.items() if term in ingredient)
+        )
+        # Terms come from free-form user input: keep the most recently used.
+        self._term_cache[term] = cached
+        if len(self._term_cache) > self.cache_size:
+            self._term_cache.popitem(last=False)
+        return cached
+
+    # --- Internal helpers ------------------------------------------------
+
+    def _allowed_ids(self, key: PreferenceKey) -> FrozenSet[int]:
+        diet, patterns, max_prep, blocked_terms, tags = key
+        constraints: List[FrozenSet[int]] = []
+
+        if diet is not None:
+            constraints.append(self.by_diet[diet])
+        for tag in patterns | tags:
+            constraints.append(self.by_tag.get(tag, frozenset()))
+        if max_prep:
+            constraints.append(self.ids_with_prep_at_most(max_prep))
+
+        # Intersect smallest sets first so the work tracks the tightest filter.
+        constraints.sort(key=len)
+        allowed = frozenset(range(len(self.meals)))
+        for ids in constraints:
+            allowed &= ids
+            if not allowed:
+                return allowed
+
+        for term in blocked_terms:
+            allowed -= self.ids_containing(term)
+            if not allowed:
+                break
+        return allowed
+
+    def _materialize(self, ids: Iterable[int]) -> Tuple[Mapping[str, object], ...]:
+        return tuple(self.meals[meal_id] for meal_id in sorted(ids))
+
+
+def _freeze(index: Mapping[str, Set[int]]) -> Mapping[str, FrozenSet[int]]:
+    return MappingProxyType({key: frozenset(ids) for key, ids in index.items()})
+
+
+__all__ = [
+    "MEAL_TYPES",
+    "INTOLERANCE_KEYWORDS",
+    "MealLibraryIndex",
+    "PreferenceKey",
+    "build_blocked_terms",
+    "normalize_preferences",
+]
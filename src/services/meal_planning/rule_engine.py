@@ -5,9 +5,11 @@ from __future__ import annotations
 import hashlib
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List
+from functools import lru_cache
+from typing import Dict, List, Mapping, Sequence
 
-from .models import DraftMeal, PlanDraft, PlanGenerationCommand, PlanFeedbackCommand, PlanPreferences
+from .library_index import MealLibraryIndex
+from .models import DraftMeal, PlanDraft, PlanGenerationCommand, PlanFeedbackCommand
 
 
 @dataclass
@@ -15,13 +17,10 @@ class RuleBasedMealPlanEngine:
     """Deterministic meal plan generator that respects basic preferences."""
 
     _feedback_tracker: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    library: MealLibraryIndex = field(default_factory=lambda: get_default_library_index())
 
     def generate(self, command: PlanGenerationCommand) -> PlanDraft:
-        library_by_type = _get_library_grouped()
-        filtered_library = {
-            meal_type: _filter_meals(meals, command.preferences)
-            for meal_type, meals in library_by_type.items()
-        }
+        filtered_library = self.library.candidates(command.preferences)
 
         days = [
             "monday",
@@ -43,7 +42,7 @@ class RuleBasedMealPlanEngine:
 
         for day_index, day_name in enumerate(days):
             for meal_index, meal_type in enumerate(meal_order):
-                candidates = filtered_library.get(meal_type) or library_by_type[meal_type]
+                candidates = filtered_library.get(meal_type) or self.library.meals_for_type(meal_type)
                 meal = _pick_meal(candidates, seed, day_index, meal_index)
                 plan_meals.append(
                     DraftMeal(
@@ -109,142 +108,22 @@ class RuleBasedMealPlanEngine:
 # --- Internal helpers ----------------------------------------------------
 
 
-def _get_library_grouped() -> Dict[str, List[Dict[str, object]]]:
-    grouped: Dict[str, List[Dict[str, object]]] = {"breakfast": [], "lunch": [], "dinner": []}
-    for meal in _MEAL_LIBRARY:
-        grouped[meal["meal_type"]].append(meal)
-    return grouped
-
-
-def _filter_meals(meals: Iterable[Dict[str, object]], preferences: PlanPreferences) -> List[Dict[str, object]]:
-    filtered: List[Dict[str, object]] = []
-    for candidate in meals:
-        if not _supports_diet(candidate, preferences.diet):
-            continue
-        if preferences.dietary_patterns and not _supports_dietary_patterns(candidate, preferences.dietary_patterns):
-            continue
-        if not _respects_prep_time(candidate, preferences.max_prep_minutes):
-            continue
-        if _contains_blocked_ingredient(
-            candidate,
-            blocked_sources=_build_blocklist(preferences),
-        ):
-            continue
-        if preferences.preference_tags and not _matches_preference_tags(candidate, preferences.preference_tags):
-            continue
-        filtered.append(candidate)
-    return filtered
-
-
-def _supports_diet(meal: Dict[str, object], diet: str | None) -> bool:
-    if not diet or diet.lower() in {"any", "omnivore"}:
-        return True
-    tags = {tag.lower() for tag in meal.get("tags", [])}
-    diet_lower = diet.lower()
-    if diet_lower == "vegetarian":
-        return "vegetarian" in tags or "vegan" in tags
-    if diet_lower == "vegan":
-        return "vegan" in tags
-    if diet_lower == "pescatarian":
-        return "pescatarian" in tags or "seafood" in tags
-    if diet_lower in {"gluten_free", "gluten-free"}:
-        return "gluten_free" in tags
-    if diet_lower == "mediterranean":
-        return "mediterranean" in tags or "vegetarian" in tags or "pescatarian" in tags
-    return True
-
-
-def _supports_dietary_patterns(meal: Dict[str, object], patterns: Iterable[str]) -> bool:
-    tags = {tag.lower() for tag in meal.get("tags", [])}
-    for pattern in patterns:
-        pattern_lower = pattern.lower()
-        if pattern_lower in {"none", "any"}:
-            continue
-        # Accept matches based on tag or derivative (e.g. low_carb -> low-carb tag)
-        normalized = pattern_lower.replace(" ", "_").replace("-", "_")
-        if normalized not in tags:
-            return False
-    return True
-
-
-def _respects_prep_time(meal: Dict[str, object], max_minutes: int | None) -> bool:
-    if not max_minutes:
-        return True
-    return int(meal.get("prep_minutes", 0)) <= max_minutes
-
-
-def _contains_blocked_ingredient(
-    meal: Dict[str, object], *, blocked_sources: Dict[str, List[str]]
-) -> bool:
-    lowered_ingredients = [ingredient.lower() for ingredient in meal.get("ingredients", [])]
-
-    for source, terms in blocked_sources.items():
-        for term in terms:
-            for ingredient in lowered_ingredients:
-                if term in ingredient:
-                    return True
-    return False
-
-
-def _matches_preference_tags(meal: Dict[str, object], desired_tags: Iterable[str]) -> bool:
-    tags = {tag.lower() for tag in meal.get("tags", [])}
-    normalized_desired = {tag.lower().replace(" ", "_") for tag in desired_tags}
-    return normalized_desired.issubset(tags)
-
-
-def _build_blocklist(preferences: PlanPreferences) -> Dict[str, List[str]]:
-    blocked: Dict[str, List[str]] = {}
-
-    allergy_terms = [item.lower() for item in preferences.allergies]
-    avoid_terms = [item.lower() for item in preferences.avoid_ingredients]
-    intolerance_terms: List[str] = []
-    for intolerance in preferences.intolerances:
-        intolerance_terms.extend(_INTOLERANCE_KEYWORDS.get(intolerance.lower(), []))
-
-    merged = set(allergy_terms + avoid_terms) | set(intolerance_terms)
-    if merged:
-        blocked["blocked_terms"] = list(merged)
-    return blocked
-
-
-_INTOLERANCE_KEYWORDS: Dict[str, List[str]] = {
-    "lactose": [
-        "milk",
-        "cheese",
-        "cream",
-        "butter",
-        "yogurt",
-        "whey",
-        "casein",
-        "custard",
-        "ghee",
-    ],
-    "gluten": [
-        "wheat",
-        "barley",
-        "rye",
-        "malt",
-        "semolina",
-        "spelt",
-        "farina",
-        "triticale",
-    ],
-    "soy": ["soy", "tofu", "edamame", "soybean"],
-    "peanut": ["peanut", "groundnut"],
-    "tree_nut": ["almond", "cashew", "walnut", "pecan", "hazelnut", "pistachio"],
-    "shellfish": ["shrimp", "prawn", "lobster", "crab", "clam", "oyster", "scallop"],
-}
-
-
 def _pick_meal(
-    meals: List[Dict[str, object]], seed: int, day_index: int, meal_index: int
-) -> Dict[str, object]:
+    meals: Sequence[Mapping[str, object]], seed: int, day_index: int, meal_index: int
+) -> Mapping[str, object]:
     if not meals:
         raise ValueError("Meal library cannot be empty")
     offset = (seed + day_index * 7 + meal_index * 3) % len(meals)
     return meals[offset]
 
 
+@lru_cache(maxsize=1)
+def get_default_library_index() -> MealLibraryIndex:
+    """Compile the static meal library once per process."""
+
+    return MealLibraryIndex.build(_MEAL_LIBRARY)
+
+
 # --- Static meal library --------------------------------------------------
 
 _MEAL_LIBRARY: List[Dict[str, object]] = [
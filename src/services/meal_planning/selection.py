@@ -0,0 +1,346 @@
+"""
+Vectorized recipe scoring and plan-level meal selection.
+
+Recipes are compiled once into a column-oriented ``RecipeMatrix``. Scores for
+every recipe are computed in a handful of NumPy operations, and the selector
+fills a whole plan with a greedy pass over a shortlisted candidate pool, then
+repairs budget or prep-time overruns with score-aware swaps. Budget, prep
+time and variety caps apply to the plan as a whole rather than meal by meal.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constraints import MergedConstraints
+
+logger = logging.getLogger(__name__)
+
+NUTRIENTS: Tuple[str, ...] = ("calories", "protein", "fiber", "sodium")
+MEALS_PER_DAY = 3
+
+# How many candidates per slot to shortlist from each ranking (score, cost, prep).
+_SHORTLIST_FACTOR = 4
+
+
+@dataclass(frozen=True, eq=False)
+class RecipeMatrix:
+    """Column-oriented view of a recipe database."""
+
+    recipe_ids: Tuple[str, ...]
+    cost: np.ndarray
+    prep_time: np.ndarray
+    nutrition: np.ndarray
+    goal_types: Tuple[str, ...]
+    goal_compatibility: np.ndarray
+    goal_mask: np.ndarray
+    anti_inflammatory: np.ndarray
+    ingredient_vocabulary: Tuple[str, ...]
+    # Flattened (recipe row, ingredient code) pairs, one per recipe ingredient.
+    ingredient_rows: np.ndarray
+    ingredient_codes: np.ndarray
+
+    @classmethod
+    def from_recipes(cls, recipes: Mapping[str, Mapping[str, Any]]) -> "RecipeMatrix":
+        recipe_ids = tuple(recipes)
+        size = len(recipe_ids)
+
+        goal_types = tuple(
+            sorted({goal for recipe in recipes.values() for goal in recipe.get("goal_compatibility", {})})
+        )
+        goal_column = {goal: column for column, goal in enumerate(goal_types)}
+
+        cost = np.empty(size, dtype=np.float64)
+        prep_time = np.empty(size, dtype=np.float64)
+        nutrition = np.zeros((size, len(NUTRIENTS)), dtype=np.float64)
+        compatibility = np.zeros((size, len(goal_types)), dtype=np.float64)
+        mask = np.zeros((size, len(goal_types)), dtype=np.float64)
+        anti_inflammatory = np.zeros(size, dtype=np.float64)
+
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        codes: List[int] = []
+
+        for row, recipe in enumerate(recipes.values()):
+            cost[row] = recipe["cost_per_serving"]
+            prep_time[row] = recipe["prep_time"]
+            recipe_nutrition = recipe.get("nutrition", {})
+            for column, nutrient in enumerate(NUTRIENTS):
+                nutrition[row, column] = recipe_nutrition.get(nutrient, 0)
+            for goal, value in recipe.get("goal_compatibility", {}).items():
+                compatibility[row, goal_column[goal]] = value
+                mask[row, goal_column[goal]] = 1.0
+            anti_inflammatory[row] = recipe.get("anti_inflammatory_score", 0.0)
+            for ingredient in recipe.get("ingredients", []):
+                rows.append(row)
+                codes.append(vocabulary.setdefault(ingredient, len(vocabulary)))
+
+        return cls(
+            recipe_ids=recipe_ids,
+            cost=cost,
+            prep_time=prep_time,
+            nutrition=nutrition,
+            goal_types=goal_types,
+            goal_compatibility=compatibility,
+            goal_mask=mask,
+            anti_inflammatory=anti_inflammatory,
+            ingredient_vocabulary=tuple(vocabulary),
+            ingredient_rows=np.asarray(rows, dtype=np.int64),
+            ingredient_codes=np.asarray(codes, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def matches_database(self, recipes: Mapping[str, Any]) -> bool:
+        return len(recipes) == len(self.recipe_ids) and tuple(recipes) == self.recipe_ids
+
+    def emphasized_ingredient_counts(self, emphasized_foods: Sequence[str]) -> np.ndarray:
+        """Count, per recipe, the ingredients containing any emphasized food."""
+
+        vocabulary_hits = np.fromiter(
+            (any(food in ingredient for food in emphasized_foods) for ingredient in self.ingredient_vocabulary),
+            dtype=np.float64,
+            count=len(self.ingredient_vocabulary),
+        )
+        if not len(self.ingredient_codes):
+            return np.zeros(len(self), dtype=np.float64)
+        return np.bincount(
+            self.ingredient_rows,
+            weights=vocabulary_hits[self.ingredient_codes],
+            minlength=len(self),
+        )
+
+
+def score_recipes(matrix: RecipeMatrix, constraints: MergedConstraints, goals: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """
+    Score every recipe against the merged constraints.
+
+    Builds a recipes x constraints matrix of component scores plus
+    per-recipe normalisation factors and reduces it in one step.
+    """
+
+    size = len(matrix)
+    components: List[np.ndarray] = []
+    factors = np.zeros(size, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if constraints.max_cost_per_meal:
+            components.append(np.minimum(1.0, constraints.max_cost_per_meal / matrix.cost))
+            factors += 1
+        if constraints.max_prep_time:
+            components.append(np.minimum(1.0, constraints.max_prep_time / matrix.prep_time))
+            factors += 1
+        if constraints.protein_grams:
+            per_meal_protein = constraints.protein_grams / MEALS_PER_DAY
+            components.append(np.minimum(1.0, matrix.nutrition[:, NUTRIENTS.index("protein")] / per_meal_protein))
+            factors += 1
+
+    goal_weights = np.zeros(len(matrix.goal_types), dtype=np.float64)
+    for goal in goals:
+        goal_type = goal["goal_type"]
+        if goal_type in matrix.goal_types:
+            goal_weights[matrix.goal_types.index(goal_type)] += goal["priority"] / 4.0
+    if goal_weights.any():
+        components.append(matrix.goal_compatibility @ goal_weights)
+        factors += matrix.goal_mask @ goal_weights
+
+    if constraints.emphasized_foods:
+        counts = matrix.emphasized_ingredient_counts(constraints.emphasized_foods)
+        components.append(np.minimum(1.0, counts / len(constraints.emphasized_foods)))
+        factors += 1
+
+    if constraints.anti_inflammatory_focus:
+        components.append(matrix.anti_inflammatory)
+        factors += 1
+
+    if not components:
+        return np.zeros(size, dtype=np.float64)
+    score_matrix = np.column_stack(components)
+    return score_matrix.sum(axis=1) / np.maximum(factors, 1)
+
+
+@dataclass
+class SelectionResult:
+    """Chosen recipe rows for each plan slot plus plan-level totals."""
+
+    rows: List[int]
+    scores: List[float]
+    total_cost: float
+    total_prep_time: float
+    cost_budget: Optional[float]
+    prep_budget: Optional[float]
+    variety_cap: int
+    repairs: int = 0
+    relaxed_variety: bool = False
+    feasible: bool = True
+    notes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PlanSelector:
+    """Greedy-with-repair selector for a full meal plan."""
+
+    shortlist_factor: int = _SHORTLIST_FACTOR
+    max_repairs: int = 256
+
+    def select(
+        self,
+        matrix: RecipeMatrix,
+        scores: np.ndarray,
+        constraints: MergedConstraints,
+        days: int,
+    ) -> SelectionResult:
+        slots = days * MEALS_PER_DAY
+        cap = max(1, days // 2)
+        cost_budget = _plan_cost_budget(constraints, days)
+        prep_budget = constraints.max_prep_time * slots if constraints.max_prep_time else None
+
+        if slots == 0 or len(matrix) == 0:
+            return SelectionResult([], [], 0.0, 0.0, cost_budget, prep_budget, cap)
+
+        relaxed = False
+        if len(matrix) * cap < slots:
+            cap = -(-slots // len(matrix))
+            relaxed = True
+
+        pool = self._shortlist(matrix, scores, slots, cap)
+        pool_cost = matrix.cost[pool]
+        pool_prep = matrix.prep_time[pool]
+        pool_score = scores[pool]
+        uses = np.zeros(len(pool), dtype=np.int64)
+
+        chosen: List[int] = []
+        spent_cost = 0.0
+        spent_prep = 0.0
+        for slot in range(slots):
+            remaining_after = slots - slot - 1
+            available = uses < cap
+            feasible = available.copy()
+            if cost_budget is not None:
+                floor = remaining_after * pool_cost[available].min()
+                feasible &= pool_cost <= cost_budget - spent_cost - floor + 1e-9
+            if prep_budget is not None:
+                floor = remaining_after * pool_prep[available].min()
+                feasible &= pool_prep <= prep_budget - spent_prep - floor + 1e-9
+
+            if not feasible.any():
+                # No choice keeps the plan within budget; take the cheapest and let repair try.
+                candidates = np.flatnonzero(available)
+                pick = int(candidates[np.argmin(pool_cost[candidates])])
+            else:
+                pick = int(np.argmax(np.where(feasible, pool_score, -np.inf)))
+
+            uses[pick] += 1
+            chosen.append(pick)
+            spent_cost += float(pool_cost[pick])
+            spent_prep += float(pool_prep[pick])
+
+        repairs = self._repair(chosen, uses, cap, pool_cost, pool_prep, pool_score, cost_budget, prep_budget)
+
+        total_cost = float(pool_cost[chosen].sum())
+        total_prep = float(pool_prep[chosen].sum())
+        feasible_plan = (cost_budget is None or total_cost <= cost_budget + 1e-9) and (
+            prep_budget is None or total_prep <= prep_budget + 1e-9
+        )
+
+        notes: List[str] = []
+        if relaxed:
+            notes.append(f"Recipe library too small for variety cap; allowing {cap} uses per recipe")
+        if not feasible_plan:
+            notes.append("No combination of available recipes fits the plan budget and prep time")
+
+        return SelectionResult(
+            rows=[int(pool[index]) for index in chosen],
+            scores=[float(pool_score[index]) for index in chosen],
+            total_cost=total_cost,
+            total_prep_time=total_prep,
+            cost_budget=cost_budget,
+            prep_budget=prep_budget,
+            variety_cap=cap,
+            repairs=repairs,
+            relaxed_variety=relaxed,
+            feasible=feasible_plan,
+            notes=notes,
+        )
+
+    def _shortlist(self, matrix: RecipeMatrix, scores: np.ndarray, slots: int, cap: int) -> np.ndarray:
+        """Union of the best-scoring, cheapest and quickest recipes."""
+
+        size = len(matrix)
+        width = min(size, max(1, -(-slots // cap)) * self.shortlist_factor)
+        if width >= size:
+            return np.arange(size)
+        parts = [
+            np.argpartition(-scores, width - 1)[:width],
+            np.argpartition(matrix.cost, width - 1)[:width],
+            np.argpartition(matrix.prep_time, width - 1)[:width],
+        ]
+        return np.unique(np.concatenate(parts))
+
+    def _repair(
+        self,
+        chosen: List[int],
+        uses: np.ndarray,
+        cap: int,
+        cost: np.ndarray,
+        prep: np.ndarray,
+        score: np.ndarray,
+        cost_budget: Optional[float],
+        prep_budget: Optional[float],
+    ) -> int:
+        """Swap slots to cheaper/quicker recipes, losing as little score as possible."""
+
+        repairs = 0
+        while repairs < self.max_repairs:
+            cost_over = 0.0 if cost_budget is None else float(cost[chosen].sum()) - cost_budget
+            prep_over = 0.0 if prep_budget is None else float(prep[chosen].sum()) - prep_budget
+            if cost_over <= 1e-9 and prep_over <= 1e-9:
+                break
+
+            # Normalised overrun weights so both budgets pull in proportion to their violation.
+            cost_weight = max(cost_over, 0.0) / (cost_budget or 1.0)
+            prep_weight = max(prep_over, 0.0) / (prep_budget or 1.0)
+
+            available = uses < cap
+            best: Optional[Tuple[float, int, int]] = None
+            for current in dict.fromkeys(chosen):
+                slot_index = chosen.index(current)
+                saving = cost_weight * (cost[current] - cost) + prep_weight * (prep[current] - prep)
+                useful = available & (saving > 1e-12)
+                if not useful.any():
+                    continue
+                ratio = np.where(useful, (score[current] - score) / np.where(useful, saving, 1.0), np.inf)
+                candidate = int(np.argmin(ratio))
+                if best is None or ratio[candidate] < best[0]:
+                    best = (float(ratio[candidate]), slot_index, candidate)
+
+            if best is None:
+                break
+            _, slot_index, replacement = best
+            uses[chosen[slot_index]] -= 1
+            uses[replacement] += 1
+            chosen[slot_index] = replacement
+            repairs += 1
+        return repairs
+
+
+def _plan_cost_budget(constraints: MergedConstraints, days: int) -> Optional[float]:
+    if constraints.weekly_budget:
+        return constraints.weekly_budget * days / 7
+    if constraints.max_cost_per_meal:
+        return constraints.max_cost_per_meal * days * MEALS_PER_DAY
+    return None
+
+
+__all__ = [
+    "NUTRIENTS",
+    "PlanSelector",
+    "RecipeMatrix",
+    "SelectionResult",
+    "score_recipes",
+]
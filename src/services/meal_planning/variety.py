@@ -11,7 +11,10 @@ from dataclasses import dataclass
 import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from .constraints import MultiGoalService, MergedConstraints, GoalType
+from .selection import PlanSelector, RecipeMatrix, score_recipes
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,8 @@ class MultiGoalMealPlanGenerator:
     def __init__(self, ai_service, multi_goal_service: MultiGoalService):
         self.ai_service = ai_service
         self.multi_goal_service = multi_goal_service
+        self.plan_selector = PlanSelector()
+        self._recipe_matrix: Optional[RecipeMatrix] = None
         
         # Enhanced recipe database with goal-specific tagging
         self.recipe_database = {
@@ -186,123 +191,43 @@ class MultiGoalMealPlanGenerator:
                 message="Failed to generate meal plan"
             )
     
+    def _get_recipe_matrix(self) -> RecipeMatrix:
+        """Compile the recipe database once, recompiling only when it changes"""
+        if self._recipe_matrix is None or not self._recipe_matrix.matches_database(self.recipe_database):
+            self._recipe_matrix = RecipeMatrix.from_recipes(self.recipe_database)
+        return self._recipe_matrix
+    
     def _score_recipes_for_constraints(self, constraints: MergedConstraints, goals: List[Dict]) -> Dict[str, float]:
         """Score each recipe against the merged constraints"""
-        recipe_scores = {}
-        
-        for recipe_id, recipe in self.recipe_database.items():
-            score = 0.0
-            factors = 0
-            
-            # Cost scoring
-            if constraints.max_cost_per_meal:
-                cost_score = min(1.0, constraints.max_cost_per_meal / recipe['cost_per_serving'])
-                score += cost_score
-                factors += 1
-            
-            # Time scoring
-            if constraints.max_prep_time:
-                time_score = min(1.0, constraints.max_prep_time / recipe['prep_time'])
-                score += time_score
-                factors += 1
-            
-            # Nutrition scoring
-            if constraints.protein_grams:
-                protein_ratio = recipe['nutrition']['protein'] / (constraints.protein_grams / 3)  # Assume 3 meals/day
-                protein_score = min(1.0, protein_ratio)
-                score += protein_score
-                factors += 1
-            
-            # Goal compatibility scoring
-            for goal in goals:
-                goal_type = goal['goal_type']
-                priority_weight = goal['priority'] / 4.0
-                
-                if goal_type in recipe['goal_compatibility']:
-                    compatibility = recipe['goal_compatibility'][goal_type]
-                    weighted_compatibility = compatibility * priority_weight
-                    score += weighted_compatibility
-                    factors += priority_weight
-            
-            # Emphasized foods bonus
-            if constraints.emphasized_foods:
-                ingredient_matches = sum(1 for ingredient in recipe['ingredients'] 
-                                       if any(emp_food in ingredient for emp_food in constraints.emphasized_foods))
-                emphasis_score = min(1.0, ingredient_matches / len(constraints.emphasized_foods))
-                score += emphasis_score
-                factors += 1
-            
-            # Anti-inflammatory scoring
-            if constraints.anti_inflammatory_focus:
-                score += recipe['anti_inflammatory_score']
-                factors += 1
-            
-            # Normalize score
-            recipe_scores[recipe_id] = score / max(factors, 1)
-        
-        return recipe_scores
+        matrix = self._get_recipe_matrix()
+        scores = score_recipes(matrix, constraints, goals)
+        return dict(zip(matrix.recipe_ids, scores.tolist()))
     
     def _select_optimal_meals(self, recipe_scores: Dict[str, float], constraints: MergedConstraints, days: int) -> List[Dict[str, Any]]:
-        """Select optimal combination of meals for the plan"""
-        # Sort recipes by score
-        sorted_recipes = sorted(recipe_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        selected_meals = []
-        total_cost = 0.0
-        total_nutrition = {"calories": 0, "protein": 0, "fiber": 0, "sodium": 0}
-        
-        meals_per_day = 3
-        total_meals_needed = days * meals_per_day
+        """Select optimal combination of meals for the plan
+        
+        Budget, prep time and variety caps are enforced across the whole plan
+        by a greedy pass with swap-based repair (see ``PlanSelector``).
+        """
+        matrix = self._get_recipe_matrix()
+        scores = np.fromiter(
+            (recipe_scores.get(recipe_id, 0.0) for recipe_id in matrix.recipe_ids),
+            dtype=np.float64,
+            count=len(matrix),
+        )
         
-        # Select top recipes, ensuring variety and constraints
-        used_recipes = set()
+        selection = self.plan_selector.select(matrix, scores, constraints, days)
+        for note in selection.notes:
+            logger.info(note)
         
-        for _ in range(total_meals_needed):
-            best_recipe = None
-            best_score = -1
-            
-            for recipe_id, score in sorted_recipes:
-                # Skip if we've used this recipe too much
-                if used_recipes.count(recipe_id) >= max(1, days // 2):
-                    continue
-                
-                recipe = self.recipe_database[recipe_id]
-                
-                # Check budget constraint
-                if constraints.max_cost_per_meal and recipe['cost_per_serving'] > constraints.max_cost_per_meal:
-                    continue
-                
-                # Check time constraint
-                if constraints.max_prep_time and recipe['prep_time'] > constraints.max_prep_time:
-                    continue
-                
-                if score > best_score:
-                    best_score = score
-                    best_recipe = recipe_id
-            
-            # Add the best recipe
-            if best_recipe:
-                recipe = self.recipe_database[best_recipe]
-                selected_meals.append({
-                    "recipe_id": best_recipe,
-                    "recipe": recipe,
-                    "score": best_score
-                })
-                used_recipes.add(best_recipe)
-                
-                # Update totals
-                total_cost += recipe['cost_per_serving']
-                for nutrient in total_nutrition:
-                    total_nutrition[nutrient] += recipe['nutrition'].get(nutrient, 0)
-            else:
-                # Fallback to any available recipe
-                fallback_recipe = sorted_recipes[0][0]
-                recipe = self.recipe_database[fallback_recipe]
-                selected_meals.append({
-                    "recipe_id": fallback_recipe,
-                    "recipe": recipe,
-                    "score": 0.5
-                })
+        selected_meals = []
+        for row, score in zip(selection.rows, selection.scores):
+            recipe_id = matrix.recipe_ids[row]
+            selected_meals.append({
+                "recipe_id": recipe_id,
+                "recipe": self.recipe_database[recipe_id],
+                "score": score
+            })
         
         return selected_meals
     
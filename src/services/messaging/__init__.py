@@ -8,10 +8,17 @@ This package contains all messaging and communication services:
 - analytics.py: Multi-user messaging analytics (MultiUserMessagingHandler)
 """
 
-from .sms import ConsolidatedMessagingService as SMSCommunicationService
-from .notifications import AWSMessagingService as NotificationService
-from .templates import NutritionMessagingService as TemplateService
-from .analytics import MultiUserMessagingHandler as AnalyticsService
+from ..infrastructure.lazy_loading import lazy_exports
+
+# Imported on first access so handlers only load the services they use
+_EXPORTS = {
+    'SMSCommunicationService': '.sms:ConsolidatedMessagingService',
+    'NotificationService': '.notifications:AWSMessagingService',
+    'TemplateService': '.templates:NutritionMessagingService',
+    'AnalyticsService': '.analytics:MultiUserMessagingHandler',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'SMSCommunicationService',
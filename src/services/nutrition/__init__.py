@@ -8,10 +8,17 @@ This package contains all nutrition-related services organized by responsibility
 - insights.py: AI-powered nutrition insights (ConsolidatedAINutritionService)
 """
 
-from .tracker import NutritionTrackingService as NutritionTracker
-from .calculator import EdamamService as NutritionCalculator
-from .goals import HealthGoalsManager
-from .insights import ConsolidatedAINutritionService as NutritionInsights
+from ..infrastructure.lazy_loading import lazy_exports
+
+# Imported on first access so handlers only load the services they use
+_EXPORTS = {
+    'NutritionTracker': '.tracker:NutritionTrackingService',
+    'NutritionCalculator': '.calculator:EdamamService',
+    'HealthGoalsManager': '.goals:HealthGoalsManager',
+    'NutritionInsights': '.insights:ConsolidatedAINutritionService',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'NutritionTracker',
@@ -0,0 +1,180 @@
+"""
+Rolling Nutrition Aggregates
+
+Per-user aggregate item kept alongside the daily nutrition items so weekly
+reports, stats and adaptation checks read one item instead of one per day.
+
+The item (user data key ``nutrition_aggregates``) holds:
+- ``days``: snapshots of the last ``retention_days`` tracked days (totals
+  plus feeling check-ins), keyed by date
+- ``windows``: rolling 7/30-day sums and tracked-day counts as of ``as_of``
+- ``since``: first date from which ``days`` is known to be complete
+
+Every daily write updates the item. Reads that reach before ``since`` (for
+example the first report after aggregates were introduced) rebuild it from
+the daily items with one range read when the user service supports
+``get_user_data_range(user_id, start_key, end_key)``.
+
+Each write bumps ``version``. When the user service supports
+``save_user_data_if_version(user_id, key, data, expected_version)`` (store
+only if the saved item's ``version`` still equals ``expected_version``, or
+the item is absent for ``None``; return whether it was stored), writes are
+conditional and retried against the latest item, so concurrent writers for
+one user do not drop each other's days.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_KEY = 'nutrition_aggregates'
+DAY_KEY_PREFIX = 'nutrition_'
+
+# Daily totals summed into rolling windows
+AGGREGATE_FIELDS = ('kcal', 'protein', 'carbs', 'fat', 'fiber', 'sodium', 'sugar_added', 'water_cups')
+# Daily check-ins kept with each snapshot for adaptation checks
+CHECK_IN_FIELDS = ('steps', 'mood', 'energy', 'digestion', 'sleep_quality')
+ROLLING_WINDOWS = (7, 30)
+# Attempts at a conditional aggregate write before giving up
+MAX_WRITE_ATTEMPTS = 5
+# Marks an aggregate item that has not been read yet
+_UNREAD = object()
+
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def day_snapshot(day: Dict[str, Any]) -> Dict[str, Any]:
+    """Totals and check-ins of a daily nutrition item, without meal lists."""
+    snapshot = {'date': day['date']}
+    for field in AGGREGATE_FIELDS:
+        snapshot[field] = float(day.get(field) or 0)
+    for field in CHECK_IN_FIELDS:
+        if day.get(field) is not None:
+            snapshot[field] = int(day[field]) if field == 'steps' else day[field]
+    return snapshot
+
+
+def rolling_window(days: Dict[str, Dict[str, Any]], as_of: str, length: int) -> Dict[str, Any]:
+    """Sums and tracked-day count over the ``length`` days ending at ``as_of``."""
+    start = _shift(as_of, -(length - 1))
+    tracked = [day for date, day in days.items() if start <= date <= as_of and day.get('kcal', 0) > 0]
+    return {
+        'sums': {field: sum(day.get(field, 0) for day in tracked) for field in AGGREGATE_FIELDS},
+        'days': len(tracked)
+    }
+
+
+class NutritionAggregateStore:
+    """Maintains and reads the rolling nutrition aggregate item of each user."""
+
+    def __init__(self, user_service, retention_days: int = 30,
+                 today: Callable[[], str] = lambda: datetime.now().strftime('%Y-%m-%d')):
+        self.user_service = user_service
+        self.retention_days = max(retention_days, max(ROLLING_WINDOWS))
+        self._today = today
+
+    def record_day(self, user_id: str, day: Dict[str, Any]) -> Dict[str, Any]:
+        """Fold a saved daily nutrition item into the user's aggregate."""
+        snapshot = day_snapshot(day)
+
+        def fold(current: Optional[Dict[str, Any]], today: str) -> Dict[str, Any]:
+            if current is None:
+                aggregate = {'since': min(day['date'], today), 'days': {}}
+            else:
+                aggregate = dict(current, days=dict(current['days']))
+            aggregate['days'][day['date']] = snapshot
+            return aggregate
+
+        return self._update(user_id, fold)
+
+    def days(self, user_id: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Day snapshots from ``start`` to ``end`` inclusive, oldest first."""
+        today = self._today()
+        retained_from = _shift(today, -(self.retention_days - 1))
+        if start < retained_from:
+            # Older than the rolling window: read the daily items directly
+            return [day_snapshot(day) for day in self._read_range(user_id, start, end)]
+
+        stored = self.user_service.get_user_data(user_id, AGGREGATE_KEY)
+        aggregate = self._valid(stored)
+        if aggregate is None or aggregate['since'] > start:
+            aggregate = self.rebuild(user_id, stored)
+        return [day for date, day in sorted(aggregate['days'].items()) if start <= date <= end]
+
+    def window(self, user_id: str, length: int = 7) -> Dict[str, Any]:
+        """Rolling sums and tracked-day count for the last ``length`` days."""
+        today = self._today()
+        snapshots = self.days(user_id, _shift(today, -(length - 1)), today)
+        return rolling_window({day['date']: day for day in snapshots}, today, length)
+
+    def rebuild(self, user_id: str, stored: Any = _UNREAD) -> Dict[str, Any]:
+        """Recompute the aggregate from the daily items; ``stored`` is the item if already read."""
+
+        def recompute(current: Optional[Dict[str, Any]], today: str) -> Dict[str, Any]:
+            since = _shift(today, -(self.retention_days - 1))
+            return {
+                'since': since,
+                'days': {day['date']: day_snapshot(day) for day in self._read_range(user_id, since, today)}
+            }
+
+        aggregate = self._update(user_id, recompute, stored)
+        logger.info(f"Rebuilt nutrition aggregates for {user_id} from {len(aggregate['days'])} days")
+        return aggregate
+
+    def _read_range(self, user_id: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Daily items from ``start`` to ``end``: one range read when supported, else one read per day."""
+        if hasattr(self.user_service, 'get_user_data_range'):
+            items = self.user_service.get_user_data_range(
+                user_id, f'{DAY_KEY_PREFIX}{start}', f'{DAY_KEY_PREFIX}{end}'
+            ) or {}
+            days = [day for day in items.values() if day and day.get('date')]
+        else:
+            days = []
+            date = start
+            while date <= end:
+                day = self.user_service.get_user_data(user_id, f'{DAY_KEY_PREFIX}{date}')
+                if day:
+                    days.append(day)
+                date = _shift(date, 1)
+        return sorted(days, key=lambda day: day['date'])
+
+    @staticmethod
+    def _valid(aggregate: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not aggregate or 'since' not in aggregate:
+            return None
+        return aggregate
+
+    def _update(self, user_id: str, build: Callable[[Optional[Dict[str, Any]], str], Dict[str, Any]],
+                stored: Any = _UNREAD) -> Dict[str, Any]:
+        """Read-modify-write of the aggregate, retried while another writer wins the race."""
+        conditional = hasattr(self.user_service, 'save_user_data_if_version')
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            today = self._today()
+            if stored is _UNREAD:
+                stored = self.user_service.get_user_data(user_id, AGGREGATE_KEY)
+            current = self._valid(stored)
+            expected_version = stored.get('version', 0) if stored else None
+            aggregate = self._finish(build(current, today), today, (expected_version or 0) + 1)
+            if not conditional:
+                self.user_service.save_user_data(user_id, AGGREGATE_KEY, aggregate)
+                return aggregate
+            if self.user_service.save_user_data_if_version(user_id, AGGREGATE_KEY, aggregate, expected_version):
+                return aggregate
+            stored = _UNREAD
+        raise RuntimeError(f"Nutrition aggregates for {user_id} kept changing; gave up after "
+                           f"{MAX_WRITE_ATTEMPTS} attempts")
+
+    def _finish(self, aggregate: Dict[str, Any], today: str, version: int) -> Dict[str, Any]:
+        retained_from = _shift(today, -(self.retention_days - 1))
+        aggregate['days'] = {date: day for date, day in aggregate['days'].items() if date >= retained_from}
+        aggregate['since'] = max(aggregate['since'], retained_from)
+        aggregate['as_of'] = today
+        aggregate['version'] = version
+        aggregate['windows'] = {
+            str(length): rolling_window(aggregate['days'], today, length) for length in ROLLING_WINDOWS
+        }
+        return aggregate
@@ -705,10 +705,15 @@ class EdamamUsageTracker:
     Track and manage Edamam API usage for cost optimization
     """
     
-    def __init__(self):
+    def __init__(self, usage_accumulator=None):
         self.dynamodb = boto3.resource('dynamodb')
         self.usage_table = self.dynamodb.Table(os.getenv('API_USAGE_TABLE_NAME', 'ai-nutritionist-api-usage-dev'))
         
+        # In-process usage (e.g. Bedrock) not yet flushed to the usage table
+        if usage_accumulator is None:
+            from ..infrastructure.usage_accounting import usage_accumulator
+        self.usage_accumulator = usage_accumulator
+        
     async def get_daily_usage_summary(self, date: str = None) -> Dict:
         """Get usage summary for a specific date"""
         if not date:
@@ -724,6 +729,7 @@ class EdamamUsageTracker:
             summary = {
                 'date': date,
                 'api_calls': {},
+                'tokens': {},
                 'total_cost': 0.0,
                 'top_users': []
             }
@@ -731,8 +737,17 @@ class EdamamUsageTracker:
             for item in response.get('Items', []):
                 if date in item['usage_key']:
                     api_type = item['usage_key'].split('#')[1]
-                    summary['api_calls'][api_type] = item.get('count', 0)
-                    summary['total_cost'] += item.get('total_cost', 0.0)
+                    summary['api_calls'][api_type] = int(item.get('count', 0))
+                    summary['total_cost'] += float(item.get('total_cost', 0.0))
+                    if 'input_tokens' in item or 'output_tokens' in item:
+                        summary['tokens'][api_type] = int(item.get('input_tokens', 0)) + int(item.get('output_tokens', 0))
+            
+            # Add usage recorded in this process since the last flush
+            for api_type, counters in self.usage_accumulator.snapshot(date).items():
+                summary['api_calls'][api_type] = summary['api_calls'].get(api_type, 0) + int(counters['count'])
+                summary['total_cost'] += counters['total_cost']
+                tokens = int(counters['input_tokens'] + counters['output_tokens'])
+                summary['tokens'][api_type] = summary['tokens'].get(api_type, 0) + tokens
             
             return summary
             
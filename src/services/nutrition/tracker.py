@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from decimal import Decimal
 
+from .aggregates import NutritionAggregateStore
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -97,6 +99,7 @@ class NutritionTrackingService:
     def __init__(self, user_service, ai_service):
         self.user_service = user_service
         self.ai_service = ai_service
+        self.aggregates = NutritionAggregateStore(user_service)
         
         # Nutrition targets (can be personalized per user)
         self.default_targets = {
@@ -440,8 +443,13 @@ class NutritionTrackingService:
             return DayNutrition(date=date)
     
     def _save_day_nutrition(self, user_id: str, day_nutrition: DayNutrition):
-        """Save nutrition data for a day"""
-        self.user_service.save_user_data(user_id, f'nutrition_{day_nutrition.date}', asdict(day_nutrition))
+        """Save nutrition data for a day and fold it into the rolling aggregates"""
+        day_data = asdict(day_nutrition)
+        self.user_service.save_user_data(user_id, f'nutrition_{day_nutrition.date}', day_data)
+        try:
+            self.aggregates.record_day(user_id, day_data)
+        except Exception as e:
+            logger.warning(f"Could not update nutrition aggregates for {user_id}: {e}")
     
     def _get_meal_nutrition(self, meal_name: str, portion_multiplier: float = 1.0) -> Dict[str, float]:
         """Get nutrition data for a meal (from recipe DB or estimation)"""
@@ -530,16 +538,10 @@ class NutritionTrackingService:
     
     def _get_week_nutrition_data(self, user_id: str, week_start: str) -> List[DayNutrition]:
         """Get nutrition data for a week"""
-        week_data = []
-        start_date = datetime.strptime(week_start, '%Y-%m-%d')
-        
-        for i in range(7):
-            date = (start_date + timedelta(days=i)).strftime('%Y-%m-%d')
-            day_nutrition = self._get_day_nutrition(user_id, date)
-            if day_nutrition.kcal > 0:  # Only include days with data
-                week_data.append(day_nutrition)
+        week_end = (datetime.strptime(week_start, '%Y-%m-%d') + timedelta(days=6)).strftime('%Y-%m-%d')
         
-        return week_data
+        # Only include days with data
+        return [day for day in self._get_nutrition_range(user_id, week_start, week_end) if day.kcal > 0]
     
     def _calculate_week_summary(self, week_data: List[DayNutrition], user_id: str) -> WeekSummary:
         """Calculate weekly summary from daily data"""
@@ -595,16 +597,26 @@ class NutritionTrackingService:
         return "; ".join(suggestions) + "."
     
     def _get_recent_nutrition_data(self, user_id: str, days: int = 7) -> List[DayNutrition]:
-        """Get recent nutrition data for analysis"""
-        recent_data = []
+        """Get recent nutrition data for analysis, most recent day first"""
+        today = datetime.now()
+        start = (today - timedelta(days=days - 1)).strftime('%Y-%m-%d')
         
-        for i in range(days):
-            date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-            day_nutrition = self._get_day_nutrition(user_id, date)
-            if day_nutrition.kcal > 0:
-                recent_data.append(day_nutrition)
+        recent_data = self._get_nutrition_range(user_id, start, today.strftime('%Y-%m-%d'))
+        return [day for day in reversed(recent_data) if day.kcal > 0]
+    
+    def _get_nutrition_range(self, user_id: str, start: str, end: str) -> List[DayNutrition]:
+        """Daily totals and check-ins from start to end, read from the rolling aggregates"""
+        try:
+            return [DayNutrition(**day) for day in self.aggregates.days(user_id, start, end)]
+        except Exception as e:
+            logger.warning(f"Could not read nutrition aggregates for {user_id}, reading days: {e}")
         
-        return recent_data
+        days = []
+        date = datetime.strptime(start, '%Y-%m-%d')
+        while date.strftime('%Y-%m-%d') <= end:
+            days.append(self._get_day_nutrition(user_id, date.strftime('%Y-%m-%d')))
+            date += timedelta(days=1)
+        return days
     
     def _analyze_user_flags(self, user_id: str, recent_data: List[DayNutrition]) -> UserFlags:
         """Analyze recent data to set user flags for adaptations"""
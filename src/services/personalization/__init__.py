@@ -8,10 +8,17 @@ This package contains all personalization-related services:
 - goals.py: Personal goal management
 """
 
-from .preferences import UserService as UserPreferencesService
-from .behavior import UserLinkingService as UserBehaviorService
-from .learning import SeamlessUserProfileService as UserLearningService
-from .goals import HealthGoalsService as PersonalGoalsManager
+from ..infrastructure.lazy_loading import lazy_exports
+
+# Imported on first access so handlers only load the services they use
+_EXPORTS = {
+    'UserPreferencesService': '.preferences:UserService',
+    'UserBehaviorService': '.behavior:UserLinkingService',
+    'UserLearningService': '.learning:SeamlessUserProfileService',
+    'PersonalGoalsManager': '.goals:HealthGoalsService',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'UserPreferencesService',
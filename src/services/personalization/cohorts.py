@@ -0,0 +1,211 @@
+"""
+Auto-Plan Cohort Membership
+===========================
+
+Opted-in users carry an ``auto_plan_cohort`` attribute on their profile item,
+which feeds a sparse global secondary index (AutoPlanCohortIndex):
+
+    partition key: auto_plan_cohort   "<schedule>#<shard>", e.g. "weekly#3"
+    sort key:      user_id
+    projection:    KEYS_ONLY
+
+Only profiles with the attribute appear in the index, so reading a cohort
+costs in proportion to its members rather than to the whole users table.
+Each schedule bucket is split over a few shards to spread write and read
+load. Shards are merged in user_id order, which lets the scheduler stream
+members in pages and resume after a checkpointed cursor with a key condition
+instead of re-reading processed users.
+
+Parallel segment scans of the base table remain for backfilling the
+attribute and as a fallback while the index is missing or still building.
+The index only becomes authoritative once a backfill has completed and left
+its marker item in the table; until then readers keep scanning, so profiles
+written before the index existed are never silently skipped.
+"""
+
+import heapq
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+COHORT_ATTRIBUTE = 'auto_plan_cohort'
+DEFAULT_SCHEDULE = 'weekly'
+DEFAULT_INDEX_NAME = 'AutoPlanCohortIndex'
+DEFAULT_SHARDS = 4
+# Written once backfill() has aligned every existing profile with the index
+BACKFILL_MARKER_KEY = {'user_id': '#auto_plan_cohort', 'plan_date': 'backfill'}
+
+
+def cohort_bucket(user_id: str, schedule: str = DEFAULT_SCHEDULE, shards: int = DEFAULT_SHARDS) -> str:
+    """Index partition for a user: the schedule plus a stable hash shard."""
+    return f"{schedule}#{zlib.crc32(user_id.encode('utf-8')) % shards}"
+
+
+class AutoPlanCohort:
+    """Membership, paged iteration and backfill for the auto-plan cohort index."""
+
+    def __init__(self, table, index_name: str = None, shards: int = None,
+                 segment_table: Optional[Callable[[], Any]] = None):
+        self.table = table
+        self.index_name = index_name or os.environ.get('AUTO_PLAN_COHORT_INDEX', DEFAULT_INDEX_NAME)
+        self.shards = shards or int(os.environ.get('AUTO_PLAN_COHORT_SHARDS', DEFAULT_SHARDS))
+        # boto3 resources are not thread-safe; parallel scans get one per segment
+        self.segment_table = segment_table or (lambda: self.table)
+        self._backfilled = False
+
+    def membership_update(self, user_id: str, enabled: bool,
+                          schedule: str = DEFAULT_SCHEDULE) -> Dict[str, Any]:
+        """``update_item`` arguments that set auto_plans and the index attribute together."""
+        if enabled:
+            return {
+                'UpdateExpression': f'SET auto_plans = :enabled, {COHORT_ATTRIBUTE} = :bucket',
+                'ExpressionAttributeValues': {
+                    ':enabled': True,
+                    ':bucket': cohort_bucket(user_id, schedule, self.shards)
+                }
+            }
+        return {
+            'UpdateExpression': f'SET auto_plans = :enabled REMOVE {COHORT_ATTRIBUTE}',
+            'ExpressionAttributeValues': {':enabled': False}
+        }
+
+    def apply_membership(self, item: Dict[str, Any], schedule: str = DEFAULT_SCHEDULE) -> Dict[str, Any]:
+        """Set or drop the index attribute on a full profile item about to be put, per its auto_plans flag."""
+        if item.get('auto_plans') is True:
+            item[COHORT_ATTRIBUTE] = cohort_bucket(item['user_id'], schedule, self.shards)
+        else:
+            item.pop(COHORT_ATTRIBUTE, None)
+        return item
+
+    def is_backfilled(self) -> bool:
+        """Whether a completed backfill has made the index authoritative."""
+        if not self._backfilled:
+            try:
+                response = self.table.get_item(Key=BACKFILL_MARKER_KEY)
+                self._backfilled = 'Item' in response
+            except Exception as e:
+                logger.warning(f"Could not read auto-plan cohort backfill marker: {str(e)}")
+        return self._backfilled
+
+    def ensure_backfilled(self, segments: int = 4,
+                          schedule: str = DEFAULT_SCHEDULE) -> Optional[Dict[str, int]]:
+        """Run the backfill unless its marker is already present; returns its counts if it ran."""
+        if self.is_backfilled():
+            return None
+        return self.backfill(segments, schedule)
+
+    def iter_pages(self, page_size: int = 100, after: Optional[str] = None,
+                   schedule: str = DEFAULT_SCHEDULE) -> Iterator[List[str]]:
+        """
+        Stream member user ids in ascending order, ``page_size`` at a time.
+
+        Shards are queried lazily, one index page at a time, starting after
+        ``after`` when resuming.
+        """
+        shard_streams = [
+            self._query_shard(f"{schedule}#{shard}", page_size, after)
+            for shard in range(self.shards)
+        ]
+        page = []
+        for user_id in heapq.merge(*shard_streams):
+            page.append(user_id)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def _query_shard(self, bucket: str, page_size: int, after: Optional[str]) -> Iterator[str]:
+        """User ids of one shard, following LastEvaluatedKey."""
+        params = {
+            'IndexName': self.index_name,
+            'KeyConditionExpression': f'{COHORT_ATTRIBUTE} = :bucket',
+            'ExpressionAttributeValues': {':bucket': bucket},
+            'Limit': page_size
+        }
+        if after is not None:
+            params['KeyConditionExpression'] += ' AND user_id > :after'
+            params['ExpressionAttributeValues'][':after'] = after
+
+        while True:
+            response = self.table.query(**params)
+            for item in response.get('Items', []):
+                yield item['user_id']
+            if 'LastEvaluatedKey' not in response:
+                return
+            params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def parallel_scan(self, segments: int = 4, **scan_kwargs: Any) -> List[Dict[str, Any]]:
+        """Scan the base table in ``segments`` parallel segments, following LastEvaluatedKey."""
+        def scan_segment(segment: int) -> List[Dict[str, Any]]:
+            table = self.segment_table()
+            params = {**scan_kwargs, 'Segment': segment, 'TotalSegments': segments}
+            items = []
+            while True:
+                response = table.scan(**params)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            return [item for items in executor.map(scan_segment, range(segments)) for item in items]
+
+    def scan_pages(self, page_size: int = 100, after: Optional[str] = None,
+                   segments: int = 4) -> Iterator[List[str]]:
+        """Fallback for :meth:`iter_pages` that scans for opted-in profiles."""
+        items = self.parallel_scan(
+            segments,
+            FilterExpression='plan_date = :profile AND auto_plans = :enabled',
+            ExpressionAttributeValues={':profile': 'profile', ':enabled': True},
+            ProjectionExpression='user_id'
+        )
+        user_ids = sorted({item['user_id'] for item in items if after is None or item['user_id'] > after})
+        for start in range(0, len(user_ids), page_size):
+            yield user_ids[start:start + page_size]
+
+    def backfill(self, segments: int = 4, schedule: str = DEFAULT_SCHEDULE) -> Dict[str, int]:
+        """
+        Bring index membership in line with the auto_plans flag.
+
+        Adds opted-in profiles missing the attribute and removes it from
+        opted-out ones; profiles already consistent are not written. Records
+        the backfill marker when done.
+        """
+        items = self.parallel_scan(
+            segments,
+            FilterExpression=(
+                f'plan_date = :profile AND ((auto_plans = :enabled AND attribute_not_exists({COHORT_ATTRIBUTE}))'
+                f' OR (attribute_exists({COHORT_ATTRIBUTE})'
+                f' AND (attribute_not_exists(auto_plans) OR auto_plans <> :enabled)))'
+            ),
+            ExpressionAttributeValues={':profile': 'profile', ':enabled': True},
+            ProjectionExpression='user_id, auto_plans'
+        )
+        counts = {'added': 0, 'removed': 0}
+        for item in items:
+            enabled = item.get('auto_plans') is True
+            self.table.update_item(
+                Key={'user_id': item['user_id'], 'plan_date': 'profile'},
+                **self.membership_update(item['user_id'], enabled, schedule)
+            )
+            counts['added' if enabled else 'removed'] += 1
+
+        self.table.put_item(Item={
+            **BACKFILL_MARKER_KEY,
+            'completed_at': datetime.utcnow().isoformat(),
+            **counts
+        })
+        self._backfilled = True
+        logger.info(f"Backfilled auto-plan cohort: {counts['added']} added, {counts['removed']} removed")
+        return counts
+
+
+def flatten_pages(pages: Iterable[List[str]]) -> List[str]:
+    """Materialize paged user ids into one list."""
+    return [user_id for page in pages for user_id in page]
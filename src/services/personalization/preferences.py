@@ -5,13 +5,15 @@ User Service for managing user profiles and preferences in DynamoDB
 import json
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from datetime import datetime, timedelta
 import re
 
 import boto3
 from botocore.exceptions import ClientError
 
+from .cohorts import AutoPlanCohort, flatten_pages
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,7 @@ class UserService:
         self.dynamodb = dynamodb_resource
         self.table_name = os.environ.get('DYNAMODB_TABLE', 'ai-nutritionist-users-dev')
         self.table = self.dynamodb.Table(self.table_name)
+        self.auto_plan_cohort = AutoPlanCohort(self.table, segment_table=self._segment_table)
     
     def get_or_create_user(self, phone_number: str) -> Dict[str, Any]:
         """
@@ -71,8 +74,8 @@ class UserService:
             updated_profile = {**current_profile, **preferences}
             updated_profile['last_updated'] = datetime.utcnow().isoformat()
             
-            # Save to DynamoDB
-            self.table.put_item(Item=updated_profile)
+            # Save to DynamoDB, keeping cohort membership in line with auto_plans
+            self.table.put_item(Item=self.auto_plan_cohort.apply_membership(updated_profile))
             
             logger.info(f"Updated preferences for user {user_id}: {preferences}")
             return True
@@ -99,6 +102,35 @@ class UserService:
             logger.error(f"Error getting profile for {user_id}: {str(e)}")
             return None
     
+    def get_user_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Bulk-fetch user profiles with BatchGetItem (100 keys per request)
+        """
+        profiles: Dict[str, Dict[str, Any]] = {}
+        unique_ids = list(dict.fromkeys(user_ids))
+
+        for start in range(0, len(unique_ids), 100):
+            request_items = {
+                self.table_name: {
+                    'Keys': [
+                        {'user_id': user_id, 'plan_date': 'profile'}
+                        for user_id in unique_ids[start:start + 100]
+                    ]
+                }
+            }
+            attempts = 0
+            try:
+                while request_items and attempts < 5:
+                    response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        profiles[item['user_id']] = item
+                    request_items = response.get('UnprocessedKeys') or {}
+                    attempts += 1
+            except Exception as e:
+                logger.error(f"Error bulk-fetching profiles: {str(e)}")
+
+        return profiles
+
     def save_meal_plan(self, user_id: str, meal_plan: Dict[str, Any], plan_date: str = None) -> bool:
         """
         Save meal plan for user
@@ -178,27 +210,84 @@ class UserService:
             logger.error(f"Error deleting user {user_id}: {str(e)}")
             return False
     
-    def get_users_for_auto_plans(self) -> List[str]:
+    def set_auto_plans(self, user_id: str, enabled: bool) -> bool:
         """
-        Get list of users who have auto meal plans enabled
+        Opt a user in or out of automatic meal plans, keeping cohort membership in sync
         """
         try:
-            # Scan for users with auto_plans enabled
-            response = self.table.scan(
-                FilterExpression='plan_date = :profile AND auto_plans = :enabled',
-                ExpressionAttributeValues={
-                    ':profile': 'profile',
-                    ':enabled': True
+            self.table.update_item(
+                Key={
+                    'user_id': user_id,
+                    'plan_date': 'profile'
                 },
-                ProjectionExpression='user_id'
+                **self.auto_plan_cohort.membership_update(user_id, enabled)
             )
+            logger.info(f"Set auto plans for user {user_id}: {enabled}")
+            return True
             
-            return [item['user_id'] for item in response['Items']]
+        except Exception as e:
+            logger.error(f"Error setting auto plans for {user_id}: {str(e)}")
+            return False
+    
+    def iter_auto_plan_user_pages(self, after: Optional[str] = None, page_size: int = 100) -> Iterator[List[str]]:
+        """
+        Stream user IDs with auto meal plans enabled, in ascending pages
+        
+        Reads the sparse cohort index, resuming after ``after``; falls back to a
+        parallel scan until the cohort backfill has completed, or if the index
+        cannot be queried.
+        """
+        if not self.auto_plan_cohort.is_backfilled():
+            logger.warning("Auto-plan cohort not backfilled yet, scanning for auto plan users")
+            yield from self.auto_plan_cohort.scan_pages(page_size, after)
+            return
+        
+        pages = self.auto_plan_cohort.iter_pages(page_size, after)
+        try:
+            first_page = next(pages, None)
+        except Exception as e:
+            logger.warning(f"Cohort index unavailable, scanning for auto plan users: {str(e)}")
+            pages = self.auto_plan_cohort.scan_pages(page_size, after)
+            first_page = next(pages, None)
+        
+        if first_page is None:
+            return
+        yield first_page
+        yield from pages
+    
+    def get_users_for_auto_plans(self) -> List[str]:
+        """
+        Get list of users who have auto meal plans enabled
+        """
+        try:
+            return flatten_pages(self.iter_auto_plan_user_pages())
             
         except Exception as e:
             logger.error(f"Error getting auto plan users: {str(e)}")
             return []
     
+    def backfill_auto_plan_cohort(self, segments: int = 4) -> Dict[str, int]:
+        """
+        Add or remove cohort membership for profiles written before the index existed
+        """
+        return self.auto_plan_cohort.backfill(segments)
+    
+    def ensure_auto_plan_cohort(self, segments: int = 4) -> Optional[Dict[str, int]]:
+        """
+        Backfill cohort membership once, if no completed backfill is recorded yet
+        """
+        try:
+            return self.auto_plan_cohort.ensure_backfilled(segments)
+        except Exception as e:
+            logger.error(f"Error backfilling auto plan cohort: {str(e)}")
+            return None
+    
+    def _segment_table(self):
+        """
+        Table handle for one parallel scan worker (boto3 resources are not thread-safe)
+        """
+        return boto3.session.Session().resource('dynamodb').Table(self.table_name)
+    
     def _normalize_phone_number(self, phone_number: str) -> str:
         """
         Normalize phone number for consistent storage
@@ -234,7 +323,7 @@ class UserService:
         }
         
         # Save to DynamoDB
-        self.table.put_item(Item=user_profile)
+        self.table.put_item(Item=self.auto_plan_cohort.apply_membership(user_profile))
         
         return user_profile
     
@@ -0,0 +1,97 @@
+"""Benchmark: direct Bedrock invocations vs. the coalescing, micro-batching dispatcher."""
+
+import asyncio
+import io
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.ai.dispatcher import BedrockDispatcher
+
+pytestmark = pytest.mark.performance
+
+REQUESTS = 200
+DISTINCT_PROMPTS = 40
+# Simulated Bedrock response latency
+LATENCY_SECONDS = 0.02
+MODEL = SimpleNamespace(model_id="amazon.titan-text-express-v1")
+PARAMS = {'max_tokens': 300, 'temperature': 0.3}
+
+
+class FakeBedrockClient:
+    """Local stand-in for the bedrock-runtime client with configurable latency."""
+
+    def __init__(self, latency: float = LATENCY_SECONDS):
+        self.latency = latency
+        self.invocations = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body, contentType, accept):
+        with self._lock:
+            self.invocations += 1
+        time.sleep(self.latency)
+        prompt = json.loads(body)["inputText"]
+        payload = {"results": [{"outputText": f"answer: {prompt}"}]}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+
+def _invoke(client):
+    """The blocking part of EnhancedAIService._invoke_model for Titan."""
+
+    def invoke(prompt, model_config, params):
+        response = client.invoke_model(
+            modelId=model_config.model_id,
+            body=json.dumps({"inputText": prompt, "textGenerationConfig": {"maxTokenCount": params['max_tokens']}}),
+            contentType='application/json',
+            accept='application/json'
+        )
+        return json.loads(response['body'].read())["results"][0]["outputText"]
+
+    return invoke
+
+
+def _prompts():
+    rng = random.Random(5)
+    return [f"How much protein is in meal {rng.randrange(DISTINCT_PROMPTS)}?" for _ in range(REQUESTS)]
+
+
+def _run(mode: str):
+    client = FakeBedrockClient()
+    invoke = _invoke(client)
+    dispatcher = BedrockDispatcher(invoke, lambda model_id: False)
+    prompts = _prompts()
+
+    async def request(prompt):
+        if mode == "direct":
+            # Previous behaviour: blocking call inside the coroutine
+            return invoke(prompt, MODEL, PARAMS)
+        return await dispatcher.dispatch(prompt, MODEL, PARAMS)
+
+    async def run():
+        started = time.perf_counter()
+        results = await asyncio.gather(*[request(prompt) for prompt in prompts])
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+    assert results == [f"answer: {prompt}" for prompt in prompts]
+    return client, dispatcher, elapsed
+
+
+@pytest.mark.parametrize("mode", ["direct", "dispatched"])
+def test_bedrock_dispatch_throughput(benchmark, mode):
+    client, dispatcher, elapsed = benchmark.pedantic(_run, args=(mode,), rounds=1, iterations=1)
+
+    benchmark.extra_info["model_calls"] = client.invocations
+    benchmark.extra_info["requests_per_sec"] = REQUESTS / elapsed
+
+    if mode == "direct":
+        assert client.invocations == REQUESTS
+    else:
+        assert client.invocations == len(set(_prompts()))
+        assert dispatcher.get_stats()['max_concurrent'] <= dispatcher.max_concurrency_per_model
+        # Distinct prompts run concurrently instead of back to back
+        assert elapsed < REQUESTS * LATENCY_SECONDS / 4
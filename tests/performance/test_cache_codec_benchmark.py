@@ -0,0 +1,87 @@
+"""Benchmark: encoded size and encode/decode time per cache codec on meal plan payloads."""
+
+from dataclasses import asdict
+from datetime import date, datetime
+
+import pytest
+
+from src.core.caching.serialization import CacheSerializer, available_codecs
+from src.services.meal_planning.repository import GeneratedMealPlan, MealEntry
+
+pytestmark = pytest.mark.performance
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner"]
+
+
+def _meal_plan() -> GeneratedMealPlan:
+    meals = [
+        MealEntry(
+            meal_id=f"{day}-{meal_type}",
+            day=day,
+            meal_type=meal_type,
+            title=f"{meal_type.title()} bowl with roasted vegetables",
+            description="Whole grains, legumes and seasonal vegetables with a lemon-tahini dressing.",
+            ingredients=["quinoa", "chickpeas", "spinach", "red pepper", "tahini", "lemon", "olive oil"],
+            calories=520 + index * 7,
+            prep_minutes=15 + index % 4 * 5,
+            macros={"protein": 24.5, "carbs": 61.0, "fat": 18.2, "fiber": 11.4},
+            cost=3.75 + index % 5 * 0.4,
+            tags=["vegetarian", "high-fiber", "meal-prep"],
+        )
+        for index, (day, meal_type) in enumerate((d, m) for d in DAYS for m in MEAL_TYPES)
+    ]
+    grocery_list = [
+        {"name": f"ingredient {i}", "quantity": 2 + i % 3, "unit": "cup", "aisle": "produce", "estimated_cost": 1.25}
+        for i in range(40)
+    ]
+    return GeneratedMealPlan(
+        plan_id="plan-2024-05-06-user-123",
+        user_id="user-123",
+        week_start=date(2024, 5, 6),
+        generated_at=datetime(2024, 5, 5, 18, 30),
+        meals=meals,
+        estimated_cost=sum(meal.cost for meal in meals),
+        total_calories=sum(meal.calories for meal in meals),
+        grocery_list=grocery_list,
+        metadata={"strategy": "rule_based", "goals": ["budget", "muscle_gain"]},
+    )
+
+
+PAYLOADS = {
+    # Dataclass as the repository returns it (non-pickle codecs fall back to pickle)
+    "dataclass": _meal_plan(),
+    # Plain dict as API handlers cache it
+    "dict": {**asdict(_meal_plan()), "week_start": "2024-05-06", "generated_at": "2024-05-05T18:30:00"},
+}
+
+CASES = [
+    pytest.param(codec, threshold, id=f"{codec}-{'zlib' if threshold is not None else 'raw'}")
+    for codec in available_codecs()
+    for threshold in (None, 1024)
+]
+
+
+@pytest.mark.parametrize("payload_name", PAYLOADS)
+@pytest.mark.parametrize("codec,threshold", CASES)
+def test_encode(benchmark, codec, threshold, payload_name):
+    serializer = CacheSerializer(codec=codec, compression_threshold=threshold)
+    payload = PAYLOADS[payload_name]
+
+    encoded = benchmark(serializer.dumps, payload)
+
+    benchmark.extra_info["bytes"] = len(encoded)
+    assert serializer.loads(encoded) == payload
+
+
+@pytest.mark.parametrize("payload_name", PAYLOADS)
+@pytest.mark.parametrize("codec,threshold", CASES)
+def test_decode(benchmark, codec, threshold, payload_name):
+    serializer = CacheSerializer(codec=codec, compression_threshold=threshold)
+    payload = PAYLOADS[payload_name]
+    encoded = serializer.dumps(payload)
+
+    decoded = benchmark(serializer.loads, encoded)
+
+    benchmark.extra_info["bytes"] = len(encoded)
+    assert decoded == payload
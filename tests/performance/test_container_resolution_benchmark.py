@@ -0,0 +1,69 @@
+"""Benchmark: DI container resolutions/sec for deep dependency graphs, compiled plans vs. per-resolution reflection."""
+
+import time
+
+import pytest
+
+from packages.core.src.container.container import Container
+
+pytestmark = pytest.mark.performance
+
+DEPTH = 12
+RESOLUTIONS = 2000
+
+
+def _graph(depth: int):
+    """A chain of transient services, each also depending on a scoped and a singleton leaf."""
+
+    class Settings:
+        pass
+
+    class RequestContext:
+        pass
+
+    levels = []
+    for index in range(depth):
+        previous = levels[-1] if levels else None
+
+        def __init__(self, context: RequestContext, settings: Settings, child=None):
+            self.context = context
+            self.settings = settings
+            self.child = child
+
+        if previous is not None:
+            __init__.__annotations__['child'] = previous
+        levels.append(type(f"Level{index}", (), {'__init__': __init__}))
+
+    container = Container()
+    container.register_singleton(Settings)
+    container.register_scoped(RequestContext)
+    for level in levels:
+        container.register_transient(level)
+    return container, levels[-1]
+
+
+@pytest.mark.parametrize("mode", ["reflect", "compiled"])
+def test_deep_graph_resolution_rate(benchmark, mode):
+    container, root = _graph(DEPTH)
+    assert not container.validate_services()
+
+    def run():
+        started = time.perf_counter()
+        for _ in range(RESOLUTIONS):
+            if mode == "reflect":
+                # Previous behaviour: every resolution re-inspects every signature
+                container._plans.clear()
+            with container.create_scope():
+                service = container.resolve(root)
+        return service, time.perf_counter() - started
+
+    service, elapsed = benchmark.pedantic(run, rounds=1, iterations=1)
+
+    depth = 0
+    while service is not None:
+        depth += 1
+        service = service.child
+    assert depth == DEPTH
+
+    benchmark.extra_info["resolutions_per_sec"] = RESOLUTIONS / elapsed
+    benchmark.extra_info["services_per_resolution"] = DEPTH
@@ -0,0 +1,107 @@
+"""Benchmark: aggregate and time-range loads on indexed vs. scanning event storage backends."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from packages.core.src.events import (
+    AppendOnlyLogStorageBackend,
+    IndexedStorageBackend,
+    InMemoryStorageBackend,
+)
+
+pytestmark = pytest.mark.performance
+
+EVENTS_PER_AGGREGATE = 50
+BASE_TIME = datetime(2024, 1, 1)
+EVENT_NAMES = ["MealLogged", "NutritionGoalSet", "MealPlanCreated", "HealthDataSynced"]
+
+SIZES = [
+    100_000,
+    pytest.param(1_000_000, marks=pytest.mark.slow),
+    pytest.param(3_000_000, marks=pytest.mark.slow),
+]
+
+
+def _events(count: int):
+    aggregates = max(1, count // EVENTS_PER_AGGREGATE)
+    for index in range(count):
+        yield {
+            "event_name": EVENT_NAMES[index % len(EVENT_NAMES)],
+            "metadata": {
+                "event_id": f"evt-{index}",
+                "timestamp": (BASE_TIME + timedelta(seconds=index)).isoformat(),
+                "aggregate_id": f"user-{index % aggregates}",
+                "aggregate_version": index // aggregates + 1,
+            },
+            "data": {"calories": index % 900},
+        }
+
+
+def _filled(backend, size: int):
+    for event in _events(size):
+        backend.save_event(event)
+    return backend
+
+
+def _aggregate_ids(size: int):
+    aggregates = max(1, size // EVENTS_PER_AGGREGATE)
+    return [f"user-{(i * 7919) % aggregates}" for i in range(20)]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_load_aggregate_indexed(benchmark, size):
+    backend = _filled(IndexedStorageBackend(), size)
+    aggregate_ids = _aggregate_ids(size)
+
+    loaded = benchmark(lambda: [backend.load_events(aggregate_id=a) for a in aggregate_ids])
+
+    assert all(len(events) == EVENTS_PER_AGGREGATE for events in loaded)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_load_aggregate_append_only_log(benchmark, size, tmp_path):
+    backend = _filled(AppendOnlyLogStorageBackend(tmp_path / "events"), size)
+    aggregate_ids = _aggregate_ids(size)
+
+    loaded = benchmark(lambda: [backend.load_events(aggregate_id=a) for a in aggregate_ids])
+
+    assert all(len(events) == EVENTS_PER_AGGREGATE for events in loaded)
+    backend.close()
+
+
+@pytest.mark.parametrize("size", SIZES[:2])
+def test_load_aggregate_scanning_baseline(benchmark, size):
+    backend = _filled(InMemoryStorageBackend(), size)
+    aggregate_ids = _aggregate_ids(size)[:2]
+
+    loaded = benchmark.pedantic(
+        lambda: [backend.load_events(aggregate_id=a) for a in aggregate_ids], rounds=2, iterations=1
+    )
+
+    assert all(len(events) == EVENTS_PER_AGGREGATE for events in loaded)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_recent_time_window_indexed(benchmark, size):
+    backend = _filled(IndexedStorageBackend(), size)
+    start = BASE_TIME + timedelta(seconds=size - 3600)
+
+    loaded = benchmark(lambda: backend.load_events(start_time=start, event_types=["MealLogged"]))
+
+    assert len(loaded) == 3600 // len(EVENT_NAMES)
+
+
+@pytest.mark.parametrize("size", SIZES[:2])
+def test_reopen_append_only_log(benchmark, size, tmp_path):
+    directory = tmp_path / "events"
+    _filled(AppendOnlyLogStorageBackend(directory), size).close()
+
+    def reopen():
+        backend = AppendOnlyLogStorageBackend(directory)
+        backend.close()
+        return backend
+
+    reopened = benchmark.pedantic(reopen, rounds=3, iterations=1)
+
+    assert reopened.event_count == size
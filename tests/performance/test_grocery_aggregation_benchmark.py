@@ -0,0 +1,63 @@
+"""Benchmark: household grocery lists from multi-week meal plans."""
+
+import random
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.services.integrations.grocery_service import GroceryListGenerator
+from src.services.integrations.ingredients import DEFAULT_INGREDIENTS
+
+pytestmark = pytest.mark.performance
+
+HOUSEHOLD_SIZE = 4
+MEALS_PER_DAY = 3
+INGREDIENTS_PER_MEAL = 9
+UNITS = ["g", "oz", "lb", "cup", "tbsp", "tsp", "ml", "item"]
+
+
+def _plans(weeks: int, seed: int = 11):
+    rng = random.Random(seed)
+    names = [name for ingredient in DEFAULT_INGREDIENTS for name in (ingredient.ingredient_id,) + ingredient.aliases]
+    names += [f"specialty item {index}" for index in range(200)]
+    return [
+        [
+            {
+                "name": f"Meal {week}-{slot}",
+                "recipe_id": f"recipe_{rng.randrange(60)}",
+                "servings": rng.choice([1, 2, 4]),
+                "ingredients": [
+                    {"name": rng.choice(names).title(), "quantity": rng.randint(1, 4), "unit": rng.choice(UNITS)}
+                    for _ in range(INGREDIENTS_PER_MEAL)
+                ],
+            }
+            for slot in range(7 * MEALS_PER_DAY)
+        ]
+        for week in range(weeks)
+    ]
+
+
+@pytest.mark.parametrize("weeks", [1, 4])
+def test_household_grocery_list_generation(benchmark, weeks):
+    plans = _plans(weeks)
+    pantry = [f"Pantry Staple {index}" for index in range(300)] + ["Salt", "olive oil", "Black Pepper"]
+    generator = GroceryListGenerator()
+    rows = weeks * 7 * MEALS_PER_DAY * INGREDIENTS_PER_MEAL
+
+    def generate():
+        started = time.perf_counter()
+        grocery_list = generator.generate_from_meal_plans(uuid4(), plans, pantry, HOUSEHOLD_SIZE)
+        return grocery_list, time.perf_counter() - started
+
+    grocery_list, elapsed = benchmark.pedantic(generate, rounds=1, iterations=1)
+
+    benchmark.extra_info["ingredient_rows"] = rows
+    benchmark.extra_info["grocery_items"] = len(grocery_list.items)
+    benchmark.extra_info["us_per_row"] = elapsed / rows * 1e6
+
+    names = [item.name.lower() for item in grocery_list.items]
+    assert not {"salt", "olive oil", "black pepper"} & set(names)
+    # One line per ingredient and unit dimension
+    assert len(grocery_list.items) < rows
+    assert all(item.quantity > 0 for item in grocery_list.items)
@@ -0,0 +1,25 @@
+"""Benchmark: cold-start import time of each Lambda handler against its budget."""
+
+import pytest
+
+from src.services.infrastructure.import_profiler import (
+    HANDLER_IMPORT_BUDGETS_MS,
+    check_budget,
+    profile_import,
+)
+
+pytestmark = pytest.mark.performance
+
+
+@pytest.mark.parametrize("entry_point", sorted(HANDLER_IMPORT_BUDGETS_MS))
+def test_handler_import_budget(benchmark, entry_point):
+    profile = benchmark.pedantic(profile_import, args=(entry_point,), rounds=1, iterations=1)
+
+    if profile.error:
+        pytest.skip(f"{entry_point} cannot be imported here: {profile.error}")
+
+    benchmark.extra_info["import_ms"] = profile.total_ms
+    benchmark.extra_info["modules_imported"] = len(profile.modules)
+    benchmark.extra_info["slowest"] = {m.module: m.self_us / 1000 for m in profile.slowest(10)}
+
+    assert check_budget(profile, HANDLER_IMPORT_BUDGETS_MS[entry_point]) == []
@@ -0,0 +1,72 @@
+"""Benchmarks for vectorized recipe scoring and plan-level meal selection."""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Any, Dict
+from unittest.mock import Mock
+
+import pytest
+
+from services.meal_planning.constraints import GoalType, MergedConstraints
+from services.meal_planning.variety import MultiGoalMealPlanGenerator
+
+pytestmark = pytest.mark.performance
+
+GOALS = [
+    {"goal_type": GoalType.BUDGET.value, "priority": 3},
+    {"goal_type": GoalType.MUSCLE_GAIN.value, "priority": 4},
+]
+
+
+def _synthetic_library(size: int, seed: int = 7) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    goal_types = [goal.value for goal in GoalType if goal is not GoalType.CUSTOM]
+    return {
+        f"recipe_{index}": {
+            "name": f"Recipe {index}",
+            "cost_per_serving": round(rng.uniform(1.5, 12.0), 2),
+            "prep_time": rng.randint(5, 90),
+            "nutrition": {
+                "calories": rng.randint(250, 900),
+                "protein": rng.randint(5, 60),
+                "fiber": rng.randint(1, 20),
+                "sodium": rng.randint(100, 1200),
+            },
+            "tags": [],
+            "goal_compatibility": {goal: round(rng.random(), 2) for goal in rng.sample(goal_types, 3)},
+            "ingredients": [f"ingredient_{rng.randint(0, 2500)}" for _ in range(6)],
+            "anti_inflammatory_score": round(rng.random(), 2),
+        }
+        for index in range(size)
+    }
+
+
+@pytest.fixture(scope="module", params=[10_000, 50_000], ids=lambda size: f"{size}_recipes")
+def generator(request) -> MultiGoalMealPlanGenerator:
+    planner = MultiGoalMealPlanGenerator(Mock(), Mock())
+    planner.recipe_database = _synthetic_library(request.param)
+    planner._get_recipe_matrix()
+    return planner
+
+
+@pytest.mark.parametrize("days", [14, 28])
+def test_plan_selection_on_large_libraries(benchmark, generator: MultiGoalMealPlanGenerator, days: int) -> None:
+    constraints = MergedConstraints(
+        max_cost_per_meal=4.0,
+        max_prep_time=25,
+        protein_grams=140,
+        emphasized_foods=["ingredient_1"],
+    )
+
+    def plan():
+        scores = generator._score_recipes_for_constraints(constraints, GOALS)
+        return generator._select_optimal_meals(scores, constraints, days)
+
+    meals = benchmark(plan)
+
+    assert len(meals) == days * 3
+    assert sum(meal["recipe"]["cost_per_serving"] for meal in meals) <= 4.0 * days * 3
+    assert sum(meal["recipe"]["prep_time"] for meal in meals) <= 25 * days * 3
+    assert max(Counter(meal["recipe_id"] for meal in meals).values()) <= days // 2
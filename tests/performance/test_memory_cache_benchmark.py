@@ -0,0 +1,94 @@
+"""Microbenchmark: O(1) memory cache backend vs. the list-ordered LRU it replaced."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from src.core.caching.backends import MemoryCacheBackend
+
+pytestmark = pytest.mark.performance
+
+OPERATIONS = 1_000
+
+
+class ListOrderedMemoryCache:
+    """The previous backend: recency kept in a list under one asyncio.Lock."""
+
+    def __init__(self, max_size: int, default_ttl: int = 3600):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._access_order: List[str] = []
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry['expires_at'] > time.time():
+                self._access_order.remove(key)
+                self._access_order.append(key)
+                return entry['value']
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        async with self._lock:
+            if key in self._cache:
+                self._access_order.remove(key)
+            while len(self._cache) >= self.max_size:
+                lru_key = self._access_order.pop(0)
+                del self._cache[lru_key]
+            self._cache[key] = {'value': value, 'expires_at': time.time() + (ttl or self.default_ttl)}
+            self._access_order.append(key)
+            return True
+
+
+def _prefill(backend, size: int) -> None:
+    async def fill():
+        for i in range(size):
+            await backend.set(f"key-{i}", i)
+
+    asyncio.run(fill())
+
+
+def _workload(backend, size: int):
+    """Hits spread across the key space plus overwrites of existing keys."""
+    keys = [f"key-{(i * 7919) % size}" for i in range(OPERATIONS)]
+
+    async def run():
+        for index, key in enumerate(keys):
+            if index % 4 == 0:
+                await backend.set(key, index)
+            else:
+                await backend.get(key)
+
+    return lambda: asyncio.run(run())
+
+
+SIZES = [
+    1_000,
+    100_000,
+    pytest.param(1_000_000, marks=pytest.mark.slow),
+]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_memory_backend_operations(benchmark, size):
+    # Headroom so shard imbalance never triggers evictions during the run.
+    backend = MemoryCacheBackend(max_size=2 * size, default_ttl=3600)
+    _prefill(backend, size)
+
+    benchmark.pedantic(_workload(backend, size), rounds=5, iterations=1)
+
+    assert asyncio.run(backend.get_size()) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_list_ordered_backend_operations(benchmark, size):
+    backend = ListOrderedMemoryCache(max_size=2 * size)
+    _prefill(backend, size)
+
+    benchmark.pedantic(_workload(backend, size), rounds=3, iterations=1)
+
+    assert len(backend._cache) == size
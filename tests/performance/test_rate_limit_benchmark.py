@@ -0,0 +1,101 @@
+"""Benchmark: sequential per-window, combined single-script and leased rate limit checks."""
+
+import asyncio
+import statistics
+import time
+
+import pytest
+
+from src.services.infrastructure.rate_limiting.config import RateLimitConfig, RateLimitStrategy, UserTier
+from src.services.infrastructure.rate_limiting.engine import RateLimitEngine
+
+pytestmark = pytest.mark.performance
+
+REQUESTS = 200
+CLIENTS = 10
+# Simulated network round trip to Redis
+ROUND_TRIP_SECONDS = 0.0002
+
+
+class RoundTripBackend:
+    """Backend that answers every call as allowed after one simulated Redis round trip."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = 0
+
+    async def _round_trip(self, commands: int) -> None:
+        self.round_trips += 1
+        self.commands += commands
+        await asyncio.sleep(ROUND_TRIP_SECONDS)
+
+    async def execute_lua_script(self, script: str, keys: list, args: list):
+        await self._round_trip(1)
+        return [1, 9, time.time() + 60, 1]
+
+    async def execute_batch_script(self, script: str, keys: list, args: list):
+        await self._round_trip(1)
+        checks = len(keys) - int(args[3])
+        return [1, 0] + [1, 5000, time.time() + 60, 1] * checks
+
+    async def increment(self, key: str, amount: int = 1, expire: int = None):
+        # INCR and EXPIRE are sent as separate commands
+        await self._round_trip(1)
+        await self._round_trip(1)
+        return 1
+
+    async def close(self):
+        pass
+
+
+def _run(mode: str, strategy: RateLimitStrategy):
+    config = RateLimitConfig(
+        default_strategy=strategy,
+        combined_evaluation=mode != "sequential",
+        token_leasing_enabled=mode == "leased",
+        cleanup_interval=0
+    )
+    engine = RateLimitEngine(config)
+    engine.backend = RoundTripBackend()
+
+    async def run():
+        latencies = []
+        started = time.perf_counter()
+        for index in range(REQUESTS):
+            request_started = time.perf_counter()
+            result = await engine.check_rate_limit(
+                identifier=f"ip-{index % CLIENTS}",
+                endpoint="/api/meal-plans",
+                user_tier=UserTier.FREE,
+                user_id=f"user-{index % CLIENTS}"
+            )
+            latencies.append(time.perf_counter() - request_started)
+            assert result.allowed
+        return latencies, time.perf_counter() - started
+
+    latencies, elapsed = asyncio.run(run())
+    return engine.backend, latencies, elapsed
+
+
+@pytest.mark.parametrize("strategy", list(RateLimitStrategy), ids=lambda s: s.value)
+@pytest.mark.parametrize("mode", ["sequential", "combined", "leased"])
+def test_rate_limit_check_latency(benchmark, mode, strategy):
+    backend, latencies, elapsed = benchmark.pedantic(_run, args=(mode, strategy), rounds=1, iterations=1)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info["p50_ms"] = quantiles[49] * 1000
+    benchmark.extra_info["p99_ms"] = quantiles[98] * 1000
+    benchmark.extra_info["round_trips_per_request"] = backend.round_trips / REQUESTS
+    benchmark.extra_info["redis_ops_per_sec"] = backend.commands / elapsed
+
+    # identifier, endpoint, user and tier dimensions x minute, hour and day
+    # windows, plus INCR/EXPIRE for the two global counters
+    if mode == "sequential":
+        assert backend.round_trips == REQUESTS * (12 + 4)
+    elif mode == "combined" or strategy == RateLimitStrategy.TOKEN_BUCKET:
+        # A free-tier bucket holds fewer tokens than lease_min_tokens, so each
+        # check stays strict instead of leasing
+        assert backend.round_trips == REQUESTS
+    else:
+        # Each client leases a few blocks of tokens
+        assert backend.round_trips < REQUESTS / 2
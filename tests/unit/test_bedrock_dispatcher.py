@@ -0,0 +1,141 @@
+"""Unit tests for the Bedrock invocation dispatcher."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.ai.dispatcher import BedrockDispatcher
+
+TITAN = SimpleNamespace(model_id="amazon.titan-text-express-v1")
+HAIKU = SimpleNamespace(model_id="anthropic.claude-3-haiku")
+
+
+class FakeInvoker:
+    """Blocking model call recording invocations and peak concurrency."""
+
+    def __init__(self, latency=0.02, fail_with=None):
+        self.latency = latency
+        self.fail_with = fail_with
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, model_config, params):
+        with self._lock:
+            self.calls.append((model_config.model_id, prompt))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+            if self.fail_with:
+                raise self.fail_with
+            return f"{model_config.model_id}:{prompt}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_prompts_share_one_invocation():
+    invoker = FakeInvoker()
+    dispatcher = BedrockDispatcher(invoker, lambda model_id: False)
+    params = {'max_tokens': 100}
+
+    results = await asyncio.gather(*[
+        dispatcher.dispatch(prompt, TITAN, dict(params))
+        for prompt in ["protein?", "fiber?", "protein?", "protein?", "fiber?"]
+    ])
+
+    assert results == [f"{TITAN.model_id}:{p}" for p in ["protein?", "fiber?", "protein?", "protein?", "fiber?"]]
+    assert sorted(invoker.calls) == [(TITAN.model_id, "fiber?"), (TITAN.model_id, "protein?")]
+    assert dispatcher.get_stats()['coalesced'] == 3
+
+    # Different parameters are different invocations
+    await asyncio.gather(
+        dispatcher.dispatch("protein?", TITAN, {'max_tokens': 100}),
+        dispatcher.dispatch("protein?", TITAN, {'max_tokens': 200}),
+    )
+    assert len(invoker.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_per_model_and_batches_fill_early():
+    invoker = FakeInvoker(latency=0.02)
+    dispatcher = BedrockDispatcher(
+        invoker, lambda model_id: False,
+        batch_window_seconds=10, max_batch_size=6, max_concurrency_per_model=3
+    )
+
+    await asyncio.wait_for(
+        asyncio.gather(*[dispatcher.dispatch(f"q{i}", TITAN, {}) for i in range(12)]),
+        timeout=5
+    )
+
+    assert len(invoker.calls) == 12
+    assert invoker.peak == 3
+    assert dispatcher.get_stats()['batches'] == 2
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_invoking():
+    invoker = FakeInvoker()
+    open_models = {HAIKU.model_id}
+    dispatcher = BedrockDispatcher(invoker, lambda model_id: model_id in open_models)
+
+    results = await asyncio.gather(
+        dispatcher.dispatch("q", HAIKU, {}),
+        dispatcher.dispatch("q", TITAN, {}),
+    )
+
+    assert results == [None, f"{TITAN.model_id}:q"]
+    assert invoker.calls == [(TITAN.model_id, "q")]
+    assert dispatcher.get_stats()['circuit_rejections'] == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opening_mid_batch_rejects_remaining_prompts():
+    failures = []
+
+    def invoke(prompt, model_config, params):
+        failures.append(prompt)
+        return None
+
+    dispatcher = BedrockDispatcher(
+        invoke, lambda model_id: len(failures) >= 3, max_concurrency_per_model=1
+    )
+
+    results = await asyncio.gather(*[dispatcher.dispatch(f"q{i}", TITAN, {}) for i in range(6)])
+
+    assert results == [None] * 6
+    assert len(failures) == 3
+    assert dispatcher.get_stats()['circuit_rejections'] == 3
+
+
+@pytest.mark.asyncio
+async def test_invocation_errors_resolve_waiters_with_none():
+    invoker = FakeInvoker(fail_with=RuntimeError("boom"))
+    dispatcher = BedrockDispatcher(invoker, lambda model_id: False)
+
+    results = await asyncio.gather(*[dispatcher.dispatch("q", TITAN, {}) for _ in range(3)])
+
+    assert results == [None, None, None]
+    assert len(invoker.calls) == 1
+    assert dispatcher.get_stats()['pending'] == 0
+
+
+def test_dispatcher_can_be_reused_across_event_loops():
+    invoker = FakeInvoker(latency=0)
+    dispatcher = BedrockDispatcher(invoker, lambda model_id: False, max_concurrency_per_model=1)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*[dispatcher.dispatch(f"q{i}", TITAN, {}) for i in range(3)]), timeout=5
+        )
+
+    for _ in range(2):
+        assert len(asyncio.run(run())) == 3
+    assert len(invoker.calls) == 6
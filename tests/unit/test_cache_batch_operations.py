@@ -0,0 +1,188 @@
+"""Unit tests for multi-key cache operations across backends and CacheManager."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.core.caching.backends import DatabaseCacheBackend, MemoryCacheBackend, RedisCacheBackend
+from src.core.caching.cache_manager import CacheManager
+from src.core.caching.config import CacheConfig, CacheTier
+from src.core.caching.serialization import DEFAULT_CODEC
+from src.core.caching.strategies import CacheAsideStrategy, CacheStrategy
+
+
+class CountingBackend(MemoryCacheBackend):
+    """Memory backend that records batch round trips."""
+
+    def __init__(self):
+        super().__init__(max_size=50_000, default_ttl=600)
+        self.batch_reads = []
+        self.batch_writes = []
+
+    async def get_many(self, keys):
+        self.batch_reads.append(list(keys))
+        return await super().get_many(keys)
+
+    async def set_many(self, items, ttl=None):
+        self.batch_writes.append((dict(items), ttl))
+        return await super().set_many(items, ttl)
+
+
+def _hybrid_manager():
+    manager = CacheManager(CacheConfig(enable_background_refresh=False))
+    memory, redis_tier = CountingBackend(), CountingBackend()
+    manager.backends = {CacheTier.MEMORY: memory, CacheTier.REDIS: redis_tier}
+    manager.strategies = {CacheStrategy.CACHE_ASIDE: CacheAsideStrategy(cache_backend=redis_tier)}
+    return manager, memory, redis_tier
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_batch_operations():
+    backend = MemoryCacheBackend(max_size=100, default_ttl=60)
+
+    assert await backend.set_many({"a": 1, "b": 2, "c": 3}) == 3
+    assert await backend.get_many(["a", "c", "missing"]) == {"a": 1, "c": 3}
+    assert await backend.delete_many(["a", "missing"]) == 1
+    assert await backend.delete_by_pattern("b*") == 1
+    assert await backend.get_size() == 1
+
+
+@pytest.mark.asyncio
+async def test_hybrid_get_many_fills_memory_from_redis_in_one_hop():
+    manager, memory, redis_tier = _hybrid_manager()
+    await redis_tier.set_many({f"user:{i}:profile": {"id": i} for i in range(50)})
+    redis_tier.batch_writes.clear()
+
+    found = await manager.get_many([f"user:{i}:profile" for i in range(60)], profile="user_data")
+
+    assert len(found) == 50
+    assert len(memory.batch_reads) == 1 and len(redis_tier.batch_reads) == 1
+    assert [ttl for _, ttl in memory.batch_writes] == [300]
+    assert len(memory.batch_writes[0][0]) == 50
+    assert manager.metrics.hits == 50 and manager.metrics.misses == 10
+
+    # Second read is served entirely from L1
+    await manager.get_many([f"user:{i}:profile" for i in range(50)], profile="user_data")
+    assert len(redis_tier.batch_reads) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_loads_missing_keys_in_bulk():
+    manager, memory, redis_tier = _hybrid_manager()
+    await memory.set("k1", "cached")
+    requested = []
+
+    async def loader(missing):
+        requested.append(missing)
+        return {key: f"loaded-{key}" for key in missing if key != "k3"}
+
+    found = await manager.get_many(["k1", "k2", "k3"], profile="user_data", loader_func=loader)
+
+    assert requested == [["k2", "k3"]]
+    assert found == {"k1": "cached", "k2": "loaded-k2"}
+    assert await redis_tier.get("k2") == "loaded-k2"
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_writes_in_batches_and_tags_keys():
+    manager, memory, redis_tier = _hybrid_manager()
+
+    async def loader_for(i):
+        await asyncio.sleep(0)
+        return {"user": i} if i % 10 else None
+
+    keys_and_loaders = [(f"user:{i}:profile", lambda i=i: loader_for(i)) for i in range(10_000)]
+    warmed = await manager.warm_cache(keys_and_loaders, profile="user_data")
+
+    assert warmed == 9_000
+    assert len(redis_tier.batch_writes) == 90  # batch_size=100
+    assert await redis_tier.get_size() == 9_000
+
+    assert await manager.invalidate_by_tag("profile") == 9_000
+    assert await memory.get_size() == 0 and await redis_tier.get_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_uses_mget_pipeline_and_batched_unlink():
+    backend = RedisCacheBackend()
+    assert backend.serializer.codec.name == DEFAULT_CODEC
+    client = MagicMock()
+    client.mget = AsyncMock(return_value=[b'{"a": 1}', None])
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, True])
+    client.pipeline.return_value = pipe
+    client.unlink = AsyncMock(side_effect=lambda *keys: len(keys))
+
+    async def scan_iter(match, count):
+        for i in range(1_200):
+            yield f"user:{i}"
+
+    client.scan_iter = scan_iter
+    backend._redis = client
+
+    assert await backend.get_many(["x", "y", "x"]) == {"x": {"a": 1}}
+    client.mget.assert_awaited_once_with(["x", "y"])
+
+    assert await backend.set_many({"x": 1, "y": 2}, ttl=30) == 2
+    assert pipe.setex.call_count == 2
+    client.pipeline.assert_called_once_with(transaction=False)
+
+    assert await backend.delete_by_pattern("user:*") == 1_200
+    assert [len(call.args) for call in client.unlink.await_args_list] == [500, 500, 200]
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_backend_batches_reads_and_writes():
+    with mock_aws():
+        boto3.client("dynamodb", region_name="us-east-1").create_table(
+            TableName="cache",
+            KeySchema=[{"AttributeName": "cache_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "cache_key", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        backend = DatabaseCacheBackend(table_name="cache")
+
+        items = {f"key-{i}": {"value": i} for i in range(260)}
+        assert await backend.set_many(items, ttl=60) == 260
+
+        keys = list(items) + ["absent"]
+        found = await backend.get_many(keys)
+        assert found == items
+        # expires_at comes back from DynamoDB as a Decimal
+        value, ttl = (await backend.get_many_with_ttl(["key-0"]))["key-0"]
+        assert value == {"value": 0} and 0 < ttl <= 60
+
+        assert await backend.delete_many(list(items)[:30]) == 30
+        assert len(await backend.get_many(keys)) == 230
+
+
+@pytest.mark.asyncio
+async def test_lower_tier_hits_are_written_back_with_their_remaining_ttl():
+    manager, memory, redis_tier = _hybrid_manager()
+    database = CountingBackend()
+    manager.backends[CacheTier.DATABASE] = database
+    database.get_many_with_ttl = AsyncMock(return_value={"short": ("s", 45), "long": ("l", 86_400), "open": ("o", None)})
+
+    found = await manager.get_many(["short", "long", "open"], profile="user_data")
+
+    assert found == {"short": "s", "long": "l", "open": "o"}
+    redis_ttls = {key: ttl for items, ttl in redis_tier.batch_writes for key in items}
+    assert redis_ttls == {"short": 45, "long": manager.config.default_ttl, "open": manager.config.default_ttl}
+    memory_ttls = {key: ttl for items, ttl in memory.batch_writes for key in items}
+    assert memory_ttls == {"short": 45, "long": 300, "open": 300}
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_reads_remaining_ttls_in_one_pipeline():
+    backend = RedisCacheBackend()
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[b'{"a": 1}', 1500, None, -2, b'{"b": 2}', -1])
+    client.pipeline.return_value = pipe
+    backend._redis = client
+
+    assert await backend.get_many_with_ttl(["x", "y", "z"]) == {"x": ({"a": 1}, 2), "z": ({"b": 2}, None)}
+    pipe.execute.assert_awaited_once()
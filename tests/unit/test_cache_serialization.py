@@ -0,0 +1,97 @@
+"""Unit tests for header-tagged cache codecs and compression."""
+
+import json
+import pickle
+from datetime import date, datetime
+
+import pytest
+
+from src.core.caching.serialization import (
+    DEFAULT_CODEC,
+    MSGPACK_AVAILABLE,
+    CacheSerializer,
+    JSONCodec,
+    MsgPackCodec,
+    PickleCodec,
+    available_codecs,
+)
+from src.services.meal_planning.repository import MealEntry
+
+PAYLOAD = {
+    "plan_id": "plan-1",
+    "meals": [{"title": "Oats", "calories": 350, "macros": {"protein": 12.5}}] * 40,
+    "tags": ["budget", "quick"],
+}
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_round_trip_and_header_per_codec(codec):
+    serializer = CacheSerializer(codec=codec, compression_threshold=None)
+
+    encoded = serializer.dumps(PAYLOAD)
+
+    assert encoded[0] == serializer.codec.codec_id
+    assert serializer.loads(encoded) == PAYLOAD
+
+
+def test_large_values_are_compressed_small_values_are_not():
+    serializer = CacheSerializer(codec="json", compression_threshold=256)
+
+    small = serializer.dumps({"a": 1})
+    large = serializer.dumps(PAYLOAD)
+
+    assert small[0] == JSONCodec.codec_id
+    assert large[0] == JSONCodec.codec_id | (1 << 3)
+    assert len(large) < len(JSONCodec().encode(PAYLOAD))
+    assert serializer.loads(large) == PAYLOAD
+
+
+def test_unsupported_values_fall_back_to_pickle():
+    serializer = CacheSerializer(codec="json")
+    meal = MealEntry("m1", "mon", "lunch", "Bowl", "", ["rice"], 500, 10, {"protein": 20.0}, 3.5)
+
+    encoded = serializer.dumps(meal)
+
+    assert encoded[0] == PickleCodec.codec_id
+    assert serializer.loads(encoded) == meal
+
+
+def test_legacy_headerless_entries_still_decode():
+    serializer = CacheSerializer()
+
+    assert serializer.loads(json.dumps(PAYLOAD).encode("utf-8")) == PAYLOAD
+    assert serializer.loads(json.dumps("text").encode("utf-8")) == "text"
+    assert serializer.loads(pickle.dumps({"when": date(2024, 1, 1)})) == {"when": date(2024, 1, 1)}
+
+
+def test_entries_from_another_codec_decode_during_migration():
+    written = CacheSerializer(codec="pickle").dumps(PAYLOAD)
+
+    assert CacheSerializer(codec="json").loads(written) == PAYLOAD
+
+
+@pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+def test_msgpack_preserves_dates_and_datetimes():
+    value = {"week_start": date(2024, 5, 6), "generated_at": datetime(2024, 5, 5, 18, 30), 1: "int key"}
+    serializer = CacheSerializer(codec="msgpack")
+
+    encoded = serializer.dumps(value)
+
+    assert encoded[0] == MsgPackCodec.codec_id
+    assert serializer.loads(encoded) == value
+
+
+@pytest.mark.parametrize("codec", [DEFAULT_CODEC, "json", "msgpack"])
+def test_default_and_configured_codecs_encode_shared_response_entries(codec):
+    # Shaped like CachedResponse.to_dict(): the response body is raw bytes
+    entry = {"status_code": 200, "headers": {"content-type": "application/json"},
+             "body": b'{"plan_id": "plan-1"}', "stored_at": 1717000000.0}
+    serializer = CacheSerializer(codec=codec)
+
+    assert serializer.loads(serializer.dumps(entry)) == entry
+    assert DEFAULT_CODEC in available_codecs()
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        CacheSerializer(codec="yaml")
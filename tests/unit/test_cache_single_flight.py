@@ -0,0 +1,151 @@
+"""Unit tests for single-flight loading and XFetch early expiration in CacheManager."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.caching import cache_manager as cache_manager_module
+from src.core.caching import decorators
+from src.core.caching.backends import MemoryCacheBackend
+from src.core.caching.cache_manager import CacheManager
+from src.core.caching.config import CacheConfig, CacheTier
+from src.core.caching.strategies import CacheAsideStrategy, CacheStrategy
+
+
+def _memory_manager(**config) -> CacheManager:
+    manager = CacheManager(CacheConfig(enable_background_refresh=False, **config))
+    backend = MemoryCacheBackend(max_size=100, default_ttl=60)
+    manager.backends = {CacheTier.MEMORY: backend}
+    manager.strategies = {CacheStrategy.CACHE_ASIDE: CacheAsideStrategy(cache_backend=backend)}
+    return manager
+
+
+def _slow_loader(calls, value="loaded", delay=0.01):
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return load
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    manager = _memory_manager()
+    calls = []
+
+    results = await asyncio.gather(
+        *(manager.get("recipe:popular", loader_func=_slow_loader(calls)) for _ in range(25))
+    )
+
+    assert calls == [1]
+    assert all(result == ("loaded", False) for result in results)
+    assert manager.metrics.loads == 1
+    assert manager.metrics.coalesced_loads == 24
+    assert not manager._inflight
+
+    assert await manager.get("recipe:popular") == ("loaded", True)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_can_be_disabled():
+    manager = _memory_manager(single_flight_enabled=False)
+    calls = []
+
+    await asyncio.gather(*(manager.get("k", loader_func=_slow_loader(calls)) for _ in range(5)))
+
+    assert len(calls) == 5
+    assert manager.metrics.coalesced_loads == 0
+
+
+@pytest.mark.asyncio
+async def test_loader_error_reaches_every_waiter_and_clears_flight():
+    manager = _memory_manager()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("dynamodb throttled")
+
+    results = await asyncio.gather(
+        *(manager.get("k", loader_func=failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not manager._inflight
+    assert await manager.get("k", loader_func=_slow_loader([])) == ("loaded", False)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_shared_load():
+    manager = _memory_manager()
+    calls = []
+    loader = _slow_loader(calls, delay=0.05)
+
+    leader = asyncio.ensure_future(manager.get("k", loader_func=loader))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(manager.get("k", loader_func=loader))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == ("loaded", False)
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_early_expiration_refreshes_hot_key_before_ttl():
+    manager = _memory_manager()
+    await manager.get("k", loader_func=_slow_loader([], value="v1"), ttl=30)
+    refreshes = []
+
+    # Far from expiry the XFetch draw never fires
+    with patch.object(cache_manager_module.random, "random", return_value=0.5):
+        value, hit = await manager.get(
+            "k", loader_func=_slow_loader(refreshes, value="v2"), early_expiration=1.0
+        )
+    assert (value, hit, refreshes) == ("v1", True, [])
+
+    # Just before expiry the same draw reaches past expires_at
+    _, expires_at = manager._load_history["k"]
+    with patch.object(cache_manager_module.random, "random", return_value=0.5), \
+            patch.object(cache_manager_module.time, "time", return_value=expires_at - 0.001):
+        value, hit = await manager.get(
+            "k", loader_func=_slow_loader(refreshes, value="v2"), early_expiration=1.0
+        )
+    assert (value, hit, refreshes) == ("v2", True, [1])
+    assert manager.metrics.early_refreshes == 1
+    assert await manager.get("k") == ("v2", True)
+
+
+@pytest.mark.asyncio
+async def test_early_refresh_is_disabled_by_default():
+    manager = _memory_manager()
+    await manager.get("k", loader_func=_slow_loader([]), ttl=1)
+    calls = []
+
+    with patch.object(cache_manager_module.time, "time", return_value=time.time() + 0.99):
+        await manager.get("k", loader_func=_slow_loader(calls))
+
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator_coalesces_and_serializes():
+    manager = _memory_manager()
+    calls = []
+
+    with patch.object(decorators, "get_cache_manager", return_value=manager):
+
+        @decorators.cached(ttl=60, serializer=lambda r: {"payload": r}, deserializer=lambda v: v["payload"])
+        async def load_template(template_id: str):
+            calls.append(template_id)
+            await asyncio.sleep(0.01)
+            return f"template-{template_id}"
+
+    results = await asyncio.gather(*(load_template("a") for _ in range(10)))
+
+    assert results == ["template-a"] * 10
+    assert calls == ["a"]
+    assert await load_template("a") == "template-a"
+    assert manager.metrics.coalesced_loads == 9
@@ -0,0 +1,117 @@
+"""Unit tests for the bounded, shared HTTP response cache behind CachingMiddleware."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middleware.caching import CacheManager, CachedResponse, CachingMiddleware
+
+
+class FakeSharedBackend:
+    """In-process stand-in for a src.core.caching backend shared by workers."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def delete_by_pattern(self, pattern):
+        prefix = pattern.rstrip("*")
+        keys = [key for key in self.data if key.startswith(prefix)]
+        for key in keys:
+            del self.data[key]
+        return len(keys)
+
+
+def _app(cache_manager):
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.get("/v1/gamification/summary")
+    async def summary(user_id: str):
+        app.state.calls += 1
+        return {"user_id": user_id, "points": 120}
+
+    app.add_middleware(CachingMiddleware, cache_manager=cache_manager)
+    return app
+
+
+def test_cached_responses_and_304s_skip_the_route_handler():
+    cache = CacheManager()
+    app = _app(cache)
+    client = TestClient(app)
+
+    first = client.get("/v1/gamification/summary?user_id=u1")
+    assert first.headers["x-cache-status"] == "MISS"
+
+    second = client.get("/v1/gamification/summary?user_id=u1")
+    assert second.headers["x-cache-status"] == "HIT"
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+
+    not_modified = client.get(
+        "/v1/gamification/summary?user_id=u1", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    assert app.state.calls == 1
+    stats = cache.get_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["not_modified"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_user_invalidation_uses_the_index():
+    cache = CacheManager()
+    app = _app(cache)
+    client = TestClient(app)
+    client.get("/v1/gamification/summary?user_id=u1")
+    client.get("/v1/gamification/summary?user_id=u2")
+
+    assert asyncio.run(cache.invalidate_user("u1")) == 1
+
+    assert client.get("/v1/gamification/summary?user_id=u1").headers["x-cache-status"] == "MISS"
+    assert client.get("/v1/gamification/summary?user_id=u2").headers["x-cache-status"] == "HIT"
+    assert app.state.calls == 3
+
+
+def test_lru_is_bounded_by_entries_and_bytes():
+    cache = CacheManager(max_entries=2, max_bytes=100)
+    cache.set("a", CachedResponse(body=b"x" * 40, etag="a"), 60, "u1")
+    cache.set("b", CachedResponse(body=b"x" * 40, etag="b"), 60, "u1")
+    assert cache.get("a") is not None
+
+    cache.set("c", CachedResponse(body=b"x" * 40, etag="c"), 60, "u2")
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.set("d", CachedResponse(body=b"x" * 90, etag="d"), 60)
+    assert len(cache) == 1
+    assert cache.get_cache_stats()["bytes"] == 90
+    assert cache.get_cache_stats()["evictions"] == 3
+    assert cache.invalidate_user_local("u1") == 0
+
+
+def test_workers_share_entries_through_the_shared_tier():
+    shared = FakeSharedBackend()
+    worker_a, worker_b = CacheManager(shared_backend=shared), CacheManager(shared_backend=shared)
+    app_a, app_b = _app(worker_a), _app(worker_b)
+
+    stored = TestClient(app_a).get("/v1/gamification/summary?user_id=u1")
+    replayed = TestClient(app_b).get("/v1/gamification/summary?user_id=u1")
+
+    assert replayed.headers["x-cache-status"] == "HIT"
+    assert replayed.content == stored.content
+    assert app_b.state.calls == 0
+    assert worker_b.get_cache_stats()["shared_hits"] == 1
+
+    asyncio.run(worker_a.invalidate_user("u1"))
+    assert not shared.data
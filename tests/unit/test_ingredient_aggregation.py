@@ -0,0 +1,99 @@
+"""Unit tests for canonical ingredient aggregation behind grocery list generation."""
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.services.integrations.ingredients import COUNT, MASS, IngredientAggregator, IngredientCatalog
+
+WEEK = [
+    {"name": "Salmon bowl", "recipe_id": "r1", "servings": 2, "ingredients": [
+        {"name": "Salmon fillets", "quantity": 2, "unit": "fillet"},
+        {"name": "Extra virgin olive oil", "quantity": 1, "unit": "tbsp"},
+        {"name": "Tomatoes", "quantity": 1, "unit": "lb"},
+    ]},
+    {"name": "Salad", "recipe_id": "r2", "ingredients": [
+        {"name": "tomato", "quantity": 2, "unit": "item"},
+        {"name": "Red bell peppers", "quantity": 2, "unit": "item"},
+    ]},
+]
+
+
+def test_aliases_plurals_and_units_merge_into_one_line():
+    aggregator = IngredientAggregator()
+    rows = [
+        {"name": "Eggs", "quantity": 2, "unit": "item", "recipe_id": "r1", "meal_name": "Omelette"},
+        {"name": "large egg", "quantity": 1, "unit": "dozen", "recipe_id": "r2", "meal_name": "Bake"},
+        {"name": "Milk", "quantity": 2, "unit": "cups"},
+        {"name": "whole milk", "quantity": 500, "unit": "ml"},
+        {"name": "Rice", "quantity": 1, "unit": "cup"},
+        {"name": "white rice", "quantity": 200, "unit": "g"},
+        {"name": "Dragon fruits", "quantity": 1, "unit": "item"},
+        {"name": "dragon fruit", "quantity": 2, "unit": "item"},
+    ]
+
+    consolidated = {item["ingredient_id"]: item for item in aggregator.consolidate(rows)}
+
+    assert consolidated["eggs"]["quantity"] == Decimal("14")
+    assert consolidated["eggs"]["recipes"] == ["r1", "r2"]
+    assert consolidated["eggs"]["meal_name"] == "Omelette"
+    # 473 ml + 500 ml
+    assert consolidated["milk"]["unit"] == "cup"
+    assert float(consolidated["milk"]["quantity"]) == pytest.approx(973.18 / 236.588, abs=0.01)
+    # 1 cup of rice at 0.78 g/ml plus 200 g, in ounces
+    assert consolidated["rice"]["unit"] == "oz"
+    assert float(consolidated["rice"]["quantity"]) == pytest.approx((236.588 * 0.78 + 200) / 28.3495, abs=0.01)
+    assert consolidated["dragon fruit"]["quantity"] == Decimal("3")
+    assert consolidated["dragon fruit"]["name"] == "Dragon fruits"
+
+
+def test_unconvertible_units_stay_separate():
+    catalog = IngredientCatalog()
+
+    assert catalog.conversion("onion", "item") == (MASS, 150)
+    assert catalog.conversion("garlic", "cloves") == (COUNT, 1.0)
+    # No density for garlic, no weight for an unknown ingredient's "can"
+    assert catalog.conversion("garlic", "tsp")[0] == "volume"
+    assert catalog.conversion("coconut milk", "can") == ("unit:can", 1.0)
+
+
+def test_household_plans_consolidate_and_skip_pantry_aliases():
+    aggregator = IngredientAggregator()
+
+    items = {item["name"]: item for item in aggregator.aggregate_plans(
+        [WEEK, WEEK], pantry_items=["Olive Oil"], household_size=4
+    )}
+
+    assert set(items) == {"salmon", "tomato", "bell pepper"}
+    # 2 fillets x 2 (household of 4, recipe serves 2) x 2 weeks, only ever counted
+    assert (items["salmon"]["quantity"], items["salmon"]["unit"]) == (Decimal("8"), "item")
+    assert (items["bell pepper"]["quantity"], items["bell pepper"]["unit"]) == (Decimal("4"), "item")
+    # Pounds and counts mixed: unscaled salad (2 lb + 2 x 2 x 120 g) over two weeks
+    assert items["tomato"]["unit"] == "lb"
+    assert float(items["tomato"]["quantity"]) == pytest.approx((4 * 453.592 + 4 * 120) / 453.592, abs=0.01)
+    assert items["salmon"]["recipes"] == ["r1"]
+
+
+def test_lookup_caches_are_bounded():
+    aggregator = IngredientAggregator(cache_size=8)
+
+    for index in range(50):
+        aggregator.consolidate([{"name": f"LLM garnish {index}", "quantity": 1, "unit": f"pinch{index}"}])
+
+    assert len(aggregator._name_ids) == 8
+    assert len(aggregator._conversions) == 8
+    assert aggregator.consolidate([{"name": "LLM garnish 0", "quantity": 1, "unit": "pinch0"}])[0]["unit"] == "pinch0"
+
+
+def test_grocery_list_generator_uses_the_aggregator():
+    grocery_service = pytest.importorskip("src.services.integrations.grocery_service")
+
+    grocery_list = grocery_service.GroceryListGenerator().generate_from_meal_plans(
+        uuid4(), [WEEK, WEEK], pantry_items=["Olive Oil"], household_size=4
+    )
+
+    items = {item.name: item for item in grocery_list.items}
+    assert set(items) == {"salmon", "tomato", "bell pepper"}
+    assert items["salmon"].category == "meat"
+    assert grocery_list.total_estimated_cost > 0
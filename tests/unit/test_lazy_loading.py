@@ -0,0 +1,126 @@
+"""Unit tests for lazy service loading and handler import profiling."""
+
+import re
+import sys
+import types
+
+import pytest
+
+from src.services.infrastructure.import_profiler import SRC_ROOT, ImportProfile, check_budget, parse_importtime
+from src.services.infrastructure.lazy_loading import LazyService, import_object, lazy_exports, loaded_services
+
+# Targets whose modules cannot be imported in this tree; the names themselves are right
+KNOWN_BROKEN_TARGETS = {
+    "services.messaging.templates:NutritionMessagingService": (
+        SyntaxError, "templates.py has an unterminated string literal"
+    ),
+    "services.messaging.templates:MessageTemplatesService": (
+        SyntaxError, "templates.py has an unterminated string literal"
+    ),
+    "services.personalization.goals:HealthGoalsService": (SyntaxError, "goals.py has a class without a body"),
+    "services.orchestration.next_best_action:NextBestActionService": (
+        SyntaxError, "next_best_action.py is not valid UTF-8"
+    ),
+    "services.business.subscription:SubscriptionService": (
+        ImportError, "subscription.py imports packages.shared.datetime_utils, which does not exist"
+    ),
+}
+
+
+def _handler_lazy_targets():
+    """Every LazyService target named in a Lambda handler (read as text: some handlers do not import)."""
+    targets = set()
+    for path in sorted((SRC_ROOT / "handlers").glob("*.py")):
+        targets.update(re.findall(r'LazyService\(\s*"([^"]+)"', path.read_text(encoding="utf-8")))
+    return sorted(targets)
+
+
+class Recorder:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        Recorder.created += 1
+        self.args = args
+        self.kwargs = kwargs
+
+    def describe(self):
+        return f"recorder {self.args}"
+
+
+@pytest.fixture
+def fake_module(monkeypatch):
+    module = types.ModuleType("fake_lazy_services")
+    module.Recorder = Recorder
+    monkeypatch.setitem(sys.modules, "fake_lazy_services", module)
+    Recorder.created = 0
+    return module
+
+
+def test_service_is_constructed_on_first_use(fake_module):
+    dependency = LazyService("fake_lazy_services:Recorder", "table")
+    service = LazyService("fake_lazy_services:Recorder", dependency, base=dependency)
+    assert Recorder.created == 0
+    assert not service.is_loaded
+
+    assert service.describe().startswith("recorder")
+    # Lazy arguments are resolved before construction
+    assert service.args == (dependency.resolve(),)
+    assert service.kwargs == {"base": dependency.resolve()}
+
+    service.describe()
+    assert Recorder.created == 2
+    assert set(loaded_services([service, dependency])) == {"fake_lazy_services:Recorder"}
+
+
+def test_lazy_exports_import_on_access(fake_module):
+    package = types.ModuleType("fake_lazy_package")
+    package.__getattr__, package.__dir__ = lazy_exports(
+        "fake_lazy_package", {"Service": "fake_lazy_services:Recorder"}
+    )
+    sys.modules["fake_lazy_package"] = package
+    try:
+        assert "Service" in package.__dir__()
+        assert package.Service is Recorder
+        assert vars(package)["Service"] is Recorder
+        with pytest.raises(AttributeError):
+            package.Missing
+    finally:
+        del sys.modules["fake_lazy_package"]
+
+
+def test_parse_importtime_and_budget():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   boto3",
+        "import time:       300 |        300 |     services.infrastructure.ai",
+        "import time:       500 |        920 |   handlers.aws_sms_handler",
+        "Traceback (most recent call last):",
+    ])
+    modules = parse_importtime(output)
+    assert [(m.module, m.depth) for m in modules] == [
+        ("boto3", 1), ("services.infrastructure.ai", 2), ("handlers.aws_sms_handler", 1)
+    ]
+
+    profile = ImportProfile("handlers.aws_sms_handler", modules)
+    assert profile.total_ms == pytest.approx(0.92)
+    assert profile.slowest(1)[0].module == "handlers.aws_sms_handler"
+    assert check_budget(profile, budget_ms=0.5) == [
+        "handlers.aws_sms_handler imports in 1 ms (budget 0 ms)",
+        "handlers.aws_sms_handler imports services.infrastructure.ai at load time",
+    ]
+
+
+@pytest.mark.parametrize("target", [
+    pytest.param(target, marks=pytest.mark.xfail(
+        raises=KNOWN_BROKEN_TARGETS[target][0], reason=KNOWN_BROKEN_TARGETS[target][1], strict=True
+    ))
+    if target in KNOWN_BROKEN_TARGETS else target
+    for target in _handler_lazy_targets()
+])
+def test_handler_lazy_service_targets_resolve(target, monkeypatch):
+    # Handlers import services as top-level packages from src, next to the repo-level packages/
+    monkeypatch.syspath_prepend(str(SRC_ROOT.parent))
+    monkeypatch.syspath_prepend(str(SRC_ROOT))
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    assert callable(import_object(target))
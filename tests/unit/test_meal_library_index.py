@@ -0,0 +1,131 @@
+"""Unit tests for the precompiled meal library index."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from services.meal_planning.library_index import MealLibraryIndex, normalize_preferences
+from services.meal_planning.models import PlanGenerationCommand, PlanPreferences
+from services.meal_planning.rule_engine import RuleBasedMealPlanEngine, get_default_library_index
+
+
+def _meal(meal_type: str, title: str, *, tags: list[str], ingredients: list[str], prep: int) -> dict:
+    return {
+        "meal_type": meal_type,
+        "title": title,
+        "description": title,
+        "ingredients": ingredients,
+        "calories": 400,
+        "prep_minutes": prep,
+        "cost": 2.0,
+        "macros": {"protein": 20, "carbs": 40, "fat": 10},
+        "tags": tags,
+    }
+
+
+def _small_index() -> MealLibraryIndex:
+    return MealLibraryIndex.build(
+        [
+            _meal("breakfast", "Oats", tags=["vegan", "budget"], ingredients=["oats", "almond milk"], prep=10),
+            _meal("breakfast", "Eggs", tags=["vegetarian"], ingredients=["eggs", "cheddar cheese"], prep=20),
+            _meal("lunch", "Salmon Bowl", tags=["pescatarian", "gluten_free"], ingredients=["salmon", "rice"], prep=15),
+            _meal("dinner", "Tofu Curry", tags=["vegan", "gluten_free"], ingredients=["tofu", "coconut milk"], prep=30),
+        ]
+    )
+
+
+def test_candidates_intersect_diet_prep_and_blocklist() -> None:
+    index = _small_index()
+
+    vegan = index.candidates(PlanPreferences(diet="vegan"))
+    assert [meal["title"] for meal in vegan["breakfast"]] == ["Oats"]
+    assert [meal["title"] for meal in vegan["dinner"]] == ["Tofu Curry"]
+    assert vegan["lunch"] == ()
+
+    quick = index.candidates(PlanPreferences(diet="vegetarian", max_prep_minutes=15))
+    assert [meal["title"] for meal in quick["breakfast"]] == ["Oats"]
+
+    no_milk = index.candidates(PlanPreferences(intolerances=["lactose"]))
+    assert [meal["title"] for meal in no_milk["breakfast"]] == []
+    assert [meal["title"] for meal in no_milk["lunch"]] == ["Salmon Bowl"]
+
+
+def test_candidates_match_patterns_and_preference_tags() -> None:
+    index = _small_index()
+
+    gluten_free = index.candidates(PlanPreferences(dietary_patterns=["gluten-free", "none"]))
+    assert [meal["title"] for meal in gluten_free["lunch"]] == ["Salmon Bowl"]
+    assert gluten_free["breakfast"] == ()
+
+    budget = index.candidates(PlanPreferences(preference_tags=["Budget"]))
+    assert [meal["title"] for meal in budget["breakfast"]] == ["Oats"]
+
+
+def test_candidates_are_memoized_per_normalized_preferences() -> None:
+    index = _small_index()
+
+    first = index.candidates(PlanPreferences(diet="Vegan", allergies=["Tofu"]))
+    second = index.candidates(PlanPreferences(diet="vegan", allergies=["tofu"]))
+
+    assert first is second
+    assert normalize_preferences(PlanPreferences(diet="omnivore")) == normalize_preferences(PlanPreferences())
+
+
+def test_candidate_cache_keeps_most_recent_preferences() -> None:
+    index = MealLibraryIndex.build(_small_index().meals, cache_size=2)
+
+    for minutes in (10, 15, 10, 20):
+        index.candidates(PlanPreferences(max_prep_minutes=minutes))
+
+    assert len(index._candidate_cache) == 2
+    assert [key[2] for key in index._candidate_cache] == [10, 20]
+
+
+def test_term_cache_keeps_most_recent_terms() -> None:
+    index = MealLibraryIndex.build(_small_index().meals, cache_size=2)
+
+    assert index.ids_containing("milk") == index.ids_containing("milk")
+    index.ids_containing("oat")
+    index.ids_containing("milk")
+    index.ids_containing("chedd")
+
+    assert list(index._term_cache) == ["milk", "chedd"]
+    assert index.ids_containing("oat") == frozenset({0})
+
+
+def test_engine_uses_shared_default_index() -> None:
+    engine = RuleBasedMealPlanEngine()
+    command = PlanGenerationCommand(
+        user_id="indexed-user",
+        preferences=PlanPreferences(diet="vegan", max_prep_minutes=30),
+        week_start=date(2025, 9, 15),
+    )
+
+    draft = engine.generate(command)
+
+    assert engine.library is get_default_library_index()
+    assert len(draft.meals) == 21
+    assert all("vegan" in meal.tags for meal in draft.meals)
+    assert all(meal.prep_minutes <= 30 for meal in draft.meals)
+
+
+def test_large_library_queries_only_touch_matching_buckets() -> None:
+    meals = [
+        _meal(
+            ("breakfast", "lunch", "dinner")[i % 3],
+            f"Meal {i}",
+            tags=["vegan"] if i % 10 == 0 else ["omnivore"],
+            ingredients=[f"ingredient {i % 500}", "salt"],
+            prep=5 + i % 60,
+        )
+        for i in range(30_000)
+    ]
+    index = MealLibraryIndex.build(meals)
+
+    result = index.candidates(PlanPreferences(diet="vegan", max_prep_minutes=10, allergies=["ingredient 10"]))
+
+    titles = [meal["title"] for group in result.values() for meal in group]
+    assert titles
+    assert all(int(title.split()[1]) % 10 == 0 for title in titles)
+    assert all(5 + int(title.split()[1]) % 60 <= 10 for title in titles)
+    assert "Meal 10" not in titles
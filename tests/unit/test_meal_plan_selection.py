@@ -0,0 +1,117 @@
+"""Unit tests for vectorized recipe scoring and plan-level selection."""
+
+from __future__ import annotations
+
+from collections import Counter
+from unittest.mock import Mock
+
+import numpy as np
+
+from services.meal_planning.constraints import GoalType, MergedConstraints
+from services.meal_planning.selection import PlanSelector, RecipeMatrix, score_recipes
+from services.meal_planning.variety import MultiGoalMealPlanGenerator
+
+
+def _recipe(cost: float, prep: int, protein: int = 20, compat: float = 0.5, ingredients=None) -> dict:
+    return {
+        "name": f"{cost}-{prep}",
+        "cost_per_serving": cost,
+        "prep_time": prep,
+        "nutrition": {"calories": 400, "protein": protein, "fiber": 5, "sodium": 300},
+        "tags": [],
+        "goal_compatibility": {GoalType.BUDGET.value: compat},
+        "ingredients": ingredients or ["rice"],
+        "anti_inflammatory_score": 0.5,
+    }
+
+
+def test_score_matrix_matches_component_formula() -> None:
+    matrix = RecipeMatrix.from_recipes(
+        {
+            "cheap": _recipe(2.0, 10, protein=40, compat=1.0, ingredients=["black_beans", "rice"]),
+            "pricey": _recipe(8.0, 40, protein=10, compat=0.0, ingredients=["salmon"]),
+        }
+    )
+    constraints = MergedConstraints(max_cost_per_meal=4.0, max_prep_time=20, protein_grams=90, emphasized_foods=["beans"])
+
+    scores = score_recipes(matrix, constraints, [{"goal_type": GoalType.BUDGET.value, "priority": 4}])
+
+    # cheap: cost 1, time 1, protein 1, goal 1 (weight 1), emphasis 1 -> 5 / 5
+    assert scores[0] == 1.0
+    # pricey: cost 0.5, time 0.5, protein 1/3, goal 0, emphasis 0 -> / 5
+    assert np.isclose(scores[1], (0.5 + 0.5 + 1 / 3) / 5)
+
+
+def test_budget_is_enforced_across_the_plan_not_per_meal() -> None:
+    recipes = {
+        "premium": _recipe(6.0, 15, compat=1.0),
+        "budget_a": _recipe(2.0, 15, compat=0.2),
+        "budget_b": _recipe(2.5, 15, compat=0.1),
+        "budget_c": _recipe(3.0, 15, compat=0.1),
+    }
+    generator = MultiGoalMealPlanGenerator(Mock(), Mock())
+    generator.recipe_database = recipes
+    constraints = MergedConstraints(max_cost_per_meal=4.0)
+    goals = [{"goal_type": GoalType.BUDGET.value, "priority": 4}]
+
+    scores = generator._score_recipes_for_constraints(constraints, goals)
+    meals = generator._select_optimal_meals(scores, constraints, days=4)
+
+    total = sum(meal["recipe"]["cost_per_serving"] for meal in meals)
+    usage = Counter(meal["recipe_id"] for meal in meals)
+    assert len(meals) == 12
+    assert total <= 4.0 * 12
+    assert usage["premium"] >= 1, "A pricier favourite fits when the plan total allows it"
+    assert max(usage.values()) <= 4, "Variety cap relaxes only as far as the library requires"
+
+
+def test_repair_swaps_to_cheaper_recipes_when_greedy_overshoots() -> None:
+    matrix = RecipeMatrix.from_recipes(
+        {
+            "best": _recipe(10.0, 10),
+            "good": _recipe(9.0, 10),
+            "cheap": _recipe(1.0, 10),
+            "cheaper": _recipe(0.5, 10),
+        }
+    )
+    scores = np.array([1.0, 0.9, 0.2, 0.1])
+    constraints = MergedConstraints(weekly_budget=7 * 14.0)
+
+    result = PlanSelector().select(matrix, scores, constraints, days=2)
+
+    assert result.feasible
+    assert result.total_cost <= result.cost_budget
+    assert Counter(result.rows)[0] <= result.variety_cap
+
+
+def test_selection_reports_infeasible_budget() -> None:
+    matrix = RecipeMatrix.from_recipes({"a": _recipe(5.0, 10), "b": _recipe(6.0, 10)})
+    constraints = MergedConstraints(max_cost_per_meal=1.0)
+
+    result = PlanSelector().select(matrix, np.array([0.5, 0.4]), constraints, days=2)
+
+    assert len(result.rows) == 6
+    assert not result.feasible
+    assert result.relaxed_variety
+    assert result.notes
+
+
+def test_generate_multi_goal_plan_end_to_end() -> None:
+    multi_goal_service = Mock()
+    multi_goal_service.merge_goal_constraints.return_value = MergedConstraints(
+        max_cost_per_meal=4.0, protein_grams=120, max_prep_time=25
+    )
+    multi_goal_service.user_service.get_user_profile.return_value = {
+        "goals": [
+            {"goal_type": GoalType.BUDGET.value, "priority": 3},
+            {"goal_type": GoalType.MUSCLE_GAIN.value, "priority": 4},
+        ]
+    }
+    multi_goal_service.goal_definitions = {}
+    generator = MultiGoalMealPlanGenerator(Mock(), multi_goal_service)
+
+    result = generator.generate_multi_goal_plan("user-1", days=7)
+
+    assert result.success
+    assert len(result.meals) == 21
+    assert result.cost_breakdown["total_cost"] <= 4.0 * 21
@@ -0,0 +1,134 @@
+"""Unit tests for the O(1) LRU/TTL memory cache backend."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.caching.backends import MemoryCacheBackend, estimate_size
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used_key():
+    backend = MemoryCacheBackend(max_size=3, default_ttl=60)
+    for key in ("a", "b", "c"):
+        await backend.set(key, key.upper())
+
+    await backend.get("a")
+    await backend.set("d", "D")
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == "A"
+    assert await backend.get_size() == 3
+    assert backend.stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overwrite_refreshes_value_and_recency():
+    backend = MemoryCacheBackend(max_size=2, default_ttl=60)
+    await backend.set("a", 1)
+    await backend.set("b", 2)
+    await backend.set("a", 3)
+    await backend.set("c", 4)
+
+    assert await backend.get("a") == 3
+    assert await backend.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_hidden_and_purged_from_heap():
+    backend = MemoryCacheBackend(max_size=100, default_ttl=60)
+    now = time.time()
+    with patch("src.core.caching.backends.time.time", return_value=now):
+        await backend.set("short", "x", ttl=1)
+        await backend.set("long", "y", ttl=100)
+
+    with patch("src.core.caching.backends.time.time", return_value=now + 5):
+        assert await backend.get("short") is None
+        await backend.set("short-2", "z", ttl=1)
+        assert backend.purge_expired() == 0  # "short" already dropped on read
+
+    with patch("src.core.caching.backends.time.time", return_value=now + 10):
+        assert backend.purge_expired() == 1
+        assert await backend.get_size() == 1
+        assert await backend.get("long") == "y"
+
+
+@pytest.mark.asyncio
+async def test_writes_reclaim_expired_entries_without_reads():
+    backend = MemoryCacheBackend(max_size=1000, default_ttl=60)
+    now = time.time()
+    with patch("src.core.caching.backends.time.time", return_value=now):
+        for i in range(5):
+            await backend.set(f"stale-{i}", i, ttl=1)
+
+    with patch("src.core.caching.backends.time.time", return_value=now + 2):
+        await backend.set("fresh", "value")
+
+    assert await backend.get_size() == 1
+    assert backend.stats["expirations"] == 5
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_evicts_until_payload_fits():
+    backend = MemoryCacheBackend(max_size=100, default_ttl=60, max_bytes=1000, sizer=len)
+    await backend.set("a", "x" * 400)
+    await backend.set("b", "x" * 400)
+    await backend.set("c", "x" * 400)
+
+    assert await backend.get("a") is None
+    assert backend.get_bytes() == 800
+
+    await backend.delete("b")
+    assert backend.get_bytes() == 400
+
+
+@pytest.mark.asyncio
+async def test_entries_larger_than_a_shard_budget_are_rejected():
+    backend = MemoryCacheBackend(max_size=100, default_ttl=60, max_bytes=1000, sizer=len)
+    await backend.set("a", "x" * 400)
+    await backend.set("b", "x" * 400)
+
+    assert await backend.set("b", "x" * 1001) is False
+    assert await backend.get("a") == "x" * 400
+    # The rejected write does not leave the previous value behind
+    assert await backend.get("b") is None
+    assert backend.get_bytes() == 400
+    assert backend.stats["rejected"] == 1 and backend.stats["evictions"] == 0
+
+
+def test_stats_are_exact_under_concurrent_access():
+    backend = MemoryCacheBackend(max_size=64_000, default_ttl=60, shards=4)
+    for i in range(100):
+        backend.set_nowait(f"key-{i}", i)
+
+    def read():
+        for i in range(5_000):
+            backend.get_nowait(f"key-{i % 200}")
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.stats["hits"] == backend.stats["misses"] == 20_000
+
+
+@pytest.mark.asyncio
+async def test_sharded_cache_spreads_keys_and_respects_capacity():
+    backend = MemoryCacheBackend(max_size=64_000, default_ttl=60, shards=8)
+    await asyncio.gather(*(backend.set(f"key-{i}", i) for i in range(10_000)))
+
+    assert backend.shard_count == 8
+    assert await backend.get_size() == 10_000
+    assert await backend.get("key-1234") == 1234
+    assert all(len(shard.entries) for shard in backend._shards)
+
+
+def test_estimate_size_counts_nested_payloads():
+    flat = estimate_size({"a": 1})
+    nested = estimate_size({"a": {"b": [1, 2, 3], "c": "text" * 10}})
+    assert nested > flat > 0
@@ -0,0 +1,147 @@
+"""Unit tests for rolling nutrition aggregates behind NutritionTrackingService."""
+
+import copy
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.services.nutrition.aggregates import AGGREGATE_KEY, NutritionAggregateStore
+from src.services.nutrition.tracker import NutritionTrackingService
+
+
+class FakeUserDataService:
+    """User data store that counts reads; range reads emulate one DynamoDB query."""
+
+    def __init__(self) -> None:
+        self.data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.reads: List[str] = []
+
+    def get_user_data(self, user_id: str, key: str):
+        self.reads.append(key)
+        return self.data.get((user_id, key))
+
+    def get_user_data_range(self, user_id: str, start_key: str, end_key: str):
+        self.reads.append(f"range:{start_key}..{end_key}")
+        return {key: value for (uid, key), value in self.data.items() if uid == user_id and start_key <= key <= end_key}
+
+    def save_user_data(self, user_id: str, key: str, data: Dict[str, Any]) -> None:
+        self.data[(user_id, key)] = data
+
+    def get_user_profile(self, user_id: str):
+        return {"user_id": user_id}
+
+
+class VersionedUserDataService(FakeUserDataService):
+    """Returns copies, like a real store, and supports conditional writes on ``version``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.before_conditional_write = None
+        self.conflicts = 0
+
+    def get_user_data(self, user_id: str, key: str):
+        return copy.deepcopy(super().get_user_data(user_id, key))
+
+    def save_user_data_if_version(self, user_id: str, key: str, data: Dict[str, Any], expected_version) -> bool:
+        hook, self.before_conditional_write = self.before_conditional_write, None
+        if hook:
+            hook()
+        current = self.data.get((user_id, key))
+        if (current.get("version", 0) if current else None) != expected_version:
+            self.conflicts += 1
+            return False
+        self.data[(user_id, key)] = copy.deepcopy(data)
+        return True
+
+
+def _date(days_ago: int) -> str:
+    return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+def _legacy_day(days_ago: int, kcal: float, protein: float, energy: str = None) -> Dict[str, Any]:
+    return {"date": _date(days_ago), "kcal": kcal, "protein": protein, "fiber": 20, "sodium": 1800,
+            "water_cups": 6, "energy": energy, "meals_ate": ["dinner"]}
+
+
+def test_tracking_writes_keep_rolling_windows_current():
+    users = FakeUserDataService()
+    tracker = NutritionTrackingService(users, ai_service=None)
+
+    tracker.track_meal_simple("u1", "miso ginger salmon", "ate")
+    tracker.track_snack("u1", "yogurt")
+    tracker.track_water("u1", 16, unit="oz")
+
+    aggregate = users.data[("u1", AGGREGATE_KEY)]
+    assert aggregate["since"] == _date(0)
+    weekly = aggregate["windows"]["7"]
+    assert weekly["days"] == 1
+    assert weekly["sums"]["kcal"] == pytest.approx(380 + 150)
+    assert weekly["sums"]["protein"] == pytest.approx(32 + 15)
+    assert weekly["sums"]["water_cups"] == pytest.approx(2)
+    assert tracker.aggregates.window("u1", 30)["sums"]["sodium"] == pytest.approx(680)
+
+
+def test_weekly_report_rebuilds_once_then_costs_one_read():
+    users = FakeUserDataService()
+    for days_ago, kcal, protein in [(1, 1800, 90), (2, 2100, 130), (40, 2500, 150)]:
+        day = _legacy_day(days_ago, kcal, protein)
+        users.data[("u1", f"nutrition_{day['date']}")] = day
+    tracker = NutritionTrackingService(users, ai_service=None)
+    week_start = _date(6)
+
+    users.reads.clear()
+    first = tracker.generate_weekly_report("u1", week_start)
+    # No aggregate yet: one read of the aggregate, one range read to rebuild it
+    assert users.reads == [AGGREGATE_KEY, f"range:nutrition_{_date(29)}..nutrition_{_date(0)}"]
+    assert "1,950 kcal/d" in first
+
+    users.reads.clear()
+    assert tracker.generate_weekly_report("u1", week_start) == first
+    assert users.reads == [AGGREGATE_KEY]
+
+    # Days outside the retention window are not kept in the aggregate
+    assert _date(40) not in users.data[("u1", AGGREGATE_KEY)]["days"]
+
+
+def test_recent_data_is_newest_first_and_drives_suggestions():
+    users = FakeUserDataService()
+    for days_ago in range(3):
+        day = _legacy_day(days_ago, 1500, 60, energy="💤")
+        users.data[("u1", f"nutrition_{day['date']}")] = day
+    tracker = NutritionTrackingService(users, ai_service=None)
+
+    recent = tracker._get_recent_nutrition_data("u1", days=7)
+
+    assert [day.date for day in recent] == [_date(0), _date(1), _date(2)]
+    assert recent[0].meals_ate == []
+    assert "Add 1 easy protein snack/day (Greek yogurt, edamame, tuna packet)" in tracker.get_adaptation_suggestions("u1")
+
+
+def test_concurrent_day_writes_both_land_in_the_aggregate():
+    users = VersionedUserDataService()
+    store = NutritionAggregateStore(users)
+    store.record_day("u1", _legacy_day(2, 1800, 90))
+
+    # Another invocation folds in yesterday between our read and our write
+    users.before_conditional_write = lambda: store.record_day("u1", _legacy_day(1, 2000, 110))
+    store.record_day("u1", _legacy_day(0, 1900, 100))
+
+    aggregate = users.data[("u1", AGGREGATE_KEY)]
+    assert sorted(aggregate["days"]) == [_date(2), _date(1), _date(0)]
+    assert aggregate["windows"]["7"]["days"] == 3
+    assert aggregate["version"] == 3
+    assert users.conflicts == 1
+
+
+def test_unreadable_aggregates_fall_back_to_daily_items():
+    users = FakeUserDataService()
+    for days_ago in range(2):
+        day = _legacy_day(days_ago, 1700, 80)
+        users.data[("u1", f"nutrition_{day['date']}")] = day
+    users.data[("u1", AGGREGATE_KEY)] = {"since": _date(30), "days": None}
+    tracker = NutritionTrackingService(users, ai_service=None)
+
+    recent = tracker._get_recent_nutrition_data("u1", days=7)
+
+    assert [day.date for day in recent] == [_date(0), _date(1)]
@@ -0,0 +1,76 @@
+"""Unit tests for the combined, streaming PII scanning mode of PIIDetector."""
+
+import re
+
+from src.services.data_quality.privacy import PIIDetector, PIIPattern, PIIType
+
+
+def _summary(detections):
+    return [(d.pii_type, d.value, d.field_path, d.start_pos) for d in detections]
+
+
+def test_combined_scan_matches_per_pattern_detection_in_document_order():
+    detector = PIIDetector()
+    document = {
+        "user": {"name": "Jane Miller", "contact": ["jane.miller@example.com", "call 555-123-4567"]},
+        "events": [
+            {"type": "meal_logged", "ssn_note": "ssn 123-45-6789", "ip": "10.0.0.12"},
+            {"type": "checkout", "card": "4111 1111 1111 1111", "dob": "born 04/12/1988"},
+        ],
+        "calories": 540,
+    }
+
+    combined = detector.scan_pii(document)
+
+    assert sorted(_summary(combined), key=str) == sorted(_summary(detector.detect_pii_in_data(document)), key=str)
+    assert [d.field_path for d in combined] == [
+        "user.name", "user.contact[0]", "user.contact[1]",
+        "events[0].ssn_note", "events[0].ip", "events[1].card", "events[1].dob",
+    ]
+    assert detector.scan_pii(document, first_only=True)[0].pii_type == PIIType.NAME
+
+
+def test_prefilters_skip_strings_that_cannot_match():
+    detector = PIIDetector()
+
+    assert detector.scan_pii(["meal_logged", "breakfast", "oatmeal with berries"]) == []
+    matcher = detector._combined_matcher()
+    # All default patterns need a digit, an "@" or an uppercase letter
+    assert list(matcher._selections.values()) == [(None, [])]
+
+
+def test_custom_patterns_flags_backreferences_and_whitelist():
+    detector = PIIDetector()
+    detector.add_custom_pattern("health_record_id", {
+        "pii_type": "health_data",
+        "pattern": re.compile(r"\bhr\d{8}\b", re.IGNORECASE),
+        "confidence": 0.95,
+        "description": "Health record ID pattern",
+    })
+    detector.add_custom_pattern("repeated_pin", PIIPattern(
+        PIIType.FINANCIAL, re.compile(r"\b(\d)\1{5}\b"), 0.5, "Repeated-digit PIN"
+    ))
+    detector.add_whitelist_pattern(re.compile(r"^TEST-"), "Synthetic fixtures")
+
+    detections = detector.scan_pii({"record": "see HR12345678", "pin": "pin 777777", "fixture": "TEST-HR12345678"})
+
+    assert _summary(detections) == [
+        (PIIType.HEALTH_DATA, "HR12345678", "record", 4),
+        (PIIType.FINANCIAL, "777777", "pin", 4),
+    ]
+    assert _summary(detector.detect_pii_in_data({"record": "see HR12345678"})) == [
+        (PIIType.HEALTH_DATA, "HR12345678", "record", 4)
+    ]
+
+
+def test_deeply_nested_documents_are_walked_iteratively():
+    detector = PIIDetector()
+    document = {"email": "deep@example.com"}
+    for _ in range(5000):
+        document = {"child": document}
+
+    detections = list(detector.iter_pii(document))
+
+    assert len(detections) == 1
+    assert detections[0].field_path == ".".join(["child"] * 5000 + ["email"])
+    assert len(detector.detect_pii_in_data(document)) == 1
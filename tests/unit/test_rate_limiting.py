@@ -22,6 +22,7 @@ from src.services.infrastructure.rate_limiting.strategies import (
     SlidingWindowStrategy,
     FixedWindowStrategy,
     LeakyBucketStrategy,
+    LimitCheck,
     get_strategy
 )
 from src.services.infrastructure.rate_limiting.redis_backend import RedisRateLimitBackend
@@ -34,6 +35,8 @@ class MockRedisBackend:
     def __init__(self):
         self.data = {}
         self.script_calls = []
+        self.batch_calls = []
+        self.batch_responses = []
         self.healthy = True
     
     async def initialize(self):
@@ -62,6 +65,15 @@ class MockRedisBackend:
         else:
             return [1, 10, time.time() + 60, 1]
     
+    async def execute_batch_script(self, script: str, keys: list, args: list):
+        """Mock combined script execution (Redis unavailable unless a response is queued)."""
+        self.batch_calls.append({
+            'script': script,
+            'keys': keys,
+            'args': args
+        })
+        return self.batch_responses.pop(0) if self.batch_responses else None
+    
     async def get_value(self, key: str):
         return self.data.get(key)
     
@@ -204,6 +216,20 @@ class TestRateLimitStrategies:
         
         with pytest.raises(ValueError):
             get_strategy("invalid_strategy")
+    
+    def test_strategies_must_define_storage_key(self):
+        """Strategies without a storage key cannot be instantiated."""
+        from src.services.infrastructure.rate_limiting.strategies import RateLimitStrategy as StrategyBase
+        
+        class KeylessStrategy(StrategyBase):
+            async def check_limit(self, key, limit, window, backend, **kwargs):
+                pass
+            
+            def get_strategy_name(self):
+                return "keyless"
+        
+        with pytest.raises(TypeError):
+            KeylessStrategy()
 
 
 class TestRateLimitEngine:
@@ -326,6 +352,222 @@ class TestRateLimitEngine:
         assert "config" in stats
 
 
+class TestCombinedEvaluation:
+    """Test single-round-trip evaluation of all dimensions and windows."""
+    
+    @staticmethod
+    def _allowed_response(checks: int, remaining: int = 50):
+        return [1, 0] + [1, remaining, time.time() + 60, 1] * checks
+    
+    @pytest.mark.asyncio
+    async def test_all_dimensions_checked_in_one_call(self, rate_limit_engine):
+        """Global counters and 4 dimensions x 3 windows go to Redis as one script call."""
+        backend = rate_limit_engine.backend
+        response = self._allowed_response(12)
+        response[2 + 5 * 4:2 + 6 * 4] = [1, 3, time.time() + 60, 57]
+        backend.batch_responses = [response]
+        
+        result = await rate_limit_engine.check_rate_limit(
+            identifier="test:user1",
+            endpoint="/api/test",
+            user_tier=UserTier.FREE,
+            user_id="user-1"
+        )
+        
+        assert len(backend.batch_calls) == 1
+        assert backend.script_calls == []
+        call = backend.batch_calls[0]
+        assert call['keys'][:2] == [
+            f"global:second:{int(call['args'][0])}",
+            f"global:minute:{int(call['args'][0] // 60)}"
+        ]
+        assert len(call['keys']) == 2 + 12
+        assert call['keys'][2] == "sw:identifier:min:id:test:user1"
+        assert result.allowed is True
+        assert result.remaining == 3
+    
+    @pytest.mark.asyncio
+    async def test_blocked_window_is_most_restrictive(self, rate_limit_engine):
+        """A denied window is returned even when other windows have capacity."""
+        response = self._allowed_response(9)
+        response[0] = 0
+        response[2 + 4 * 4:2 + 5 * 4] = [0, 0, time.time() + 3600, 1000]
+        rate_limit_engine.backend.batch_responses = [response]
+        
+        result = await rate_limit_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert result.allowed is False
+        assert result.window_size == 3600
+        assert result.retry_after >= 1
+        assert rate_limit_engine._global_stats['blocked_requests'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_global_limit_exceeded(self, rate_limit_engine):
+        """A global counter over its limit short-circuits the combined check."""
+        rate_limit_engine.backend.batch_responses = [[-1, 1, 101]]
+        
+        result = await rate_limit_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert result.allowed is False
+        assert result.strategy == "global_limit"
+        assert result.limit == 100
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sequential_checks(self, rate_limit_engine):
+        """Without Redis the engine checks each dimension through the per-key scripts."""
+        result = await rate_limit_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert len(rate_limit_engine.backend.batch_calls) == 1
+        assert len(rate_limit_engine.backend.script_calls) == 9
+        assert result.allowed is True
+    
+    @pytest.mark.asyncio
+    async def test_disabled_combined_evaluation(self, rate_limit_engine):
+        """Combined evaluation can be switched off in configuration."""
+        rate_limit_engine.config.combined_evaluation = False
+        
+        await rate_limit_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert rate_limit_engine.backend.batch_calls == []
+    
+    @pytest.mark.asyncio
+    async def test_fixed_window_keys_include_window_start(self, mock_backend):
+        """Fixed window checks pass the window start so keys roll over per window."""
+        strategy = FixedWindowStrategy()
+        mock_backend.batch_responses = [[1, 0, 1, 9, time.time() + 60, 1]]
+        
+        results = await strategy.check_limits(
+            [LimitCheck(key="identifier:min:id:a", limit=10, window=60)],
+            mock_backend
+        )
+        
+        call = mock_backend.batch_calls[0]
+        window_start = int(call['args'][0] // 60) * 60
+        assert call['keys'] == [f"fw:identifier:min:id:a:{window_start}"]
+        assert call['args'][1:] == [1, "", 0, 10, 60, 10, window_start]
+        assert results[0].remaining == 9
+        assert results[0].strategy == "fixed_window"
+
+
+class TestTokenLeasing:
+    """Test hybrid mode with locally spent token leases."""
+    
+    @pytest.fixture
+    def leasing_engine(self, mock_config, mock_backend):
+        mock_config.token_leasing_enabled = True
+        mock_config.cleanup_interval = 0
+        engine = RateLimitEngine(mock_config)
+        engine.backend = mock_backend
+        return engine
+    
+    @staticmethod
+    def _response(remaining: int, checks: int = 9, allowed: int = 1):
+        return [allowed, 0] + [allowed, remaining, time.time() + 60, 1] * checks
+    
+    @pytest.mark.asyncio
+    async def test_leased_tokens_are_spent_locally(self, leasing_engine, mock_backend):
+        """One Redis call reserves a block of tokens that later requests spend in process."""
+        mock_backend.batch_responses = [self._response(remaining=40)]
+        
+        results = [
+            await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+            for _ in range(3)
+        ]
+        
+        assert len(mock_backend.batch_calls) == 1
+        assert mock_backend.batch_calls[0]['args'][1] == leasing_engine.config.lease_min_tokens
+        assert all(r.allowed for r in results)
+        assert [r.remaining for r in results] == [43, 42, 41]
+        assert leasing_engine._lease_manager.get_stats()['local_requests'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_lease_renewed_before_running_out(self, leasing_engine, mock_backend):
+        """The next lease is prefetched in the background when the current one runs low."""
+        mock_backend.batch_responses = [self._response(remaining=400), self._response(remaining=396)]
+        
+        for _ in range(4):
+            await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        await asyncio.sleep(0)
+        result = await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert len(mock_backend.batch_calls) == 2
+        assert result.allowed is True
+        assert leasing_engine._lease_manager.get_stats()['strict_requests'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_strict_mode_near_limit(self, leasing_engine, mock_backend):
+        """Once the remaining budget is small, requests are checked one by one."""
+        leasing_engine.config.lease_max_fraction = 0.1
+        mock_backend.batch_responses = [
+            self._response(remaining=20),
+            self._response(remaining=19),
+        ]
+        
+        for _ in range(5):
+            await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        costs = [call['args'][1] for call in mock_backend.batch_calls]
+        assert costs[0] == leasing_engine.config.lease_min_tokens
+        assert costs[1:] == [1] * (len(costs) - 1)
+        assert leasing_engine._lease_manager.get_stats()['strict_requests'] >= 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_lease_refunds_unused_tokens(self, leasing_engine, mock_backend):
+        """Unused tokens of an expired lease are returned to Redis."""
+        leasing_engine.config.lease_ttl_seconds = 0.01
+        mock_backend.batch_responses = [self._response(remaining=40), [9]]
+        
+        await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        await asyncio.sleep(0.02)
+        assert await leasing_engine._lease_manager.release_expired() == 1
+        await asyncio.sleep(0)
+        
+        refund = mock_backend.batch_calls[-1]
+        assert refund['args'][1] == leasing_engine.config.lease_min_tokens - 1
+        assert refund['args'][2] == mock_backend.batch_calls[0]['args'][2]
+        assert refund['keys'] == mock_backend.batch_calls[0]['keys'][2:]
+        assert leasing_engine._lease_manager.get_stats()['tokens_refunded'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_free_tier_token_bucket_is_checked_strictly(self, leasing_engine, mock_backend):
+        """A burst capacity of 10 never yields lease_min_tokens, so every request is strict."""
+        leasing_engine.config.default_strategy = RateLimitStrategy.TOKEN_BUCKET
+        mock_backend.batch_responses = [self._response(remaining=9 - i) for i in range(3)]
+        
+        for _ in range(3):
+            await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        manager = leasing_engine._lease_manager
+        assert [call['args'][1] for call in mock_backend.batch_calls] == [1, 1, 1]
+        assert manager.get_stats()['strict_requests'] == 3
+        assert manager.get_stats()['tracked_keys'] == 0 and manager._locks == {}
+    
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_forgotten(self, leasing_engine, mock_backend):
+        """Per-key state of keys checked strictly is pruned once they go idle."""
+        leasing_engine.config.lease_ttl_seconds = 0.01
+        # Each lease is denied, then the request is checked strictly
+        mock_backend.batch_responses = [self._response(remaining=0, allowed=0)] * 200
+        
+        for i in range(100):
+            await leasing_engine.check_rate_limit(f"test:user{i}", "/api/test", UserTier.FREE)
+        manager = leasing_engine._lease_manager
+        assert manager.get_stats()['strict_requests'] == 100
+        assert len(manager._locks) == len(manager._budgets) == len(manager._next_sizes) == 100
+        
+        await asyncio.sleep(0.02)
+        assert await manager.release_expired() == 100
+        assert manager._locks == {} and manager._budgets == {} and manager._next_sizes == {}
+    
+    @pytest.mark.asyncio
+    async def test_leasing_without_redis_falls_back(self, leasing_engine, mock_backend):
+        """Without Redis, requests go through the per-key checks."""
+        result = await leasing_engine.check_rate_limit("test:user1", "/api/test", UserTier.FREE)
+        
+        assert result.allowed is True
+        assert len(mock_backend.script_calls) == 9
+
+
 class TestRateLimitConfig:
     """Test rate limiting configuration."""
     
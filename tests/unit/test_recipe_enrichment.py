@@ -0,0 +1,156 @@
+"""Unit tests for the concurrent, cached recipe enrichment stage."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.infrastructure.recipe_enrichment import (
+    RecipeEnrichmentStage,
+    RecipeLookupCache,
+    plan_meals,
+    recipe_lookup_key,
+)
+
+
+class FakeRecipeApi:
+    """Recipe lookup that records calls and tracks concurrency."""
+
+    def __init__(self, delay=0.01, slow=(), empty=()):
+        self.delay = delay
+        self.slow = set(slow)
+        self.empty = set(empty)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def lookup(self, meal_name):
+        self.calls.append(meal_name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(10 if meal_name in self.slow else self.delay)
+        finally:
+            self.active -= 1
+        if meal_name in self.empty:
+            return {}
+        return {'url': f"https://recipes.example/{meal_name}"}
+
+
+def _weekly_plan(names):
+    return {
+        'days': {
+            f"day_{day}": {
+                meal_type: {'name': names[(day + offset) % len(names)]}
+                for offset, meal_type in enumerate(['breakfast', 'lunch', 'dinner'])
+            }
+            for day in range(7)
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolve_deduplicates_names_and_bounds_concurrency():
+    api = FakeRecipeApi()
+    stage = RecipeEnrichmentStage(cache=RecipeLookupCache(), max_concurrency=2)
+    names = ["Oatmeal", "Chicken Salad", "Lentil Soup", "Stir Fry"]
+    meals = plan_meals(_weekly_plan(names + ["oatmeal ", "CHICKEN  salad"]))
+
+    recipes = await stage.resolve([meal['name'] for _, _, meal in meals], api.lookup)
+
+    assert len(meals) == 21
+    assert sorted(api.calls) == sorted(names)
+    assert api.max_active == 2
+    assert set(recipes) == {"oatmeal", "chicken salad", "lentil soup", "stir fry"}
+
+
+@pytest.mark.asyncio
+async def test_cache_is_shared_and_keyed_by_labels():
+    api = FakeRecipeApi()
+    cache = RecipeLookupCache()
+
+    await RecipeEnrichmentStage(cache=cache).resolve(["Oatmeal"], api.lookup, ["vegan"], [])
+    await RecipeEnrichmentStage(cache=cache).resolve(["oatmeal"], api.lookup, ["vegan"], [])
+    await RecipeEnrichmentStage(cache=cache).resolve(["Oatmeal"], api.lookup, [], ["gluten-free"])
+
+    assert api.calls == ["Oatmeal", "Oatmeal"]
+    assert cache.stats['hits'] == 1
+    assert recipe_lookup_key("Oatmeal", ["vegan", "vegan"], []) == recipe_lookup_key(" oatmeal", ["vegan"], [])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_plans_share_in_flight_lookups():
+    api = FakeRecipeApi()
+    cache = RecipeLookupCache()
+
+    results = await asyncio.gather(*[
+        RecipeEnrichmentStage(cache=cache).resolve(["Oatmeal", "Lentil Soup"], api.lookup)
+        for _ in range(3)
+    ])
+
+    assert sorted(api.calls) == ["Lentil Soup", "Oatmeal"]
+    assert all(set(result) == {"oatmeal", "lentil soup"} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_partial_results_and_skips_empty_results():
+    api = FakeRecipeApi(slow={"Beef Wellington"}, empty={"Mystery Stew"})
+    cache = RecipeLookupCache()
+    stage = RecipeEnrichmentStage(cache=cache, timeout_seconds=0.2)
+
+    recipes = await stage.resolve(["Oatmeal", "Beef Wellington", "Mystery Stew"], api.lookup)
+
+    assert set(recipes) == {"oatmeal"}
+    assert cache.get(recipe_lookup_key("Mystery Stew", [], [])) is None
+
+
+def test_cache_evicts_least_recently_used_and_expires():
+    cache = RecipeLookupCache(max_entries=2)
+    keys = [recipe_lookup_key(name, [], []) for name in ("a", "b", "c")]
+    cache.set(keys[0], {'url': 'a'})
+    cache.set(keys[1], {'url': 'b'})
+    assert cache.get(keys[0]) == {'url': 'a'}
+    cache.set(keys[2], {'url': 'c'})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {'url': 'a'}
+
+    expired = RecipeLookupCache(ttl_seconds=0)
+    expired.set(keys[0], {'url': 'a'})
+    assert expired.get(keys[0]) is None
+
+
+def test_plans_on_separate_event_loops_do_not_await_each_other():
+    api = FakeRecipeApi(delay=0.3)
+    cache = RecipeLookupCache()
+    stage = RecipeEnrichmentStage(cache=cache, timeout_seconds=3.0)
+    results = []
+
+    def generate_plan():
+        # AIService.generate_meal_plan runs asyncio.run per plan, one thread each
+        results.append(asyncio.run(stage.resolve(["Oatmeal"], api.lookup)))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=generate_plan) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.perf_counter() - started < 1.5
+    assert [set(result) for result in results] == [{"oatmeal"}, {"oatmeal"}]
+
+
+@pytest.mark.asyncio
+async def test_cached_recipes_are_copies():
+    api = FakeRecipeApi()
+    cache = RecipeLookupCache()
+    stage = RecipeEnrichmentStage(cache=cache)
+
+    first = await stage.resolve(["Oatmeal"], api.lookup)
+    first["oatmeal"]["verified_ingredients"] = ["peanut butter"]
+    second = await stage.resolve(["Oatmeal"], api.lookup)
+
+    assert "verified_ingredients" not in second["oatmeal"]
+    assert second["oatmeal"] is not first["oatmeal"]
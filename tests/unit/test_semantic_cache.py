@@ -0,0 +1,206 @@
+"""Unit tests for the semantic LLM response cache."""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.knowledge.ingestion_pipeline import MockEmbeddingEncoder
+from src.services.knowledge.semantic_cache import HashingEmbeddingEncoder, SemanticResponseCache, profile_scope
+from src.services.knowledge.smart_cache import SmartResponseCache
+
+
+class VectorEncoder:
+    """Encoder returning preset vectors, for controlled similarities."""
+
+    def __init__(self):
+        self.vectors = {}
+
+    def encode(self, texts):
+        return np.stack([self.vectors[text] for text in texts])
+
+
+def _near(vector, cosine, rng):
+    noise = rng.standard_normal(len(vector)).astype(np.float32)
+    noise -= noise.dot(vector) * vector
+    noise /= np.linalg.norm(noise)
+    return cosine * vector + np.sqrt(1 - cosine ** 2) * noise
+
+
+@pytest.fixture
+def cache():
+    return SemanticResponseCache()
+
+
+def test_similar_prompt_hits_and_unrelated_prompt_misses(cache):
+    cache.store("How much protein should I eat per day to build muscle?", "About 1.6 g/kg", "quick_nutrition_qa")
+
+    hit = cache.lookup("how much  protein should i eat per day to build muscle?", "quick_nutrition_qa")
+    assert hit.exact and hit.response == "About 1.6 g/kg"
+
+    hit = cache.lookup("How much protein should I eat per day to build lean muscle?", "quick_nutrition_qa")
+    assert hit is not None and not hit.exact
+    assert cache.threshold_for("quick_nutrition_qa") <= hit.similarity < 1.0
+
+    assert cache.lookup("Is coffee bad for my sleep?", "quick_nutrition_qa") is None
+    assert cache.get_stats()["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_templates_are_isolated_with_their_own_thresholds():
+    rng = np.random.default_rng(1)
+    encoder = VectorEncoder()
+    base = rng.standard_normal(64).astype(np.float32)
+    base /= np.linalg.norm(base)
+    encoder.vectors["cached"] = base
+    encoder.vectors["close"] = _near(base, 0.95, rng)
+    cache = SemanticResponseCache(
+        encoder=encoder, template_thresholds={"strict": 0.99, "loose": 0.9}
+    )
+    cache.store("cached", "strict answer", "strict")
+    cache.store("cached", "loose answer", "loose")
+
+    assert cache.lookup("close", "strict") is None
+    assert cache.lookup("close", "loose").response == "loose answer"
+    assert cache.lookup("close", "other") is None
+    stats = cache.get_stats()["templates"]
+    assert stats["strict"]["hits"] == 0 and stats["loose"]["hits"] == 1
+
+
+def test_lsh_index_finds_near_duplicates_among_many_entries():
+    rng = np.random.default_rng(2)
+    encoder = VectorEncoder()
+    cache = SemanticResponseCache(encoder=encoder, exact_scan_limit=0, default_threshold=0.9)
+    vectors = rng.standard_normal((5000, 128)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    for index, vector in enumerate(vectors):
+        encoder.vectors[f"prompt {index}"] = vector
+        cache.store(f"prompt {index}", index)
+
+    found = 0
+    for index in range(0, 5000, 25):
+        encoder.vectors[f"query {index}"] = _near(vectors[index], 0.96, rng)
+        hit = cache.lookup(f"query {index}")
+        found += hit is not None and hit.response == index
+        candidates = cache._candidates(encoder.vectors[f"query {index}"], 0)
+        assert len(candidates) < 500
+
+    assert found >= 195
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    cache = SemanticResponseCache(max_entries=2)
+    cache.store("first prompt about oats", 1)
+    cache.store("second prompt about rice", 2)
+    assert cache.lookup("first prompt about oats").response == 1
+
+    cache.store("third prompt about beans", 3)
+    assert len(cache) == 2
+    assert cache.lookup("second prompt about rice") is None
+    assert cache.lookup("first prompt about oats").response == 1
+    assert cache.get_stats()["evictions"] == 1
+
+    cache.store("short lived prompt", 4, ttl_seconds=-1)
+    assert cache.lookup("short lived prompt") is None
+    assert cache.remove_expired() == 0
+    assert len(cache) == 1
+
+
+def test_mock_embedding_encoder_is_supported():
+    cache = SemanticResponseCache(encoder=MockEmbeddingEncoder(dimension=32))
+    cache.store("Plan my week", "plan")
+
+    assert cache.lookup("Plan my week").response == "plan"
+    assert cache.lookup("Plan my month") is None
+
+
+def test_hashing_encoder_returns_unit_vectors():
+    vectors = HashingEmbeddingEncoder(dimension=64).encode(["Greek yogurt bowl", ""])
+
+    assert vectors.shape == (2, 64)
+    assert np.linalg.norm(vectors[0]) == pytest.approx(1.0)
+    assert not vectors[1].any()
+
+
+@pytest.mark.asyncio
+async def test_smart_cache_serves_similar_queries_from_semantic_index():
+    smart_cache = SmartResponseCache(semantic_cache=SemanticResponseCache())
+
+    async def ai(query, user_id):
+        return f"answer to {query}"
+
+    first = await smart_cache.get_or_generate("which vegetables have the most fiber", "user-1", ai)
+    second = await smart_cache.get_or_generate("which vegetables have the most fiber overall", "user-2", ai)
+
+    assert first["source"] == "ai_generated"
+    assert second["source"] == "semantic_cache"
+    assert second["response"] == first["response"]
+    assert smart_cache.get_cache_stats()["semantic_cache_size"] == 1
+
+
+def test_prompts_differing_only_in_allergies_never_share_an_entry():
+    from src.services.infrastructure.ai import AIService
+
+    base = {"household_size": 2, "weekly_budget": 60, "dietary_restrictions": ["pescatarian"]}
+    shellfish = {**base, "allergies": ["shellfish"]}
+    peanut = {**base, "allergies": ["peanuts"]}
+    shellfish_prompt = AIService._build_meal_plan_prompt(None, shellfish)
+    peanut_prompt = AIService._build_meal_plan_prompt(None, peanut)
+    cache = SemanticResponseCache()
+
+    for template in ("meal_plan", "quick_nutrition_qa"):
+        cache.store(shellfish_prompt, "shrimp-free plan", template, scope=profile_scope(shellfish))
+        assert cache.lookup(peanut_prompt, template, profile_scope(peanut)) is None
+        # The same prompt text under another profile scope is not reused either
+        assert cache.lookup(shellfish_prompt, template, profile_scope(peanut)) is None
+
+    # Meal plans are only reused for identical prompts, never by similarity
+    assert cache.lookup(peanut_prompt, "meal_plan", profile_scope(shellfish)) is None
+    assert cache.lookup(shellfish_prompt, "meal_plan", profile_scope(shellfish)).exact
+    assert profile_scope({**shellfish, "allergies": ["Shellfish"]}) == profile_scope(shellfish)
+
+
+def test_templated_questions_are_compared_without_the_template_text():
+    from src.services.infrastructure.ai import AIService
+
+    service = AIService.__new__(AIService)
+    service.model_id = "amazon.titan-text-express-v1"
+    service.semantic_cache = SemanticResponseCache()
+    service._get_cached_response = lambda key: None
+    service._cache_response = MagicMock()
+    service._track_bedrock_usage = MagicMock()
+    service.bedrock_runtime = MagicMock()
+
+    def invoke_model(**kwargs):
+        question = json.loads(kwargs["body"])["inputText"].split('User question: "')[1].split('"')[0]
+        return {"body": io.BytesIO(json.dumps({"results": [{"outputText": f"answer to {question}"}]}).encode())}
+
+    service.bedrock_runtime.invoke_model.side_effect = invoke_model
+    profile = {"dietary_restrictions": ["vegetarian"], "fitness_goals": "muscle_gain"}
+    protein = "How much protein should I eat per day to build muscle?"
+    assert service.get_nutrition_advice(protein, profile) == f"answer to {protein}"
+
+    for question in ("Is coffee bad for me?", "Can I eat eggs every day?", "What should I eat before bed?"):
+        assert service.get_nutrition_advice(question, profile) == f"answer to {question}"
+    assert service.get_nutrition_advice(
+        "How much protein should I eat per day to build lean muscle?", profile
+    ) == f"answer to {protein}"
+    # The rest of the prompt must match exactly
+    assert service.get_nutrition_advice(
+        "How much protein should I eat per day to build lean muscle?", {**profile, "fitness_goals": "weight_loss"}
+    ) == "answer to How much protein should I eat per day to build lean muscle?"
+    assert service.bedrock_runtime.invoke_model.call_count == 5
+
+
+def test_template_ids_are_released_with_their_last_entry():
+    cache = SemanticResponseCache(max_entries=2)
+    for index in range(5):
+        cache.store("Is coffee bad for me?", index, "quick_nutrition_qa", scope=f"profile-{index}")
+
+    assert len(cache._template_ids) == len(cache._template_sizes) == 2
+    assert cache.lookup("Is coffee bad for me?", "quick_nutrition_qa", "profile-4").response == 4
+
+    cache.store("Is tea bad for me?", "tea", "quick_nutrition_qa", ttl_seconds=-1, scope="profile-5")
+    cache.remove_expired()
+    assert len(cache._template_ids) == len(cache._template_sizes) == len(cache) == 1
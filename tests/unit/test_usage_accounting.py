@@ -0,0 +1,153 @@
+"""Unit tests for buffered API usage accounting."""
+
+import os
+import signal
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from src.services.infrastructure import usage_accounting
+from src.services.infrastructure.usage_accounting import UsageAccumulator, bedrock_cost, flush_usage_after
+
+
+class FakeUsageTable:
+    """Applies ADD update expressions to in-memory items."""
+
+    def __init__(self, fail=False):
+        self.items = {}
+        self.updates = 0
+        self.fail = fail
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        if self.fail:
+            raise RuntimeError("throttled")
+        self.updates += 1
+        assert UpdateExpression.startswith('ADD ')
+        item = self.items.setdefault(Key['usage_key'], {})
+        add_clause, set_clause = UpdateExpression[4:].split(' SET ')
+        for action in add_clause.split(', '):
+            name, value = action.split()
+            attribute = ExpressionAttributeNames[name]
+            item[attribute] = item.get(attribute, 0) + ExpressionAttributeValues[value]
+        item.setdefault('ttl', ExpressionAttributeValues[':ttl'])
+
+
+@pytest.fixture
+def table():
+    return FakeUsageTable()
+
+
+@pytest.fixture
+def accumulator(table):
+    accumulator = UsageAccumulator(flush_interval_seconds=3600, table_factory=lambda name: table)
+    yield accumulator
+    accumulator._stop.set()
+
+
+def test_record_aggregates_per_day_and_model_without_io(accumulator, table):
+    for _ in range(5):
+        accumulator.record('bedrock:titan', input_tokens=100, output_tokens=40, cost=0.5, date='2024-03-01')
+    accumulator.record('bedrock:titan', input_tokens=10, date='2024-03-02')
+    accumulator.record('bedrock:lite', output_tokens=7, date='2024-03-01')
+
+    assert table.updates == 0
+    assert accumulator.snapshot('2024-03-01') == {
+        'bedrock:titan': {'count': 5, 'input_tokens': 500, 'output_tokens': 200, 'total_cost': 2.5},
+        'bedrock:lite': {'count': 1, 'input_tokens': 0, 'output_tokens': 7, 'total_cost': 0},
+    }
+
+    assert accumulator.flush() == 3
+    assert table.items['system#bedrock:titan#2024-03-01']['count'] == 5
+    assert table.items['system#bedrock:titan#2024-03-01']['total_cost'] == Decimal('2.5')
+    assert table.items['system#bedrock:titan#2024-03-02']['input_tokens'] == 10
+    assert accumulator.snapshot('2024-03-01') == {}
+
+
+def test_concurrent_records_are_not_lost(accumulator, table):
+    def worker():
+        for _ in range(500):
+            accumulator.record('bedrock:titan', input_tokens=2, date='2024-03-01')
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        accumulator.flush()
+    for thread in threads:
+        thread.join()
+    accumulator.flush()
+
+    item = table.items['system#bedrock:titan#2024-03-01']
+    assert item['count'] == 4000
+    assert item['input_tokens'] == 8000
+
+
+def test_failed_flush_keeps_counters_for_retry(accumulator, table):
+    table.fail = True
+    accumulator.record('bedrock:titan', input_tokens=3, date='2024-03-01')
+    assert accumulator.flush() == 0
+    accumulator.record('bedrock:titan', input_tokens=4, date='2024-03-01')
+
+    table.fail = False
+    assert accumulator.flush() == 1
+    assert table.items['system#bedrock:titan#2024-03-01']['count'] == 2
+    assert table.items['system#bedrock:titan#2024-03-01']['input_tokens'] == 7
+    assert accumulator.stats['flush_errors'] == 1
+
+
+def test_close_flushes_remaining_usage(accumulator, table):
+    accumulator.record('bedrock:titan', input_tokens=1)
+    accumulator.close()
+
+    accumulator._worker.join(timeout=1)
+    assert table.updates == 1
+    assert not accumulator._worker.is_alive()
+
+
+def test_shutdown_flush_while_record_holds_the_lock(accumulator, table):
+    accumulator.record('bedrock:titan', input_tokens=1, date='2024-03-01')
+
+    # A signal handler runs on the thread it interrupted, lock held or not
+    with accumulator._lock, accumulator._flush_lock:
+        assert accumulator.flush() == 1
+
+    assert table.items['system#bedrock:titan#2024-03-01']['count'] == 1
+
+
+@pytest.mark.parametrize('previous, terminates', [
+    (signal.SIG_DFL, True), (None, True), (signal.SIG_IGN, False),
+])
+def test_sigterm_flushes_then_keeps_the_previous_disposition(accumulator, table, previous, terminates):
+    installed = []
+
+    with patch.object(signal, 'getsignal', return_value=previous), \
+            patch.object(signal, 'signal', side_effect=lambda signum, handler: installed.append(handler)), \
+            patch.object(os, 'kill') as kill, patch('atexit.register'):
+        accumulator._install_shutdown_hooks()
+        accumulator.record('bedrock:titan', input_tokens=1, date='2024-03-01')
+        installed[0](signal.SIGTERM, None)
+
+    assert table.items['system#bedrock:titan#2024-03-01']['count'] == 1
+    assert kill.called is terminates
+    assert installed[1:] == ([signal.SIG_DFL] if terminates else [])
+
+
+def test_handlers_flush_usage_at_the_end_of_each_invocation(accumulator, table):
+    @flush_usage_after
+    def handler(event, context):
+        accumulator.record('bedrock:titan', input_tokens=event['tokens'], date='2024-03-01')
+        return {'statusCode': 200}
+
+    with patch.object(usage_accounting, 'usage_accumulator', accumulator):
+        assert handler({'tokens': 5}, None) == {'statusCode': 200}
+        assert table.items['system#bedrock:titan#2024-03-01']['input_tokens'] == 5
+        handler({'tokens': 2}, None)
+
+    assert table.updates == 2
+
+
+def test_bedrock_cost_uses_model_pricing():
+    assert bedrock_cost('amazon.titan-text-express-v1', 1000, 1000) == pytest.approx(0.0008)
+    assert bedrock_cost('unknown-model', 1000, 0) > 0